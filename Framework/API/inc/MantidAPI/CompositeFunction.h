@@ -308,6 +308,16 @@ public:
    *   @param iP :: The index of an active parameter.
    */
   void addNumberToColumn(const double &value, const size_t &iP) override { m_J->addNumberToColumn(value, m_iP0 + iP); }
+  /// The number of data points of the overall Jacobian after the offset
+  size_t nData() const override {
+    const auto n = m_J->nData();
+    return n > m_iY0 ? n - m_iY0 : 0;
+  }
+  /// The number of parameters of the overall Jacobian after the offset
+  size_t nParams() const override {
+    const auto n = m_J->nParams();
+    return n > m_iP0 ? n - m_iP0 : 0;
+  }
 };
 
 } // namespace API
@@ -34,6 +34,8 @@ public:
     return maxIndex;
   }
   void zero() override { m_J.assign(m_J.size(), 0.0); }
+  size_t nData() const override { return m_y; }
+  size_t nParams() const override { return m_p; }
 
 protected:
   size_t m_y;
@@ -38,6 +38,16 @@ public:
    */
   virtual void zero() = 0;
 
+  /// Return the number of data points (rows) which can be set
+  virtual size_t nData() const {
+    throw Kernel::Exception::NotImplementedError("No nData() method of Jacobian provided");
+  }
+
+  /// Return the number of parameters (columns) which can be set
+  virtual size_t nParams() const {
+    throw Kernel::Exception::NotImplementedError("No nParams() method of Jacobian provided");
+  }
+
   ///@cond do not document
   /**  Add number to all iY (data) Jacobian elements for a given iP (parameter)
    *   @param value :: Value to add
@@ -53,6 +53,13 @@ public:
   void zero() override {
     throw Kernel::Exception::NotImplementedError("zero() is not implemented for PartialJacobian1");
   }
+  /// The number of data points of the overall Jacobian after the offset
+  size_t nData() const override {
+    const auto n = m_J->nData();
+    return n > static_cast<size_t>(m_iY0) ? n - static_cast<size_t>(m_iY0) : 0;
+  }
+  /// The number of parameters of the overall Jacobian
+  size_t nParams() const override { return m_J->nParams(); }
 };
 
 /// Tolerance for determining the smallest significant value on the peak
@@ -68,11 +68,12 @@ private:
   void exec() override;
   std::map<std::string, std::string> validateInputs() override;
 
-  API::MatrixWorkspace_uptr doSimulation(const API::MatrixWorkspace &inputWS, const size_t nevents,
-                                         const bool simulateTracksForEachWavelength, const int seed,
-                                         const InterpolationOption &interpolateOpt, const bool useSparseInstrument,
-                                         const size_t maxScatterPtAttempts,
-                                         MCInteractionVolume::ScatteringPointVicinity pointsIn);
+  std::vector<API::MatrixWorkspace_uptr> doSimulation(const API::MatrixWorkspace &inputWS, const size_t nevents,
+                                                      const bool simulateTracksForEachWavelength, const int seed,
+                                                      const InterpolationOption &interpolateOpt,
+                                                      const bool useSparseInstrument, const size_t maxScatterPtAttempts,
+                                                      MCInteractionVolume::ScatteringPointVicinity pointsIn,
+                                                      const bool paalmanPingsFactors);
   API::MatrixWorkspace_uptr createOutputWorkspace(const API::MatrixWorkspace &inputWS) const;
   void interpolateFromSparse(API::MatrixWorkspace &targetWS, const SparseWorkspace &sparseWS,
                              const Mantid::Algorithms::InterpolationOption &interpOpt);
@@ -19,6 +19,10 @@ namespace Mantid {
 namespace API {
 class Sample;
 }
+namespace Geometry {
+class BoundingBox;
+class SampleEnvironment;
+} // namespace Geometry
 namespace Kernel {
 class PseudoRandomNumberGenerator;
 class V3D;
@@ -47,6 +51,12 @@ public:
                          const std::vector<double> &lambdas, const double lambdaFixed,
                          std::vector<double> &attenuationFactors, std::vector<double> &attFactorErrors,
                          MCInteractionStatistics &stats) override;
+  void calculatePaalmanPings(Kernel::PseudoRandomNumberGenerator &rng, const Kernel::V3D &finalPos,
+                             const std::vector<double> &lambdas, const double lambdaFixed,
+                             const Geometry::SampleEnvironment &environment, const bool scatterInEnvironment,
+                             std::vector<double> &ownFactors, std::vector<double> &ownFactorErrors,
+                             std::vector<double> &totalFactors, std::vector<double> &totalFactorErrors,
+                             MCInteractionStatistics &stats);
 
 private:
   std::shared_ptr<IMCInteractionVolume> m_scatterVol;
@@ -56,6 +66,9 @@ private:
   const Kernel::DeltaEMode::Type m_EMode;
   const bool m_regenerateTracksForEachLambda;
   void setActiveRegion();
+  TrackPair generateTracks(Kernel::PseudoRandomNumberGenerator &rng, const Geometry::BoundingBox &scatterBounds,
+                           const Kernel::V3D &finalPos, MCInteractionStatistics &stats) const;
+  std::pair<double, double> inOutWavelengths(const double lambdaStep, const double lambdaFixed) const;
 };
 
 } // namespace Algorithms
@@ -147,6 +147,29 @@ void MonteCarloAbsorption::init() {
                   "Simulate the scattering point in the vicinity of the sample or its "
                   "environment or both (default).",
                   scatteringOptionValidator);
+
+  declareProperty("CalculatePaalmanPingsFactors", false,
+                  "Calculate the four Paalman-Pings factors of a sample in a container from a shared set of "
+                  "tracks. Each track is traced once and the attenuation is accumulated both through the "
+                  "component it scatters in and through the sample and container. OutputWorkspace is set to "
+                  "A_s,s and SimulateScatteringPointIn is ignored.");
+  declareProperty(std::make_unique<WorkspaceProperty<>>("SampleContainerOutputWorkspace", "", Direction::Output,
+                                                        PropertyMode::Optional),
+                  "The name of the output workspace for A_s,sc, the attenuation of the scattering in the sample "
+                  "by the sample and container.");
+  declareProperty(
+      std::make_unique<WorkspaceProperty<>>("ContainerOutputWorkspace", "", Direction::Output, PropertyMode::Optional),
+      "The name of the output workspace for A_c,c, the attenuation of the scattering in the "
+      "container by the container.");
+  declareProperty(std::make_unique<WorkspaceProperty<>>("ContainerSampleOutputWorkspace", "", Direction::Output,
+                                                        PropertyMode::Optional),
+                  "The name of the output workspace for A_c,sc, the attenuation of the scattering in the "
+                  "container by the sample and container.");
+  for (const auto &name :
+       {"SampleContainerOutputWorkspace", "ContainerOutputWorkspace", "ContainerSampleOutputWorkspace"}) {
+    setPropertySettings(name, std::make_unique<EnabledWhenProperty>("CalculatePaalmanPingsFactors",
+                                                                    ePropertyCriterion::IS_NOT_DEFAULT));
+  }
 }
 
 /**
@@ -168,9 +191,16 @@ void MonteCarloAbsorption::exec() {
   } else if (pointsInProperty == "EnvironmentOnly") {
     simulatePointsIn = MCInteractionVolume::ScatteringPointVicinity::ENVIRONMENTONLY;
   }
-  auto outputWS = doSimulation(*inputWS, static_cast<size_t>(nevents), resimulateTracks, seed, interpolateOpt,
-                               useSparseInstrument, static_cast<size_t>(maxScatterPtAttempts), simulatePointsIn);
-  setProperty("OutputWorkspace", std::move(outputWS));
+  const bool paalmanPingsFactors = getProperty("CalculatePaalmanPingsFactors");
+  auto outputWSs =
+      doSimulation(*inputWS, static_cast<size_t>(nevents), resimulateTracks, seed, interpolateOpt, useSparseInstrument,
+                   static_cast<size_t>(maxScatterPtAttempts), simulatePointsIn, paalmanPingsFactors);
+  setProperty("OutputWorkspace", std::move(outputWSs[0]));
+  if (paalmanPingsFactors) {
+    setProperty("SampleContainerOutputWorkspace", std::move(outputWSs[1]));
+    setProperty("ContainerOutputWorkspace", std::move(outputWSs[2]));
+    setProperty("ContainerSampleOutputWorkspace", std::move(outputWSs[3]));
+  }
 }
 
 /**
@@ -191,6 +221,19 @@ std::map<std::string, std::string> MonteCarloAbsorption::validateInputs() {
       issues["NumberOfWavelengthPoints"] = nlambdaIssue;
     }
   }
+  const bool paalmanPingsFactors = getProperty("CalculatePaalmanPingsFactors");
+  if (paalmanPingsFactors) {
+    for (const auto &name :
+         {"SampleContainerOutputWorkspace", "ContainerOutputWorkspace", "ContainerSampleOutputWorkspace"}) {
+      if (isDefault(name)) {
+        issues[name] = "An output workspace is required when CalculatePaalmanPingsFactors is enabled.";
+      }
+    }
+    const MatrixWorkspace_sptr inputWS = getProperty("InputWorkspace");
+    if (inputWS && (!inputWS->sample().hasEnvironment() || !inputWS->sample().getShape().hasValidShape())) {
+      issues["CalculatePaalmanPingsFactors"] = "The input workspace must have both a sample shape and a container.";
+    }
+  }
   return issues;
 }
 
@@ -255,15 +298,20 @@ std::unique_ptr<InterpolationOption> MonteCarloAbsorption::createInterpolateOpti
  * @param maxScatterPtAttempts The maximum number of tries to generate a
  * scatter point within the object
  * @param pointsIn Where to simulate the scattering point in
- * @return A new workspace containing the correction factors & errors
+ * @param paalmanPingsFactors If true, calculate the four Paalman-Pings factors
+ * from a shared set of tracks rather than a single correction
+ * @return New workspaces containing the correction factors & errors. A single
+ * workspace, or A_s,s, A_s,sc, A_c,c & A_c,sc if paalmanPingsFactors is true
  */
-MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &inputWS, const size_t nevents,
-                                                        const bool resimulateTracksForDiffWavelengths, const int seed,
-                                                        const InterpolationOption &interpolateOpt,
-                                                        const bool useSparseInstrument,
-                                                        const size_t maxScatterPtAttempts,
-                                                        MCInteractionVolume::ScatteringPointVicinity pointsIn) {
-  auto outputWS = createOutputWorkspace(inputWS);
+std::vector<MatrixWorkspace_uptr> MonteCarloAbsorption::doSimulation(
+    const MatrixWorkspace &inputWS, const size_t nevents, const bool resimulateTracksForDiffWavelengths, const int seed,
+    const InterpolationOption &interpolateOpt, const bool useSparseInstrument, const size_t maxScatterPtAttempts,
+    MCInteractionVolume::ScatteringPointVicinity pointsIn, const bool paalmanPingsFactors) {
+  const size_t noutputs = paalmanPingsFactors ? 4 : 1;
+  std::vector<MatrixWorkspace_uptr> outputWSs;
+  for (size_t k = 0; k < noutputs; ++k) {
+    outputWSs.emplace_back(createOutputWorkspace(inputWS));
+  }
   const auto inputNbins = static_cast<int>(inputWS.blocksize());
 
   int nlambda;
@@ -280,13 +328,21 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
   } else {
     nlambda = inputNbins;
   }
-  SparseWorkspace_sptr sparseWS;
+  std::vector<SparseWorkspace_sptr> sparseWSs;
+  std::vector<MatrixWorkspace *> simulationWSs;
   if (useSparseInstrument) {
     const int latitudinalDets = getProperty("NumberOfDetectorRows");
     const int longitudinalDets = getProperty("NumberOfDetectorColumns");
-    sparseWS = createSparseWorkspace(inputWS, nlambda, latitudinalDets, longitudinalDets);
+    for (size_t k = 0; k < noutputs; ++k) {
+      sparseWSs.emplace_back(createSparseWorkspace(inputWS, nlambda, latitudinalDets, longitudinalDets));
+      simulationWSs.emplace_back(sparseWSs.back().get());
+    }
+  } else {
+    for (const auto &outputWS : outputWSs) {
+      simulationWSs.emplace_back(outputWS.get());
+    }
   }
-  MatrixWorkspace &simulationWS = useSparseInstrument ? *sparseWS : *outputWS;
+  MatrixWorkspace &simulationWS = *simulationWSs.front();
   const MatrixWorkspace &instrumentWS = useSparseInstrument ? simulationWS : inputWS;
   // Cache information about the workspace that will be used repeatedly
   auto instrument = instrumentWS.getInstrument();
@@ -312,6 +368,9 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
   }
 
   if (hasGaugeVol) {
+    if (paalmanPingsFactors) {
+      throw std::runtime_error("A gauge volume is not supported when calculating the Paalman-Pings factors.");
+    }
     std::string xmlString = inputWS.run().getProperty("GaugeVolume")->value();
     gaugeVolume = ShapeFactory().createShape(xmlString);
     if (pointsIn != MCInteractionVolume::ScatteringPointVicinity::SAMPLEONLY) {
@@ -321,14 +380,25 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
                                                                          // points from the sample
   }
 
-  std::shared_ptr<IMCInteractionVolume> interactionVolume =
-      MCInteractionVolume::create(inputWS.sample(), maxScatterPtAttempts, pointsIn, gaugeVolume);
-
-  Geometry::IObject_sptr gv = interactionVolume->getGaugeVolume();
-
-  std::shared_ptr<IMCAbsorptionStrategy> strategy =
-      createStrategy(interactionVolume, *beamProfile, efixed.emode(), nevents, maxScatterPtAttempts,
-                     resimulateTracksForDiffWavelengths);
+  std::shared_ptr<IMCAbsorptionStrategy> strategy;
+  // Strategies generating scattering points in the sample and in the environment
+  // respectively, used to calculate the Paalman-Pings factors
+  std::shared_ptr<MCAbsorptionStrategy> sampleStrategy, environmentStrategy;
+  if (paalmanPingsFactors) {
+    sampleStrategy = std::make_shared<MCAbsorptionStrategy>(
+        MCInteractionVolume::create(inputWS.sample(), maxScatterPtAttempts,
+                                    MCInteractionVolume::ScatteringPointVicinity::SAMPLEONLY),
+        *beamProfile, efixed.emode(), nevents, maxScatterPtAttempts, resimulateTracksForDiffWavelengths);
+    environmentStrategy = std::make_shared<MCAbsorptionStrategy>(
+        MCInteractionVolume::create(inputWS.sample(), maxScatterPtAttempts,
+                                    MCInteractionVolume::ScatteringPointVicinity::ENVIRONMENTONLY),
+        *beamProfile, efixed.emode(), nevents, maxScatterPtAttempts, resimulateTracksForDiffWavelengths);
+  } else {
+    std::shared_ptr<IMCInteractionVolume> interactionVolume =
+        MCInteractionVolume::create(inputWS.sample(), maxScatterPtAttempts, pointsIn, gaugeVolume);
+    strategy = createStrategy(interactionVolume, *beamProfile, efixed.emode(), nevents, maxScatterPtAttempts,
+                              resimulateTracksForDiffWavelengths);
+  }
 
   const auto &spectrumInfo = simulationWS.spectrumInfo();
 
@@ -336,9 +406,10 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
   for (int64_t i = 0; i < nhists; ++i) {
     PARALLEL_START_INTERRUPT_REGION
 
-    auto &outE = simulationWS.mutableE(i);
-    // The input was cloned so clear the errors out
-    outE = 0.0;
+    for (auto *ws : simulationWSs) {
+      // The input was cloned so clear the errors out
+      ws->mutableE(i) = 0.0;
+    }
 
     if (!spectrumInfo.hasDetectors(i) || spectrumInfo.isMasked(i)) {
       continue;
@@ -354,45 +425,55 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
     const size_t lambdaStepSize = nbins / nlambda;
 
     std::vector<double> packedLambdas;
-    std::vector<double> packedAttFactors;
-    std::vector<double> packedAttFactorErrors;
-
     for (size_t j = 0; j < nbins; j += lambdaStepSize) {
       packedLambdas.push_back(lambdas[j]);
-      packedAttFactors.push_back(0);
-      packedAttFactorErrors.push_back(0);
       // Ensure we have the last point for the interpolation
       if (lambdaStepSize > 1 && j + lambdaStepSize >= nbins && j + 1 != nbins) {
         j = nbins - lambdaStepSize - 1;
       }
     }
+    std::vector<std::vector<double>> packedAttFactors(noutputs, std::vector<double>(packedLambdas.size(), 0.));
+    std::vector<std::vector<double>> packedAttFactorErrors(noutputs, std::vector<double>(packedLambdas.size(), 0.));
     MCInteractionStatistics detStatistics(spectrumInfo.detector(i).getID(), inputWS.sample());
 
-    strategy->calculate(rng, detPos, packedLambdas, lambdaFixed, packedAttFactors, packedAttFactorErrors,
-                        detStatistics);
+    if (paalmanPingsFactors) {
+      const auto &environment = inputWS.sample().getEnvironment();
+      sampleStrategy->calculatePaalmanPings(rng, detPos, packedLambdas, lambdaFixed, environment, false,
+                                            packedAttFactors[0], packedAttFactorErrors[0], packedAttFactors[1],
+                                            packedAttFactorErrors[1], detStatistics);
+      environmentStrategy->calculatePaalmanPings(rng, detPos, packedLambdas, lambdaFixed, environment, true,
+                                                 packedAttFactors[2], packedAttFactorErrors[2], packedAttFactors[3],
+                                                 packedAttFactorErrors[3], detStatistics);
+    } else {
+      strategy->calculate(rng, detPos, packedLambdas, lambdaFixed, packedAttFactors[0], packedAttFactorErrors[0],
+                          detStatistics);
+    }
 
     if (g_log.is(Kernel::Logger::Priority::PRIO_DEBUG)) {
       g_log.debug(detStatistics.generateScatterPointStats());
     }
 
-    for (size_t j = 0; j < packedLambdas.size(); j++) {
-      auto idx = simulationWS.yIndexOfX(packedLambdas[j], i);
-      simulationWS.getSpectrum(i).dataY()[idx] = packedAttFactors[j];
-      simulationWS.getSpectrum(i).dataE()[idx] = packedAttFactorErrors[j];
-    }
+    for (size_t k = 0; k < noutputs; ++k) {
+      auto &ws = *simulationWSs[k];
+      for (size_t j = 0; j < packedLambdas.size(); j++) {
+        auto idx = ws.yIndexOfX(packedLambdas[j], i);
+        ws.getSpectrum(i).dataY()[idx] = packedAttFactors[k][j];
+        ws.getSpectrum(i).dataE()[idx] = packedAttFactorErrors[k][j];
+      }
 
-    // Interpolate through points not simulated. Simulation WS only has
-    // reduced X values if using sparse instrument so no interpolation required
+      // Interpolate through points not simulated. Simulation WS only has
+      // reduced X values if using sparse instrument so no interpolation required
 
-    if (!useSparseInstrument && lambdaStepSize > 1) {
-      auto histnew = simulationWS.histogram(i);
+      if (!useSparseInstrument && lambdaStepSize > 1) {
+        auto histnew = ws.histogram(i);
 
-      if (lambdaStepSize < nbins) {
-        interpolateOpt.applyInplace(histnew, lambdaStepSize);
-      } else {
-        std::fill(histnew.mutableY().begin() + 1, histnew.mutableY().end(), histnew.y()[0]);
+        if (lambdaStepSize < nbins) {
+          interpolateOpt.applyInplace(histnew, lambdaStepSize);
+        } else {
+          std::fill(histnew.mutableY().begin() + 1, histnew.mutableY().end(), histnew.y()[0]);
+        }
+        outputWSs[k]->setHistogram(i, histnew);
       }
-      outputWS->setHistogram(i, histnew);
     }
 
     prog.report(reportMsg);
@@ -402,10 +483,12 @@ MatrixWorkspace_uptr MonteCarloAbsorption::doSimulation(const MatrixWorkspace &i
   PARALLEL_CHECK_INTERRUPT_REGION
 
   if (useSparseInstrument) {
-    interpolateFromSparse(*outputWS, *sparseWS, interpolateOpt);
+    for (size_t k = 0; k < noutputs; ++k) {
+      interpolateFromSparse(*outputWSs[k], *sparseWSs[k], interpolateOpt);
+    }
   }
 
-  return outputWS;
+  return outputWSs;
 }
 
 MatrixWorkspace_uptr MonteCarloAbsorption::createOutputWorkspace(const MatrixWorkspace &inputWS) const {
@@ -6,10 +6,13 @@
 // SPDX - License - Identifier: GPL - 3.0 +
 #include "MantidAlgorithms/SampleCorrections/MCAbsorptionStrategy.h"
 #include "MantidAlgorithms/SampleCorrections/IBeamProfile.h"
+#include "MantidKernel/Material.h"
 #include "MantidKernel/PseudoRandomNumberGenerator.h"
 #include "MantidKernel/V3D.h"
 
+#include "MantidGeometry/Instrument/SampleEnvironment.h"
 #include "MantidGeometry/Objects/CSGObject.h"
+#include "MantidGeometry/Objects/Track.h"
 
 namespace Mantid {
 using Kernel::DeltaEMode;
@@ -17,6 +20,75 @@ using Kernel::PseudoRandomNumberGenerator;
 
 namespace Algorithms {
 
+namespace {
+
+/**
+ * Accumulates the mean and the standard deviation of the mean of the track
+ * weights at each wavelength point
+ */
+class WeightStatistics {
+public:
+  WeightStatistics(std::vector<double> &factors, std::vector<double> &errors)
+      : m_factors(factors), m_errors(errors), m_mean(factors.size()), m_m2(factors.size()) {}
+
+  void add(const size_t event, const size_t bin, const double wgt) {
+    m_factors[bin] += wgt;
+    // increment standard deviation using Welford algorithm
+    const double delta = wgt - m_mean[bin];
+    m_mean[bin] += delta / static_cast<double>(event + 1);
+    m_m2[bin] += delta * (wgt - m_mean[bin]);
+    // calculate sample SD (M2/n-1)
+    // will give NaN for m_events=1, but that's correct
+    m_errors[bin] = sqrt(m_m2[bin] / static_cast<double>(event));
+  }
+
+  void finalise(const size_t nevents) {
+    std::transform(m_factors.begin(), m_factors.end(), m_factors.begin(),
+                   std::bind(std::divides<double>(), std::placeholders::_1, static_cast<double>(nevents)));
+    // calculate standard deviation of mean from sample mean
+    std::transform(m_errors.begin(), m_errors.end(), m_errors.begin(),
+                   [nevents](double v) -> double { return v / sqrt(static_cast<double>(nevents)); });
+  }
+
+private:
+  std::vector<double> &m_factors;
+  std::vector<double> &m_errors;
+  std::vector<double> m_mean;
+  std::vector<double> m_m2;
+};
+
+/**
+ * Calculate the attenuation along a track separately for the links through the
+ * sample and the links through the components of the sample environment
+ * @param track The track to calculate the attenuation along
+ * @param lambda The wavelength of the neutron
+ * @param environment The sample environment
+ * @return The attenuation through the sample and through the environment
+ */
+std::pair<double, double> splitAttenuation(const Geometry::Track &track, const double lambda,
+                                           const Geometry::SampleEnvironment &environment) {
+  double sampleFactor(1.0), environmentFactor(1.0);
+  for (const auto &segment : track) {
+    const auto &segObj = *(segment.object);
+    const double factor = segObj.material().attenuation(segment.distInsideObject, lambda);
+    bool inEnvironment(false);
+    for (size_t i = 0; i < environment.nelements(); ++i) {
+      if (&environment.getComponent(i) == &segObj) {
+        inEnvironment = true;
+        break;
+      }
+    }
+    if (inEnvironment) {
+      environmentFactor *= factor;
+    } else {
+      sampleFactor *= factor;
+    }
+  }
+  return {sampleFactor, environmentFactor};
+}
+
+} // namespace
+
 /**
  * Constructor
  * @param interactionVolume A reference to the MCInteractionVolume dependency
@@ -70,70 +142,123 @@ void MCAbsorptionStrategy::calculate(Kernel::PseudoRandomNumberGenerator &rng, c
                                      std::vector<double> &attenuationFactors, std::vector<double> &attFactorErrors,
                                      MCInteractionStatistics &stats) {
   const auto scatterBounds = m_scatterVol->getFullBoundingBox();
-  const auto nbins = static_cast<int>(lambdas.size());
-  Geometry::IObject_sptr gv = m_scatterVol->getGaugeVolume();
+  const auto nbins = lambdas.size();
 
-  std::vector<double> wgtMean(attenuationFactors.size()), wgtM2(attenuationFactors.size());
+  WeightStatistics weights(attenuationFactors, attFactorErrors);
 
   for (size_t i = 0; i < m_nevents; ++i) {
-    std::shared_ptr<Geometry::Track> beforeScatter;
-    std::shared_ptr<Geometry::Track> afterScatter;
-    for (int j = 0; j < nbins; ++j) {
-      size_t attempts(0);
-      do {
-        bool success = false;
-        if (m_regenerateTracksForEachLambda || j == 0) {
-          const auto neutron = m_beamProfile.generatePoint(rng, scatterBounds);
-          std::tie(success, beforeScatter, afterScatter) =
-              m_scatterVol->calculateBeforeAfterTrack(rng, neutron.startPos, finalPos, stats);
-        } else {
-          success = true;
-        }
-        if (!success) {
-          ++attempts;
-        } else {
-          const double lambdaStep = lambdas[j];
-          double lambdaIn(lambdaStep), lambdaOut(lambdaStep);
-          if (m_EMode == DeltaEMode::Direct) {
-            lambdaIn = lambdaFixed;
-          } else if (m_EMode == DeltaEMode::Indirect) {
-            lambdaOut = lambdaFixed;
-          } else {
-            // elastic case already initialized
-          }
-          const double wgt =
-              beforeScatter->calculateAttenuation(lambdaIn) * afterScatter->calculateAttenuation(lambdaOut);
-          attenuationFactors[j] += wgt;
-          // increment standard deviation using Welford algorithm
-          double delta = wgt - wgtMean[j];
-          wgtMean[j] += delta / static_cast<double>(i + 1);
-          wgtM2[j] += delta * (wgt - wgtMean[j]);
-          // calculate sample SD (M2/n-1)
-          // will give NaN for m_events=1, but that's correct
-          attFactorErrors[j] = sqrt(wgtM2[j] / static_cast<double>(i));
-
-          break;
-        }
-        if (attempts == m_maxScatterAttempts) {
-          throw std::runtime_error("Unable to generate valid track through "
-                                   "sample interaction volume after " +
-                                   std::to_string(m_maxScatterAttempts) +
-                                   " attempts. Try increasing the maximum "
-                                   "threshold or if this does not help then "
-                                   "please check the defined shape and, "
-                                   "if defined, the gauge volume (both its shape "
-                                   "and its intersection with the defined sample shape).");
-        }
-      } while (true);
+    TrackPair tracks;
+    for (size_t j = 0; j < nbins; ++j) {
+      if (m_regenerateTracksForEachLambda || j == 0) {
+        tracks = generateTracks(rng, scatterBounds, finalPos, stats);
+      }
+      const auto &beforeScatter = std::get<1>(tracks);
+      const auto &afterScatter = std::get<2>(tracks);
+      const auto [lambdaIn, lambdaOut] = inOutWavelengths(lambdas[j], lambdaFixed);
+      weights.add(i, j, beforeScatter->calculateAttenuation(lambdaIn) * afterScatter->calculateAttenuation(lambdaOut));
     }
   }
+  weights.finalise(m_nevents);
+}
 
-  std::transform(attenuationFactors.begin(), attenuationFactors.end(), attenuationFactors.begin(),
-                 std::bind(std::divides<double>(), std::placeholders::_1, static_cast<double>(m_nevents)));
+/**
+ * Compute the Paalman-Pings correction factors for the scattering component of the
+ * interaction volume from a single set of tracks. Each track is traced once through
+ * the sample and its environment, and the attenuation is accumulated both through the
+ * scattering component alone and through all of the components. For an interaction
+ * volume generating points in the sample these are \f$A_{s,s}\f$ and \f$A_{s,sc}\f$,
+ * for one generating points in the environment \f$A_{c,c}\f$ and \f$A_{c,sc}\f$.
+ * @param rng A reference to a PseudoRandomNumberGenerator
+ * @param finalPos Defines the final position of the neutron, assumed to be
+ * where it is detected
+ * @param lambdas Set of wavelength values from the input workspace
+ * @param lambdaFixed Efixed value for a detector ID converted to wavelength
+ * @param environment The sample environment that the tracks pass through
+ * @param scatterInEnvironment True if the interaction volume generates the scattering
+ * points in the environment, false if it generates them in the sample
+ * @param ownFactors A vector to hold the correction factors for attenuation by
+ * the scattering component only
+ * @param ownFactorErrors A vector to hold the errors on ownFactors
+ * @param totalFactors A vector to hold the correction factors for attenuation by
+ * the sample and its environment
+ * @param totalFactorErrors A vector to hold the errors on totalFactors
+ * @param stats A statistics class to hold the statistics on the generated tracks
+ */
+void MCAbsorptionStrategy::calculatePaalmanPings(
+    Kernel::PseudoRandomNumberGenerator &rng, const Kernel::V3D &finalPos, const std::vector<double> &lambdas,
+    const double lambdaFixed, const Geometry::SampleEnvironment &environment, const bool scatterInEnvironment,
+    std::vector<double> &ownFactors, std::vector<double> &ownFactorErrors, std::vector<double> &totalFactors,
+    std::vector<double> &totalFactorErrors, MCInteractionStatistics &stats) {
+  const auto scatterBounds = m_scatterVol->getFullBoundingBox();
+  const auto nbins = lambdas.size();
+
+  WeightStatistics ownWeights(ownFactors, ownFactorErrors);
+  WeightStatistics totalWeights(totalFactors, totalFactorErrors);
+
+  for (size_t i = 0; i < m_nevents; ++i) {
+    TrackPair tracks;
+    for (size_t j = 0; j < nbins; ++j) {
+      if (m_regenerateTracksForEachLambda || j == 0) {
+        tracks = generateTracks(rng, scatterBounds, finalPos, stats);
+      }
+      const auto &beforeScatter = std::get<1>(tracks);
+      const auto &afterScatter = std::get<2>(tracks);
+      const auto [lambdaIn, lambdaOut] = inOutWavelengths(lambdas[j], lambdaFixed);
+      const auto [sampleBefore, environmentBefore] = splitAttenuation(*beforeScatter, lambdaIn, environment);
+      const auto [sampleAfter, environmentAfter] = splitAttenuation(*afterScatter, lambdaOut, environment);
+      const double sampleWgt = sampleBefore * sampleAfter;
+      const double environmentWgt = environmentBefore * environmentAfter;
+      ownWeights.add(i, j, scatterInEnvironment ? environmentWgt : sampleWgt);
+      totalWeights.add(i, j, sampleWgt * environmentWgt);
+    }
+  }
+  ownWeights.finalise(m_nevents);
+  totalWeights.finalise(m_nevents);
+}
 
-  // calculate standard deviation of mean from sample mean
-  std::transform(attFactorErrors.begin(), attFactorErrors.end(), attFactorErrors.begin(),
-                 [this](double v) -> double { return v / sqrt(static_cast<double>(m_nevents)); });
+/**
+ * Generate a pair of tracks before and after a random scattering point
+ * @param rng A reference to a PseudoRandomNumberGenerator
+ * @param scatterBounds The bounding box of the interaction volume
+ * @param finalPos Defines the final position of the neutron
+ * @param stats A statistics class to hold the statistics on the generated tracks
+ * @return The successfully generated before and after scatter tracks
+ */
+TrackPair MCAbsorptionStrategy::generateTracks(Kernel::PseudoRandomNumberGenerator &rng,
+                                               const Geometry::BoundingBox &scatterBounds, const Kernel::V3D &finalPos,
+                                               MCInteractionStatistics &stats) const {
+  for (size_t attempts = 0; attempts < m_maxScatterAttempts; ++attempts) {
+    const auto neutron = m_beamProfile.generatePoint(rng, scatterBounds);
+    auto tracks = m_scatterVol->calculateBeforeAfterTrack(rng, neutron.startPos, finalPos, stats);
+    if (std::get<0>(tracks)) {
+      return tracks;
+    }
+  }
+  throw std::runtime_error("Unable to generate valid track through "
+                           "sample interaction volume after " +
+                           std::to_string(m_maxScatterAttempts) +
+                           " attempts. Try increasing the maximum "
+                           "threshold or if this does not help then "
+                           "please check the defined shape and, "
+                           "if defined, the gauge volume (both its shape "
+                           "and its intersection with the defined sample shape).");
+}
+
+/**
+ * Return the wavelengths before and after scattering for a simulated wavelength point
+ * @param lambdaStep The simulated wavelength
+ * @param lambdaFixed Efixed value for a detector ID converted to wavelength
+ * @return The wavelengths before and after scattering
+ */
+std::pair<double, double> MCAbsorptionStrategy::inOutWavelengths(const double lambdaStep,
+                                                                 const double lambdaFixed) const {
+  if (m_EMode == DeltaEMode::Direct) {
+    return {lambdaFixed, lambdaStep};
+  } else if (m_EMode == DeltaEMode::Indirect) {
+    return {lambdaStep, lambdaFixed};
+  }
+  // elastic case
+  return {lambdaStep, lambdaStep};
 }
 
 } // namespace Algorithms
@@ -16,9 +16,11 @@
 #include "MantidAlgorithms/SampleCorrections/RectangularBeamProfile.h"
 #include "MantidDataObjects/Histogram1D.h"
 #include "MantidGeometry/Instrument/ReferenceFrame.h"
+#include "MantidGeometry/Instrument/SampleEnvironment.h"
 #include "MantidGeometry/Objects/BoundingBox.h"
 #include "MantidGeometry/Objects/Track.h"
 #include "MantidKernel/Logger.h"
+#include "MantidKernel/MersenneTwister.h"
 #include "MantidKernel/WarningSuppressions.h"
 #include "MonteCarloTesting.h"
 
@@ -178,6 +180,42 @@ public:
     TS_ASSERT_EQUALS(attenuationFactors[0], 3.0);
   }
 
+  void test_calculatePaalmanPings_for_scatter_in_sample_matches_separate_simulations() {
+    using ScatteringPointVicinity = MCInteractionVolume::ScatteringPointVicinity;
+    auto sampleAndCan = MonteCarloTesting::createTestSample(MonteCarloTesting::TestSampleType::SamplePlusContainer);
+    Mantid::API::Sample sampleOnly;
+    sampleOnly.setShape(sampleAndCan.getShapePtr());
+
+    std::vector<double> ass, assErrors, assc, asscErrors;
+    calculatePaalmanPingsFactors(sampleAndCan, ScatteringPointVicinity::SAMPLEONLY, ass, assErrors, assc, asscErrors);
+
+    const auto expectedAss = calculateFactors(sampleOnly, ScatteringPointVicinity::SAMPLEONLY);
+    const auto expectedAssc = calculateFactors(sampleAndCan, ScatteringPointVicinity::SAMPLEONLY);
+    for (size_t i = 0; i < LAMBDAS.size(); ++i) {
+      TS_ASSERT_DELTA(expectedAss[i], ass[i], 1e-12);
+      TS_ASSERT_DELTA(expectedAssc[i], assc[i], 1e-12);
+      TS_ASSERT_LESS_THAN(assc[i], ass[i]);
+      TS_ASSERT(assErrors[i] > 0.);
+      TS_ASSERT(asscErrors[i] > 0.);
+    }
+  }
+
+  void test_calculatePaalmanPings_for_scatter_in_environment_matches_separate_simulation() {
+    using ScatteringPointVicinity = MCInteractionVolume::ScatteringPointVicinity;
+    auto sampleAndCan = MonteCarloTesting::createTestSample(MonteCarloTesting::TestSampleType::SamplePlusContainer);
+
+    std::vector<double> acc, accErrors, acsc, acscErrors;
+    calculatePaalmanPingsFactors(sampleAndCan, ScatteringPointVicinity::ENVIRONMENTONLY, acc, accErrors, acsc,
+                                 acscErrors);
+
+    const auto expectedAcsc = calculateFactors(sampleAndCan, ScatteringPointVicinity::ENVIRONMENTONLY);
+    for (size_t i = 0; i < LAMBDAS.size(); ++i) {
+      TS_ASSERT_DELTA(expectedAcsc[i], acsc[i], 1e-12);
+      TS_ASSERT_LESS_THAN(acsc[i], acc[i]);
+      TS_ASSERT_LESS_THAN(acc[i], 1.);
+    }
+  }
+
   //----------------------------------------------------------------------------
   // Failure cases
   //----------------------------------------------------------------------------
@@ -210,6 +248,47 @@ public:
   }
 
 private:
+  const size_t NEVENTS = 50;
+  const size_t MAX_TRIES = 100;
+  const int SEED = 123456789;
+  const std::vector<double> LAMBDAS = {1.0, 2.5};
+  const double LAMBDA_FIXED = 3.5;
+  const Mantid::Kernel::V3D END_POS{0.7, 0.7, 1.4};
+
+  std::vector<double> calculateFactors(const Mantid::API::Sample &sample,
+                                       MCInteractionVolume::ScatteringPointVicinity pointsIn) {
+    using namespace Mantid::Geometry;
+    using namespace Mantid::Kernel;
+    Mantid::Algorithms::RectangularBeamProfile beamProfile(ReferenceFrame(Y, Z, Right, "source"), V3D(), 1, 1);
+    MCAbsorptionStrategy mcabsorb(MCInteractionVolume::create(sample, MAX_TRIES, pointsIn), beamProfile,
+                                  DeltaEMode::Type::Direct, NEVENTS, MAX_TRIES, false);
+    MersenneTwister rng(SEED);
+    std::vector<double> attenuationFactors(LAMBDAS.size()), attenuationFactorErrors(LAMBDAS.size());
+    MCInteractionStatistics trackStatistics(-1, sample);
+    mcabsorb.calculate(rng, END_POS, LAMBDAS, LAMBDA_FIXED, attenuationFactors, attenuationFactorErrors,
+                       trackStatistics);
+    return attenuationFactors;
+  }
+
+  void calculatePaalmanPingsFactors(const Mantid::API::Sample &sample,
+                                    MCInteractionVolume::ScatteringPointVicinity pointsIn,
+                                    std::vector<double> &ownFactors, std::vector<double> &ownFactorErrors,
+                                    std::vector<double> &totalFactors, std::vector<double> &totalFactorErrors) {
+    using namespace Mantid::Geometry;
+    using namespace Mantid::Kernel;
+    Mantid::Algorithms::RectangularBeamProfile beamProfile(ReferenceFrame(Y, Z, Right, "source"), V3D(), 1, 1);
+    MCAbsorptionStrategy mcabsorb(MCInteractionVolume::create(sample, MAX_TRIES, pointsIn), beamProfile,
+                                  DeltaEMode::Type::Direct, NEVENTS, MAX_TRIES, false);
+    MersenneTwister rng(SEED);
+    for (auto *factors : {&ownFactors, &ownFactorErrors, &totalFactors, &totalFactorErrors}) {
+      factors->assign(LAMBDAS.size(), 0.);
+    }
+    MCInteractionStatistics trackStatistics(-1, sample);
+    mcabsorb.calculatePaalmanPings(rng, END_POS, LAMBDAS, LAMBDA_FIXED, sample.getEnvironment(),
+                                   pointsIn == MCInteractionVolume::ScatteringPointVicinity::ENVIRONMENTONLY,
+                                   ownFactors, ownFactorErrors, totalFactors, totalFactorErrors, trackStatistics);
+  }
+
   class MockBeamProfile final : public Mantid::Algorithms::IBeamProfile {
   public:
     using Mantid::Algorithms::IBeamProfile::Ray;
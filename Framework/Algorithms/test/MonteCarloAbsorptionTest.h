@@ -402,6 +402,43 @@ public:
     TS_ASSERT_DELTA(calculatedAttFactor, yData[0], delta);
   }
 
+  void test_Paalman_Pings_Factors_From_Shared_Tracks() {
+    using Mantid::API::MatrixWorkspace_sptr;
+    using Mantid::Kernel::DeltaEMode;
+    TestWorkspaceDescriptor wsProps = {1, 2, false, Environment::CubeSamplePlusContainer, DeltaEMode::Elastic, -1};
+    auto testWS = setUpWS(wsProps);
+
+    // the scattering points in the sample are generated first, so A_s,sc uses
+    // the same random numbers as a separate simulation in the sample only
+    auto mcAbsorb = createAlgorithm();
+    mcAbsorb->setProperty("InputWorkspace", testWS);
+    mcAbsorb->setProperty("SimulateScatteringPointIn", "SampleOnly");
+    TS_ASSERT_THROWS_NOTHING(mcAbsorb->execute());
+    auto expectedAssc = getOutputWorkspace(mcAbsorb);
+
+    auto mcAbsorbPP = createAlgorithm();
+    mcAbsorbPP->setProperty("InputWorkspace", testWS);
+    mcAbsorbPP->setProperty("CalculatePaalmanPingsFactors", true);
+    mcAbsorbPP->setPropertyValue("SampleContainerOutputWorkspace", "__assc");
+    mcAbsorbPP->setPropertyValue("ContainerOutputWorkspace", "__acc");
+    mcAbsorbPP->setPropertyValue("ContainerSampleOutputWorkspace", "__acsc");
+    TS_ASSERT_THROWS_NOTHING(mcAbsorbPP->execute());
+    auto ass = getOutputWorkspace(mcAbsorbPP);
+    MatrixWorkspace_sptr assc = mcAbsorbPP->getProperty("SampleContainerOutputWorkspace");
+    MatrixWorkspace_sptr acc = mcAbsorbPP->getProperty("ContainerOutputWorkspace");
+    MatrixWorkspace_sptr acsc = mcAbsorbPP->getProperty("ContainerSampleOutputWorkspace");
+    TS_ASSERT(assc);
+    TS_ASSERT(acc);
+    TS_ASSERT(acsc);
+
+    verifyDimensions(wsProps, ass);
+    for (size_t i = 0; i < ass->blocksize(); ++i) {
+      TS_ASSERT_DELTA(expectedAssc->y(0)[i], assc->y(0)[i], 1e-12);
+      TS_ASSERT_LESS_THAN(assc->y(0)[i], ass->y(0)[i]);
+      TS_ASSERT_LESS_THAN(acsc->y(0)[i], acc->y(0)[i]);
+    }
+  }
+
   void test_Workspace_With_Cylindrical_Sample_And_Gauge_Volume() {
     using namespace Mantid::Geometry;
 
@@ -670,6 +707,20 @@ public:
   //---------------------------------------------------------------------------
   // Failure cases
   //---------------------------------------------------------------------------
+  void test_Paalman_Pings_Factors_Require_A_Container() {
+    using Mantid::Kernel::DeltaEMode;
+    TestWorkspaceDescriptor wsProps = {1, 2, false, Environment::CubeSampleOnly, DeltaEMode::Elastic, -1};
+    auto testWS = setUpWS(wsProps);
+
+    auto mcAbsorb = createAlgorithm();
+    mcAbsorb->setProperty("InputWorkspace", testWS);
+    mcAbsorb->setProperty("CalculatePaalmanPingsFactors", true);
+    mcAbsorb->setPropertyValue("SampleContainerOutputWorkspace", "__assc");
+    mcAbsorb->setPropertyValue("ContainerOutputWorkspace", "__acc");
+    mcAbsorb->setPropertyValue("ContainerSampleOutputWorkspace", "__acsc");
+    TS_ASSERT_THROWS(mcAbsorb->execute(), const std::runtime_error &);
+  }
+
   void test_Workspace_With_No_Instrument_Is_Not_Accepted() {
     using namespace Mantid::API;
 
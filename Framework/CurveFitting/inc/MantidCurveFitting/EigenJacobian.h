@@ -79,6 +79,10 @@ public:
   }
   /// overwrite base method
   void zero() override { m_J.zero(); }
+  /// overwrite base method
+  size_t nData() const override { return m_J.size1(); }
+  /// overwrite base method
+  size_t nParams() const override { return m_index.size(); }
 };
 
 /// The implementation of Jacobian
@@ -139,6 +143,10 @@ public:
   }
   /// overwrite base method
   void zero() override { m_J->zero(); }
+  /// overwrite base method
+  size_t nData() const override { return m_J->size1(); }
+  /// overwrite base method
+  size_t nParams() const override { return m_index.size(); }
 };
 
 } // namespace CurveFitting
@@ -70,6 +70,10 @@ public:
   }
   /// overwrite base method
   void zero() override { m_data.assign(m_data.size(), 0.0); }
+  /// overwrite base method
+  size_t nData() const override { return m_ny; }
+  /// overwrite base method
+  size_t nParams() const override { return m_np; }
 };
 
 } // namespace CurveFitting
@@ -70,6 +70,10 @@ public:
   /** Zero all matrix elements.
    */
   void zero() override { gsl_matrix_set_zero(m_J); }
+  /// The number of data points
+  size_t nData() const override { return m_J->size1; }
+  /// The number of parameters
+  size_t nParams() const override { return m_map.size(); }
   /// Set the pointer to the GSL's jacobian
   void setJ(gsl_matrix *J) { m_J = J; }
 
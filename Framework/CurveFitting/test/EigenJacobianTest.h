@@ -32,6 +32,8 @@ public:
     EigenJacobian J(*test_fn, size);
     TS_ASSERT_EQUALS(J.matrix().size1(), size);
     TS_ASSERT_EQUALS(J.matrix().size2(), test_fn->nParams());
+    TS_ASSERT_EQUALS(J.nData(), size);
+    TS_ASSERT_EQUALS(J.nParams(), test_fn->nParams());
   }
 
   void test_EigenJacobian_get_and_set() {
@@ -89,6 +91,8 @@ public:
     TS_ASSERT_EQUALS(J.get(9, 2), val * 3);
     TS_ASSERT_EQUALS(m(5, 1), val);
     TS_ASSERT_EQUALS(m(9, 2), val * 3);
+    TS_ASSERT_EQUALS(J.nData(), size);
+    TS_ASSERT_EQUALS(J.nParams(), n_params);
   }
 
   void test_JacobianImpl1_add_number_to_column() {
@@ -5,15 +5,33 @@
 //   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 // SPDX - License - Identifier: GPL - 3.0 +
 #include "MantidAPI/Jacobian.h"
+#include "MantidPythonInterface/core/Converters/NDArrayToVector.h"
 #include "MantidPythonInterface/core/GetPointer.h"
 #include <boost/python/class.hpp>
 #include <boost/python/register_ptr_to_python.hpp>
+#include <stdexcept>
 
 using Mantid::API::Jacobian;
+using namespace Mantid::PythonInterface;
 using namespace boost::python;
 
 GET_POINTER_SPECIALIZATION(Jacobian)
 
+namespace {
+void setColumn(Jacobian &self, const size_t iP, const NDArray &values) {
+  if (iP >= self.nParams()) {
+    throw std::out_of_range("Parameter index in Jacobian is out of range");
+  }
+  const auto column = Converters::NDArrayToVector<double>(values)();
+  if (column.size() > self.nData()) {
+    throw std::out_of_range("More values than data points in Jacobian");
+  }
+  for (size_t iY = 0; iY < column.size(); ++iY) {
+    self.set(iY, iP, column[iY]);
+  }
+}
+} // namespace
+
 void export_Jacobian() {
   register_ptr_to_python<Jacobian *>();
 
@@ -22,6 +40,10 @@ void export_Jacobian() {
            "Set an element of the Jacobian matrix where iy=index of data "
            "point, ip=index of parameter.")
 
+      .def("setColumn", &setColumn, (arg("self"), arg("ip"), arg("values")),
+           "Set the partial derivatives with respect to parameter ip for all "
+           "data points from a numpy array.")
+
       .def("get", &Jacobian::get, (arg("self"), arg("iy"), arg("ip")),
            "Return the given element of the Jacobian matrix where iy=index of "
            "data point, ip=index of parameter.");
@@ -20,8 +20,14 @@ using namespace boost::python;
 namespace {
 void addExperimentInfo(MultipleExperimentInfos &self, const boost::python::object &item) {
   auto workspaceExtractor = ExtractSharedPtr<Workspace>(item);
-  if (!workspaceExtractor.check())
-    throw std::invalid_argument("Incorrect type. Expected a workspace.");
+  if (!workspaceExtractor.check()) {
+    // an ExperimentInfo of another workspace is copied, so that it is not shared by the two workspaces
+    auto exptInfoExtractor = ExtractSharedPtr<ExperimentInfo>(item);
+    if (!exptInfoExtractor.check())
+      throw std::invalid_argument("Incorrect type. Expected a workspace or an ExperimentInfo.");
+    self.addExperimentInfo(ExperimentInfo_sptr(exptInfoExtractor()->cloneExperimentInfo()));
+    return;
+  }
 
   if (auto exptInfo = std::dynamic_pointer_cast<ExperimentInfo>(workspaceExtractor()))
     self.addExperimentInfo(exptInfo);
@@ -38,7 +44,8 @@ void export_MultipleExperimentInfos() {
           (arg("self"), arg("expInfoIndex")), "Return the experiment info at the given index.")
       .def("addExperimentInfo", addExperimentInfo, (arg("self"), arg("ExperimentalInfo")),
            "Add a new :class:`~mantid.api.ExperimentInfo` to this "
-           ":class:`~mantid.api.IMDWorkspace`")
+           ":class:`~mantid.api.IMDWorkspace`, either a workspace or a copy of "
+           "an :class:`~mantid.api.ExperimentInfo`")
       .def("getNumExperimentInfo", &MultipleExperimentInfos::getNumExperimentInfo, arg("self"),
            "Return the number of :class:`~mantid.api.ExperimentInfo` objects,")
       .def("copyExperimentInfos", &MultipleExperimentInfos::copyExperimentInfos,
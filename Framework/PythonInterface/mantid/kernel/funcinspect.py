@@ -15,6 +15,7 @@ function call. For example
 
 import inspect
 import dis
+from functools import lru_cache
 
 
 def customise_func(func, name, signature, docstring):
@@ -199,10 +200,23 @@ def process_frame(frame):
     =========
     Returns the a tuple with the number of arguments and their names
     """
-    # Index of the last attempted instruction in byte code
-    last_i = frame.f_lasti
-    ins_stack_with_caches = decompile(frame.f_code, show_caches=True)
-    ins_stack = decompile(frame.f_code)
+    max_returns, output_var_names = _process_code(frame.f_code, frame.f_lasti)
+    # copy nested lists so callers cannot modify the cached result
+    return max_returns, tuple(list(names) if isinstance(names, list) else names for names in output_var_names)
+
+
+@lru_cache(maxsize=4096)
+def _process_code(code, last_i):
+    """Analyse the byte code around the given instruction offset. The result only depends
+    on the code object and the offset so it is cached, which avoids decompiling the caller
+    each time a function is called from the same place, e.g. in a loop.
+
+    :param code: The code object of the frame to analyse
+    :param last_i: Index of the last attempted instruction in the byte code
+    :return: A tuple with the number of arguments and their names
+    """
+    ins_stack_with_caches = decompile(code, show_caches=True)
+    ins_stack = decompile(code)
 
     call_function_locs = {}
     start_index = 0
@@ -31,10 +31,12 @@ Importing this module starts the FrameworkManager instance.
 # std libs
 from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 import datetime
 from dateutil.parser import parse as parse_date
 import os
 import sys
+import threading
 
 import mantid
 
@@ -894,7 +896,7 @@ def _gather_returns(func_name, lhs, algm_obj, ignore_regex=None, inout=False):
             "These numbers must match." % (func_name, number_of_returned_values, number_of_values_on_lhs)
         )
     if number_of_returned_values > 0:
-        ret_type = namedtuple(func_name + "_returns", retvals.keys())
+        ret_type = _returns_type(func_name, tuple(retvals.keys()))
         ret_value = ret_type(**retvals)
         if number_of_returned_values == 1:
             return ret_value[0]
@@ -904,6 +906,18 @@ def _gather_returns(func_name, lhs, algm_obj, ignore_regex=None, inout=False):
         return None
 
 
+@lru_cache(maxsize=None)
+def _returns_type(func_name, property_names):
+    """
+    Return the namedtuple type used to hold the return values of an algorithm function. Creating
+    the type is relatively slow so it is only done once for each set of output properties.
+
+    :param func_name: The name of the calling function.
+    :param property_names: A tuple of the names of the output properties
+    """
+    return namedtuple(func_name + "_returns", property_names)
+
+
 def _set_logging_option(algm_obj, kwargs):
     """
     Checks the keyword arguments for the _LOGGING keyword, sets the state of the
@@ -1003,18 +1017,20 @@ def _create_algorithm_function(name, version, algm_object):  # noqa: C901
             @staticmethod
             def _init_alias(algm_alias):
                 r"""
-                @brief Encapsulate alias features on a namedtuple
+                @brief Encapsulate alias features on a namedtuple. The deprecation date is parsed once here
+                rather than on every call
                 @param str algm_alias
                 """
                 deprecated = algm_object.aliasDeprecated()  # non-empty string when alias set to be deprecated
+                deprecation_date = None
                 if deprecated:
                     try:
-                        parse_date(deprecated)
+                        deprecation_date = parse_date(deprecated)
                     except ValueError:
-                        deprecated = ""
                         logger.error(f"Alias deprecation date {deprecated} must be in ISO8601 format")
-                AlgorithmAlias = namedtuple("AlgorithmAlias", "name, deprecated")
-                return AlgorithmAlias(algm_alias, deprecated)
+                        deprecated = ""
+                AlgorithmAlias = namedtuple("AlgorithmAlias", "name, deprecated, deprecation_date")
+                return AlgorithmAlias(algm_alias, deprecated, deprecation_date)
 
             def __init__(self, algm_alias=None):
                 self._alias = self._init_alias(algm_alias) if algm_alias else None
@@ -1042,7 +1058,7 @@ def _create_algorithm_function(name, version, algm_object):  # noqa: C901
 
                 # Check at runtime whether to throw upon alias deprecation.
                 if self._alias and self._alias.deprecated:
-                    deprecated = parse_date(self._alias.deprecated) < datetime.datetime.today()
+                    deprecated = self._alias.deprecation_date < datetime.datetime.today()
                     deprecated_action = ConfigService.Instance().get("algorithms.alias.deprecated", "Log").lower()
                     if deprecated and deprecated_action == "raise":
                         raise RuntimeError(f"Use of algorithm alias {self._alias.name} not allowed. Use {name} instead")
@@ -1148,6 +1164,55 @@ def _create_algorithm_object(name, version=-1, startProgress=None, endProgress=N
 # -------------------------------------------------------------------------------------------------------------
 
 
+class PreparedAlgorithm:
+    """
+    A reusable handle to an algorithm for calling it many times with mostly the same properties,
+    e.g. inside a loop. The algorithm is created, initialized and given the fixed properties once.
+    Each call then only sets the properties that change and executes the algorithm again, e.g.
+
+        rebin = PreparedAlgorithm("Rebin", Params="0,10,1000")
+        for name in names:
+            rebin(InputWorkspace=name, OutputWorkspace=name)
+
+    Properties set in a call keep their value for later calls unless they are set again.
+    As with the algorithm functions the return values are gathered from the output properties
+    and output workspace names can be taken from the variables on the left of the assignment.
+    """
+
+    def __init__(self, name, version=-1, **kwargs):
+        """
+        :param name: The name of the algorithm
+        :param version: The version of the algorithm, default is the latest
+        :param kwargs: Properties that are the same for every call, including the
+                       EnableLogging and StoreInADS keywords
+        """
+        self._name = name
+        self._algm = _create_algorithm_object(name, version)
+        _set_logging_option(self._algm, kwargs)
+        _set_store_ads(self._algm, kwargs)
+        set_properties(self._algm, **kwargs)
+
+    @property
+    def algorithm(self):
+        """The underlying algorithm object"""
+        return self._algm
+
+    def __call__(self, **kwargs):
+        frame = kwargs.pop("__LHS_FRAME_OBJECT__", None)
+        lhs = _kernel.funcinspect.lhs_info(frame=frame)
+        lhs_args = _get_args_from_lhs(lhs, self._algm)
+        set_properties(self._algm, **_merge_keywords_with_lhs(kwargs, lhs_args))
+        try:
+            self._algm.execute()
+        except RuntimeError as e:
+            msg = "{}-v{}: {}".format(self._algm.name(), self._algm.version(), str(e))
+            raise RuntimeError(msg) from e
+        return _gather_returns(self._name, lhs, self._algm)
+
+
+# -------------------------------------------------------------------------------------------------------------
+
+
 def _find_parent_pythonalgorithm(frame):
     """
     Look for a PyExec method in the call stack and return
@@ -1174,10 +1239,35 @@ def _find_parent_pythonalgorithm(frame):
             frame = frame.f_back
         else:
             break
-    if frame.f_code.co_name == fn_name:
-        return get_self(frame)
-    else:
-        return None
+    # A worker thread started by PyExec does not have it in its call stack
+    return getattr(_thread_parent_algorithm, "algorithm", None)
+
+
+_thread_parent_algorithm = threading.local()
+
+
+@contextmanager
+def child_algorithms_of(parent):
+    """
+    Run the algorithm functions called on the current thread within this context as child algorithms of parent.
+    The parent algorithm is normally found by looking for its PyExec method in the call stack, which
+    is not possible when the functions are called from a worker thread started within PyExec, e.g.
+
+        def PyExec(self):
+            def task(name):
+                with child_algorithms_of(self):
+                    return Rebin(InputWorkspace=name, Params="0,10,1000")
+            with ThreadPoolExecutor() as executor:
+                outputs = list(executor.map(task, names))
+
+    :param parent: The algorithm that is running PyExec
+    """
+    previous = getattr(_thread_parent_algorithm, "algorithm", None)
+    _thread_parent_algorithm.algorithm = parent
+    try:
+        yield
+    finally:
+        _thread_parent_algorithm.algorithm = previous
 
 
 # ----------------------------------------------------------------------------------------------------------------------
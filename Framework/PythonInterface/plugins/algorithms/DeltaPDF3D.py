@@ -18,6 +18,7 @@ from mantid.kernel import (
 )
 from mantid.geometry import SpaceGroupFactory
 from mantid import logger
+import itertools
 import numpy as np
 from scipy import ndimage
 
@@ -259,32 +260,37 @@ class DeltaPDF3D(PythonAlgorithm):
         else:
             check_space_group = False
 
+        h_values = np.arange(int(np.ceil(Xmin)), int(Xmax) + 1)
+        k_values = np.arange(int(np.ceil(Ymin)), int(Ymax) + 1)
+        l_values = np.arange(int(np.ceil(Zmin)), int(Zmax) + 1)
+        if check_space_group:
+            allowed = np.array([[[sg.isAllowedReflection([h, k, l]) for l in l_values] for k in k_values] for h in h_values], dtype=bool)
+        else:
+            allowed = np.ones((len(h_values), len(k_values), len(l_values)), dtype=bool)
+        allowed = allowed.reshape((len(h_values), len(k_values), len(l_values)))
+
         if cut_shape == "cube":
-            for h in range(int(np.ceil(Xmin)), int(Xmax) + 1):
-                for k in range(int(np.ceil(Ymin)), int(Ymax) + 1):
-                    for l in range(int(np.ceil(Zmin)), int(Zmax) + 1):
-                        if not check_space_group or sg.isAllowedReflection([h, k, l]):
-                            signal[
-                                int((h - size[0] - Xmin) / Xwidth + 1) : int((h + size[0] - Xmin) / Xwidth),
-                                int((k - size[1] - Ymin) / Ywidth + 1) : int((k + size[1] - Ymin) / Ywidth),
-                                int((l - size[2] - Zmin) / Zwidth + 1) : int((l + size[2] - Zmin) / Zwidth),
-                            ] = np.nan
+            mask = _reflection_box_mask(
+                allowed,
+                signal.shape,
+                _bin_stencil(h_values, size[0], Xmin, Xwidth, signal.shape[0]),
+                _bin_stencil(k_values, size[1], Ymin, Ywidth, signal.shape[1]),
+                _bin_stencil(l_values, size[2], Zmin, Zwidth, signal.shape[2]),
+            )
         else:  # sphere
             mask = (X - np.round(X)) ** 2 / size[0] ** 2 + (Y - np.round(Y)) ** 2 / size[1] ** 2 + (Z - np.round(Z)) ** 2 / size[2] ** 2 < 1
 
             # Unmask invalid reflections
             if check_space_group:
-                for h in range(int(np.ceil(Xmin)), int(Xmax) + 1):
-                    for k in range(int(np.ceil(Ymin)), int(Ymax) + 1):
-                        for l in range(int(np.ceil(Zmin)), int(Zmax) + 1):
-                            if not sg.isAllowedReflection([h, k, l]):
-                                mask[
-                                    int((h - 0.5 - Xmin) / Xwidth + 1) : int((h + 0.5 - Xmin) / Xwidth),
-                                    int((k - 0.5 - Ymin) / Ywidth + 1) : int((k + 0.5 - Ymin) / Ywidth),
-                                    int((l - 0.5 - Zmin) / Zwidth + 1) : int((l + 0.5 - Zmin) / Zwidth),
-                                ] = False
-
-            signal[mask] = np.nan
+                mask &= ~_reflection_box_mask(
+                    ~allowed,
+                    signal.shape,
+                    _bin_stencil(h_values, 0.5, Xmin, Xwidth, signal.shape[0]),
+                    _bin_stencil(k_values, 0.5, Ymin, Ywidth, signal.shape[1]),
+                    _bin_stencil(l_values, 0.5, Zmin, Zwidth, signal.shape[2]),
+                )
+
+        signal[mask] = np.nan
 
         return signal
 
@@ -332,16 +338,16 @@ class DeltaPDF3D(PythonAlgorithm):
         return dim.getMinimum(), dim.getMaximum(), dim.getNBins(), dim.getBinWidth()
 
     def _convolution(self, signal):
-        from astropy.convolution import convolve, convolve_fft, Gaussian1DKernel
+        from astropy.convolution import convolve_fft, Gaussian1DKernel
 
         G1D = Gaussian1DKernel(self.getProperty("ConvolutionWidth").value).array
         G3D = G1D * G1D.reshape((-1, 1)) * G1D.reshape((-1, 1, 1))
         try:
             logger.debug("Trying astropy.convolution.convolve_fft for convolution")
-            return convolve_fft(signal, G3D)  # Faster but will fail with large signal and kernel arrays
+            return convolve_fft(signal, G3D)  # Will fail if the padded arrays are larger than 1 GB
         except ValueError:
-            logger.debug("Using astropy.convolution.convolve for convolution")
-            return convolve(signal, G3D)
+            logger.debug("Using separable convolution for large workspace")
+            return _separable_convolution(signal, G1D / G3D.sum() ** (1.0 / 3.0))
 
     def _calc_new_extents(self, inWS):
         # Calculate new extents for fft space
@@ -418,4 +424,67 @@ class DeltaPDF3D(PythonAlgorithm):
         return np.kaiser(width[0], beta).reshape((-1, 1, 1)) * np.kaiser(width[1], beta).reshape((-1, 1)) * np.kaiser(width[2], beta)
 
 
+def _bin_stencil(hkl_values, half_width, minimum, bin_width, n_bins):
+    """
+    Find the bins along one dimension that are covered by the region around each integer HKL value.
+
+    The bin range of each region matches slicing the signal array with
+    [int((h - half_width - minimum) / bin_width + 1) : int((h + half_width - minimum) / bin_width)].
+    As regions can overlap, the result is returned as a list of layers. Each layer is a tuple
+    (index, valid) of arrays of length n_bins, where index is the position in hkl_values of a
+    region covering the bin and valid is False where the bin is not covered in this layer.
+    """
+    covering = [[] for _ in range(n_bins)]
+    for index, h in enumerate(hkl_values):
+        bins = slice(int((h - half_width - minimum) / bin_width + 1), int((h + half_width - minimum) / bin_width))
+        for b in range(*bins.indices(n_bins)):
+            covering[b].append(index)
+
+    layers = []
+    for layer in range(max((len(c) for c in covering), default=0)):
+        valid = np.array([len(c) > layer for c in covering], dtype=bool)
+        index = np.array([c[layer] if len(c) > layer else 0 for c in covering], dtype=int)
+        layers.append((index, valid))
+    return layers
+
+
+def _reflection_box_mask(selected, shape, stencil_x, stencil_y, stencil_z):
+    """
+    Mask of the boxes around the selected reflections.
+
+    :param selected: Boolean array of shape (number of H, number of K, number of L) selecting the reflections
+    :param shape: Shape of the signal
+    :param stencil_x: Bin stencil, from _bin_stencil, for the first dimension
+    :param stencil_y: Bin stencil for the second dimension
+    :param stencil_z: Bin stencil for the third dimension
+    :return: Boolean array with the shape of the signal, True in the box of any selected reflection
+    """
+    mask = np.zeros(shape, dtype=bool)
+    for (hx, vx), (hy, vy), (hz, vz) in itertools.product(stencil_x, stencil_y, stencil_z):
+        mask |= selected[np.ix_(hx, hy, hz)] & vx[:, np.newaxis, np.newaxis] & vy[np.newaxis, :, np.newaxis] & vz[np.newaxis, np.newaxis, :]
+    return mask
+
+
+def _separable_convolution(signal, kernel_1d):
+    """
+    Convolve signal with the separable kernel kernel_1d x kernel_1d x kernel_1d, one dimension at a time.
+
+    This follows the conventions of astropy.convolution.convolve_fft with its default arguments:
+    values outside the signal are zero and NaN values are interpolated by normalising with the
+    convolved weights. Memory use stays at a few copies of the signal, so it works for any
+    workspace size.
+    """
+    nans = np.isnan(signal)
+    data = np.where(nans, 0.0, signal)
+    # Outside the signal the fill value of zero counts as valid data
+    weights = (~nans).astype(float)
+    for axis in range(signal.ndim):
+        data = ndimage.convolve1d(data, kernel_1d, axis=axis, mode="constant", cval=0.0)
+        weights = ndimage.convolve1d(weights, kernel_1d, axis=axis, mode="constant", cval=1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = data / weights
+    result[weights < 10 * np.finfo(weights.dtype).eps] = 0.0
+    return result
+
+
 AlgorithmFactory.subscribe(DeltaPDF3D)
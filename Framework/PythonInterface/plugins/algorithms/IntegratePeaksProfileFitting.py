@@ -11,10 +11,17 @@ fitting for integrating peaks.
 """
 
 from mantid.api import mtd, AlgorithmFactory, FileAction, FileProperty, Progress, PythonAlgorithm, WorkspaceProperty
-from mantid.kernel import logger, Direction, FloatBoundedValidator, V3D
+from mantid.kernel import logger, Direction, FloatBoundedValidator, IntBoundedValidator, V3D
 from mantid.simpleapi import CreateEmptyTableWorkspace, CreateWorkspace, Fit
+from plugins.algorithms.peakdata_utils import integrate_peaks_in_parallel, thread_ws_name
 import numpy as np
+import os
+import pickle
 import warnings
+from time import perf_counter
+
+# Minimum time in seconds between two writes of the checkpoint file
+CHECKPOINT_INTERVAL = 60.0
 
 
 class IntegratePeaksProfileFitting(PythonAlgorithm):
@@ -71,6 +78,18 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
 
         self.declareProperty("DQMax", defaultValue=0.15, doc="Largest total side length (in Angstrom) to consider for profile fitting.")
         self.declareProperty("PeakNumber", defaultValue=-1, doc="Which Peak to fit.  Leave negative for all.")
+        self.declareProperty(
+            name="NumberOfThreads",
+            defaultValue=0,
+            direction=Direction.Input,
+            validator=IntBoundedValidator(lower=0),
+            doc="Number of threads used to fit peaks concurrently. If 0 all but one of the available cores are used.",
+        )
+        self.declareProperty(
+            FileProperty("CheckpointFile", defaultValue="", action=FileAction.OptionalSave, extensions=[".pkl"]),
+            doc="File in which the fitted peaks are saved as the fit progresses.  If the file exists, "
+            "the peaks it contains are not fit again, so an interrupted run can be resumed.",
+        )
 
     def initializeStrongPeakSettings(self, strongPeaksParamsFile, peaks_ws, sampleRun, forceCutoff, edgeCutoff, numDetRows, numDetCols):
         import pickle
@@ -140,6 +159,165 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
             peaksToFit,
         )
 
+    def getIntensityAndSigma(self, Y3D, goodIDX, n_events, qMask, fracStop, neigh_length_m):
+        from scipy.ndimage.filters import convolve
+
+        # First we get the peak intensity
+        peakIDX = Y3D / Y3D.max() > fracStop
+        intensity = np.sum(Y3D[peakIDX])
+
+        # Now the number of background counts under the peak assuming a constant bg across the box
+        convBox = 1.0 * np.ones([neigh_length_m, neigh_length_m, neigh_length_m]) / neigh_length_m**3
+        conv_n_events = convolve(n_events, convBox)
+        bgIDX = np.logical_and.reduce(np.array([~goodIDX, qMask, conv_n_events > 0]))
+        bgEvents = np.mean(n_events[bgIDX]) * np.sum(peakIDX)
+
+        # Now we consider the variation of the fit.  These are done as three independent fits.  So we need to consider
+        # the variance within our fit sig^2 = sum(N*(yFit-yData)) / sum(N) and scale by the number of parameters that go into
+        # the fit.  In total: 10 (removing scale variables)
+        w_events = n_events.copy()
+        w_events[w_events == 0] = 1
+        varFit = np.average((n_events[peakIDX] - Y3D[peakIDX]) * (n_events[peakIDX] - Y3D[peakIDX]), weights=(w_events[peakIDX]))
+
+        sigma = np.sqrt(intensity + bgEvents + varFit)
+        return intensity, sigma
+
+    def addStrongPeak(self, peak, peakNumber, fitNumber, params, peaks_ws, strongPeakParams, strongPeakParams_ws):
+        """
+        Adds the profile of a strong peak to strongPeakParams if its width agrees with the current model.
+        Returns True if the peak was added.
+        """
+        import BVGFitTools as BVGFT
+
+        qPeak = peak.getQLabFrame()
+        theta = np.arctan2(qPeak[2], np.hypot(qPeak[0], qPeak[1]))  # 2theta
+        try:
+            p = mtd["__fitSigX0_Parameters"].column(1)[:-1]
+            tol = 0.2  # We should have a good idea now - only allow 20% variation
+        except:
+            p = peaks_ws.getInstrument().getStringParameter("sigSC0Params")
+            p = np.array(str(p).strip("[]'").split(), dtype=float)
+            tol = 5.0  # High tolerance since we don't know what the answer will be
+        predSigX = BVGFT.coshPeakWidthModel(theta, p[0], p[1], p[2], p[3])
+
+        if np.abs((params["SigX"] - predSigX) / 1.0 / predSigX) >= tol:
+            return False
+        strongPeakParams[fitNumber, 0] = np.arctan2(qPeak[1], qPeak[0])  # phi
+        strongPeakParams[fitNumber, 1] = np.arctan2(qPeak[2], np.hypot(qPeak[0], qPeak[1]))  # theta
+        strongPeakParams[fitNumber, 2] = params["scale3d"]
+        strongPeakParams[fitNumber, 3] = params["MuTH"]
+        strongPeakParams[fitNumber, 4] = params["MuPH"]
+        strongPeakParams[fitNumber, 5] = params["SigX"]
+        strongPeakParams[fitNumber, 6] = params["SigY"]
+        strongPeakParams[fitNumber, 7] = params["SigP"]
+        strongPeakParams[fitNumber, 8] = peakNumber
+        strongPeakParams_ws.addRow(strongPeakParams[fitNumber])
+        return True
+
+    def extractBoxes(self, batch, fitResults, peaks_ws, MDdata, UBMatrix, dQ, dQPixel, q_frame):
+        """
+        Bins the events around each peak in the batch that has not been fit yet.  Returns a dictionary
+        of the Q-boxes keyed by peak number.  Peaks whose box cannot be extracted are added to fitResults
+        as failed fits.
+        """
+        import ICCFitTools as ICCFT
+
+        boxes = {}
+        mdRunNumber = MDdata.getExperimentInfo(0).getRunNumber()
+        for _, peakNumber in batch:
+            if peakNumber in fitResults:
+                continue
+            peak = peaks_ws.getPeak(peakNumber)
+            if peak.getRunNumber() != mdRunNumber:
+                logger.warning(
+                    "Peak number %i has run number %i but MDWorkspace is from run number %i.  Skipping this peak."
+                    % (peakNumber, peak.getRunNumber(), mdRunNumber)
+                )
+                continue
+            try:
+                boxes[peakNumber] = ICCFT.getBoxFracHKL(
+                    peak,
+                    peaks_ws,
+                    MDdata,
+                    UBMatrix,
+                    peakNumber,
+                    dQ,
+                    fracHKL=0.5,
+                    dQPixel=dQPixel,
+                    q_frame=q_frame,
+                    outputWSName="__MDbox%i" % peakNumber,
+                )
+            except Exception:
+                fitResults[peakNumber] = None
+        return boxes
+
+    def setPeakResult(self, peak, peakNumber, result, params_ws):
+        """
+        Sets the intensity of a fitted peak and adds its parameters to params_ws.  result is None if the fit failed.
+        Returns the fitted parameters, or None if the fit failed.
+        """
+        if result is None:
+            logger.warning("Error fitting peak number " + str(peakNumber))
+            peak.setIntensity(0.0)
+            peak.setSigmaIntensity(1.0)
+            return None
+        params, intensity, sigma = result
+
+        compStr = "peak {:d}; original: {:4.2f} +- {:4.2f};  new: {:4.2f} +- {:4.2f}".format(
+            peakNumber, peak.getIntensity(), peak.getSigmaIntensity(), intensity, sigma
+        )
+        logger.information(compStr)
+
+        # Save the results
+        row = dict(params)
+        row["peakNumber"] = peakNumber
+        row["Intens3d"] = intensity
+        row["SigInt3d"] = sigma
+        row["newQ"] = V3D(params["newQ"][0], params["newQ"][1], params["newQ"][2])
+        params_ws.addRow(row)
+        peak.setIntensity(intensity)
+        peak.setSigmaIntensity(sigma)
+        return params
+
+    def getBatches(self, peaksToFit, needsForcedProfile, generateStrongPeakParams, batchSize):
+        """
+        Splits peaksToFit into batches of at most batchSize (fitNumber, peakNumber) pairs that are fit
+        concurrently.  If the strong peak profiles are generated as we go, the peaks that need a forced
+        profile are not put in the same batch as the strong peaks they are forced with.
+        """
+        batches = []
+        for fitNumber, peakNumber in enumerate(peaksToFit):
+            peakNumber = int(peakNumber)
+            newBatch = len(batches) == 0 or len(batches[-1]) == batchSize
+            if generateStrongPeakParams and not newBatch:
+                newBatch = needsForcedProfile[peakNumber] != needsForcedProfile[batches[-1][-1][1]]
+            if newBatch:
+                batches.append([])
+            batches[-1].append((fitNumber, peakNumber))
+        return batches
+
+    def loadCheckpoint(self, checkpointFile, checkpointKey):
+        """
+        Returns a dictionary with the results of the peaks already fit in checkpointFile, keyed by peak number.
+        The checkpoint is ignored if it was written for a different run or with different settings.
+        """
+        if checkpointFile == "" or not os.path.isfile(checkpointFile):
+            return {}
+        with open(checkpointFile, "rb") as f:
+            checkpoint = pickle.load(f)
+        if checkpoint["Key"] != checkpointKey:
+            logger.warning("Checkpoint file %s was written for a different run or settings.  All peaks will be fit." % checkpointFile)
+            return {}
+        logger.notice("Resuming from checkpoint file %s containing %i peaks." % (checkpointFile, len(checkpoint["Results"])))
+        return checkpoint["Results"]
+
+    def saveCheckpoint(self, checkpointFile, checkpointKey, fitResults):
+        # Write to a temporary file first so that an interrupted write does not corrupt the checkpoint
+        tmpFile = checkpointFile + ".tmp"
+        with open(tmpFile, "wb") as f:
+            pickle.dump({"Key": checkpointKey, "Results": fitResults}, f)
+        os.replace(tmpFile, checkpointFile)
+
     def getBVGInitialGuesses(self, peaks_ws, strongPeakParams_ws, minNumberPeaks=30):
         """
         Returns initial guesses for the BVG fit if strongPeakParams_ws contains more than
@@ -190,7 +368,6 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
     def PyExec(self):
         import ICCFitTools as ICCFT
         import BVGFitTools as BVGFT
-        from scipy.ndimage.filters import convolve
 
         MDdata = self.getProperty("InputWorkspace").value
         peaks_ws = self.getProperty("PeaksWorkspace").value
@@ -204,6 +381,8 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
         peakNumberToFit = self.getProperty("PeakNumber").value
         pplmin_frac = self.getProperty("MinpplFrac").value
         pplmax_frac = self.getProperty("MaxpplFrac").value
+        numThreads = self.getProperty("NumberOfThreads").value or max(1, os.cpu_count() - 1)
+        checkpointFile = self.getProperty("CheckpointFile").value
         sampleRun = peaks_ws.getPeak(0).getRunNumber()
 
         q_frame = "lab"
@@ -283,22 +462,29 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
 
         # And we're off!
         peaks_ws_out = peaks_ws.clone()
-        warnings.filterwarnings("ignore")  # There can be a lot of warnings for bad solutions that get rejected.
         progress = Progress(self, 0.0, 1.0, len(peaksToFit))
         sigX0Params, sigY0, sigP0Params = self.getBVGInitialGuesses(peaks_ws, strongPeakParams_ws)
-
-        for fitNumber, peakNumber in enumerate(peaksToFit):  # range(peaks_ws.getNumberPeaks()):
-            peakNumber = int(peakNumber)
+        checkpointKey = {
+            "RunNumber": sampleRun,
+            "NumberOfPeaks": peaks_ws.getNumberPeaks(),
+            "FracStop": fracStop,
+            "DQMax": dQMax,
+            "StrongPeakParamsFile": strongPeaksParamsFile,
+            "IntensityCutoff": forceCutoff,
+            "EdgeCutoff": edgeCutoff,
+            "MinpplFrac": pplmin_frac,
+            "MaxpplFrac": pplmax_frac,
+        }
+        fitResults = self.loadCheckpoint(checkpointFile, checkpointKey)
+        timings = {"Extracting Q-boxes": 0.0, "Fitting peaks": 0.0, "Updating peaks": 0.0, "Writing checkpoints": 0.0}
+        boxes = {}
+
+        def fitPeak(peakNumber):
+            # Runs in a worker thread - the temporary workspaces of each thread get their own names
+            ICCFT.setWorkspaceSuffix(thread_ws_name(""))
             peak = peaks_ws_out.getPeak(peakNumber)
-            progress.report(" ")
-            if peak.getRunNumber() != MDdata.getExperimentInfo(0).getRunNumber():
-                logger.warning(
-                    "Peak number %i has run number %i but MDWorkspace is from run number %i.  Skipping this peak."
-                    % (peakNumber, peak.getRunNumber(), MDdata.getExperimentInfo(0).getRunNumber())
-                )
-                continue
+            box = boxes[peakNumber]
             try:
-                box = ICCFT.getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, fracHKL=0.5, dQPixel=dQPixel, q_frame=q_frame)
                 if ~needsForcedProfile[peakNumber]:
                     strongPeakParamsToSend = None
                 else:
@@ -333,80 +519,69 @@ class IntegratePeaksProfileFitting(PythonAlgorithm):
                     sigP0Params=sigP0Params,
                     fitPenalty=1.0e7,
                 )
-                # First we get the peak intensity
-                peakIDX = Y3D / Y3D.max() > fracStop
-                intensity = np.sum(Y3D[peakIDX])
-
-                # Now the number of background counts under the peak assuming a constant bg across the box
-                n_events = box.getNumEventsArray()
-                convBox = 1.0 * np.ones([neigh_length_m, neigh_length_m, neigh_length_m]) / neigh_length_m**3
-                conv_n_events = convolve(n_events, convBox)
-                bgIDX = np.logical_and.reduce(np.array([~goodIDX, qMask, conv_n_events > 0]))
-                bgEvents = np.mean(n_events[bgIDX]) * np.sum(peakIDX)
-
-                # Now we consider the variation of the fit.  These are done as three independent fits.  So we need to consider
-                # the variance within our fit sig^2 = sum(N*(yFit-yData)) / sum(N) and scale by the number of parameters that go into
-                # the fit.  In total: 10 (removing scale variables)
-                w_events = n_events.copy()
-                w_events[w_events == 0] = 1
-                varFit = np.average((n_events[peakIDX] - Y3D[peakIDX]) * (n_events[peakIDX] - Y3D[peakIDX]), weights=(w_events[peakIDX]))
-
-                sigma = np.sqrt(intensity + bgEvents + varFit)
-
-                compStr = "peak {:d}; original: {:4.2f} +- {:4.2f};  new: {:4.2f} +- {:4.2f}".format(
-                    peakNumber, peak.getIntensity(), peak.getSigmaIntensity(), intensity, sigma
-                )
-                logger.information(compStr)
-
-                # Save the results
-                params["peakNumber"] = peakNumber
-                params["Intens3d"] = intensity
-                params["SigInt3d"] = sigma
-                params["newQ"] = V3D(params["newQ"][0], params["newQ"][1], params["newQ"][2])
-                params_ws.addRow(params)
-                peak.setIntensity(intensity)
-                peak.setSigmaIntensity(sigma)
-
-                if generateStrongPeakParams and ~needsForcedProfile[peakNumber]:
-                    qPeak = peak.getQLabFrame()
-                    theta = np.arctan2(qPeak[2], np.hypot(qPeak[0], qPeak[1]))  # 2theta
-                    try:
-                        p = mtd["__fitSigX0_Parameters"].column(1)[:-1]
-                        tol = 0.2  # We should have a good idea now - only allow 20% variation
-                    except:
-                        p = peaks_ws.getInstrument().getStringParameter("sigSC0Params")
-                        p = np.array(str(p).strip("[]'").split(), dtype=float)
-                        tol = 5.0  # High tolerance since we don't know what the answer will be
-                    predSigX = BVGFT.coshPeakWidthModel(theta, p[0], p[1], p[2], p[3])
-
-                    if np.abs((params["SigX"] - predSigX) / 1.0 / predSigX) < tol:
-                        strongPeakParams[fitNumber, 0] = np.arctan2(qPeak[1], qPeak[0])  # phi
-                        strongPeakParams[fitNumber, 1] = np.arctan2(qPeak[2], np.hypot(qPeak[0], qPeak[1]))  # theta
-                        strongPeakParams[fitNumber, 2] = params["scale3d"]
-                        strongPeakParams[fitNumber, 3] = params["MuTH"]
-                        strongPeakParams[fitNumber, 4] = params["MuPH"]
-                        strongPeakParams[fitNumber, 5] = params["SigX"]
-                        strongPeakParams[fitNumber, 6] = params["SigY"]
-                        strongPeakParams[fitNumber, 7] = params["SigP"]
-                        strongPeakParams[fitNumber, 8] = peakNumber
-                        strongPeakParams_ws.addRow(strongPeakParams[fitNumber])
-                        sigX0Params, sigY0, sigP0Params = self.getBVGInitialGuesses(peaks_ws, strongPeakParams_ws)
-
-            except KeyboardInterrupt:
-                warnings.filterwarnings("default")  # Re-enable on exit
-                raise
+                intensity, sigma = self.getIntensityAndSigma(Y3D, goodIDX, box.getNumEventsArray(), qMask, fracStop, neigh_length_m)
+            except Exception:
+                return None
+            return params, intensity, sigma
 
-            except:
-                # raise
-                logger.warning("Error fitting peak number " + str(peakNumber))
-                peak.setIntensity(0.0)
-                peak.setSigmaIntensity(1.0)
+        warnings.filterwarnings("ignore")  # There can be a lot of warnings for bad solutions that get rejected.
+        lastCheckpoint = perf_counter()
+        try:
+            for batch in self.getBatches(peaksToFit, needsForcedProfile, generateStrongPeakParams, numThreads):
+                # First we extract the Q-boxes of all the peaks in the batch that have not been fit yet
+                start = perf_counter()
+                boxes.update(self.extractBoxes(batch, fitResults, peaks_ws, MDdata, UBMatrix, dQ, dQPixel, q_frame))
+                timings["Extracting Q-boxes"] += perf_counter() - start
+
+                # Then we fit them concurrently
+                start = perf_counter()
+                for peakNumber, result, _ in integrate_peaks_in_parallel(fitPeak, list(boxes), numThreads):
+                    fitResults[peakNumber] = result
+                for peakNumber in boxes:
+                    mtd.remove("__MDbox%i" % peakNumber)
+                boxes.clear()
+                timings["Fitting peaks"] += perf_counter() - start
+
+                # Finally we save the results in order, updating the strong peak profiles as we go
+                start = perf_counter()
+                addedStrongPeaks = False
+                for fitNumber, peakNumber in batch:
+                    progress.report(" ")
+                    if peakNumber not in fitResults:
+                        continue
+                    peak = peaks_ws_out.getPeak(peakNumber)
+                    params = self.setPeakResult(peak, peakNumber, fitResults[peakNumber], params_ws)
+                    if params is not None and generateStrongPeakParams and ~needsForcedProfile[peakNumber]:
+                        if self.addStrongPeak(peak, peakNumber, fitNumber, params, peaks_ws, strongPeakParams, strongPeakParams_ws):
+                            addedStrongPeaks = True
+                # The next batch starts from the initial guesses of all the strong peaks fit so far
+                if addedStrongPeaks:
+                    sigX0Params, sigY0, sigP0Params = self.getBVGInitialGuesses(peaks_ws, strongPeakParams_ws)
+                timings["Updating peaks"] += perf_counter() - start
+
+                if checkpointFile and perf_counter() - lastCheckpoint > CHECKPOINT_INTERVAL:
+                    start = perf_counter()
+                    self.saveCheckpoint(checkpointFile, checkpointKey, fitResults)
+                    lastCheckpoint = perf_counter()
+                    timings["Writing checkpoints"] += lastCheckpoint - start
+        finally:
+            # Keep the peaks fit so far if we were interrupted
+            if checkpointFile:
+                start = perf_counter()
+                self.saveCheckpoint(checkpointFile, checkpointKey, fitResults)
+                timings["Writing checkpoints"] += perf_counter() - start
+            for peakNumber in boxes:
+                mtd.remove("__MDbox%i" % peakNumber)
+            warnings.filterwarnings("default")  # Re-enable on exit
 
         # Cleanup
         for wsName in mtd.getObjectNames():
             if "fit_" in wsName or "bvgWS" in wsName or "tofWS" in wsName or "scaleWS" in wsName:
                 mtd.remove(wsName)
-        warnings.filterwarnings("default")  # Re-enable on exit
+        logger.notice(
+            "Fit %i peaks using %i threads: " % (len(fitResults), numThreads)
+            + "; ".join("%s %.1f s" % (phase, elapsed) for phase, elapsed in timings.items())
+        )
         # Set the output
         self.setProperty("OutputPeaksWorkspace", peaks_ws_out)
         self.setProperty("OutputParamsWorkspace", params_ws)
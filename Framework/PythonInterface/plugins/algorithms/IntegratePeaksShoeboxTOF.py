@@ -35,6 +35,8 @@ from plugins.algorithms.peakdata_utils import (
     set_peak_intensity,
     make_kernel,
     get_kernel_shape,
+    integrate_peaks_in_parallel,
+    PeakIntegrationStatistics,
 )
 from enum import Enum
 from mantid.dataobjects import PeakShapeDetectorBin
@@ -59,12 +61,24 @@ class WeakPeak:
     kernel_shape: tuple
 
 
+@dataclass
+class IntegratedPeak:
+    ipk: int
+    intens: float = 0.0
+    sigma: float = 0.0
+    status: PEAK_STATUS = None  # None if peak TOF is outside the x-axis limits
+    detids: np.ndarray = None
+    result: "ShoeboxResult" = None
+    weak_peak: WeakPeak = None  # set if peak to be re-integrated with shoebox of nearest strong peak
+
+
 class ShoeboxResult:
     """
     This class is used to hold data and integration parameters for single-crystal Bragg peaks
     """
 
     def __init__(self, ipk, pk, x, y, peak_shape, ipos, ipk_pos, intens_over_sig, status, strong_peak=None, ipk_strong=None):
+        self.ipk = ipk
         self.peak_shape = list(peak_shape)
         self.kernel_shape = list(get_kernel_shape(*self.peak_shape)[0])
         self.ipos = list(ipos) if ipos is not None else ipos
@@ -291,6 +305,14 @@ class IntegratePeaksShoeboxTOF(DataProcessorAlgorithm):
             "Optional file path in which to write diagnostic plots (note this will slow the execution of algorithm).",
         )
         self.setPropertyGroup("OutputFile", "Plotting")
+        # parallelisation
+        self.declareProperty(
+            name="NumberOfThreads",
+            defaultValue=0,
+            direction=Direction.Input,
+            validator=IntBoundedValidator(lower=0),
+            doc="Number of threads used to integrate peaks concurrently. If 0 all but one of the available cores are used.",
+        )
 
     def validateInputs(self):
         issues = dict()
@@ -336,170 +358,212 @@ class IntegratePeaksShoeboxTOF(DataProcessorAlgorithm):
         # saving file
         output_file = self.getProperty("OutputFile").value
 
+        # parallelisation
+        nthreads = self.getProperty("NumberOfThreads").value
+        # default shoebox dimensions
+        nrows_default = self.getProperty("NRows").value
+        ncols_default = self.getProperty("NCols").value
+        nbins_default = self.getProperty("NBins").value
+
         # create output table workspace
         peaks = self.exec_child_alg("CloneWorkspace", InputWorkspace=peaks, OutputWorkspace="out_peaks")
 
         array_converter = InstrumentArrayConverter(ws)
-        weak_peaks_list = []
-        ipks_strong = []
-        results = np.full(peaks.getNumberPeaks(), None)
-        peaks_det_ids = np.full(peaks.getNumberPeaks(), None)
-        prog_reporter = Progress(self, start=0.0, end=1.0, nreports=peaks.getNumberPeaks())
-        for ipk, peak in enumerate(peaks):
-            prog_reporter.report("Integrating")
-            intens, sigma = 0.0, 0.0
-
+        # peak table columns used for every peak (avoid reading the column for each peak)
+        bank_names = peaks.column("BankName")
+        ispecs_peaks = np.asarray(ws.getIndicesFromDetectorIDs([int(p.getDetectorID()) for p in peaks]))
+        xdim = ws.getXDimension()
+        xmin, xmax = xdim.getMinimum(), xdim.getMaximum()
+
+        def integrate_initial_shoebox(ipk):
+            # integrate peak with initial (or optimised) shoebox - must not modify the peaks workspace
+            peak = peaks.getPeak(ipk)
+            integrated = IntegratedPeak(ipk)
             detid = peak.getDetectorID()
-            bank_name = peaks.column("BankName")[ipk]
             pk_tof = peak.getTOF()
-
             # check TOF is in limits of x-axis
-            xdim = ws.getXDimension()
-            if xdim.getMinimum() < pk_tof < xdim.getMaximum():
-                # get shoebox kernel for initial integration
-                nrows = self.getProperty("NRows").value  # get these inside loop as overwritten if shoebox optimised
-                ncols = self.getProperty("NCols").value
-                ispec = ws.getIndicesFromDetectorIDs([detid])[0]
-                bin_width = get_bin_width_at_tof(ws, ispec, pk_tof)  # used later to scale intensity
-                if get_nbins_from_b2bexp_params:
-                    fwhm = get_fwhm_from_back_to_back_params(peak, ws, detid)
-                    nbins = max(3, int(nfwhm * fwhm / bin_width)) if fwhm is not None else self.getProperty("NBins").value
-                    nbins = round_up_to_odd_number(nbins)
-                else:
-                    nbins = self.getProperty("NBins").value
-                kernel = make_kernel(nrows, ncols, nbins)
-
-                # get data array and crop
+            if not xmin < pk_tof < xmax:
+                return integrated
+            # get shoebox kernel for initial integration
+            nrows, ncols = nrows_default, ncols_default
+            ispec = ws.getIndicesFromDetectorIDs([detid])[0]
+            bin_width = get_bin_width_at_tof(ws, ispec, pk_tof)  # used later to scale intensity
+            if get_nbins_from_b2bexp_params:
+                fwhm = get_fwhm_from_back_to_back_params(peak, ws, detid)
+                nbins = max(3, int(nfwhm * fwhm / bin_width)) if fwhm is not None else nbins_default
+                nbins = round_up_to_odd_number(nbins)
+            else:
+                nbins = nbins_default
+            kernel = make_kernel(nrows, ncols, nbins)
+
+            # get data array and crop
+            peak_data = array_converter.get_peak_data(
+                peak, detid, bank_names[ipk], nshoebox * kernel.shape[0], nshoebox * kernel.shape[1], nrows_edge, ncols_edge
+            )
+            x, y, esq, ispecs = get_and_clip_data_arrays(ws, peak_data, pk_tof, kernel, nshoebox)
+            ix = np.argmin(abs(x - pk_tof))
+            ipos_predicted = [peak_data.irow, peak_data.icol, ix]
+            det_edges = peak_data.det_edges if not integrate_on_edge else None
+            integrated.detids = peak_data.detids
+
+            intens, sigma, i_over_sig, status, ipos, nrows, ncols, nbins = integrate_peak(
+                ws,
+                peaks,
+                ipk,
+                kernel,
+                nrows,
+                ncols,
+                nbins,
+                x,
+                y,
+                esq,
+                ispecs,
+                ipos_predicted,
+                det_edges,
+                weak_peak_threshold,
+                do_optimise_shoebox,
+                ispecs_peaks,
+            )
+            integrated.status = status
+
+            if status == PEAK_STATUS.WEAK and do_optimise_shoebox and weak_peak_strategy == "NearestStrongPeak":
+                # look for possible strong peaks at any TOF in the window (won't know if strong until all pks integrated)
+                ipks_near, _ = find_ipks_in_window(ws, peaks, ispecs, ipk, ispecs_peaks=ispecs_peaks)
+                fwhm = fwhm if get_nbins_from_b2bexp_params else None  # not calculated but not going to be used
+                integrated.weak_peak = WeakPeak(
+                    ipk, ispecs[ipos[0], ipos[1]], x[ipos[-1]], fwhm, bin_width, ipks_near, (nrows, ncols, nbins)
+                )
+            else:
+                integrated.result = ShoeboxResult(
+                    ipk, peak, x, y, [nrows, ncols, nbins], ipos, [peak_data.irow, peak_data.icol, ix], i_over_sig, status
+                )  # use this to get strong peak shoebox dimensions even if no plotting
+            # scale summed intensity by bin width to get integrated area
+            integrated.intens = intens * bin_width
+            integrated.sigma = sigma * bin_width
+            return integrated
+
+        def integrate_weak_peak_with_strong_shoebox(weak_pk):
+            # re-integrate weak peak using shoebox of nearest strong peak - must not modify the peaks workspace
+            ipk = weak_pk.ipk
+            peak = peaks.getPeak(ipk)
+            integrated = IntegratedPeak(ipk)
+            bank_name = bank_names[ipk]
+            pk_tof = peak.getTOF()
+            # find nearest strong peak to get shoebox dimensions from (only uses results from the first pass)
+            ipk_strong, strong_pk = get_nearest_strong_peak(peaks, peak, results, weak_pk.ipks_near, ipks_strong)
+            # get peak shape and make kernel
+            nrows, ncols, nbins = results[ipk_strong].peak_shape
+            # scale TOF extent
+            if get_nbins_from_b2bexp_params:
+                # scale TOF extent by ratio of fwhm
+                strong_pk_fwhm = get_fwhm_from_back_to_back_params(strong_pk, ws, strong_pk.getDetectorID())
+                ratio = weak_pk.tof_fwhm / strong_pk_fwhm
+            else:
+                # scale assuming resolution dTOF/TOF = const
+                ratio = pk_tof / strong_pk.getTOF()
+            # scale ratio by bin widths at the two TOFs (can be different if log-binning)
+            ispec_strong = ws.getIndicesFromDetectorIDs([strong_pk.getDetectorID()])[0]
+            ratio = ratio * get_bin_width_at_tof(ws, ispec_strong, strong_pk.getTOF()) / weak_pk.tof_bin_width
+            nbins = max(3, round_up_to_odd_number(int(nbins * ratio)))
+            kernel = make_kernel(nrows, ncols, nbins)
+            # get data array in peak region (keep same window size, nshoebox, for plotting)
+            peak_data = array_converter.get_peak_data(
+                peak, peak.getDetectorID(), bank_name, nshoebox * kernel.shape[0], nshoebox * kernel.shape[1], nrows_edge, ncols_edge
+            )
+            x, y, esq, ispecs = get_and_clip_data_arrays(ws, peak_data, pk_tof, kernel, nshoebox)
+
+            # integrate at previously found ipos
+            if weak_pk.ispec not in ispecs:
+                nrows = max(kernel.shape[0], weak_pk.kernel_shape[0])
+                ncols = max(kernel.shape[0], weak_pk.kernel_shape[0])
                 peak_data = array_converter.get_peak_data(
-                    peak, detid, bank_name, nshoebox * kernel.shape[0], nshoebox * kernel.shape[1], nrows_edge, ncols_edge
+                    peak,
+                    peak.getDetectorID(),
+                    bank_name,
+                    nshoebox * nrows,
+                    nshoebox * ncols,
+                    nrows_edge,
+                    ncols_edge,
                 )
                 x, y, esq, ispecs = get_and_clip_data_arrays(ws, peak_data, pk_tof, kernel, nshoebox)
-                ix = np.argmin(abs(x - pk_tof))
-                ipos_predicted = [peak_data.irow, peak_data.icol, ix]
-                det_edges = peak_data.det_edges if not integrate_on_edge else None
-                peaks_det_ids[ipk] = peak_data.detids
-
-                intens, sigma, i_over_sig, status, ipos, nrows, ncols, nbins = integrate_peak(
-                    ws,
-                    peaks,
-                    ipk,
-                    kernel,
-                    nrows,
-                    ncols,
-                    nbins,
-                    x,
-                    y,
-                    esq,
-                    ispecs,
-                    ipos_predicted,
-                    det_edges,
-                    weak_peak_threshold,
-                    do_optimise_shoebox,
+            ipos = [*np.argwhere(ispecs == weak_pk.ispec)[0], np.argmin(abs(x - weak_pk.tof))]
+            integrated.detids = peak_data.detids
+
+            det_edges = peak_data.det_edges if not integrate_on_edge else None
+            intens, sigma, i_over_sig, status, ipos, nrows, ncols, nbins = integrate_peak(
+                ws,
+                peaks,
+                ipk,
+                kernel,
+                nrows,
+                ncols,
+                nbins,
+                x,
+                y,
+                esq,
+                ispecs,
+                ipos,
+                det_edges,
+                weak_peak_threshold,
+                False,
+                ispecs_peaks,
+            )
+            integrated.status = status
+
+            # scale summed intensity by bin width to get integrated area
+            integrated.intens = intens * weak_pk.tof_bin_width
+            integrated.sigma = sigma * weak_pk.tof_bin_width
+            if output_file:
+                # save result for plotting
+                peak_shape = [nrows, ncols, nbins]
+                ipos_predicted = [peak_data.irow, peak_data.icol, np.argmin(abs(x - pk_tof))]
+                integrated.result = ShoeboxResult(
+                    ipk, peak, x, y, peak_shape, ipos, ipos_predicted, i_over_sig, status, strong_peak=strong_pk, ipk_strong=ipk_strong
                 )
+            return integrated
 
-                if status == PEAK_STATUS.WEAK and do_optimise_shoebox and weak_peak_strategy == "NearestStrongPeak":
-                    # look for possible strong peaks at any TOF in the window (won't know if strong until all pks integrated)
-                    ipks_near, _ = find_ipks_in_window(ws, peaks, ispecs, ipk)
-                    fwhm = fwhm if get_nbins_from_b2bexp_params else None  # not calculated but not going to be used
-                    weak_peaks_list.append(
-                        WeakPeak(ipk, ispecs[ipos[0], ipos[1]], x[ipos[-1]], fwhm, bin_width, ipks_near, (nrows, ncols, nbins))
-                    )
-                else:
-                    if status == PEAK_STATUS.STRONG:
-                        ipks_strong.append(ipk)
-                    results[ipk] = ShoeboxResult(
-                        ipk, peak, x, y, [nrows, ncols, nbins], ipos, [peak_data.irow, peak_data.icol, ix], i_over_sig, status
-                    )  # use this to get strong peak shoebox dimensions even if no plotting
-                # scale summed intensity by bin width to get integrated area
-                intens = intens * bin_width
-                sigma = sigma * bin_width
-            set_peak_intensity(peak, intens, sigma, do_lorz_cor)
+        weak_peaks_list = []
+        ipks_strong = []
+        results = np.full(peaks.getNumberPeaks(), None)
+        peaks_det_ids = np.full(peaks.getNumberPeaks(), None)
+        stats = PeakIntegrationStatistics()
+        prog_reporter = Progress(self, start=0.0, end=1.0, nreports=peaks.getNumberPeaks())
+        # first pass: integrate all peaks independently (weak peaks are re-integrated once the strong peaks are known)
+        for ipk, integrated, elapsed in integrate_peaks_in_parallel(
+            integrate_initial_shoebox, range(peaks.getNumberPeaks()), nthreads, prog_reporter, "Integrating"
+        ):
+            stats.add(integrated.status, elapsed)
+            peaks_det_ids[ipk] = integrated.detids
+            if integrated.weak_peak is not None:
+                weak_peaks_list.append(integrated.weak_peak)
+            else:
+                if integrated.status == PEAK_STATUS.STRONG:
+                    ipks_strong.append(ipk)
+                results[ipk] = integrated.result
+            set_peak_intensity(peaks.getPeak(ipk), integrated.intens, integrated.sigma, do_lorz_cor)
 
         if len(ipks_strong):
             prog_reporter.resetNumSteps(int(len(weak_peaks_list)), start=0.0, end=1.0)
-            for weak_pk in weak_peaks_list:
-                prog_reporter.report("Re-integrating weak peaks")
-                # get peak
-                ipk = weak_pk.ipk
-                peak = peaks.getPeak(ipk)
-                bank_name = peaks.column("BankName")[ipk]
-                pk_tof = peak.getTOF()
-                # find nearest strong peak to get shoebox dimensions from
-                ipk_strong, strong_pk = get_nearest_strong_peak(peaks, peak, results, weak_pk.ipks_near, ipks_strong)
-                # get peak shape and make kernel
-                nrows, ncols, nbins = results[ipk_strong].peak_shape
-                # scale TOF extent
-                if get_nbins_from_b2bexp_params:
-                    # scale TOF extent by ratio of fwhm
-                    strong_pk_fwhm = get_fwhm_from_back_to_back_params(strong_pk, ws, strong_pk.getDetectorID())
-                    ratio = weak_pk.tof_fwhm / strong_pk_fwhm
-                else:
-                    # scale assuming resolution dTOF/TOF = const
-                    ratio = pk_tof / strong_pk.getTOF()
-                # scale ratio by bin widths at the two TOFs (can be different if log-binning)
-                ispec_strong = ws.getIndicesFromDetectorIDs([strong_pk.getDetectorID()])[0]
-                ratio = ratio * get_bin_width_at_tof(ws, ispec_strong, strong_pk.getTOF()) / weak_pk.tof_bin_width
-                nbins = max(3, round_up_to_odd_number(int(nbins * ratio)))
-                kernel = make_kernel(nrows, ncols, nbins)
-                # get data array in peak region (keep same window size, nshoebox, for plotting)
-                peak_data = array_converter.get_peak_data(
-                    peak, peak.getDetectorID(), bank_name, nshoebox * kernel.shape[0], nshoebox * kernel.shape[1], nrows_edge, ncols_edge
-                )
-                x, y, esq, ispecs = get_and_clip_data_arrays(ws, peak_data, pk_tof, kernel, nshoebox)
-
-                # integrate at previously found ipos
-                if weak_pk.ispec not in ispecs:
-                    nrows = max(kernel.shape[0], weak_pk.kernel_shape[0])
-                    ncols = max(kernel.shape[0], weak_pk.kernel_shape[0])
-                    peak_data = array_converter.get_peak_data(
-                        peak,
-                        peak.getDetectorID(),
-                        bank_name,
-                        nshoebox * nrows,
-                        nshoebox * ncols,
-                        nrows_edge,
-                        ncols_edge,
-                    )
-                    x, y, esq, ispecs = get_and_clip_data_arrays(ws, peak_data, pk_tof, kernel, nshoebox)
-                ipos = [*np.argwhere(ispecs == weak_pk.ispec)[0], np.argmin(abs(x - weak_pk.tof))]
-                peaks_det_ids[ipk] = peak_data.detids
-
-                det_edges = peak_data.det_edges if not integrate_on_edge else None
-                intens, sigma, i_over_sig, status, ipos, nrows, ncols, nbins = integrate_peak(
-                    ws,
-                    peaks,
-                    ipk,
-                    kernel,
-                    nrows,
-                    ncols,
-                    nbins,
-                    x,
-                    y,
-                    esq,
-                    ispecs,
-                    ipos,
-                    det_edges,
-                    weak_peak_threshold,
-                    False,
-                )
-
-                # scale summed intensity by bin width to get integrated area
-                intens = intens * weak_pk.tof_bin_width
-                sigma = sigma * weak_pk.tof_bin_width
-                set_peak_intensity(peak, intens, sigma, do_lorz_cor)
-                if output_file:
-                    # save result for plotting
-                    peak_shape = [nrows, ncols, nbins]
-                    ipos_predicted = [peak_data.irow, peak_data.icol, np.argmin(abs(x - pk_tof))]
-                    results[ipk] = ShoeboxResult(
-                        ipk, peak, x, y, peak_shape, ipos, ipos_predicted, i_over_sig, status, strong_peak=strong_pk, ipk_strong=ipk_strong
-                    )
+            # second pass: re-integrate weak peaks using the shoebox of the nearest strong peak
+            weak_results = []
+            for weak_pk, integrated, elapsed in integrate_peaks_in_parallel(
+                integrate_weak_peak_with_strong_shoebox, weak_peaks_list, nthreads, prog_reporter, "Re-integrating weak peaks"
+            ):
+                stats.add(integrated.status, elapsed)
+                peaks_det_ids[weak_pk.ipk] = integrated.detids
+                set_peak_intensity(peaks.getPeak(weak_pk.ipk), integrated.intens, integrated.sigma, do_lorz_cor)
+                if integrated.result is not None:
+                    weak_results.append(integrated.result)
+            # only update results once all weak peaks are integrated (strong peak search uses first pass results)
+            for result in weak_results:
+                results[result.ipk] = result
         elif weak_peak_strategy == "NearestStrongPeak":
             raise ValueError(
                 f"No peaks found with I/sigma > WeakPeakThreshold ({weak_peak_threshold}) - can't "
                 f"estimate shoebox dimension for weak peaks. Try reducing WeakPeakThreshold or set "
                 f"WeakPeakStrategy to Fix"
             )
+        self.log().notice(stats.summary())
 
         # Sets PeakShapeDetectorBin shapes for successfully integrated peaks
         self._set_peak_shapes(results, peaks_det_ids, peaks)
@@ -566,13 +630,28 @@ def get_nearest_strong_peak(peaks, peak, results, ipks_near, ipks_strong):
 
 
 def integrate_peak(
-    ws, peaks, ipk, kernel, nrows, ncols, nbins, x, y, esq, ispecs, ipos_predicted, det_edges, weak_peak_threshold, do_optimise_shoebox
+    ws,
+    peaks,
+    ipk,
+    kernel,
+    nrows,
+    ncols,
+    nbins,
+    x,
+    y,
+    esq,
+    ispecs,
+    ipos_predicted,
+    det_edges,
+    weak_peak_threshold,
+    do_optimise_shoebox,
+    ispecs_peaks=None,
 ):
     # perform initial integration
     intens_over_sig = convolve_shoebox(y, esq, kernel)  # array of I/sigma same size as data
 
     # identify best shoebox position near peak
-    ipos = find_nearest_peak_in_data_window(intens_over_sig, ispecs, x, ws, peaks, ipk, tuple(ipos_predicted))
+    ipos = find_nearest_peak_in_data_window(intens_over_sig, ispecs, x, ws, peaks, ipk, tuple(ipos_predicted), ispecs_peaks=ispecs_peaks)
 
     # perform final integration if required
     intens, sigma, i_over_sig = 0.0, 0.0, 0.0
@@ -647,7 +726,7 @@ def convolve_shoebox(y, esq, kernel, mode="same"):
     return intens_over_sig
 
 
-def find_nearest_peak_in_data_window(data, ispecs, x, ws, peaks, ipk, ipos, min_threshold=2):
+def find_nearest_peak_in_data_window(data, ispecs, x, ws, peaks, ipk, ipos, min_threshold=2, ispecs_peaks=None):
     # find threshold
     threshold = max(0.5 * (data[ipos] + min_threshold), min_threshold)
     labels, nlabels = label(data > threshold)
@@ -658,10 +737,10 @@ def find_nearest_peak_in_data_window(data, ispecs, x, ws, peaks, ipk, ipos, min_
         dists, inearest = distance_transform_edt(labels == 0, return_distances=True, return_indices=True)
         nearest_label = labels[tuple(inearest)]
         # mask out labels closest to other peaks
-        ipks_near, ispecs_peaks = find_ipks_in_window(ws, peaks, ispecs, ipk, tof_min=x.min(), tof_max=x.max())
+        ipks_near, ispecs_near = find_ipks_in_window(ws, peaks, ispecs, ipk, tof_min=x.min(), tof_max=x.max(), ispecs_peaks=ispecs_peaks)
         tofs = peaks.column("TOF")
         for ii, ipk_near in enumerate(ipks_near):
-            ipos_near = tuple([*np.argwhere(ispecs == ispecs_peaks[ii])[0], np.argmin(abs(x - tofs[ipk_near]))])
+            ipos_near = tuple([*np.argwhere(ispecs == ispecs_near[ii])[0], np.argmin(abs(x - tofs[ipk_near]))])
             ilabel_near = nearest_label[ipos_near]
             if ilabel_near != nearest_label[ipos] or dists[ipos] > dists[ipos_near]:
                 labels[labels == nearest_label[ipos_near]] = 0  # remove the label
@@ -673,8 +752,9 @@ def find_nearest_peak_in_data_window(data, ispecs, x, ws, peaks, ipk, ipos, min_
     return maximum_position(data, labels, peak_label)
 
 
-def find_ipks_in_window(ws, peaks, ispecs, ipk, tof_min=None, tof_max=None):
-    ispecs_peaks = np.asarray(ws.getIndicesFromDetectorIDs([int(p.getDetectorID()) for p in peaks]))
+def find_ipks_in_window(ws, peaks, ispecs, ipk, tof_min=None, tof_max=None, ispecs_peaks=None):
+    if ispecs_peaks is None:
+        ispecs_peaks = np.asarray(ws.getIndicesFromDetectorIDs([int(p.getDetectorID()) for p in peaks]))
     ipks_near = np.isin(ispecs_peaks, ispecs)
     if tof_min and tof_max:
         tofs = peaks.column("TOF")
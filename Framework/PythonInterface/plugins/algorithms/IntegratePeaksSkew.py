@@ -35,6 +35,8 @@ from plugins.algorithms.peakdata_utils import (
     PeakData,
     get_fwhm_from_back_to_back_params,
     exec_simpleapi_alg,
+    integrate_peaks_in_parallel,
+    PeakIntegrationStatistics,
 )
 
 
@@ -654,6 +656,14 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
             "sin(theta)^2 / lambda^4 - do not do this if the data have already been corrected.",
         )
         self.setPropertyGroup("LorentzCorrection", "Corrections")
+        # parallelisation
+        self.declareProperty(
+            name="NumberOfThreads",
+            defaultValue=0,
+            direction=Direction.Input,
+            validator=IntBoundedValidator(lower=0),
+            doc="Number of threads used to integrate peaks concurrently. If 0 all but one of the available cores are used.",
+        )
         # Output
         self.declareProperty(
             IPeaksWorkspaceProperty(name="OutputWorkspace", defaultValue="", direction=Direction.Output),
@@ -730,6 +740,8 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
         plot_filename = self.getProperty("OutputFile").value
         # corrections
         do_lorz_cor = self.getProperty("LorentzCorrection").value
+        # parallelisation
+        nthreads = self.getProperty("NumberOfThreads").value
 
         array_converter = InstrumentArrayConverterSkew(ws)
 
@@ -745,10 +757,11 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
         end_frac = 0.5 if plot_filename else 1.0
         prog_reporter = Progress(self, start=0.0, end=end_frac, nreports=pk_ws.getNumberPeaks())
 
-        for ipk, pk in enumerate(pk_ws):
-            # check that peak is in a valid detector
+        # skip peaks that are not in a valid detector
+        detector_info = ws.detectorInfo()
+        ipks_valid = []
+        for ipk in range(pk_ws.getNumberPeaks()):
             detid = detids[ipk]
-            detector_info = ws.detectorInfo()
             try:
                 det_idx = detector_info.indexOf(detid)
                 invalid_detector = detector_info.isMonitor(det_idx) or detector_info.isMasked(det_idx)
@@ -757,9 +770,12 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
             if invalid_detector:
                 logger.error("Peak with index {ipk} is not in a valid detector (with ID {detid}).")
                 continue  # skip peak - don't plot as no data to retrieve
-            # copy pk to output peak workspace
-            pk_ws_int.addPeak(pk)
-            pk = pk_ws_int.getPeak(pk_ws_int.getNumberPeaks() - 1)  # don't overwrite pk in input ws
+            ipks_valid.append(ipk)
+
+        def integrate_peak_data(ipk):
+            # integrate peak in the input workspace - must not modify the output peaks workspace
+            pk = pk_ws.getPeak(ipk)
+            detid = detids[ipk]
             # get data array in window around peak region
             peak_data = array_converter.get_peak_data(pk, detid, bank_names[ipk], nrows, ncols, nrows_edge, ncols_edge)
             if get_dTOF_from_b2bexp_params:
@@ -790,6 +806,16 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
                 optimise_xwindow,
                 threshold_i_over_sig,
             )
+            return peak_data
+
+        stats = PeakIntegrationStatistics()
+        for ipk, peak_data, elapsed in integrate_peaks_in_parallel(
+            integrate_peak_data, ipks_valid, nthreads, prog_reporter, "Integrating Peaks"
+        ):
+            stats.add(peak_data.status, elapsed)
+            # copy pk to output peak workspace
+            pk_ws_int.addPeak(pk_ws.getPeak(ipk))
+            pk = pk_ws_int.getPeak(pk_ws_int.getNumberPeaks() - 1)  # don't overwrite pk in input ws
             if peak_data.status is PEAK_MASK_STATUS.VALID:
                 if update_peak_pos:
                     hkl = pk.getHKL()
@@ -818,8 +844,7 @@ class IntegratePeaksSkew(DataProcessorAlgorithm):
                 pk.setIntensity(0.0)
                 pk.setSigmaIntensity(0.0)
             peak_data_collection.append(peak_data)
-            # update progress
-            prog_reporter.report("Integrating Peaks")
+        logger.notice(stats.summary())
         # delete rows
         self.child_DeleteTableRows(TableWorkspace=pk_ws_int, Rows=irows_delete)
 
@@ -176,14 +176,13 @@ class MuonMaxent(PythonAlgorithm):
     def doDeadTimes(self, POINTS_ngroups, GROUPING_group, ws, FLAGS_fitdead, mylog):
         RUNDATA_frames = None
         SENSE_taud = np.zeros([POINTS_ngroups])  # default zero if not provided
-        tmpTaud = [[] for i in range(POINTS_ngroups)]
         if not self.getProperty("InputDeadTimeTable").isDefault:
             # load data from standard Mantid dead time table
-            for r in self.getProperty("InputDeadTimeTable").value:
-                if GROUPING_group[r["spectrum"] - 1] >= 0:
-                    tmpTaud[GROUPING_group[r["spectrum"] - 1]].append(r["dead-time"])
+            deadTable = self.getProperty("InputDeadTimeTable").value
+            deadGroups = GROUPING_group[np.asarray(deadTable.column("spectrum"), dtype=int) - 1]
+            deadTimes = np.asarray(deadTable.column("dead-time"), dtype=float)
             for g in range(POINTS_ngroups):
-                SENSE_taud[g] = np.mean(tmpTaud[g])
+                SENSE_taud[g] = np.mean(deadTimes[deadGroups == g])
         try:
             RUNDATA_frames = ws.getRun().getProperty("goodfrm").value  # need frames for dead time calc
         except:
@@ -226,20 +225,21 @@ class MuonMaxent(PythonAlgorithm):
             if asymmLabel is None:
                 raise ValueError("Asymmetry is not labelled in the phase table")
 
+            IDs = np.asarray(pt.column(IDLabel), dtype=int)
+            phases = np.asarray(pt.column(phaseLabel), dtype=float)
             if len(pt) == POINTS_ngroups:  # phase table for grouped data, or when not grouping
-                for row in pt:
-                    filePHASE[row[IDLabel] - 1] = row[phaseLabel]
-                    # sign of phase now OK for Mantid 3.12 onwards
+                filePHASE[IDs - 1] = phases
+                # sign of phase now OK for Mantid 3.12 onwards
             elif len(pt) == POINTS_nhists:  # phase table for ungrouped data. Pick a representative detector for each group (the last one)
-                for row in pt:
-                    filePHASE[GROUPING_group[row[IDLabel] - 1]] = row[phaseLabel]
+                # wrap unused histograms (group -1) the same way as indexing filePHASE does
+                groups = GROUPING_group[IDs - 1] % POINTS_ngroups
+                _, lastFromEnd = np.unique(groups[::-1], return_index=True)
+                last = len(groups) - 1 - lastFromEnd
+                filePHASE[groups[last]] = phases[last]
             else:  # muat be some dead Detectors
-                offset = 0
-                for row in pt:
-                    if row[asymmLabel] == 999:
-                        offset += 1
-                    else:
-                        filePHASE[row[IDLabel] - 1 - offset] = row[phaseLabel]
+                dead = np.asarray(pt.column(asymmLabel)) == 999
+                offset = np.cumsum(dead)
+                filePHASE[IDs[~dead] - 1 - offset[~dead]] = phases[~dead]
         return filePHASE
 
     def phaseConvergenceTable(self, POINTS_ngroups, deadDetectors, OuterIter, filePHASE):
@@ -4,10 +4,15 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import time
+
+import numpy as np
 from mantid.api import AlgorithmFactory, AnalysisDataService, DataProcessorAlgorithm, MatrixWorkspaceProperty, WorkspaceGroup
 from mantid.kernel import config, Direction, Property, StringListValidator
 from mantid.simpleapi import AddSampleLogMultiple, CloneWorkspace, LoadInstrument, SetInstrumentParameter
 
+LATENCY_LOG_NAME = "live_update_latency"
+
 
 class LiveValue:
     """Hold the value and unit of a live instrument block value. Also hold an
@@ -27,7 +32,35 @@ class LiveValue:
         self.log_type = log_type
 
 
+class LiveReductionCache:
+    """Hold what is kept between live data updates for an output workspace when
+    CacheBetweenUpdates is enabled. A new instance of the algorithm is run for every
+    update, so this is stored at class level rather than on the algorithm. The
+    prepared workspace, which already has the instrument loaded, is kept in the ADS
+    and only its counts and sample logs are replaced on each update."""
+
+    def __init__(self, input_ws_name, instrument):
+        self.input_ws_name = input_ws_name
+        self.instrument = instrument
+        self.settings = None
+        self.output = None
+
+    def is_valid_for(self, workspace, instrument):
+        """Return true if the prepared workspace can take the counts of the given workspace"""
+        if instrument != self.instrument or not AnalysisDataService.doesExist(self.input_ws_name):
+            return False
+        prepared_ws = AnalysisDataService.retrieve(self.input_ws_name)
+        return (
+            workspace.id() == "Workspace2D"
+            and prepared_ws.id() == "Workspace2D"
+            and workspace.getNumberHistograms() == prepared_ws.getNumberHistograms()
+            and np.array_equal(workspace.extractX(), prepared_ws.extractX())
+        )
+
+
 class ReflectometryReductionOneLiveData(DataProcessorAlgorithm):
+    _caches = {}
+
     def category(self):
         return "Reflectometry"
 
@@ -60,6 +93,14 @@ class ReflectometryReductionOneLiveData(DataProcessorAlgorithm):
             direction=Direction.Input,
             doc="The algorithm to use to get live values from the instrument",
         )
+        self.declareProperty(
+            name="CacheBetweenUpdates",
+            defaultValue=False,
+            direction=Direction.Input,
+            doc="If true, keep the workspace with the loaded instrument between live data updates and only replace its "
+            "counts and sample logs, and skip the reduction if neither the counts nor the live values have changed "
+            "since the previous update.",
+        )
 
         self._child_properties = [
             "FirstTransmissionRunList",
@@ -119,28 +160,106 @@ class ReflectometryReductionOneLiveData(DataProcessorAlgorithm):
         self.copyProperties("ReflectometryISISLoadAndProcess", self._child_properties)
 
     def PyExec(self):
-        self._setup_workspace_for_reduction()
-        alg = self._setup_reduction_algorithm()
-        self._run_reduction_algorithm(alg)
+        start_time = time.perf_counter()
+        if self.getProperty("CacheBetweenUpdates").value:
+            self._run_cached_update()
+        else:
+            self._setup_workspace_for_reduction()
+            alg = self._setup_reduction_algorithm()
+            self._run_reduction_algorithm(alg)
+        self._record_latency(time.perf_counter() - start_time)
+
+    def _run_cached_update(self):
+        """Run an update reusing the workspace prepared in the previous update, if it is still valid"""
+        output_name = self.getPropertyValue("OutputWorkspace")
+        self._temp_ws_name = "__" + output_name
+        self._instrument = self.getProperty("Instrument").value
+        in_ws = self.getProperty("InputWorkspace").value
+        cache = self._caches.get(output_name)
+        if cache is None or not cache.is_valid_for(in_ws, self._instrument):
+            cache = LiveReductionCache(self._temp_ws_name + "_live_input", self._instrument)
+            self._caches[output_name] = cache
+            self._setup_workspace_for_reduction(cache.input_ws_name)
+            liveValues = self._live_values
+        else:
+            liveValues = self._get_live_values_from_instrument()
+            settings = self._reduction_settings(liveValues)
+            prepared_ws = AnalysisDataService.retrieve(cache.input_ws_name)
+            if (
+                settings == cache.settings
+                and cache.output is not None
+                and AnalysisDataService.doesExist(output_name)
+                and np.array_equal(in_ws.extractY(), prepared_ws.extractY())
+                and np.array_equal(in_ws.extractE(), prepared_ws.extractE())
+            ):
+                self.log().information("No new data since the previous update; reusing the previous reduction")
+                self.setProperty("OutputWorkspace", cache.output)
+                return
+            self._update_prepared_workspace(prepared_ws, in_ws, liveValues)
+
+        cache.settings = self._reduction_settings(liveValues)
+        alg = self._setup_reduction_algorithm(cache.input_ws_name)
+        alg.execute()
+        cache.output = alg.getProperty("OutputWorkspaceBinned").value
+        self.setProperty("OutputWorkspace", cache.output)
+        # the input is prepared in the cache's workspace, so the temporary workspace only exists if the reduction left it
+        if AnalysisDataService.doesExist(self._temp_ws_name):
+            AnalysisDataService.remove(self._temp_ws_name)
+
+    def _update_prepared_workspace(self, prepared_ws, in_ws, liveValues):
+        """Replace the counts and sample logs of the prepared workspace without loading the instrument again"""
+        for i in range(in_ws.getNumberHistograms()):
+            prepared_ws.setY(i, in_ws.readY(i))
+            prepared_ws.setE(i, in_ws.readE(i))
+        prepared_ws.setRun(in_ws.run())
+        alg = self.createChildAlgorithm("AddSampleLogMultiple")
+        alg.setProperty("Workspace", prepared_ws)
+        self._set_sample_log_properties(alg, liveValues)
+        alg.execute()
+        # Apply any instrument parameters which are taken from the sample logs, as LoadInstrument does
+        prepared_ws.populateInstrumentParameters()
+        for component, value in self._slit_gaps(liveValues):
+            alg = self.createChildAlgorithm("SetInstrumentParameter")
+            alg.setProperty("Workspace", prepared_ws)
+            alg.setProperty("ParameterName", "vertical gap")
+            alg.setProperty("ParameterType", "Number")
+            alg.setProperty("ComponentName", component)
+            alg.setProperty("Value", str(value))
+            alg.execute()
+
+    def _reduction_settings(self, liveValues):
+        """Return everything the reduction depends on other than the counts"""
+        properties = tuple(self.getPropertyValue(prop) for prop in self._child_properties if prop != "OutputWorkspace")
+        values = tuple((name, str(liveValue.value)) for name, liveValue in sorted(liveValues.items()))
+        return self._instrument, properties, values
+
+    def _record_latency(self, latency):
+        """Record how long the update took in the logs of the output workspace"""
+        output_ws = self.getProperty("OutputWorkspace").value
+        ws_list = output_ws if isinstance(output_ws, WorkspaceGroup) else [output_ws]
+        for ws in ws_list:
+            ws.mutableRun().addProperty(LATENCY_LOG_NAME, latency, "s", True)
+        self.log().notice("Live data update took {:.3f} seconds".format(latency))
 
-    def _setup_workspace_for_reduction(self):
+    def _setup_workspace_for_reduction(self, prepared_ws_name=None):
         """Set up the workspace ready for the reduction"""
         in_ws_name = self.getPropertyValue("InputWorkspace")
         self._temp_ws_name = "__" + self.getPropertyValue("OutputWorkspace")
         self._instrument = self.getProperty("Instrument").value
+        self._prepared_ws_name = prepared_ws_name if prepared_ws_name else self._temp_ws_name
         # Set up a clone for the output because we need to do some in-place manipulations
-        CloneWorkspace(InputWorkspace=in_ws_name, OutputWorkspace=self._temp_ws_name)
-        liveValues = self._get_live_values_from_instrument()
-        self._setup_sample_logs(liveValues)
+        CloneWorkspace(InputWorkspace=in_ws_name, OutputWorkspace=self._prepared_ws_name)
+        self._live_values = self._get_live_values_from_instrument()
+        self._setup_sample_logs(self._live_values)
         # Set up the instrument after adding the sample logs in case the IDF uses any log values
         self._setup_instrument()
-        self._setup_slits(liveValues)
+        self._setup_slits(self._live_values)
 
-    def _setup_reduction_algorithm(self):
+    def _setup_reduction_algorithm(self, input_ws_name=None):
         """Set up the reduction algorithm"""
         alg = self.createChildAlgorithm("ReflectometryISISLoadAndProcess")
         self._copy_property_values_to(alg)
-        alg.setProperty("InputRunList", self._temp_ws_name)
+        alg.setProperty("InputRunList", input_ws_name if input_ws_name else self._temp_ws_name)
         alg.setProperty("ThetaLogName", "Theta")
         alg.setProperty("GroupTOFWorkspaces", False)
         alg.setProperty("ReloadInvalidWorkspaces", False)
@@ -156,7 +275,7 @@ class ReflectometryReductionOneLiveData(DataProcessorAlgorithm):
 
     def _setup_instrument(self):
         """Sets the instrument name and loads the instrument on the workspace"""
-        LoadInstrument(Workspace=self._temp_ws_name, RewriteSpectraMap=False, InstrumentName=self._instrument)
+        LoadInstrument(Workspace=self._prepared_ws_name, RewriteSpectraMap=False, InstrumentName=self._instrument)
 
     def _setup_sample_logs(self, liveValues):
         """Set up the sample logs based on live values from the instrument"""
@@ -171,19 +290,37 @@ class ReflectometryReductionOneLiveData(DataProcessorAlgorithm):
             log_types.append(live_values.log_type)
 
         AddSampleLogMultiple(
-            Workspace=self._temp_ws_name, LogNames=log_names, LogValues=log_values, LogUnits=log_units, LogTypes=log_types, ParseType=False
+            Workspace=self._prepared_ws_name,
+            LogNames=log_names,
+            LogValues=log_values,
+            LogUnits=log_units,
+            LogTypes=log_types,
+            ParseType=False,
         )
 
+    @staticmethod
+    def _set_sample_log_properties(alg, liveValues):
+        """Set the properties of an AddSampleLogMultiple algorithm for the live values"""
+        alg.setProperty("LogNames", list(liveValues.keys()))
+        alg.setProperty("LogValues", [str(live_values.value) for live_values in liveValues.values()])
+        alg.setProperty("LogUnits", [live_values.unit for live_values in liveValues.values()])
+        alg.setProperty("LogTypes", [live_values.log_type for live_values in liveValues.values()])
+        alg.setProperty("ParseType", False)
+
+    def _slit_gaps(self, liveValues):
+        """Return the slit components and their vertical gaps from the live values"""
+        return [("slit1", liveValues[self._s1vg_name()].value), ("slit2", liveValues[self._s2vg_name()].value)]
+
     def _setup_slits(self, liveValues):
         """Set up instrument parameters for the slits"""
-        s1 = liveValues[self._s1vg_name()].value
-        s2 = liveValues[self._s2vg_name()].value
-        output_ws = AnalysisDataService.retrieve(self._temp_ws_name)
+        output_ws = AnalysisDataService.retrieve(self._prepared_ws_name)
 
         ws_list = output_ws if isinstance(output_ws, WorkspaceGroup) else [output_ws]
         for ws in ws_list:
-            SetInstrumentParameter(Workspace=ws, ParameterName="vertical gap", ParameterType="Number", ComponentName="slit1", Value=str(s1))
-            SetInstrumentParameter(Workspace=ws, ParameterName="vertical gap", ParameterType="Number", ComponentName="slit2", Value=str(s2))
+            for component, value in self._slit_gaps(liveValues):
+                SetInstrumentParameter(
+                    Workspace=ws, ParameterName="vertical gap", ParameterType="Number", ComponentName=component, Value=str(value)
+                )
 
     def _copy_property_values_to(self, alg):
         for prop in self._child_properties:
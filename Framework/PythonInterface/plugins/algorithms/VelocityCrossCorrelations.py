@@ -12,9 +12,20 @@ from mantid.simpleapi import CreateWorkspace
 
 from scipy.io import netcdf
 import numpy as np
-import re
 import time
 
+from plugins.algorithms.trajectory_utils import (
+    block_velocities,
+    box_tensors,
+    fold_correlation,
+    padded_fft_length,
+    particle_blocks,
+    read_particle_species,
+    species_indices,
+    spectra,
+    spectrum_to_correlation,
+)
+
 
 class VelocityCrossCorrelations(PythonAlgorithm):
     def category(self):
@@ -41,47 +52,15 @@ class VelocityCrossCorrelations(PythonAlgorithm):
         # Get file path
         file_name = self.getPropertyValue("InputFile")
 
-        # Load trajectory file
+        # Load trajectory file. The file is memory mapped so particle blocks are only read when needed
         trajectory = netcdf.netcdf_file(file_name, mode="r")
 
         logger.information("Loading particle id's and coordinate array...")
         start_time = time.time()
 
-        # netcdf object containing the particle id numbers
-        description = (trajectory.variables["description"])[:]
-        # Convert description object to string via for loop. The original object has strange formatting
-        particleID = ""
-        for i in description:
-            particleID += i.decode("UTF-8")
-        # Extract particle id's from string using regular expressions
-        p_atoms = re.findall(r"A\('[a-z]+\d+',\d+", particleID)
-
-        # Many-to-one structures. Identify the set of atomic species present (list structure 'elements')
-        # in the simulation and repackage particles into a dictionary
-        # 'particles_to_species' with structure id number -> species
-        atoms_to_species = {}
-        species_to_atoms = {}
-        elements = []
-
-        # Populate the particles_to_species dictionary and the elements list
-        for j in p_atoms:
-            key = re.findall(r"',\d+", j)[0]
-            key = int(re.findall(r"\d+", key)[0])
-            element = re.findall(r"[a-z]+", j)[0]
-            if element not in elements:
-                elements.append(str(element))
-            atoms_to_species[key] = str(element)
-
-        # Initialise lists in the species_to_particles dictionary
-        for j in elements:
-            species_to_atoms[j] = []
-
-        # Populate the species_to_particles dictionary
-        for j in p_atoms:
-            key = re.findall(r"',\d+", j)[0]
-            key = int(re.findall(r"\d+", key)[0])
-            element = re.findall(r"[a-z]+", j)[0]
-            species_to_atoms[element].append(key)
+        # Identify the set of atomic species present (list structure 'elements') in the simulation
+        # and the species of each particle
+        elements, atoms_to_species = read_particle_species(trajectory)
 
         # Coordinate array. Shape: timesteps x (# of particles) x (# of spatial dimensions)
         configuration = trajectory.variables["configuration"]
@@ -96,76 +75,51 @@ class VelocityCrossCorrelations(PythonAlgorithm):
         # Number of spatial dimensions
         n_dimensions = int(configuration.shape[2])
 
-        logger.information(str(time.time() - start_time) + " s")
-
-        logger.information("Transforming coordinates...")
-        start_time = time.time()
-
-        # Box size for each timestep. Shape: timesteps x (3 consecutive 3-vectors)
-        box_size = trajectory.variables["box_size"]
-
-        # Reshape the paralellepipeds into 3x3 tensors for coordinate transformations.
-        # Shape: timesteps x 3 vectors x (# of spatial dimensions)
-        box_size_tensors = np.array([box_size[j].reshape((3, 3)) for j in range(n_timesteps)])
-
-        # Copy the configuration object into a numpy array
-        configuration_copy = np.array([configuration[i] for i in range(n_timesteps)])
-
-        # Swap the time and particle axes
-        configuration_copy = np.swapaxes(configuration_copy, 0, 1)  # /1.12484770
-
-        # Get scaled coordinates (assumes orthogonal simulation box)
-        scaled_coords = np.zeros(np.shape(configuration_copy))
-        for i in range(n_particles):
-            for j in range(n_timesteps):
-                for k in range(n_dimensions):
-                    scaled_coords[i, j, k] = configuration_copy[i, j, k] / box_size_tensors[j, k, k]
-
-        # # Transform particle trajectories (configuration array) to Cartesian coordinates at each time step
+        species = species_indices(elements, atoms_to_species, n_particles)
+        # Box size for each timestep reshaped into 3x3 tensors. Shape: timesteps x 3 vectors x (# of spatial dimensions)
+        boxes = box_tensors(trajectory, n_timesteps)
 
         logger.information(str(time.time() - start_time) + " s")
 
-        logger.information("Calculating velocities...")
-        start_time = time.time()
-
-        # Initialise velocity arrray. Note that the first dimension is 2 elements shorter than the coordinate array.
-        # Use finite difference methods to evaluate the time-derivative to 1st order
-        # Shape: (# of particles) x (timesteps-2) x (# of spatial dimensions)
-
-        velocities = np.zeros((n_particles, n_timesteps - 1, n_dimensions))
-        v1 = scaled_coords[:, 1:-1, :] - scaled_coords[:, :-2, :] - np.round(scaled_coords[:, 1:-1, :] - scaled_coords[:, :-2, :])
-        v2 = scaled_coords[:, 2:, :] - scaled_coords[:, 1:-1, :] - np.round(scaled_coords[:, 2:, :] - scaled_coords[:, 1:-1, :])
-        velocities[:, :-1, :] = (v1 + v2) / 2.0
-
-        # Transform velocities (configuration array) back to Cartesian coordinates at each time step
-        velocities = np.array(
-            [[np.dot(box_size_tensors[j + 1], np.transpose(velocities[i, j])) for j in range(n_timesteps - 1)] for i in range(n_particles)]
-        )
-        logger.information(str(time.time() - start_time) + " s")
-
         logger.information("Calculating velocity cross-correlations (resource intensive calculation)...")
         start_time = time.time()
+
+        # Velocities are one element shorter than the coordinate array
         correlation_length = n_timesteps - 1
+        fft_length = padded_fft_length(correlation_length)
+        n_frequencies = fft_length // 2 + 1
+        # Running sum of the velocity spectra of each species, over the particles streamed so far
+        species_spectra = np.zeros((n_species, n_dimensions, n_frequencies), dtype=complex)
+        # Sum over particle pairs i < j of the same species of F(v_i) * conj(F(v_j))
+        same_species_spectra = np.zeros((n_species, n_frequencies), dtype=complex)
+
+        # Stream blocks of particles from the file. Particles are visited in index order so the pairs i < j
+        # of a species are formed from the running sum of the preceding particles (exclusive prefix sum)
+        for start, stop in particle_blocks(n_particles, n_timesteps, n_dimensions):
+            block_spectra = spectra(block_velocities(configuration, boxes, start, stop), fft_length)
+            block_species = species[start:stop]
+            for k in np.unique(block_species):
+                spectra_k = block_spectra[block_species == k]
+                preceding = np.cumsum(spectra_k, axis=0)
+                preceding[1:] = preceding[:-1]
+                preceding[0] = 0.0
+                preceding += species_spectra[k]
+                same_species_spectra[k] += np.sum(preceding * np.conj(spectra_k), axis=(0, 1))
+                species_spectra[k] += np.sum(spectra_k, axis=0)
+
         correlations = np.zeros((n_species, n_species, correlation_length))
         # Array for counting particle pairings
         correlation_count = np.zeros((n_species, n_species))
+        particles_per_species = np.bincount(species, minlength=n_species)
 
-        # Compute cross-correlations for each pair of particles in each spatial coordinate
-        for i in range(n_particles):
-            for j in range(i + 1, n_particles):
-                # Retrieve particle indices from the 'particles' dictionary and
-                # determine the relevant position in the 'correlations' matrices
-                k = elements.index(atoms_to_species[i])
-                l = elements.index(atoms_to_species[j])
-                # Check for the order of elements (ensures upper triangular matrix form & consistent order of operations)
-                if k <= l:
-                    correlation_temp = self.cross_correlation(velocities[i], velocities[j])
-                    correlations[k, l] += correlation_temp
-                    correlation_count[k, l] += 1
-                else:
-                    correlation_temp = self.cross_correlation(velocities[j], velocities[i])
-                    correlations[l, k] += correlation_temp
-                    correlation_count[l, k] += 1
+        # Pairs of different species (k < l) sum to the correlation of the species' total velocities
+        for k in range(n_species):
+            correlations[k, k] = spectrum_to_correlation(same_species_spectra[k], correlation_length, fft_length)
+            correlation_count[k, k] = particles_per_species[k] * (particles_per_species[k] - 1) / 2
+            for l in range(k + 1, n_species):
+                cross_spectrum = np.sum(species_spectra[k] * np.conj(species_spectra[l]), axis=0)
+                correlations[k, l] = spectrum_to_correlation(cross_spectrum, correlation_length, fft_length)
+                correlation_count[k, l] = particles_per_species[k] * particles_per_species[l]
 
         logger.information(str(time.time() - start_time) + " s")
 
@@ -295,7 +249,7 @@ class VelocityCrossCorrelations(PythonAlgorithm):
         for i in range(n_species):
             for j in range(i, n_species):
                 # Add folded correlations to the array passed to the workspace
-                yvals = np.append(yvals, self.fold_correlation(correlations[i, j]))
+                yvals = np.append(yvals, fold_correlation(correlations[i, j]))
 
         # Timesteps between coordinate positions
         step = float(self.getPropertyValue("Timestep"))
@@ -319,27 +273,6 @@ class VelocityCrossCorrelations(PythonAlgorithm):
         # Set output workspace to output_ws
         self.setProperty("OutputWorkspace", output_ws)
 
-    def cross_correlation(self, u, v):
-        # Returns cross-correlation of two 3-vectors
-        n = np.shape(v)[0]
-        norm = np.arange(np.ceil(n / 2.0), n + 1)
-        norm = np.append(norm, (np.arange(n / 2 + 1, n)[::-1]))
-        # Correlation in x
-        C = np.divide(np.correlate(u[:, 0], v[:, 0], "same"), norm)
-        # Correlation in y
-        C += np.divide(np.correlate(u[:, 1], v[:, 1], "same"), norm)
-        # Correlation in z
-        C += np.divide(np.correlate(u[:, 2], v[:, 2], "same"), norm)
-
-        return C
-
-    def fold_correlation(self, w):
-        # Folds an array with symmetrical values into half by averaging values around the centre
-        right_half = w[int(len(w) / 2) :]
-        left_half = w[: int(np.ceil(len(w) / 2.0))][::-1]
-
-        return (left_half + right_half) / 2.0
-
 
 # Subscribe algorithm to Mantid software
 AlgorithmFactory.subscribe(VelocityCrossCorrelations)
@@ -40,6 +40,7 @@ class PaalmanPingsMonteCarloAbsorption(DataProcessorAlgorithm):
     _height = None
     _isis_instrument = None
     _has_container = None
+    _shared_tracks = None
 
     # Sample variables
     _sample_angle = None
@@ -124,6 +125,13 @@ class PaalmanPingsMonteCarloAbsorption(DataProcessorAlgorithm):
             doc="Number of detector columns in the detector grid of the sparse instrument.",
         )
 
+        self.declareProperty(
+            name="SharedTracks",
+            defaultValue=False,
+            doc="Whether to calculate all four correction factors from a single set of tracks through the sample and container, "
+            "rather than from a separate simulation for each factor.",
+        )
+
         sparse_condition = EnabledWhenProperty("SparseInstrument", PropertyCriterion.IsNotDefault)
         self.setPropertySettings("NumberOfDetectorRows", sparse_condition)
         self.setPropertySettings("NumberOfDetectorColumns", sparse_condition)
@@ -393,6 +401,12 @@ class PaalmanPingsMonteCarloAbsorption(DataProcessorAlgorithm):
         self._sample_shape = input_wave_ws.sample().getShape()
         if input_wave_ws.sample().hasEnvironment():
             self._sample_env = input_wave_ws.sample().getEnvironment()
+
+        if self._has_can and self._shared_tracks:
+            self._output_ws = self._group_ws(self._calculate_from_shared_tracks(input_wave_ws))
+            self.setProperty("CorrectionsWorkspace", self._output_ws)
+            return
+
         # make sure there is no container defined at this point
         self._set_sample(input_wave_ws, ["Sample"])
         monte_carlo_alg = self.createChildAlgorithm("MonteCarloAbsorption", enableLogging=True, startProgress=0, endProgress=progess_steps)
@@ -450,6 +464,35 @@ class PaalmanPingsMonteCarloAbsorption(DataProcessorAlgorithm):
 
         self.setProperty("CorrectionsWorkspace", self._output_ws)
 
+    def _calculate_from_shared_tracks(self, input_wave_ws):
+        """
+        Calculates A_s,s, A_s,sc, A_c,sc and A_c,c in a single MonteCarloAbsorption run, tracing each
+        track through the sample and container once
+        :param input_wave_ws: the input workspace in wavelength
+        :return: the list of correction workspaces, in the order of the output group
+        """
+        self._set_sample(input_wave_ws, ["Sample", "Container"])
+        monte_carlo_alg = self.createChildAlgorithm("MonteCarloAbsorption", enableLogging=True, startProgress=0, endProgress=1.0)
+        self._set_algorithm_properties(monte_carlo_alg, self._monte_carlo_kwargs)
+        monte_carlo_alg.setProperty("InputWorkspace", input_wave_ws)
+        monte_carlo_alg.setProperty("CalculatePaalmanPingsFactors", True)
+        outputs = {
+            "OutputWorkspace": self._ass_ws_name,
+            "SampleContainerOutputWorkspace": self._assc_ws_name,
+            "ContainerSampleOutputWorkspace": self._acsc_ws_name,
+            "ContainerOutputWorkspace": self._acc_ws_name,
+        }
+        for prop_name, ws_name in outputs.items():
+            monte_carlo_alg.setProperty(prop_name, ws_name)
+        monte_carlo_alg.execute()
+
+        workspaces = []
+        for prop_name, ws_name in outputs.items():
+            ws = self._convert_from_wavelength(monte_carlo_alg.getProperty(prop_name).value)
+            mtd.addOrReplace(ws_name, ws)
+            workspaces.append(ws)
+        return workspaces
+
     def _set_beam(self, ws):
         set_beam_alg = self.createChildAlgorithm("SetBeam", enableLogging=False)
         set_beam_alg.setProperty("InputWorkspace", ws)
@@ -581,6 +624,7 @@ class PaalmanPingsMonteCarloAbsorption(DataProcessorAlgorithm):
             "NumberOfDetectorRows": self.getProperty("NumberOfDetectorRows").value,
             "NumberOfDetectorColumns": self.getProperty("NumberOfDetectorColumns").value,
         }
+        self._shared_tracks = self.getProperty("SharedTracks").value
 
         self._sample_unit = self._input_ws.getAxis(0).getUnit().unitID()
         if self._sample_unit == "dSpacing":
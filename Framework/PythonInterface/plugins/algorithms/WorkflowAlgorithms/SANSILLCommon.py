@@ -4,11 +4,14 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
-from mantid.simpleapi import CropToComponent, logger, mtd
+from mantid.simpleapi import CropToComponent, child_algorithms_of, logger, mtd
 from mantid.api import WorkspaceGroup, MatrixWorkspace
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from enum import IntEnum
 from math import fabs
 from os import path
+from time import perf_counter
 import re
 
 
@@ -347,3 +350,93 @@ def get_vertical_grouping_pattern(ws):
         logger.warning("Instruments other than D11, D22, and D33 are not yet supported for direct beam width fitting.")
         return
     return ",".join(["{}-{}".format(start, start + step - 1) for start in range(min_id, max_id, step)])
+
+
+class TaskGraph:
+    """
+    Runs a set of tasks, which may depend on the results of other tasks, in a thread pool.
+    Each task starts as soon as all the tasks it depends on have finished.
+    The time taken by each task is recorded in order to report the critical path,
+    i.e. the chain of dependent tasks which determined the total run time.
+    """
+
+    def __init__(self, parent=None):
+        """
+        @param parent: the algorithm running the tasks, simpleapi functions called by the tasks
+                       will create child algorithms of it
+        """
+        self._parent = parent
+        self._tasks = dict()  # name -> (function, names of the tasks it depends on)
+        self._times = dict()  # name -> (start, end)
+
+    def add(self, name, function, depends_on=()):
+        """
+        Adds a task to the graph
+        @param name: the unique name of the task
+        @param function: the function to run, it is called with the results of the tasks it depends on as arguments
+        @param depends_on: the names of the tasks that have to finish before this one, they must have been added already
+        """
+        if name in self._tasks:
+            raise ValueError(f"Task {name} has already been added.")
+        for dependency in depends_on:
+            if dependency not in self._tasks:
+                raise ValueError(f"Task {name} depends on {dependency}, which has not been added.")
+        self._tasks[name] = (function, tuple(depends_on))
+
+    def run(self, n_threads):
+        """
+        Runs all the tasks. When several tasks are ready to run, they are started in the order they were added.
+        @param n_threads: the maximum number of tasks to run at the same time
+        @return: a dictionary with the result of each task
+        """
+        results = dict()
+        waiting = dict(self._tasks)
+        running = dict()  # future -> task name
+        with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+            while waiting or running:
+                for name, (function, depends_on) in list(waiting.items()):
+                    if all(dependency in results for dependency in depends_on):
+                        args = [results[dependency] for dependency in depends_on]
+                        running[executor.submit(self._run_task, name, function, args)] = name
+                        del waiting[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+        return results
+
+    def _run_task(self, name, function, args):
+        with child_algorithms_of(self._parent) if self._parent else nullcontext():
+            start = perf_counter()
+            result = function(*args)
+            self._times[name] = (start, perf_counter())
+        return result
+
+    def critical_path(self):
+        """
+        Returns the chain of tasks ending with the last task to finish, where each task
+        is preceded by the task it depended on that finished last
+        @return: a list of (name, duration in seconds) tuples in the order of execution
+        """
+        if not self._times:
+            return []
+        name = max(self._times, key=lambda task: self._times[task][1])
+        path = []
+        while name:
+            start, end = self._times[name]
+            path.append((name, end - start))
+            depends_on = self._tasks[name][1]
+            name = max(depends_on, key=lambda task: self._times[task][1]) if depends_on else None
+        return path[::-1]
+
+    def report(self):
+        """Returns a summary of the run time with the timing of the tasks on the critical path"""
+        if not self._times:
+            return "No tasks have been run."
+        wall_time = max(end for _, end in self._times.values()) - min(start for start, _ in self._times.values())
+        total_time = sum(end - start for start, end in self._times.values())
+        lines = [
+            f"Ran {len(self._times)} tasks in {wall_time:.2f} s, the sum of the task run times is {total_time:.2f} s.",
+            "Critical path:",
+        ]
+        lines += [f"    {name}: {duration:.2f} s" for name, duration in self.critical_path()]
+        return "\n".join(lines)
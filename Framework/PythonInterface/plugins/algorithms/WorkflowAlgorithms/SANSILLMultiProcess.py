@@ -8,8 +8,10 @@ from SANSILLCommon import (
     AcqMode,
     add_correction_numors,
     create_name,
+    get_run_number,
     needs_loading,
     needs_processing,
+    TaskGraph,
 )
 from mantid.api import (
     mtd,
@@ -46,6 +48,7 @@ from mantid.simpleapi import (
     Transpose,
     UnGroupWorkspace,
 )
+import threading
 
 
 N_DISTANCES = 5  # maximum number of distinct distance configurations
@@ -68,6 +71,7 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
     name_axis = None  # TextAxis holding the sample names
     progress = None  # the global progress object
     n_reports = None  # the number of progress reports
+    loading_lock = None  # serialises loading the calibrants shared by the distances reduced concurrently
 
     def category(self):
         return "ILL\\SANS;ILL\\Auto"
@@ -314,6 +318,14 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
         )
         self.setPropertyGroup("StitchReferenceIndex", "Stitch Options")
 
+        self.declareProperty(
+            name="NumberOfThreads",
+            defaultValue=0,
+            validator=IntBoundedValidator(lower=0),
+            doc="The maximum number of wavelength and distance configurations to reduce concurrently. "
+            "If 0, all the configurations are reduced at the same time.",
+        )
+
         # ================================OUTPUT WORKSPACES================================#
 
         # This will be a group containing all the main and diagnostic outputs
@@ -537,6 +549,7 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
         self.name_axis = None
         self.progress = None
         self.n_reports = None
+        self.loading_lock = threading.Lock()
 
     def _set_rank(self):
         """Sets the actual rank of the reduction"""
@@ -596,45 +609,120 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
 
     # ================================PROCESSING ALL===============================#
 
-    def process_all_transmissions(self):
-        """Calculates all the transmissions"""
-        all_outputs = []
-        for i in range(self.lambda_rank):
-            transmissions = self.process_all_transmissions_at_lambda(i)
-            self.progress.report((i + 1) * self.n_samples, f"Calculated transmissions for wavelength index {i + 1}")
-            all_outputs.append(transmissions)
-        return all_outputs
-
-    def process_all_samples(self, transmissions):
-        """Reduces all the samples"""
-        all_outputs = []
-        for d in range(self.rank):
-            outputs = dict()
-            sample_ws = self.process_all_samples_at_distance(d, transmissions)
-            self.progress.report((d + 1) * self.n_samples, f"Reduced sample data at distance index {d + 1}")
-            outputs["RealSpace"] = sample_ws[0]
-            if len(sample_ws) > 1:
-                # if there is a 2nd output, it must be sensitivity
-                outputs["Sensitivity"] = sample_ws[1]
-            integrated_ws = self.integrate(d, sample_ws)
-            # set distribution to false since stitch doesn't deal with frequencies
-            self.set_distribution(integrated_ws, False)
-            outputs["IQ"] = integrated_ws[0]
-            if len(integrated_ws) > 1:
-                # if there is a second output from integration, it must be either the panels or the wedges
-                key = "IQP" if self.getProperty("OutputPanels").value else "IQW"
-                outputs[key] = integrated_ws[1]
-            all_outputs.append(outputs)
-        return all_outputs
-
-    def process_all_transmissions_at_lambda(self, i):
+    def process_all(self):
         """
-        Calculates transmissions at the given lambda index
+        Calculates all the transmissions and reduces all the samples.
+        The reductions at each wavelength and distance do not depend on each other, so they run concurrently.
+        The sample reductions wait for the transmissions, and an auxiliary workspace that is shared
+        between configurations is processed only once, by the configuration that would have processed it first.
         """
-        tr_dark_current_ws = self.process_tr_dark_current(i)
-        [tr_empty_beam_ws, tr_empty_beam_flux] = self.process_tr_empty_beam(i, tr_dark_current_ws)
-        tr_empty_can_ws = self.process_empty_can_tr(i, tr_dark_current_ws, tr_empty_beam_ws, tr_empty_beam_flux)
-        tr_sample_ws = self.process_sample_tr(i, tr_dark_current_ws, tr_empty_beam_ws, tr_empty_beam_flux)
+        graph = TaskGraph(parent=self)
+        producers = dict()  # auxiliary workspace name -> the task processing it
+
+        def add_auxiliary(name, function, depends_on, ws_name):
+            """Adds a task processing an auxiliary workspace, which waits for any other task producing the same workspace"""
+            if ws_name in producers:
+                depends_on = depends_on + [producers[ws_name]]
+            elif ws_name:
+                producers[ws_name] = name
+            graph.add(name, function, depends_on)
+
+        for i in range(self.lambda_rank):
+            w = f"W{i + 1}"
+            add_auxiliary(
+                "TrDarkCurrent" + w,
+                lambda *_, i=i: self.process_tr_dark_current(i),
+                [],
+                self.auxiliary_ws_name("TrDarkCurrentRuns", i, "DarkCurrent"),
+            )
+            add_auxiliary(
+                "TrEmptyBeam" + w,
+                lambda dark_current, *_, i=i: self.process_tr_empty_beam(i, dark_current),
+                ["TrDarkCurrent" + w],
+                self.auxiliary_ws_name("TrEmptyBeamRuns", i, "EmptyBeam"),
+            )
+            add_auxiliary(
+                "ContainerTr" + w,
+                lambda dark_current, empty_beam, *_, i=i: self.process_empty_can_tr(i, dark_current, *empty_beam),
+                ["TrDarkCurrent" + w, "TrEmptyBeam" + w],
+                self.auxiliary_ws_name("ContainerTrRuns", i, "Transmission"),
+            )
+            graph.add(
+                "SampleTr" + w,
+                lambda dark_current, empty_beam, i=i: self.process_sample_tr(i, dark_current, *empty_beam),
+                ["TrDarkCurrent" + w, "TrEmptyBeam" + w],
+            )
+            graph.add(
+                "Transmissions" + w,
+                lambda tr_sample, tr_empty_can, i=i: self.gather_transmissions(i, tr_sample, tr_empty_can),
+                ["SampleTr" + w, "ContainerTr" + w],
+            )
+        graph.add("Transmissions", lambda *transmissions: list(transmissions), [f"TransmissionsW{i + 1}" for i in range(self.lambda_rank)])
+
+        # The auxiliary workspaces at the distances are processed after those of the transmissions, so that
+        # the transmissions are processed with their own settings if they use the same runs
+        transmission_auxiliaries = [task for task in producers.values() if not task.startswith("ContainerTr")]
+        for d in range(self.rank):
+            dist = f"D{d + 1}"
+            add_auxiliary(
+                "DarkCurrent" + dist,
+                lambda *_, d=d: self.process_dark_current(d),
+                transmission_auxiliaries,
+                self.auxiliary_ws_name("DarkCurrentRuns", d, "DarkCurrent"),
+            )
+            add_auxiliary(
+                "EmptyBeam" + dist,
+                lambda dark_current, *_, d=d: self.process_empty_beam(d, dark_current),
+                ["DarkCurrent" + dist] + transmission_auxiliaries,
+                self.auxiliary_ws_name("EmptyBeamRuns", d, "EmptyBeam"),
+            )
+            add_auxiliary(
+                "Flux" + dist,
+                lambda dark_current, *_, d=d: self.process_flux(d, dark_current),
+                ["DarkCurrent" + dist] + transmission_auxiliaries,
+                self.auxiliary_ws_name("FluxRuns", d, "EmptyBeam"),
+            )
+            add_auxiliary(
+                "Container" + dist,
+                lambda dark_current, empty_beam, transmissions, *_, d=d: self.process_container(
+                    d, dark_current, empty_beam[0], transmissions
+                ),
+                ["DarkCurrent" + dist, "EmptyBeam" + dist, "Transmissions"],
+                self.auxiliary_ws_name("EmptyContainerRuns", d, "EmptyContainer"),
+            )
+            graph.add(
+                "Sample" + dist,
+                lambda dark_current, empty_beam, flux, empty_can, transmissions, d=d: self.process_sample_at_distance(
+                    d, dark_current, empty_beam, flux, empty_can, transmissions
+                ),
+                ["DarkCurrent" + dist, "EmptyBeam" + dist, "Flux" + dist, "Container" + dist, "Transmissions"],
+            )
+            # The sample names are taken from the first distance, so the others wait for it
+            graph.add(
+                "Integrate" + dist,
+                lambda sample_ws, *_, d=d: self.integrate_at_distance(d, sample_ws),
+                ["Sample" + dist] + (["IntegrateD1"] if d > 0 else []),
+            )
+
+        results = graph.run(self.get_number_of_threads())
+        self.log().notice(graph.report())
+        transmissions = results["Transmissions"]
+        samples = [results[f"IntegrateD{d + 1}"] for d in range(self.rank)]
+        return transmissions, samples
+
+    def get_number_of_threads(self):
+        """Returns the number of threads used to run the reductions at different configurations concurrently"""
+        n_threads = self.getProperty("NumberOfThreads").value
+        return n_threads if n_threads > 0 else self.rank + self.lambda_rank
+
+    def auxiliary_ws_name(self, prop, index, process_type):
+        """Returns the name of the auxiliary workspace processed from the given run property at the given index"""
+        runs = self.getPropertyValue(prop)
+        return get_run_number(runs.split(",")[index]) + "_" + process_type if runs else ""
+
+    def gather_transmissions(self, i, tr_sample_ws, tr_empty_can_ws):
+        """Returns the transmissions calculated at a wavelength"""
+        self.progress.reportIncrement(self.n_samples, f"Calculated transmissions for wavelength index {i + 1}")
         results = dict()
         if tr_sample_ws:
             results["SampleTransmission"] = tr_sample_ws
@@ -642,16 +730,33 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
             results["ContainerTransmission"] = tr_empty_can_ws
         return results
 
-    def process_all_samples_at_distance(self, d, transmissions):
+    def process_sample_at_distance(self, d, dark_current_ws, empty_beam, flux, empty_can_ws, transmissions):
         """
         Reduces all the samples at a given distance
         """
-        dark_current_ws = self.process_dark_current(d)
-        [empty_beam1_ws, empty_beam1_flux] = self.process_empty_beam(d, dark_current_ws)
-        [empty_beam2_ws, empty_beam2_flux] = self.process_flux(d, dark_current_ws)
-        empty_can_ws = self.process_container(d, dark_current_ws, empty_beam1_ws, transmissions)
+        [empty_beam1_ws, empty_beam1_flux] = empty_beam
+        [_, empty_beam2_flux] = flux
         actual_flux_ws = empty_beam2_flux if empty_beam2_flux else empty_beam1_flux
-        return self.process_sample(d, dark_current_ws, empty_beam1_ws, empty_can_ws, actual_flux_ws, transmissions)
+        sample_ws = self.process_sample(d, dark_current_ws, empty_beam1_ws, empty_can_ws, actual_flux_ws, transmissions)
+        self.progress.reportIncrement(self.n_samples, f"Reduced sample data at distance index {d + 1}")
+        return sample_ws
+
+    def integrate_at_distance(self, d, sample_ws):
+        """Integrates the samples reduced at a given distance"""
+        outputs = dict()
+        outputs["RealSpace"] = sample_ws[0]
+        if len(sample_ws) > 1:
+            # if there is a 2nd output, it must be sensitivity
+            outputs["Sensitivity"] = sample_ws[1]
+        integrated_ws = self.integrate(d, sample_ws)
+        # set distribution to false since stitch doesn't deal with frequencies
+        self.set_distribution(integrated_ws, False)
+        outputs["IQ"] = integrated_ws[0]
+        if len(integrated_ws) > 1:
+            # if there is a second output from integration, it must be either the panels or the wedges
+            key = "IQP" if self.getProperty("OutputPanels").value else "IQW"
+            outputs[key] = integrated_ws[1]
+        return outputs
 
     # ================================LOAD PROCESSED CALIBRANTS================================#
 
@@ -875,10 +980,11 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
         """Processes all the samples at the given distance"""
         runs = self.getPropertyValue(f"SampleRunsD{d + 1}")
         if runs:
-            [edge_mask_ws, beam_stop_mask_ws] = self.load_masks(d)
-            flat_field_ws = self.load_flat_field(d)
-            solvent_ws = self.load_solvent(d)
-            sens_ws = self.load_sensitivity(d)
+            with self.loading_lock:
+                [edge_mask_ws, beam_stop_mask_ws] = self.load_masks(d)
+                flat_field_ws = self.load_flat_field(d)
+                solvent_ws = self.load_solvent(d)
+                sens_ws = self.load_sensitivity(d)
             sample_tr_ws = transmissions[self.tr_index(d)]["SampleTransmission"] if transmissions else ""
             process = "Sample"
             [_, sample_ws] = needs_processing(runs, "Sample")
@@ -1165,8 +1271,7 @@ class SANSILLMultiProcess(DataProcessorAlgorithm):
     def PyExec(self):
         """Executes the algorithm"""
         self._setup_light()
-        transmissions = self.process_all_transmissions()
-        samples = self.process_all_samples(transmissions)
+        transmissions, samples = self.process_all()
         outputs = self.combine(samples)
         self.package(outputs, transmissions)
         self.progress.report(self.n_reports, "Combined and packaged reduced data")
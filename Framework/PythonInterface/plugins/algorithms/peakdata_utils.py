@@ -13,6 +13,10 @@ import numpy as np
 from scipy.stats import moment
 from mantid.geometry import RectangularDetector, GridDetector
 import re
+import threading
+from collections import Counter
+from time import perf_counter
+from joblib import Parallel, delayed
 from scipy.signal import convolve2d
 
 """
@@ -271,7 +275,7 @@ class PeakData:
         # focus and subtract background shell
         ws_bg_foc = self._focus_detids(self.detids[bg_shell_mask])
         scale = exec_simpleapi_alg(
-            "CreateSingleValuedWorkspace", DataValue=self.peak_mask.sum() / bg_shell_mask.sum(), OutputWorkspace="__scale"
+            "CreateSingleValuedWorkspace", DataValue=self.peak_mask.sum() / bg_shell_mask.sum(), OutputWorkspace=thread_ws_name("__scale")
         )
         exec_simpleapi_alg("Multiply", LHSWorkspace=ws_bg_foc, RHSWorkspace=scale, OutputWorkspace=ws_bg_foc)
         ws_pk_foc = self._focus_detids(self.detids[self.peak_mask])
@@ -298,7 +302,7 @@ class PeakData:
                 "GroupDetectors",
                 InputWorkspace=ws_roi,
                 WorkspaceIndexList=range(0, len(detids)),
-                OutputWorkspace=f"__foc{detids[0]}",
+                OutputWorkspace=thread_ws_name(f"__foc{detids[0]}"),
             )
             exec_simpleapi_alg("DeleteWorkspaces", WorkspaceList=[ws_roi, ws_roi_spec])
         else:
@@ -306,18 +310,29 @@ class PeakData:
                 "GroupDetectors",
                 InputWorkspace=self.ws,
                 DetectorList=",".join([str(id) for id in detids]),
-                OutputWorkspace=f"__foc{detids[0]}",
+                OutputWorkspace=thread_ws_name(f"__foc{detids[0]}"),
             )
         return ws_foc
 
     def get_roi_on_detector(self, detids):
         isort = np.argsort(detids.flatten())
         ws_roi = exec_simpleapi_alg(
-            "ExtractSpectra", InputWorkspace=self.ws, DetectorList=detids.flat[isort], OutputWorkspace=f"__roi{detids.flat[0]}"
+            "ExtractSpectra",
+            InputWorkspace=self.ws,
+            DetectorList=detids.flat[isort],
+            OutputWorkspace=thread_ws_name(f"__roi{detids.flat[0]}"),
         )
         return ws_roi, isort
 
 
+def thread_ws_name(name):
+    """
+    Append the id of the calling thread to a temporary workspace name so that peaks integrated concurrently
+    do not overwrite each other's workspaces in the ADS
+    """
+    return f"{name}_{threading.get_ident()}"
+
+
 def exec_simpleapi_alg(alg_name, **kwargs):
     alg = AlgorithmManager.create(alg_name)
     alg.initialize()
@@ -375,3 +390,55 @@ def get_kernel_shape(nrows, ncols, nbins):
     ncols_bg = max(1, ncols // 16)
     nbins_bg = max(1, nbins // 16)
     return (nrows + 2 * nrows_bg, ncols + 2 * ncols_bg, nbins + 2 * nbins_bg), (nrows_bg, ncols_bg, nbins_bg)
+
+
+class PeakIntegrationStatistics:
+    """
+    This class accumulates the time taken to integrate each peak and the number of peaks with each status
+    """
+
+    def __init__(self):
+        self.status_counts = Counter()
+        self.npeaks = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def add(self, status, elapsed):
+        self.status_counts[status] += 1
+        self.npeaks += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def summary(self):
+        mean_time = self.total_time / self.npeaks if self.npeaks else 0.0
+        lines = [f"Integrated {self.npeaks} peaks (mean {1e3 * mean_time:.2f} ms, max {1e3 * self.max_time:.2f} ms per peak)"]
+        # status is an Enum for peaks that were integrated (None if e.g. peak outside data range)
+        lines.extend(f"{count} x {getattr(status, 'value', 'Not integrated')}" for status, count in self.status_counts.items())
+        return "\n".join(lines)
+
+
+def integrate_peaks_in_parallel(integrate_func, items, nthreads=0, prog_reporter=None, message="Integrating"):
+    """
+    Calls integrate_func on each item using a pool of threads (the scipy/numpy routines and Mantid algorithms
+    doing the work release the GIL). integrate_func must not modify shared state - the results are yielded in
+    the same order as items so that they can be applied to the workspaces in the calling thread.
+    :param integrate_func: function called as integrate_func(item)
+    :param items: iterable of items (e.g. peak indices) to integrate
+    :param nthreads: number of threads to use, 0 uses all but one of the available cores
+    :param prog_reporter: optional Progress object reported once for each item
+    :param message: message passed to the progress reporter
+    :return: generator of (item, result, elapsed time in seconds)
+    """
+
+    def timed_integrate(item):
+        start = perf_counter()
+        result = integrate_func(item)
+        return item, result, perf_counter() - start
+
+    n_jobs = nthreads if nthreads > 0 else -2
+    for item, result, elapsed in Parallel(n_jobs=n_jobs, prefer="threads", return_as="generator")(
+        delayed(timed_integrate)(item) for item in items
+    ):
+        if prog_reporter is not None:
+            prog_reporter.report(message)
+        yield item, result, elapsed
@@ -0,0 +1,144 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Shared helpers for the algorithms that compute velocity correlations from nMoldyn trajectory files
+(VelocityAutoCorrelations and VelocityCrossCorrelations).
+
+The trajectory is never held in memory as a whole: particles are streamed from the file in blocks,
+unwrapped and differentiated with array operations, and reduced immediately into per-species
+Fourier-space accumulators. Correlations are evaluated with real FFTs, which reproduce the
+``numpy.correlate(u, v, "same")`` convention previously used particle by particle.
+"""
+
+import re
+
+import numpy as np
+from scipy import fft
+
+# Upper bound on the memory used by a block of particle trajectories (bytes)
+DEFAULT_BLOCK_MEMORY = 256 * 1024**2
+# Number of float64 copies of a block held at once while computing velocities and spectra
+_BLOCK_COPIES = 8
+
+
+def read_particle_species(trajectory):
+    """
+    Parse the particle description of an nMoldyn trajectory.
+
+    :param trajectory: An open netcdf trajectory file
+    :return: (elements, atoms_to_species) where elements lists the species in order of first
+             appearance and atoms_to_species maps a particle index onto its species
+    """
+    # The description is stored as an array of single characters
+    particle_id = b"".join(trajectory.variables["description"][:]).decode("UTF-8")
+    atoms_to_species = {}
+    elements = []
+    for atom in re.findall(r"A\('[a-z]+\d+',\d+", particle_id):
+        key = int(re.findall(r"\d+", re.findall(r"',\d+", atom)[0])[0])
+        element = str(re.findall(r"[a-z]+", atom)[0])
+        if element not in elements:
+            elements.append(element)
+        atoms_to_species[key] = element
+    return elements, atoms_to_species
+
+
+def species_indices(elements, atoms_to_species, n_particles):
+    """
+    :return: An integer array giving the position in elements of the species of every particle
+    """
+    lookup = {element: index for index, element in enumerate(elements)}
+    return np.array([lookup[atoms_to_species[i]] for i in range(n_particles)], dtype=int)
+
+
+def particle_blocks(n_particles, n_timesteps, n_dimensions, memory_limit=DEFAULT_BLOCK_MEMORY):
+    """
+    Split the particle range into contiguous blocks whose trajectories fit within memory_limit.
+
+    :return: A list of (start, stop) tuples
+    """
+    bytes_per_particle = n_timesteps * n_dimensions * np.dtype(np.float64).itemsize * _BLOCK_COPIES
+    block_size = max(1, int(memory_limit // max(bytes_per_particle, 1)))
+    return [(start, min(start + block_size, n_particles)) for start in range(0, n_particles, block_size)]
+
+
+def box_tensors(trajectory, n_timesteps):
+    """
+    :return: The simulation box for each timestep reshaped into 3x3 tensors. Shape: timesteps x 3 x 3
+    """
+    return np.asarray(trajectory.variables["box_size"][:n_timesteps], dtype=np.float64).reshape((n_timesteps, 3, 3))
+
+
+def block_velocities(configuration, boxes, start, stop):
+    """
+    Read the trajectories of particles [start, stop) and compute their unwrapped velocities.
+
+    The velocity at step j is the average of the minimum-image displacements j -> j+1 and
+    j+1 -> j+2 in scaled coordinates (assumes an orthogonal simulation box), transformed back to
+    Cartesian coordinates using the box at step j+1. The final step is left as zero.
+
+    :param configuration: The netcdf configuration variable. Shape: timesteps x particles x dimensions
+    :param boxes: Box tensors as returned by box_tensors
+    :return: Velocities with shape (stop - start) x (timesteps - 1) x dimensions
+    """
+    # Scaled coordinates, dividing each dimension by the box length along it
+    coords = configuration[:, start:stop, :] / np.diagonal(boxes, axis1=1, axis2=2)[:, np.newaxis, :]
+    n_timesteps = coords.shape[0]
+    # Minimum image displacement between consecutive frames
+    displacement = np.diff(coords, axis=0)
+    displacement -= np.round(displacement)
+    scaled_velocities = np.zeros((n_timesteps - 1,) + coords.shape[1:])
+    scaled_velocities[:-1] = (displacement[:-1] + displacement[1:]) / 2.0
+    # Back to Cartesian coordinates, particles first
+    return np.einsum("tij,tpj->pti", boxes[1:], scaled_velocities)
+
+
+def padded_fft_length(n):
+    """
+    :return: FFT length that avoids circular wrap-around when correlating sequences of length n
+    """
+    return fft.next_fast_len(2 * n - 1, real=True)
+
+
+def spectra(velocities, fft_length):
+    """
+    :param velocities: Array of shape particles x timesteps x dimensions
+    :return: Real FFT along the time axis, shape particles x dimensions x frequencies
+    """
+    return fft.rfft(np.swapaxes(velocities, 1, 2), n=fft_length, axis=-1, workers=-1)
+
+
+def correlation_norm(n):
+    """
+    :return: Normalisation applied to a correlation of length n
+    """
+    norm = np.arange(np.ceil(n / 2.0), n + 1)
+    return np.append(norm, (np.arange(n / 2 + 1, n)[::-1]))
+
+
+def spectrum_to_correlation(cross_spectrum, n, fft_length):
+    """
+    Convert a cross power spectrum, summed over dimensions, into a normalised correlation matching
+    the "same" mode of numpy.correlate.
+
+    :param cross_spectrum: Product F(u) * conj(F(v)) of the real FFTs of two sequences of length n
+    :param n: The length of the original sequences
+    :param fft_length: The padded transform length used to compute the spectra
+    :return: The normalised correlation of length n
+    """
+    circular = fft.irfft(cross_spectrum, n=fft_length, axis=-1)
+    # "same" mode keeps lags -(n // 2) ... n - 1 - n // 2
+    lags = np.arange(n) - n // 2
+    return circular[..., lags % fft_length] / correlation_norm(n)
+
+
+def fold_correlation(w):
+    """
+    Folds an array with symmetrical values into half by averaging values around the centre
+    """
+    right_half = w[len(w) // 2 :]
+    left_half = w[: int(np.ceil(len(w) / 2.0))][::-1]
+    return (left_half + right_half) / 2.0
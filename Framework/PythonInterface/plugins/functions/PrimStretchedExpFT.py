@@ -18,6 +18,9 @@ from StretchedExpFTHelper import surrogate, function1Dcommon
 
 
 class PrimStretchedExpFT(IFunction1D):
+    # divide the natural energy width by this value
+    refine_factor = 16
+
     # pylint: disable=super-on-old-class
     def __init__(self):
         super(self.__class__, self).__init__()
@@ -56,10 +59,21 @@ class PrimStretchedExpFT(IFunction1D):
         :param optparms: alternate list of function parameters
         :return: P(bin_boundaries[i+1])- P(bin_boundaries[i]), the difference of the primitive
         """
-        rf = 16
-        parms, de, energies, fourier = function1Dcommon(self, xvals, rf=rf, **optparms)
+        parms, de, energies, fourier = function1Dcommon(self, xvals, refine_factor=self.refine_factor, **optparms)
         if parms is None:
             return fourier  # return zeros if parameters not valid
+        return self.evaluate(xvals, parms, de, energies, fourier)
+
+    def evaluate(self, xvals, parms, de, energies, fourier):
+        """Integrate the Fourier transform within each energy bin
+        :param xvals: list of values where to evaluate the function
+        :param parms: function parameters
+        :param de: energy width of the refined grid
+        :param energies: energies of the refined grid
+        :param fourier: normalized Fourier transform evaluated at energies
+        :return: P(bin_boundaries[i+1])- P(bin_boundaries[i]), the difference of the primitive
+        """
+        rf = self.refine_factor
         denergies = (energies[-1] - energies[0]) / (len(energies) - 1)
         # Find bin boundaries
         boundaries = (xvals[1:] + xvals[:-1]) / 2  # internal bin boundaries
@@ -18,6 +18,9 @@ from StretchedExpFTHelper import surrogate, function1Dcommon
 
 
 class StretchedExpFT(IFunction1D):
+    # divide the natural energy width by this value
+    refine_factor = 16
+
     # pylint: disable=super-on-old-class
     def __init__(self):
         super(self.__class__, self).__init__()
@@ -47,11 +50,20 @@ class StretchedExpFT(IFunction1D):
             F(E) is normalized:
                 \int_{-infty}^{infty} dE F(E) = 1
         """
-        parms, de, energies, fourier = function1Dcommon(self, xvals, **optparms)
+        parms, de, energies, fourier = function1Dcommon(self, xvals, refine_factor=self.refine_factor, **optparms)
         if parms is None:
             return fourier  # return zeros if parameters not valid
-        transform = parms["Height"] * np.interp(xvals - parms["Centre"], energies, fourier)
-        return transform
+        return self.evaluate(xvals, parms, de, energies, fourier)
+
+    def evaluate(self, xvals, parms, de, energies, fourier):
+        """Interpolate the Fourier transform onto xvals
+        :param xvals: list of values where to evaluate the function
+        :param parms: function parameters
+        :param de: energy width of the refined grid
+        :param energies: energies of the refined grid
+        :param fourier: normalized Fourier transform evaluated at energies
+        """
+        return parms["Height"] * np.interp(xvals - parms["Centre"], energies, fourier)
 
     @surrogate
     def fillJacobian(self, xvals, jacobian, partials):
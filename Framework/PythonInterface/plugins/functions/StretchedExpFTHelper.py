@@ -14,11 +14,14 @@ This module provides functionality common to classes StretchedExpFT and PrimStre
 """
 
 import copy
-from scipy.fftpack import fft, fftfreq
+from functools import lru_cache
+from scipy.fft import rfft, fftfreq
 from scipy.special import gamma
 from scipy import constants
 import numpy as np
 
+planck_constant = constants.Planck / constants.e * 1e15  # meV*psec
+
 
 def fillJacobian(function, xvals, jacobian, partials):
     """Fill the jacobian object with the dictionary of partial derivatives
@@ -28,17 +31,10 @@ def fillJacobian(function, xvals, jacobian, partials):
     :param partials: dictionary with partial derivates with respect to the
     fitting parameters
     """
-    # Return zero derivatives if empty object
-    if not partials:
-        for ip in range(len(function._parmList)):
-            for ix in range(len(xvals)):
-                jacobian.set(ix, ip, 0.0)
-    else:
-        for ip in range(len(function._parmList)):
-            name = function._parmList[ip]
-            pd = partials[name]
-            for ix in range(len(xvals)):
-                jacobian.set(ix, ip, pd[ix])
+    for ip, name in enumerate(function._parmList):
+        # Return zero derivatives if empty object
+        pd = partials[name] if partials else np.zeros(len(xvals))
+        jacobian.setColumn(ip, np.ascontiguousarray(pd, dtype=float))
 
 
 def functionDeriv1D(function, xvals, jacobian):
@@ -53,18 +49,25 @@ def functionDeriv1D(function, xvals, jacobian):
     if not p:
         function.fillJacobian(xvals, jacobian, {})
         return
-    f0 = function.function1D(xvals)
     # Add these quantities to original parameter values
     dp = {"Tau": 1.0, "Beta": 0.01, "Centre": 0.0001}  # change by 1ps  # change by 0.1 micro-eV
+    perturbed = {}
     for name in dp.keys():
         pp = copy.copy(p)
         pp[name] += dp[name]
-        partials[name] = (function.function1D(xvals, **pp) - f0) / dp[name]
+        perturbed[name] = pp
+    # Only Tau and Beta change the shape of the transform, so evaluate the
+    # original and these two parameter sets with a single batched FFT
+    de, energies, fouriers = transformBatch(xvals, [p, perturbed["Tau"], perturbed["Beta"]], refine_factor=function.refine_factor)
+    f0 = function.evaluate(xvals, p, de, energies, fouriers[0])
+    partials["Tau"] = (function.evaluate(xvals, perturbed["Tau"], de, energies, fouriers[1]) - f0) / dp["Tau"]
+    partials["Beta"] = (function.evaluate(xvals, perturbed["Beta"], de, energies, fouriers[2]) - f0) / dp["Beta"]
+    partials["Centre"] = (function.evaluate(xvals, perturbed["Centre"], de, energies, fouriers[0]) - f0) / dp["Centre"]
     # Analytical derivative for Height parameter. Note we don't use
     # f0/p['Height'] in case p['Height'] was set to zero by the user
     pp = copy.copy(p)
     pp["Height"] = 1.0
-    partials["Height"] = function.function1D(xvals, **pp)
+    partials["Height"] = function.evaluate(xvals, pp, de, energies, fouriers[0])
     function.fillJacobian(xvals, jacobian, partials)
 
 
@@ -115,6 +118,70 @@ def surrogate(method):
     return surrogates[method.__name__]
 
 
+@lru_cache(maxsize=32)
+def _refinedGrid(ne, first, last, erange, refine_factor):
+    """Time and energy grids for the Fourier transform. Cached, as they only depend on the extent of the energy domain
+    :return: energy width, number of time points per sign, absolute sampled times, and energies in increasing order
+    """
+    # energy spacing. Assumed xvals is a single-segment grid
+    # of increasing energy values
+    de = (last - first) / (refine_factor * (ne - 1))
+    dt = 0.5 * planck_constant / erange  # spacing in time
+    tmax = planck_constant / de  # maximum reciprocal time
+    # round to an upper power of two
+    nt = 2 ** (1 + int(np.log(tmax / dt) / np.log(2)))
+    sampled_times = np.abs(dt * np.arange(-nt, nt))
+    # Find energy values corresponding to the fourier values
+    energies = planck_constant * fftfreq(2 * nt, d=dt)  # standard ordering
+    energies = np.concatenate([energies[nt:], energies[:nt]])  # increasing ordering
+    sampled_times.flags.writeable = False
+    energies.flags.writeable = False
+    return de, nt, sampled_times, energies
+
+
+def refinedGrid(xvals, refine_factor=16):
+    """Time and energy grids used to evaluate the Fourier transform over xvals
+    :param xvals: energy domain
+    :param refine_factor: divide the natural energy width by this value
+    :return: energy width, number of time points per sign, absolute sampled times, and energies in increasing order
+    """
+    return _refinedGrid(len(xvals), float(xvals[0]), float(xvals[-1]), float(2 * np.max(np.abs(xvals))), refine_factor)
+
+
+def symmetricFourier(signals, nt):
+    """Absolute value of the real part of the Fourier transform of each row of signals, normalized to its
+    first element and ordered by increasing energy
+    :param signals: array of shape (number of signals, 2 * nt) sampled at the times given by refinedGrid
+    :param nt: number of time points per sign
+    :return: array of transforms with the same shape as signals
+    """
+    # The real part of the transform of a real signal is symmetric, so only half of it has to be computed
+    fourier = np.abs(rfft(signals, axis=-1).real)
+    fourier /= fourier[:, :1]  # set maximum to unity
+    # symmetrize to negative energies
+    return np.concatenate([fourier[:, nt:0:-1], fourier[:, :nt]], axis=1)  # increasing ordering
+
+
+def transformBatch(xvals, parameter_sets, refine_factor=16):
+    """Fourier transform of the symmetrized stretched exponential for several parameter sets at once
+    :param xvals: energy domain
+    :param parameter_sets: list of dictionaries containing at least Tau and Beta
+    :param refine_factor: divide the natural energy width by this value
+    :return: energy width, energies, and function values with one row per parameter set
+    """
+    de, nt, sampled_times, energies = refinedGrid(xvals, refine_factor)
+    tau = np.array([p["Tau"] for p in parameter_sets])[:, np.newaxis]
+    beta = np.array([p["Beta"] for p in parameter_sets])[:, np.newaxis]
+    decay = np.exp(-((sampled_times / tau) ** beta))
+    # The Fourier transform introduces an extra factor exp(i*pi*E/de),
+    # which amounts to alternating sign every time E increases by de,
+    # the energy bin width. Thus, we take the absolute value
+    fourier = symmetricFourier(decay, nt)
+    # Normalize the integral in energies to unity
+    fourier *= 2 * tau * gamma(1.0 / beta) / (beta * planck_constant)
+    return de, energies, fourier
+
+
 def function1Dcommon(function, xvals, refine_factor=16, **optparms):
     """Fourier transform of the symmetrized stretched exponential
     :param function: instance of StretchedExpFT or PrimStretchedExpFT
@@ -123,7 +190,6 @@ def function1Dcommon(function, xvals, refine_factor=16, **optparms):
     :param optparms: optional parameters used when evaluating the numerical derivative
     :return: parameters, energy width, energies, and function values
     """
-    planck_constant = constants.Planck / constants.e * 1e15  # meV*psec
     p = function.validateParams()
     if p is None:
         # return zeros if parameters not valid
@@ -132,28 +198,5 @@ def function1Dcommon(function, xvals, refine_factor=16, **optparms):
     if optparms:
         for name in optparms.keys():
             p[name] = optparms[name]
-
-    ne = len(xvals)
-    # energy spacing. Assumed xvals is a single-segment grid
-    # of increasing energy values
-    de = (xvals[-1] - xvals[0]) / (refine_factor * (ne - 1))
-    erange = 2 * max(abs(xvals))
-    dt = 0.5 * planck_constant / erange  # spacing in time
-    tmax = planck_constant / de  # maximum reciprocal time
-    # round to an upper power of two
-    nt = 2 ** (1 + int(np.log(tmax / dt) / np.log(2)))
-    sampled_times = dt * np.arange(-nt, nt)
-    decay = np.exp(-((np.abs(sampled_times) / p["Tau"]) ** p["Beta"]))
-    # The Fourier transform introduces an extra factor exp(i*pi*E/de),
-    # which amounts to alternating sign every time E increases by de,
-    # the energy bin width. Thus, we take the absolute value
-    fourier = np.abs(fft(decay).real)  # notice the reverse of decay array
-    fourier /= fourier[0]  # set maximum to unity
-    # Normalize the integral in energies to unity
-    fourier *= 2 * p["Tau"] * gamma(1.0 / p["Beta"]) / (p["Beta"] * planck_constant)
-    # symmetrize to negative energies
-    fourier = np.concatenate([fourier[nt:], fourier[:nt]])  # increasing ordering
-    # Find energy values corresponding to the fourier values
-    energies = planck_constant * fftfreq(2 * nt, d=dt)  # standard ordering
-    energies = np.concatenate([energies[nt:], energies[:nt]])  # increasing ordering
-    return p, de, energies, fourier
+    de, energies, fourier = transformBatch(xvals, [p], refine_factor=refine_factor)
+    return p, de, energies, fourier[0]
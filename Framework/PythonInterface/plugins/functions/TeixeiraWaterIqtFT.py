@@ -8,11 +8,10 @@
 import numpy as np
 
 from mantid.api import IFunction1D, FunctionFactory
-from scipy import constants
-from scipy.fftpack import fft, fftfreq
 from scipy.special import spherical_jn
 import copy
 
+from StretchedExpFTHelper import planck_constant, refinedGrid, symmetricFourier
 from TeixeiraWaterIqtHelper import functionTeixeiraWaterIQT
 
 
@@ -51,31 +50,25 @@ class TeixeiraWaterIqtFT(IFunction1D):
             for name in optparms.keys():
                 p[name] = optparms[name]
 
-        amp = p["Amp"]
-        tau1 = p["Tau1"]
-        gamma = p["Gamma"]
+        energies, fourier = self._transformBatch(xvals, [p])
+        return np.interp(xvals, energies, fourier[0])
+
+    def _transformBatch(self, xvals, parameter_sets):
+        """Fourier transform of I(Q,t) for several parameter sets with a single batched FFT
+        :param xvals: energy domain
+        :param parameter_sets: list of parameter dictionaries
+        :return: energies in increasing order, and transforms with one row per parameter set
+        """
+        amp, tau1, gamma = (np.array([p[name] for p in parameter_sets])[:, np.newaxis] for name in self._parmList)
 
         q_value = self.getAttributeValue("Q")
         radius = self.getAttributeValue("a")
 
-        planck_constant = constants.Planck / constants.e * 1e15
-
-        ne = len(xvals)
-
-        de = (xvals[-1] - xvals[0]) / (16 * (ne - 1))
-        tmax = planck_constant / de
-
-        erange = 2 * max(abs(xvals))
-        dt = 0.5 * planck_constant / erange
-
-        nt = 2 ** (1 + int(np.log(tmax / dt) / np.log(2)))
-        sampled_times = dt * np.arange(-nt, nt)
-
-        iqt = functionTeixeiraWaterIQT(amp, tau1, gamma, q_value, radius, np.abs(sampled_times))
+        _, nt, sampled_times, energies = refinedGrid(xvals)
 
-        fourier = np.abs(fft(iqt).real)
+        iqt = functionTeixeiraWaterIQT(amp, tau1, gamma, q_value, radius, sampled_times)
 
-        fourier /= fourier[0]
+        fourier = symmetricFourier(iqt, nt)
 
         qr = q_value * radius
         j0 = spherical_jn(0, qr)
@@ -90,24 +83,12 @@ class TeixeiraWaterIqtFT(IFunction1D):
 
         fourier *= 2 * total_norm
 
-        fourier = np.concatenate([fourier[nt:], fourier[:nt]])
-
-        energies = planck_constant * fftfreq(2 * nt, d=dt)
-        energies = np.concatenate([energies[nt:], energies[:nt]])
-
-        return np.interp(xvals, energies, fourier)
+        return energies, fourier
 
     def fillJacobian(self, xvals, jacobian, partials):
-        if not partials:
-            for ip in range(len(self._parmList)):
-                for ix in range(len(xvals)):
-                    jacobian.set(ix, ip, 0.0)
-        else:
-            for ip in range(len(self._parmList)):
-                name = self._parmList[ip]
-                pd = partials[name]
-                for ix in range(len(xvals)):
-                    jacobian.set(ix, ip, pd[ix])
+        for ip, name in enumerate(self._parmList):
+            pd = partials[name] if partials else np.zeros(len(xvals))
+            jacobian.setColumn(ip, np.ascontiguousarray(pd, dtype=float))
 
     def functionDeriv1D(self, xvals, jacobian):
         partials = {}
@@ -116,17 +97,25 @@ class TeixeiraWaterIqtFT(IFunction1D):
             self.fillJacobian(xvals, jacobian, {})
             return
 
-        f0 = self.function1D(xvals)
-
         dp = {"Tau1": 1.0, "Gamma": 0.01}
+        parameter_sets = [p]
         for name in dp.keys():
             pp = copy.copy(p)
             pp[name] += dp[name]
-            partials[name] = (self.function1D(xvals, **pp) - f0) / dp[name]
+            parameter_sets.append(pp)
 
+        # Analytical derivative for the amplitude, which only scales the function
         pp = copy.copy(p)
         pp["Amp"] = 1.0
-        partials["Amp"] = self.function1D(xvals, **pp)
+        parameter_sets.append(pp)
+
+        energies, fourier = self._transformBatch(xvals, parameter_sets)
+        values = [np.interp(xvals, energies, row) for row in fourier]
+
+        f0 = values[0]
+        for index, name in enumerate(dp.keys(), start=1):
+            partials[name] = (values[index] - f0) / dp[name]
+        partials["Amp"] = values[-1]
 
         self.fillJacobian(xvals, jacobian, partials)
 
@@ -113,6 +113,27 @@ class SimpleAPITest(unittest.TestCase):
         simpleapi.CreateWorkspace(data, data, OutputWorkspace=wsname, NSpec=1, UnitX="Wavelength", EnableLogging=False)
         self.assertTrue(wsname in mtd)
 
+    def test_prepared_algorithm_can_be_called_repeatedly(self):
+        data = [1.0, 2.0, 3.0, 4.0, 5.0]
+        create = simpleapi.PreparedAlgorithm("CreateWorkspace", NSpec=1, UnitX="Wavelength")
+        for i in range(3):
+            wsname = "test_prepared_algorithm_{}".format(i)
+            create(DataX=data, DataY=[y * i for y in data], OutputWorkspace=wsname)
+            self.assertTrue(wsname in mtd)
+            self.assertEqual(mtd[wsname].readY(0)[1], 2.0 * i)
+            self.assertEqual(mtd[wsname].getAxis(0).getUnit().unitID(), "Wavelength")
+
+    def test_prepared_algorithm_uses_lhs_as_output_workspace(self):
+        create = simpleapi.PreparedAlgorithm("CreateSingleValuedWorkspace")
+        prepared_output = create(DataValue=3.0)
+        self.assertTrue("prepared_output" in mtd)
+        self.assertEqual(prepared_output.readY(0)[0], 3.0)
+
+    def test_prepared_algorithm_raises_RuntimeError_with_algorithm_name(self):
+        load = simpleapi.PreparedAlgorithm("LoadEmptyInstrument")
+        with self.assertRaisesRegex(RuntimeError, "LoadEmptyInstrument-v1"):
+            load(InstrumentName="NotAnInstrument", OutputWorkspace="ws")
+
     def test_function_call_raises_ValueError_when_passed_args_with_invalid_values(self):
         for func_call in (simpleapi.LoadNexus, simpleapi.Load):
             self.assertRaises(ValueError, func_call, "DoesNotExist")
@@ -388,6 +409,28 @@ class SimpleAPITest(unittest.TestCase):
         top_level.PyExec()
         self._is_initialized_test(top_level.alg, 1, expected_class=IAlgorithm, expected_child=True)
 
+    def test_create_algorithm_produces_child_in_thread_started_by_PyExec_within_child_algorithms_of(self):
+        from threading import Thread
+
+        class TestAlg(PythonAlgorithm):
+            def PyInit(self):
+                pass
+
+            def PyExec(self):
+                def create_in_context():
+                    with simpleapi.child_algorithms_of(self):
+                        self.alg_in_context = simpleapi._create_algorithm_object("Rebin")
+                    self.alg_after_context = simpleapi._create_algorithm_object("Rebin")
+
+                thread = Thread(target=create_in_context)
+                thread.start()
+                thread.join()
+
+        top_level = TestAlg()
+        top_level.PyExec()
+        self._is_initialized_test(top_level.alg_in_context, 1, expected_class=IAlgorithm, expected_child=True)
+        self._is_initialized_test(top_level.alg_after_context, 1, expected_class=IAlgorithm, expected_child=False)
+
     def _is_initialized_test(self, alg, version, expected_class, expected_child):
         self.assertTrue(alg.isInitialized())
         self.assertEqual(expected_child, alg.isChild())
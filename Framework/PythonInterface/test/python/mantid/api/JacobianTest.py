@@ -5,13 +5,37 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
-from mantid.api import Jacobian
+
+import numpy as np
+
+from mantid.api import FunctionDomain1DVector, FunctionFactory, Jacobian
 
 
 class JacobianTest(unittest.TestCase):
     def test_class_has_expected_attrs(self):
         self.assertTrue(hasattr(Jacobian, "set"), "No set method found on Jacobian class")
         self.assertTrue(hasattr(Jacobian, "get"), "No get method found on Jacobian class")
+        self.assertTrue(hasattr(Jacobian, "setColumn"), "No setColumn method found on Jacobian class")
+
+    def test_setColumn_sets_values_of_all_data_points(self):
+        function = FunctionFactory.createInitialized("name=LinearBackground,A0=1,A1=2")
+        jacobian = function.functionDeriv(FunctionDomain1DVector(np.arange(4.0)))
+        derivatives = np.array([0.5, -1.5, 2.5, 4.0])
+
+        jacobian.setColumn(1, derivatives)
+
+        np.testing.assert_array_equal([jacobian.get(iy, 1) for iy in range(4)], derivatives)
+        # the other parameters are unchanged
+        np.testing.assert_array_equal([jacobian.get(iy, 0) for iy in range(4)], np.ones(4))
+
+    def test_setColumn_raises_for_indices_out_of_range(self):
+        function = FunctionFactory.createInitialized("name=LinearBackground,A0=1,A1=2")
+        jacobian = function.functionDeriv(FunctionDomain1DVector(np.arange(4.0)))
+
+        self.assertRaises(IndexError, jacobian.setColumn, 2, np.zeros(4))
+        self.assertRaises(IndexError, jacobian.setColumn, 0, np.zeros(5))
+        # nothing is written when the values do not fit
+        np.testing.assert_array_equal([jacobian.get(iy, 0) for iy in range(4)], np.ones(4))
 
 
 if __name__ == "__main__":
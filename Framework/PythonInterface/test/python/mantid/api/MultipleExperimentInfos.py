@@ -27,6 +27,25 @@ class MultipleExperimentInfoTest(unittest.TestCase):
         md = CreateMDWorkspace(Dimensions=1, Extents="-1,1", Names="A", Units="U")
         md.addExperimentInfo(ws1)
 
+    def test_add_experiment_info_of_another_workspace_copies_it(self):
+        ws1 = CreateSampleWorkspace()
+        ws1.mutableRun().addProperty("monitor", 100, True)
+        md1 = CreateMDWorkspace(Dimensions=1, Extents="-1,1", Names="A", Units="U")
+        md1.addExperimentInfo(ws1)
+        md2 = CreateMDWorkspace(Dimensions=1, Extents="-1,1", Names="A", Units="U")
+
+        md2.addExperimentInfo(md1.getExperimentInfo(0))
+        md2.getExperimentInfo(0).mutableRun().addProperty("monitor", 200, True)
+
+        self.assertEqual(1, md2.getNumExperimentInfo())
+        self.assertEqual(100, md1.getExperimentInfo(0).run().getProperty("monitor").value)
+        self.assertEqual(200, md2.getExperimentInfo(0).run().getProperty("monitor").value)
+
+    def test_add_experiment_info_of_incorrect_type_raises(self):
+        md = CreateMDWorkspace(Dimensions=1, Extents="-1,1", Names="A", Units="U")
+
+        self.assertRaises(ValueError, md.addExperimentInfo, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
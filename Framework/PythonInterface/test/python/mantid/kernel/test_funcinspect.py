@@ -51,6 +51,20 @@ class FuncInspectTest(unittest.TestCase):
         self.assertEqual(len(a[1]), 1)
         self.assertEqual(a[1][0], "a")
 
+    def test_lhs_info_is_consistent_when_called_repeatedly_from_same_location(self):
+        for _ in range(3):
+            n, names = self._function_returns_lhs_info()
+            self.assertEqual(n, 2)
+            self.assertEqual(names, ("n", "names"))
+            x = self._function_returns_lhs_info()
+            self.assertEqual(x, (1, ("x",)))
+
+    def test_lhs_info_cached_result_cannot_be_modified_by_caller(self):
+        for _ in range(2):
+            a, b = c, d = self._function_returns_lhs_info()
+            self.assertEqual(b, (["a", "b"], ["c", "d"]))
+            b[0].append("modified")
+
     @classmethod
     def _function_returns_lhs_info(cls, **kwargs):
         n_outputs, var_names = lhs_info("both")
@@ -9,6 +9,14 @@ import unittest
 from mantid.simpleapi import DeltaPDF3D, CreateMDWorkspace, FakeMDEventData, BinMD, mtd
 import numpy as np
 from scipy import signal
+from plugins.algorithms.DeltaPDF3D import _bin_stencil, _reflection_box_mask, _separable_convolution
+
+try:
+    import astropy  # noqa: F401
+
+    HAS_ASTROPY = True
+except ImportError:
+    HAS_ASTROPY = False
 
 
 class DeltaPDF3DTest(unittest.TestCase):
@@ -115,6 +123,21 @@ class DeltaPDF3DTest(unittest.TestCase):
         self.assertAlmostEqual(fft.signalAt(113496), -4057.0, delta=350.0)  # [1,0,0] - discrepancy windows, OSX and RHEL, Ubuntu
         self.assertAlmostEqual(fft.signalAt(113862), 3839.3468074482)  # [1,1,0]
 
+    def test_3D_RemoveReflections_zero_size_cube(self):
+        DeltaPDF3D(
+            InputWorkspace="DeltaPDF3DTest_MDH",
+            OutputWorkspace="fft",
+            IntermediateWorkspace="int",
+            Method="Punch and fill",
+            Shape="cube",
+            Size=0,
+            CropSphere=False,
+            Convolution=False,
+            WindowFunction="None",
+        )
+        # A box of zero size does not cover any bin, so nothing is removed
+        np.testing.assert_array_equal(mtd["int"].getSignalArray(), mtd["DeltaPDF3DTest_MDH"].getSignalArray())
+
     def test_3D_CropSphere(self):
         DeltaPDF3D(
             InputWorkspace="DeltaPDF3DTest_MDH",
@@ -263,6 +286,29 @@ class DeltaPDF3DTest(unittest.TestCase):
         self.assertAlmostEqual(fft.signalAt(1866), -113.4886083267)  # [1,0,0]
         self.assertAlmostEqual(fft.signalAt(2232), 107.9361501707)  # [1,1,0]
 
+    @unittest.skipIf(not HAS_ASTROPY, "astropy is required for convolution")
+    def test_separable_convolution_matches_convolve_fft(self):
+        from astropy.convolution import convolve_fft, Gaussian1DKernel
+
+        rng = np.random.default_rng(seed=1337)
+        data = rng.random((20, 21, 22))
+        data[rng.random(data.shape) < 0.2] = np.nan
+        G1D = Gaussian1DKernel(2.0).array
+        G3D = G1D * G1D.reshape((-1, 1)) * G1D.reshape((-1, 1, 1))
+
+        np.testing.assert_allclose(_separable_convolution(data, G1D / G3D.sum() ** (1.0 / 3.0)), convolve_fft(data, G3D), atol=1e-12)
+
+    def test_reflection_box_mask_has_the_signal_shape_when_no_bin_is_covered(self):
+        selected = np.ones((3, 3, 3), dtype=bool)
+        stencil = _bin_stencil([-1.0, 0.0, 1.0], 0.2, -1.5, 0.1, 30)
+        empty_stencil = _bin_stencil([-1.0, 0.0, 1.0], 0.0, -1.5, 0.1, 30)
+        self.assertEqual(empty_stencil, [])
+
+        mask = _reflection_box_mask(selected, (30, 30, 30), stencil, stencil, empty_stencil)
+
+        self.assertEqual(mask.shape, (30, 30, 30))
+        self.assertFalse(mask.any())
+
 
 if __name__ == "__main__":
     unittest.main()
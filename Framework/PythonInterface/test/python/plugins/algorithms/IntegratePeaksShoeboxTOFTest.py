@@ -190,6 +190,22 @@ class IntegratePeaksShoeboxTOFTest(unittest.TestCase):
         # check I/sigmas much worse if not optimised
         self._assert_found_correct_peaks(out, i_over_sigs=[4.4631, 2.3966])
 
+    def test_exec_single_thread_matches_multiple_threads(self):
+        kwargs = dict(
+            InputWorkspace=self.ws,
+            PeaksWorkspace=self.peaks,
+            GetNBinsFromBackToBackParams=False,
+            NRows=5,
+            NCols=5,
+            NBins=3,
+            WeakPeakThreshold=0.0,
+            OptimiseShoebox=True,
+            IntegrateIfOnEdge=True,
+        )
+        for nthreads, out_name in [(1, "peaks_serial"), (4, "peaks_parallel")]:
+            out = IntegratePeaksShoeboxTOF(**kwargs, NumberOfThreads=nthreads, OutputWorkspace=out_name)
+            self._assert_found_correct_peaks(out, i_over_sigs=[6.4407, 4.0207])
+
     @unittest.skipIf(sys.platform.startswith("win"), "Unknown exception when running Windows CI")
     def test_exec_OutputFile(self):
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -115,6 +115,23 @@ class IntegratePeaksSkewTest(unittest.TestCase):
         for ipk in range(1, out.getNumberPeaks()):
             self.assertEqual(out.getPeak(ipk).getIntensity(), 0)
 
+    def test_integrate_single_thread_matches_multiple_threads(self):
+        kwargs = dict(
+            InputWorkspace=self.ws,
+            PeaksWorkspace=self.peaks,
+            ThetaWidth=0,
+            BackscatteringTOFResolution=0.3,
+            IntegrateIfOnEdge=True,
+            UseNearestPeak=True,
+            UpdatePeakPosition=True,
+        )
+        out_serial = IntegratePeaksSkew(**kwargs, NumberOfThreads=1, OutputWorkspace="out_serial")
+        out_parallel = IntegratePeaksSkew(**kwargs, NumberOfThreads=4, OutputWorkspace="out_parallel")
+        self.assertEqual(out_serial.getNumberPeaks(), out_parallel.getNumberPeaks())
+        for ipk in range(out_serial.getNumberPeaks()):
+            self.assertEqual(out_serial.column("DetID")[ipk], out_parallel.column("DetID")[ipk])
+            self.assertAlmostEqual(out_serial.getPeak(ipk).getIntensity(), out_parallel.getPeak(ipk).getIntensity(), delta=1e-8)
+
     def test_integrate_use_nearest_peak_false_update_peak_position_false_with_resolution_params(self):
         out = IntegratePeaksSkew(
             InputWorkspace=self.ws,
@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
 
+import numpy as np
 from mantid.api import mtd, AlgorithmFactory, AnalysisDataService, DataProcessorAlgorithm
 from mantid.kernel import config, Direction, StringListValidator, StringMandatoryValidator
 from mantid.simpleapi import CreateWorkspace, ReflectometryReductionOneLiveData, GroupWorkspaces, LoadInstrument
@@ -283,6 +284,68 @@ class ReflectometryReductionOneLiveDataTest(unittest.TestCase):
         # We only output an IvsLam workspace from the reduction when workspace groups are correctly handled this way.
         self.assertTrue(AnalysisDataService.doesExist("IvsLam"))
 
+    def test_update_latency_is_recorded_on_output_workspace(self):
+        workspace = self._run_algorithm_with_defaults()
+        latency = workspace.getRun().getProperty("live_update_latency")
+        self.assertEqual(latency.units, "s")
+        self.assertGreater(latency.value, 0.0)
+
+    def test_cached_update_does_not_load_instrument_again(self):
+        self._default_args["CacheBetweenUpdates"] = True
+        self._run_algorithm_with_defaults()
+        self._add_counts_to_input()
+
+        workspace = self._run_algorithm_with_defaults()
+        expected = [
+            "GetFakeLiveInstrumentValue",
+            "GetFakeLiveInstrumentValue",
+            "GetFakeLiveInstrumentValue",
+            "AddSampleLogMultiple",
+            "SetInstrumentParameter",
+            "SetInstrumentParameter",
+            "ReflectometryISISLoadAndProcess",
+        ]
+        self._check_history(workspace, expected)
+        self.assertEqual(workspace.getInstrument().getName(), self._instrument_name)
+        self._check_sample_log_values(workspace)
+
+    def test_cached_update_gives_the_same_result_as_a_full_update(self):
+        self._default_args["CacheBetweenUpdates"] = True
+        self._run_algorithm_with_defaults()
+        self._add_counts_to_input()
+        cached = self._run_algorithm_with_defaults()
+
+        self._default_args["CacheBetweenUpdates"] = False
+        self._default_args["OutputWorkspace"] = "expected"
+        expected = self._run_algorithm(self._default_args, "expected")
+        np.testing.assert_allclose(cached.extractX(), expected.extractX())
+        np.testing.assert_allclose(cached.extractY(), expected.extractY())
+        np.testing.assert_allclose(cached.extractE(), expected.extractE())
+
+    def test_cached_update_skips_reduction_if_there_is_no_new_data(self):
+        self._default_args["CacheBetweenUpdates"] = True
+        first_y = self._run_algorithm_with_defaults().extractY()
+        second = self._run_algorithm_with_defaults()
+
+        np.testing.assert_allclose(second.extractY(), first_y)
+        expected = ["GetFakeLiveInstrumentValue", "GetFakeLiveInstrumentValue", "GetFakeLiveInstrumentValue"]
+        self._check_history(second, expected)
+
+    def test_cached_update_does_not_leave_temporary_workspace(self):
+        self._default_args["CacheBetweenUpdates"] = True
+        self._run_algorithm_with_defaults()
+        self._add_counts_to_input()
+        self._run_algorithm_with_defaults()
+
+        output_name = self._default_args["OutputWorkspace"]
+        self.assertFalse(AnalysisDataService.doesExist("__" + output_name))
+        self.assertTrue(AnalysisDataService.doesExist("__" + output_name + "_live_input"))
+
+    def _add_counts_to_input(self):
+        for i in range(self._input_ws.getNumberHistograms()):
+            self._input_ws.setY(i, 2 * self._input_ws.readY(i))
+            self._input_ws.setE(i, np.sqrt(self._input_ws.readY(i)))
+
     def _setup_environment(self):
         self._old_facility = config["default.facility"]
         if self._old_facility.strip() == "":
@@ -544,10 +607,10 @@ class ReflectometryReductionOneLiveDataTest(unittest.TestCase):
         args["GetLiveValueAlgorithm"] = "GetFakeLiveInstrumentValuesWithZeroTheta"
         return self._run_algorithm(args)
 
-    def _run_algorithm(self, args):
+    def _run_algorithm(self, args, output_name="output"):
         alg = create_algorithm("ReflectometryReductionOneLiveData", **args)
         assertRaisesNothing(self, alg.execute)
-        return mtd["output"]
+        return mtd[output_name]
 
     def _assert_delta(self, value1, value2):
         self.assertEqual(round(value1, 6), round(value2, 6))
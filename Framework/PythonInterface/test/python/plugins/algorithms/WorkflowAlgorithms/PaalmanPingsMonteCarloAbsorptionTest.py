@@ -222,6 +222,25 @@ class PaalmanPingsMonteCarloAbsorptionTest(unittest.TestCase):
     def test_annulus_with_container_sparse(self):
         self._annulus_test(self._run_correction_with_container_test, True)
 
+    def test_cylinder_with_container_shared_tracks(self):
+        self._test_arguments["SharedTracks"] = True
+        self._cylinder_test(self._run_correction_with_container_test)
+
+    def test_flat_plate_with_container_shared_tracks_sparse(self):
+        self._test_arguments["SharedTracks"] = True
+        self._flat_plate_test(self._run_correction_with_container_test, True)
+
+    def test_shared_tracks_output_order(self):
+        self._test_arguments.update(self._container_args)
+        self._test_arguments["SharedTracks"] = True
+        self._setup_cylinder_container()
+        arguments = self._arguments.copy()
+        arguments.update(self._test_arguments)
+        corrected = PaalmanPingsMonteCarloAbsorption(
+            InputWorkspace=self._red_ws, Shape="Cylinder", SampleRadius=0.5, CorrectionsWorkspace="shared", **arguments
+        )
+        self.assertEqual(corrected.getNames(), ["shared_ass", "shared_assc", "shared_acsc", "shared_acc"])
+
     def test_flat_plate_indirect_elastic(self):
         self._flat_plate_test(self._run_indirect_elastic_test)
 
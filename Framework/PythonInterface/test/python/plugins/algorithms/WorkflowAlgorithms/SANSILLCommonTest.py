@@ -0,0 +1,93 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import sys
+import threading
+import unittest
+
+from mantid import simpleapi
+from SANSILLCommon import TaskGraph
+
+
+class TaskGraphTest(unittest.TestCase):
+    def test_results_of_dependencies_are_passed_to_task(self):
+        graph = TaskGraph()
+        graph.add("a", lambda: 2)
+        graph.add("b", lambda: 3)
+        graph.add("c", lambda a, b: a * b, ["a", "b"])
+        graph.add("d", lambda c, a: c - a, ["c", "a"])
+
+        results = graph.run(n_threads=2)
+
+        self.assertEqual(results, {"a": 2, "b": 3, "c": 6, "d": 4})
+
+    def test_independent_tasks_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=10)
+        graph = TaskGraph()
+        # each task waits for the other one to start, so this would time out if they ran one after the other
+        graph.add("a", barrier.wait)
+        graph.add("b", barrier.wait)
+
+        results = graph.run(n_threads=2)
+
+        self.assertEqual(sorted(results.values()), [0, 1])
+
+    def test_task_starts_after_its_dependencies(self):
+        finished = []
+        graph = TaskGraph()
+        for name in ["a", "b", "c"]:
+            graph.add(name, lambda *_, name=name: finished.append(name))
+        graph.add("d", lambda *_: list(finished), ["a", "b", "c"])
+
+        results = graph.run(n_threads=3)
+
+        self.assertEqual(sorted(results["d"]), ["a", "b", "c"])
+
+    def test_exception_in_task_is_raised(self):
+        graph = TaskGraph()
+        graph.add("a", lambda: 1 / 0)
+        graph.add("b", lambda a: a, ["a"])
+
+        self.assertRaises(ZeroDivisionError, graph.run, 2)
+
+    def test_fail_unknown_dependency(self):
+        graph = TaskGraph()
+        self.assertRaisesRegex(ValueError, "Task b depends on a, which has not been added", graph.add, "b", lambda a: a, ["a"])
+
+    def test_fail_duplicate_task(self):
+        graph = TaskGraph()
+        graph.add("a", lambda: 1)
+        self.assertRaisesRegex(ValueError, "Task a has already been added", graph.add, "a", lambda: 2)
+
+    def test_tasks_run_as_children_of_parent(self):
+        parent = object()
+        graph = TaskGraph(parent)
+        graph.add("a", lambda: simpleapi._find_parent_pythonalgorithm(sys._getframe()))
+        graph.add("b", lambda a: (a, simpleapi._find_parent_pythonalgorithm(sys._getframe())), ["a"])
+
+        results = graph.run(n_threads=2)
+
+        self.assertIs(results["a"], parent)
+        self.assertIs(results["b"][1], parent)
+        self.assertIsNone(simpleapi._find_parent_pythonalgorithm(sys._getframe()))
+
+    def test_critical_path(self):
+        graph = TaskGraph()
+        graph.add("a", lambda: 1)
+        graph.add("b", lambda a: a, ["a"])
+        graph.add("c", lambda: 1)
+        graph.add("d", lambda b: b, ["b"])
+        graph.run(n_threads=1)
+
+        path = graph.critical_path()
+
+        self.assertEqual([name for name, _ in path], ["a", "b", "d"])
+        self.assertTrue(all(duration >= 0 for _, duration in path))
+        self.assertIn("Critical path:", graph.report())
+
+
+if __name__ == "__main__":
+    unittest.main()
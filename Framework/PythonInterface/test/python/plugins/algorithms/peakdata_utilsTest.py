@@ -12,7 +12,7 @@ from mantid.simpleapi import (
     LoadEmptyInstrument,
     SetInstrumentParameter,
 )
-from plugins.algorithms.peakdata_utils import InstrumentArrayConverter
+from plugins.algorithms.peakdata_utils import InstrumentArrayConverter, integrate_peaks_in_parallel, PeakIntegrationStatistics
 from testhelpers import WorkspaceCreationHelper
 from numpy import array, sqrt, arange, ones, zeros
 
@@ -148,6 +148,23 @@ class peakdata_utilsTest(unittest.TestCase):
         det_edges_expected[:, -1] = True  # last tube in window is second from end of bank and ncols_edge=2
         self.assertTrue((peak_data.det_edges == det_edges_expected).all())
 
+    def test_integrate_peaks_in_parallel_yields_results_in_order(self):
+        for nthreads in [0, 1, 3]:
+            results = list(integrate_peaks_in_parallel(lambda ipk: 2 * ipk, range(20), nthreads))
+            self.assertEqual([ipk for ipk, _, _ in results], list(range(20)))
+            self.assertEqual([result for _, result, _ in results], [2 * ipk for ipk in range(20)])
+            self.assertTrue(all(elapsed >= 0 for _, _, elapsed in results))
+
+    def test_peak_integration_statistics_counts_status(self):
+        stats = PeakIntegrationStatistics()
+        for status, elapsed in [("a", 0.1), ("b", 0.3), ("a", 0.2)]:
+            stats.add(status, elapsed)
+        self.assertEqual(stats.npeaks, 3)
+        self.assertEqual(stats.status_counts["a"], 2)
+        self.assertAlmostEqual(stats.total_time, 0.6)
+        self.assertAlmostEqual(stats.max_time, 0.3)
+        self.assertIn("Integrated 3 peaks", stats.summary())
+
 
 if __name__ == "__main__":
     unittest.main()
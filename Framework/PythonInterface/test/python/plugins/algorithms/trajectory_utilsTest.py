@@ -0,0 +1,64 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+
+import numpy as np
+from plugins.algorithms.trajectory_utils import (
+    block_velocities,
+    correlation_norm,
+    fold_correlation,
+    padded_fft_length,
+    particle_blocks,
+    spectra,
+    spectrum_to_correlation,
+)
+
+
+class trajectory_utilsTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(seed=42)
+        self.n_timesteps, self.n_particles = 12, 5
+        self.configuration = rng.random((self.n_timesteps, self.n_particles, 3)) * 10.0
+        self.boxes = np.array([np.diag(10.0 + rng.random(3)) for _ in range(self.n_timesteps)])
+
+    def _reference_velocities(self):
+        scaled = np.swapaxes(self.configuration, 0, 1) / np.diagonal(self.boxes, axis1=1, axis2=2)[np.newaxis]
+        velocities = np.zeros((self.n_particles, self.n_timesteps - 1, 3))
+        for i in range(self.n_particles):
+            for j in range(self.n_timesteps - 2):
+                step1 = scaled[i, j + 1] - scaled[i, j] - np.round(scaled[i, j + 1] - scaled[i, j])
+                step2 = scaled[i, j + 2] - scaled[i, j + 1] - np.round(scaled[i, j + 2] - scaled[i, j + 1])
+                velocities[i, j] = np.dot(self.boxes[j + 1], (step1 + step2) / 2.0)
+        return velocities
+
+    def test_block_velocities_match_loop_implementation(self):
+        velocities = block_velocities(self.configuration, self.boxes, 1, 4)
+
+        np.testing.assert_allclose(velocities, self._reference_velocities()[1:4])
+
+    def test_fft_correlation_matches_numpy_correlate(self):
+        velocities = self._reference_velocities()
+        n = self.n_timesteps - 1
+        fft_length = padded_fft_length(n)
+        velocity_spectra = spectra(velocities, fft_length)
+
+        correlation = spectrum_to_correlation(np.sum(velocity_spectra[0] * np.conj(velocity_spectra[3]), axis=0), n, fft_length)
+
+        expected = sum(np.correlate(velocities[0, :, k], velocities[3, :, k], "same") for k in range(3)) / correlation_norm(n)
+        np.testing.assert_allclose(correlation, expected, atol=1e-12)
+
+    def test_particle_blocks_cover_all_particles(self):
+        blocks = particle_blocks(10, 100, 3, memory_limit=3 * 100 * 3 * 8 * 8)
+
+        self.assertEqual(blocks, [(0, 3), (3, 6), (6, 9), (9, 10)])
+
+    def test_fold_correlation(self):
+        np.testing.assert_allclose(fold_correlation(np.array([1.0, 2.0, 3.0, 2.0, 1.0])), [3.0, 2.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -115,6 +115,10 @@ public:
 
   void zero() override { m_jacobian.zero(); }
 
+  size_t nData() const override { return m_factors.size() - m_factorOffset; }
+
+  size_t nParams() const override { return m_jacobian.nParams(); }
+
 protected:
   API::Jacobian &m_jacobian;
   size_t m_offset;
@@ -151,6 +155,12 @@ public:
   /// Implements API::Jacobian::zero
   void zero() override { m_jacobian.assign(m_jacobian.size(), 0.0); }
 
+  /// Implements API::Jacobian::nData
+  size_t nData() const override { return m_nValues; }
+
+  /// Implements API::Jacobian::nParams
+  size_t nParams() const override { return m_nParams; }
+
   /// Provides raw pointer access to the underlying std::vector. Required for
   /// adept-interface.
   double *rawValues() { return &m_jacobian[0]; }
@@ -0,0 +1,65 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import time
+
+import systemtesting
+from ISIS.SANS.isis_sans_system_test import ISISSansSystemTest
+from sans.common.enums import SANSFacility, SANSInstrument
+from sans.common.file_information import SANSFileInformationFactory
+from sans.state.Serializer import Serializer, _decode, _encode
+from sans.state.StateObjects.StateData import get_data_builder
+from sans.user_file.txt_parsers.UserFileReaderAdapter import UserFileReaderAdapter
+
+N_CALLS = 200
+
+
+# -----------------------------------------------
+# Measures the cost of passing a SANS state to the workflow algorithms
+# -----------------------------------------------
+@ISISSansSystemTest(SANSInstrument.SANS2D)
+class SANSStateSerializationTest(systemtesting.MantidSystemTest):
+    def runTest(self):
+        state = self._get_state()
+        state_json = _encode(state)
+        self.reportResult("state_size_bytes", str(len(state_json)))
+
+        self._report("to_json_uncached", self._time(_encode, state))
+        self._report("from_json_uncached", self._time(_decode, state_json))
+        Serializer.clear_cache()
+        self._report("to_json", self._time(Serializer.to_json, state))
+        self._report("from_json", self._time(Serializer.from_json, state_json))
+
+        self._round_trip_matches = _encode(Serializer.from_json(Serializer.to_json(state))) == state_json
+
+    def validate(self):
+        return self._round_trip_matches
+
+    def _report(self, name, elapsed):
+        self.reportResult(name + " time_per_call_us", "%.2f" % (1e6 * elapsed / N_CALLS))
+
+    @staticmethod
+    def _time(func, arg):
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            func(arg)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _get_state():
+        file_information_factory = SANSFileInformationFactory()
+        file_information = file_information_factory.create_sans_file_information("SANS2D00034484")
+        data_builder = get_data_builder(SANSFacility.ISIS, file_information)
+        data_builder.set_sample_scatter("SANS2D00034484")
+        data_builder.set_sample_transmission("SANS2D00034505")
+        data_builder.set_sample_direct("SANS2D00034461")
+        data_state = data_builder.build()
+
+        user_file = "USER_SANS2D_154E_2p4_4m_M3_Xpress_8mm_SampleChanger.txt"
+        user_file_director = UserFileReaderAdapter(file_information=file_information, user_file_name=user_file)
+        state = user_file_director.get_all_states(file_information=file_information)
+        state.data = data_state
+        return state
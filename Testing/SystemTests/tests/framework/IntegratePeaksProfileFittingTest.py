@@ -2,6 +2,8 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import os
+
 from numpy.testing import assert_allclose
 
 from systemtesting import MantidSystemTest
@@ -36,3 +38,32 @@ class IntegratePeaksProfileFittingTest(MantidSystemTest):
         table = mtd["peaks_output"]
         # intensities for the first two peaks
         assert_allclose(table.column("Intens")[0:2], [302.9, 10013.7], rtol=5e-2, atol=1.0)
+
+
+class IntegratePeaksProfileFittingCheckpointTest(MantidSystemTest):
+    r"""Fit the peaks concurrently and resume the fit from the checkpoint file"""
+
+    def runTest(self):
+        LoadNexus(Filename="TOPAZ_39037_bank29.nxs", OutputWorkspace="events")
+        LoadNexus(Filename="TOPAZ_39037_peaks_short.nxs", OutputWorkspace="peaks_input")
+        FindUBUsingFFT(PeaksWorkspace="peaks_input", MinD=5.0, MaxD=10.0)
+        ConvertToMD(InputWorkspace="events", QDimensions="Q3D", dEAnalysisMode="Elastic", Q3DFrames="Q_lab", OutputWorkspace="md")
+        checkpoint_file = os.path.join(self.temporary_directory(), "checkpoint.pkl")
+
+        kwargs = dict(
+            OutputParamsWorkspace="params_ws",
+            ModeratorCoefficientsFile="bl11_moderatorCoefficients_2018.dat",
+            InputWorkspace="md",
+            PeaksWorkspace="peaks_input",
+            NumberOfThreads=2,
+            CheckpointFile=checkpoint_file,
+        )
+        IntegratePeaksProfileFitting(OutputPeaksWorkspace="peaks_output", **kwargs)
+        self.assertTrue(os.path.isfile(checkpoint_file))
+        # every peak is in the checkpoint so the second run does not fit any peaks
+        IntegratePeaksProfileFitting(OutputPeaksWorkspace="peaks_resumed", **kwargs)
+
+        table = mtd["peaks_output"]
+        assert_allclose(table.column("Intens")[0:2], [302.9, 10013.7], rtol=5e-2, atol=1.0)
+        assert_allclose(mtd["peaks_resumed"].column("Intens"), table.column("Intens"))
+        assert_allclose(mtd["peaks_resumed"].column("SigInt"), table.column("SigInt"))
@@ -4,6 +4,9 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import time
+
+import numpy as np
 import systemtesting
 from mantid.simpleapi import PaalmanPingsMonteCarloAbsorption, Load, mtd, SetSample
 
@@ -149,3 +152,58 @@ class PresetTest(systemtesting.MantidSystemTest):
         PaalmanPingsMonteCarloAbsorption(
             InputWorkspace="sample", Shape="Preset", BeamHeight=2.0, BeamWidth=2.0, CorrectionsWorkspace="preset_corr", EventsPerPoint=5000
         )
+
+
+class CylinderSharedTracksTest(systemtesting.MantidSystemTest):
+    """
+    Compares the speed and the results of calculating the corrections with a separate simulation
+    for each factor and from a single set of shared tracks
+    """
+
+    def __init__(self):
+        super(CylinderSharedTracksTest, self).__init__()
+        self._times = dict()
+        self.setUp()
+
+    def setUp(self):
+        Load(Filename="irs26176_graphite002_red.nxs", OutputWorkspace="sample")
+
+    def cleanup(self):
+        mtd.clear()
+
+    def validate(self):
+        # both are statistical estimates of the same factors
+        for separate, shared in zip(mtd["separate_corr"], mtd["shared_corr"]):
+            if not np.allclose(separate.extractY(), shared.extractY(), rtol=0.02):
+                return False
+        return True
+
+    def runTest(self):
+        self._report("separate", self._time_corrections("separate_corr", False))
+        self._report("shared_tracks", self._time_corrections("shared_corr", True))
+        self.reportResult("speedup", "%.2f" % (self._times["separate"] / self._times["shared_tracks"]))
+
+    def _report(self, name, elapsed):
+        self._times[name] = elapsed
+        self.reportResult(name + " time_s", "%.2f" % elapsed)
+
+    @staticmethod
+    def _time_corrections(output_name, shared_tracks):
+        start = time.perf_counter()
+        PaalmanPingsMonteCarloAbsorption(
+            InputWorkspace="sample",
+            Shape="Cylinder",
+            BeamHeight=2.0,
+            BeamWidth=2.0,
+            Height=2.0,
+            SampleRadius=0.2,
+            SampleChemicalFormula="H2-O",
+            SampleDensity=1.0,
+            ContainerRadius=0.22,
+            ContainerChemicalFormula="V",
+            ContainerDensity=6.0,
+            CorrectionsWorkspace=output_name,
+            EventsPerPoint=5000,
+            SharedTracks=shared_tracks,
+        )
+        return time.perf_counter() - start
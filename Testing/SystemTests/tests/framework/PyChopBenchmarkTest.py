@@ -0,0 +1,57 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Benchmarks for the resolution and flux calculations of PyChop.
+
+For each instrument bundled with PyChop, in its default chopper setting, the resolution and flux are
+calculated over a range of incident energies one energy at a time and with a single call to
+getResFluxArrays, and the time taken by each is reported so that changes in the speed can be tracked.
+"""
+
+import glob
+import os
+import time
+import warnings
+
+import numpy as np
+import pychop
+import systemtesting
+from pychop.Instruments import Instrument
+
+N_EI = 200
+
+
+class PyChopBenchmarkTest(systemtesting.MantidSystemTest):
+    def runTest(self):
+        self._results = []
+        folder = os.path.dirname(pychop.__file__)
+        with warnings.catch_warnings():
+            # Energies outside of the range an instrument transmits warn but are calculated as NaN
+            warnings.simplefilter("ignore")
+            for yaml_file in sorted(glob.glob(os.path.join(folder, "*.yaml"))):
+                self._run_instrument(Instrument(yaml_file))
+
+    def validate(self):
+        return all(self._results)
+
+    def _run_instrument(self, instrument):
+        eis = np.linspace(max(instrument.emin, 1.0), min(instrument.emax, 200.0), N_EI)
+
+        start = time.perf_counter()
+        scalar_res = np.array([instrument.getResolution(0.0, ei)[0] for ei in eis])
+        scalar_flux = np.array([instrument.getFlux(ei) for ei in eis])
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        res, flux = instrument.getResFluxArrays(eis)
+        array_time = time.perf_counter() - start
+
+        self.reportResult(instrument.name + " scalar_time_ms", "%.2f" % (1e3 * scalar_time))
+        self.reportResult(instrument.name + " array_time_ms", "%.2f" % (1e3 * array_time))
+        self._results.append(
+            np.allclose(res, scalar_res, rtol=1e-10, equal_nan=True) and np.allclose(flux, scalar_flux, rtol=1e-10, equal_nan=True)
+        )
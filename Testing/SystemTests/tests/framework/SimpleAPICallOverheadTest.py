@@ -0,0 +1,79 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Micro-benchmarks for the per-call overhead of the simpleapi algorithm functions.
+
+Each benchmark calls a cheap algorithm many times in a loop, as workflow algorithms do with their
+child algorithms, and reports the mean time per call so that changes in the overhead can be tracked.
+"""
+
+import time
+
+import systemtesting
+from mantid.api import mtd
+from mantid.kernel.funcinspect import lhs_info
+from mantid.simpleapi import CreateSingleValuedWorkspace, PreparedAlgorithm
+
+N_CALLS = 1000
+
+
+def _lhs_info_caller():
+    return lhs_info("both")
+
+
+class SimpleAPICallOverheadTest(systemtesting.MantidSystemTest):
+    def runTest(self):
+        self._report("lhs_info", self._time_lhs_info())
+        self._report("simpleapi_call", self._time_simpleapi_call())
+        self._report("simpleapi_call_lhs", self._time_simpleapi_call_lhs())
+        self._report("simpleapi_call_not_in_ads", self._time_simpleapi_call_not_in_ads())
+        self._report("prepared_algorithm_call", self._time_prepared_algorithm_call())
+
+    def tearDown(self):
+        mtd.clear()
+
+    def validate(self):
+        return True
+
+    def _report(self, name, elapsed):
+        self.reportResult(name + " time_per_call_us", "%.2f" % (1e6 * elapsed / N_CALLS))
+
+    @staticmethod
+    def _time_lhs_info():
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            n_outputs, names = _lhs_info_caller()
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _time_simpleapi_call():
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            CreateSingleValuedWorkspace(DataValue=1.0, OutputWorkspace="__overhead")
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _time_simpleapi_call_lhs():
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            overhead_lhs = CreateSingleValuedWorkspace(DataValue=1.0)  # noqa: F841
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _time_simpleapi_call_not_in_ads():
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            CreateSingleValuedWorkspace(DataValue=1.0, OutputWorkspace="__overhead", StoreInADS=False)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def _time_prepared_algorithm_call():
+        create = PreparedAlgorithm("CreateSingleValuedWorkspace", OutputWorkspace="__overhead")
+        start = time.perf_counter()
+        for _ in range(N_CALLS):
+            create(DataValue=1.0)
+        return time.perf_counter() - start
@@ -116,6 +116,8 @@ class EngineeringDiffractionPresenter(object):
         self.fitting_presenter.data_widget.ads_observer.unsubscribe()
         self.fitting_presenter.data_widget.view.saveSettings()
         self.fitting_presenter.plot_widget.view.ensure_fit_dock_closed()
+        if self.gsas2_presenter is not None:
+            self.gsas2_presenter.handle_close()
 
     def open_help_window(self):
         InterfaceManager().showCustomInterfaceHelp(self.doc, self.doc_folder)
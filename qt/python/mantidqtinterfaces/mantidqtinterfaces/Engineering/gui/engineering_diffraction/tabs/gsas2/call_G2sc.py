@@ -6,8 +6,11 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 # ruff: noqa: E741  # Ambiguous variable name
 import os
+import shutil
 import sys
 import json
+import tempfile
+import time
 from pathlib import Path
 from types import ModuleType
 
@@ -196,10 +199,31 @@ def import_gsasii(gsasii_scriptable: Path) -> ModuleType:
             )
 
 
-def main():
-    # Parse Inputs from Mantid
-    inputs_dict = json.loads(sys.argv[1])
+# Prefix of the line a worker prints to report the result of a refinement, see run_worker
+WORKER_RESULT_PREFIX = "GSASII_WORKER_RESULT "
 
+
+def create_project(G2sc, project_path, phase_files, phase_templates=None):
+    """
+    Creates a GSAS-II project with the phases added. If phase_templates is given, the project with the phases
+    is saved there for each list of phase files, and copied for later projects instead of reading the phases again.
+    """
+    if phase_templates is None:
+        gsas_project = G2sc.G2Project(filename=project_path)
+        add_phases(gsas_project, phase_files)
+        return gsas_project
+    key = tuple(phase_files)
+    if key not in phase_templates["projects"]:
+        template_path = os.path.join(phase_templates["directory"], f"phases_{len(phase_templates['projects'])}.gpx")
+        template_project = G2sc.G2Project(filename=template_path)
+        add_phases(template_project, phase_files)
+        template_project.save(template_path)
+        phase_templates["projects"][key] = template_path
+    shutil.copyfile(phase_templates["projects"][key], project_path)
+    return G2sc.G2Project(gpxfile=project_path)
+
+
+def run_refinement(G2sc, inputs_dict, phase_templates=None):
     temporary_save_directory = inputs_dict["temporary_save_directory"]
     project_name = inputs_dict["project_name"]
     refinement_method = inputs_dict["refinement_settings"]["method"]
@@ -217,15 +241,10 @@ def main():
     mantid_pawley_reflections = inputs_dict["mantid_pawley_reflections"]
     d_spacing_min = inputs_dict["d_spacing_min"]
     number_of_regions = inputs_dict["number_of_regions"]
-    gsasii_scriptable_path = inputs_dict["gsasii_scriptable_path"]
-
-    # Call GSASIIscriptable
-    G2sc = import_gsasii(Path(gsasii_scriptable_path))
 
     project_path = os.path.join(temporary_save_directory, project_name + ".gpx")
-    gsas_project = G2sc.G2Project(filename=project_path)
+    gsas_project = create_project(G2sc, project_path, phase_files, phase_templates)
 
-    add_phases(gsas_project, phase_files)
     add_histograms(data_files, gsas_project, instrument_files, number_of_regions)
 
     if refinement_method == "Pawley" and mantid_pawley_reflections:
@@ -254,5 +273,46 @@ def main():
         export_reflections(temporary_save_directory, project_name, gsas_project)
 
 
+def run_worker(input_stream, output_stream):
+    """
+    Runs the refinements read from input_stream, one JSON string of inputs per line, until the stream is closed.
+    GSAS-II is imported once and the phases are read once for each list of phase files. After each refinement
+    a line starting with WORKER_RESULT_PREFIX and followed by a JSON string of the result is written to output_stream.
+    """
+    G2sc = None
+    phase_templates = {"directory": tempfile.mkdtemp(prefix="GSASII_worker_"), "projects": {}}
+    try:
+        for line in input_stream:
+            if not line.strip():
+                continue
+            start = time.time()
+            try:
+                inputs_dict = json.loads(line)
+                if G2sc is None:
+                    G2sc = import_gsasii(Path(inputs_dict["gsasii_scriptable_path"]))
+                run_refinement(G2sc, inputs_dict, phase_templates)
+                result = {"success": True, "error": ""}
+            except Exception as exc:
+                result = {"success": False, "error": f"{type(exc).__name__}: {exc}"}
+            result["runtime"] = time.time() - start
+            output_stream.write(WORKER_RESULT_PREFIX + json.dumps(result, separators=(",", ":")) + "\n")
+            output_stream.flush()
+    finally:
+        shutil.rmtree(phase_templates["directory"], ignore_errors=True)
+
+
+def main():
+    if sys.argv[1] == "--worker":
+        run_worker(sys.stdin, sys.stdout)
+        return
+
+    # Parse Inputs from Mantid
+    inputs_dict = json.loads(sys.argv[1])
+
+    # Call GSASIIscriptable
+    G2sc = import_gsasii(Path(inputs_dict["gsasii_scriptable_path"]))
+    run_refinement(G2sc, inputs_dict)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,178 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import json
+import queue
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.call_G2sc import WORKER_RESULT_PREFIX
+
+
+@dataclass
+class GSAS2JobResult:
+    """
+    The result of a refinement run by a GSAS-II worker.
+
+    Attributes:
+        success: Whether the refinement completed.
+        runtime: Time (in seconds) taken by the refinement.
+        output: Output printed by GSAS-II during the refinement.
+        error: Description of the error if the refinement failed.
+    """
+
+    success: bool
+    runtime: float
+    output: str
+    error: str
+
+
+class _GSAS2Worker:
+    """
+    A GSAS-II Python process running call_G2sc.py in worker mode, which refines the jobs written to its stdin.
+    """
+
+    def __init__(self, command: List[str], env: Dict[str, str]) -> None:
+        # see GSAS2Model.call_subprocess for why argv[0] is replaced
+        self.process = subprocess.Popen(
+            ["_"] + command[1:] + ["--worker"],
+            executable=command[0],
+            shell=False,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            close_fds=True,
+            universal_newlines=True,
+            bufsize=1,
+            env=env,
+        )
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def refine(self, serialized_inputs: str, timeout: float) -> GSAS2JobResult:
+        timed_out = threading.Event()
+
+        def abort() -> None:
+            timed_out.set()
+            self.process.kill()
+
+        timer = threading.Timer(timeout, abort)
+        timer.start()
+        output_lines = []
+        try:
+            self.process.stdin.write(serialized_inputs + "\n")
+            self.process.stdin.flush()
+            for line in self.process.stdout:
+                if line.startswith(WORKER_RESULT_PREFIX):
+                    result = json.loads(line[len(WORKER_RESULT_PREFIX) :])
+                    return GSAS2JobResult(result["success"], result["runtime"], "".join(output_lines), result["error"])
+                output_lines.append(line)
+        except OSError as exc:
+            output_lines.append(str(exc))
+        finally:
+            timer.cancel()
+        if timed_out.is_set():
+            error = f"GSAS-II refinement did not complete after {timeout} seconds, so it was aborted."
+        else:
+            error = "GSAS-II worker process exited unexpectedly."
+        self.close()
+        return GSAS2JobResult(False, 0.0, "".join(output_lines), error)
+
+    def close(self) -> None:
+        if self.is_alive():
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+
+
+class GSAS2WorkerPool:
+    """
+    A pool of GSAS-II worker processes that refine several data files at the same time. The workers stay alive
+    between runs, so GSAS-II is only imported, and each set of phase files only read, once per worker.
+    """
+
+    def __init__(self, command: List[str], env: Dict[str, str], number_of_workers: int, timeout: float) -> None:
+        """
+        :param command: The GSAS-II Python executable followed by the path to call_G2sc.py
+        :param env: The environment of the worker processes
+        :param number_of_workers: The maximum number of worker processes
+        :param timeout: Maximum time (in seconds) to wait for a single refinement
+        """
+        self.command = command
+        self.env = env
+        self.number_of_workers = max(1, number_of_workers)
+        self.timeout = timeout
+        self._idle_workers: "queue.Queue[_GSAS2Worker]" = queue.Queue()
+        self._workers: List[_GSAS2Worker] = []
+        self._workers_lock = threading.Lock()
+
+    def matches(self, command: List[str], env: Dict[str, str]) -> bool:
+        return self.command == command and self.env == env
+
+    def run(self, jobs: Sequence[Tuple[Any, str]]) -> Iterator[Tuple[Any, GSAS2JobResult]]:
+        """
+        Refines the jobs, given as (key, serialized inputs) pairs, and yields (key, result) pairs as each
+        refinement completes.
+        """
+        pending: "queue.Queue[Tuple[Any, str]]" = queue.Queue()
+        for job in jobs:
+            pending.put(job)
+        results: "queue.Queue[Tuple[Any, GSAS2JobResult]]" = queue.Queue()
+        threads = [
+            threading.Thread(target=self._run_jobs, args=(pending, results), daemon=True)
+            for _ in range(min(self.number_of_workers, len(jobs)))
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(len(jobs)):
+            yield results.get()
+        for thread in threads:
+            thread.join()
+
+    def close(self) -> None:
+        with self._workers_lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers.clear()
+        self._idle_workers = queue.Queue()
+
+    def _run_jobs(self, pending: "queue.Queue[Tuple[Any, str]]", results: "queue.Queue[Tuple[Any, GSAS2JobResult]]") -> None:
+        worker: Optional[_GSAS2Worker] = None
+        try:
+            while True:
+                try:
+                    key, serialized_inputs = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    if worker is None or not worker.is_alive():
+                        worker = self._get_worker()
+                    result = worker.refine(serialized_inputs, self.timeout)
+                except (FileNotFoundError, ValueError, subprocess.SubprocessError, OSError) as exc:
+                    result = GSAS2JobResult(False, 0.0, "", str(exc))
+                results.put((key, result))
+        finally:
+            if worker is not None and worker.is_alive():
+                self._idle_workers.put(worker)
+
+    def _get_worker(self) -> _GSAS2Worker:
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                break
+            if worker.is_alive():
+                return worker
+        worker = _GSAS2Worker(self.command, self.env)
+        with self._workers_lock:
+            self._workers = [existing for existing in self._workers if existing.is_alive()] + [worker]
+        return worker
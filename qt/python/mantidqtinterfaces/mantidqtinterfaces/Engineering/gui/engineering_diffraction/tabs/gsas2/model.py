@@ -38,6 +38,7 @@ from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.gsas2
     FilePaths,
     GSAS2Config,
 )
+from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.gsas2_worker_pool import GSAS2WorkerPool
 from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.common.output_sample_logs import (
     SampleLogsGroupWorkspace,
     _generate_workspace_name,
@@ -55,10 +56,12 @@ class GSAS2ModelConfig:
     Attributes:
         limits: A list of limits for the configuration.
         timeout: Maximum time (in seconds) to wait for GSAS-II subprocesses.
+        number_of_workers: Number of files refined at the same time, 0 uses all but one of the cores.
     """
 
     path_to_gsas2: str = ""
     timeout: int = 100
+    number_of_workers: int = 0
 
 
 @dataclass
@@ -133,6 +136,33 @@ class GSAS2RuntimeState:
     d_spacing_min: float = 1.0
 
 
+@dataclass
+class RefinementJob:
+    """
+    The inputs and outputs of the refinement of one data file, which are restored to the model
+    when the outputs of the refinement are loaded.
+
+    Attributes:
+        save_directories: Directories for the temporary and project files.
+        file_paths: Paths to the instrument, phase and data files.
+        x_limits: The x-axis limits of the data file.
+        state: The runtime state for the data file.
+        output_state: The outputs of the refinement.
+        user_save_directory: The directory the outputs are moved to.
+        gsasii_call_args: The GSAS-II Python executable, path to call_G2sc.py and serialized inputs.
+        gsas_binary_paths: The paths to the GSAS-II binaries.
+    """
+
+    save_directories: SaveDirectories
+    file_paths: FilePaths
+    x_limits: XLimitsState
+    state: GSAS2RuntimeState
+    output_state: OutputState
+    user_save_directory: Optional[str]
+    gsasii_call_args: List[str]
+    gsas_binary_paths: List[str]
+
+
 class GSAS2Model:
     """
     GSAS2Model is a class that provides an interface for managing and executing GSAS-II refinements.
@@ -171,14 +201,15 @@ class GSAS2Model:
         self.output_state.phase_names_list = []
         self.refinement_state.crystal_structures = []
         self.user_save_directory: Optional[str] = None
+        self._worker_pool: Optional[GSAS2WorkerPool] = None
 
     def clear_input_components(self) -> None:
         """
         Clears all input components and resets the configuration, state, and refinement settings
-        to their default values.
+        to their default values. The number of workers is kept, as it configures the worker pool rather than a refinement.
         """
         # Reset configuration and state to their default values
-        self.config = GSAS2ModelConfig()
+        self.config = GSAS2ModelConfig(number_of_workers=self.config.number_of_workers)
         self.state = GSAS2RuntimeState()
 
         # Reset refinement settings
@@ -206,9 +237,9 @@ class GSAS2Model:
         Returns a dictionary mapping data file names to their result counts
         """
         data_files = load_parameters[2]  # Extract data files list
-        num_hist = None
+        jobs: List[RefinementJob] = []
 
-        for data_file in data_files:
+        for file_index, data_file in enumerate(data_files):
             # Create unique project name for each file
             file_basename = os.path.splitext(os.path.basename(data_file))[0]
             individual_project_name = f"{project_name}_{file_basename}"
@@ -220,29 +251,38 @@ class GSAS2Model:
                 [data_file],  # single data file
             ]
 
-            num_hist = self._run_single_refinement(
-                single_file_load_params, refinement_parameters, individual_project_name, rb_num, user_x_limits
+            # The phases and reflections are the same for every file, so are only generated for the first one
+            job = self._prepare_single_refinement(
+                single_file_load_params, refinement_parameters, individual_project_name, rb_num, user_x_limits, file_index == 0
             )
 
-            if not num_hist:
+            if not job:
                 return
+            jobs.append(job)
 
-        return num_hist
+        return self._run_refinements(jobs)
 
-    def _run_single_refinement(
+    def _prepare_single_refinement(
         self,
         load_parameters: list,
         refinement_parameters: list,
         project_name: str,
         rb_num: Optional[str] = None,
         user_x_limits: Optional[List[List[float]]] = None,
-    ) -> Optional[int]:
+        read_phases: bool = True,
+    ) -> Optional[RefinementJob]:
         self.clear_input_components()
+        # Each file has its own save directories, paths and limits, which are kept in its RefinementJob
+        self.save_directories = SaveDirectories(temporary_save_directory="", project_name="")
+        self.file_paths = FilePaths()
+        self.x_limits = XLimitsState()
+        self.output_state = OutputState()
         if not self.initial_validation(project_name, load_parameters):
             return None
         self.set_components_from_inputs(load_parameters, refinement_parameters, project_name, rb_num)
-        self.read_phase_files()
-        self.generate_reflections_from_space_group()
+        if read_phases or not self.refinement_state.crystal_structures:
+            self.read_phase_files()
+            self.generate_reflections_from_space_group()
 
         formatted_limits: Optional[List[List[float]]] = None
         # Ensure both elements are lists of floats and pass formatted limits to validate_x_limits
@@ -257,22 +297,80 @@ class GSAS2Model:
         if not self.further_validation():
             return None
 
-        runtime = self.call_gsas2()
-        if not runtime:
+        gsasii_call_args, gsas_binary_paths = self._prepare_gsas2_call()
+        return RefinementJob(
+            save_directories=self.save_directories,
+            file_paths=self.file_paths,
+            x_limits=self.x_limits,
+            state=self.state,
+            output_state=self.output_state,
+            user_save_directory=self.user_save_directory,
+            gsasii_call_args=gsasii_call_args,
+            gsas_binary_paths=gsas_binary_paths,
+        )
+
+    def _restore_refinement_job(self, job: RefinementJob) -> None:
+        self.save_directories = job.save_directories
+        self.file_paths = job.file_paths
+        self.x_limits = job.x_limits
+        self.state = job.state
+        self.output_state = job.output_state
+        self.user_save_directory = job.user_save_directory
+
+    def _run_refinements(self, jobs: List[RefinementJob]) -> Optional[int]:
+        """
+        Refines the prepared jobs with the GSAS-II worker pool and loads the outputs of each refinement as it completes.
+        Returns the number of histograms of the last file, whose outputs are left loaded in the model.
+        """
+        if not jobs:
+            return None
+        worker_pool = self._get_worker_pool(jobs[0])
+        all_succeeded = True
+        for number_completed, (job, result) in enumerate(worker_pool.run([(job, job.gsasii_call_args[2]) for job in jobs]), start=1):
+            self._restore_refinement_job(job)
+            self.output_state.out_call_gsas2 = result.output
+            self.output_state.err_call_gsas2 = result.error
+            if not result.success:
+                logger.error(f"GSAS-II refinement of {job.save_directories.project_name} failed with error: {result.error}")
+                all_succeeded = False
+                continue
+            logger.notice(f"GSAS-II refinement {number_completed} of {len(jobs)} complete: {job.save_directories.project_name}")
+            if not self._load_refinement_outputs(f"{result.runtime:.2f}"):
+                all_succeeded = False
+        if not all_succeeded:
             return None
-        runtime_str = runtime[1]  # Extract the string part of the runtime tuple
+        self._restore_refinement_job(jobs[-1])
+        return self.state.number_of_regions
+
+    def _load_refinement_outputs(self, runtime_str: str) -> bool:
         report_result = self.report_on_outputs(runtime_str)
-        if report_result is not None:
-            gsas_result_filepath, _ = report_result  # Unpack the tuple
-        else:
+        if report_result is None:
             logger.error("Failed to unpack the result from report_on_outputs.")
-            return None
-        gsas_result = gsas_result_filepath
-        if not gsas_result:
-            return None
-        self.load_basic_outputs(gsas_result)
+            return False
+        gsas_result_filepath, _ = report_result  # Unpack the tuple
+        if not gsas_result_filepath:
+            return False
+        self.load_basic_outputs(gsas_result_filepath)
+        return True
 
-        return self.state.number_of_regions
+    def _get_worker_pool(self, job: RefinementJob) -> GSAS2WorkerPool:
+        """
+        Returns the pool of GSAS-II workers, which is kept between runs unless the GSAS-II installation changes.
+        """
+        command = job.gsasii_call_args[:2]
+        env = self._prepare_gsas2_environment(job.gsas_binary_paths, job.gsasii_call_args[2])
+        if self._worker_pool is None or not self._worker_pool.matches(command, env):
+            if self._worker_pool is not None:
+                self._worker_pool.close()
+            number_of_workers = self.config.number_of_workers or max(1, (os.cpu_count() or 2) - 1)
+            self._worker_pool = GSAS2WorkerPool(command, env, number_of_workers, self.config.timeout)
+        self._worker_pool.timeout = self.config.timeout
+        return self._worker_pool
+
+    def close_worker_pool(self) -> None:
+        if self._worker_pool is not None:
+            self._worker_pool.close()
+            self._worker_pool = None
 
     # ===============
     # Prepare Inputs
@@ -329,6 +427,13 @@ class GSAS2Model:
         """
         Prepares and executes the GSAS-II subprocess call.
         """
+        gsasii_call_args, gsas_binary_paths = self._prepare_gsas2_call()
+        return self.call_subprocess(gsasii_call_args, gsas_binary_paths)
+
+    def _prepare_gsas2_call(self) -> Tuple[List[str], List[str]]:
+        """
+        Returns the command line of the GSAS-II call and the paths to the GSAS-II binaries.
+        """
         self._validate_required_attributes()
 
         save_directories = self._create_save_directories()
@@ -340,7 +445,7 @@ class GSAS2Model:
         serialized_inputs = gsas2_handler.to_json()
         gsasii_call_args = self._construct_gsasii_call(gsas2_handler, call_g2sc_path, serialized_inputs)
 
-        return self.call_subprocess(gsasii_call_args, gsas2_handler.python_binaries)
+        return gsasii_call_args, gsas2_handler.python_binaries
 
     def _validate_required_attributes(self) -> None:
         if not self.config.path_to_gsas2.strip():
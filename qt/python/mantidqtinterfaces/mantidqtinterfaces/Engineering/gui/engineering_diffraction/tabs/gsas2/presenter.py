@@ -29,6 +29,9 @@ class GSAS2Presenter(object):
         self.view.set_refine_clicked(self.on_refine_clicked)
         self.view.number_output_histograms_combobox.currentTextChanged.connect(self.on_plot_index_changed)
 
+    def handle_close(self):
+        self.model.close_worker_pool()
+
     def on_refine_clicked(self):
         self.clear_plot()
         load_params = self.view.get_load_parameters()
@@ -27,7 +27,12 @@ from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.call_
     export_refined_instrument_parameters,
     export_lattice_parameters,
     import_gsasii,
+    create_project,
+    run_worker,
+    WORKER_RESULT_PREFIX,
 )
+import io
+import json
 
 import numpy as np
 from pathlib import Path
@@ -242,6 +247,40 @@ class GSAS2ViewTest(unittest.TestCase):
             str_2 = file.read()
             self.assertEqual(str_2, """{"Microstrain":10}""")
 
+    def test_create_project_reads_phases_once_with_templates(self):
+        G2sc = mock.Mock()
+        G2sc.G2Project.side_effect = lambda filename=None, gpxfile=None: mock.Mock(filename=filename, gpxfile=gpxfile)
+        phase_templates = {"directory": self.temp_save_directory, "projects": {}}
+
+        with mock.patch(f"{create_project.__module__}.shutil.copyfile") as mock_copy:
+            first = create_project(G2sc, "first.gpx", ["phase.cif"], phase_templates)
+            second = create_project(G2sc, "second.gpx", ["phase.cif"], phase_templates)
+
+        template_path = os.path.join(self.temp_save_directory, "phases_0.gpx")
+        self.assertEqual(phase_templates["projects"], {("phase.cif",): template_path})
+        # the phases are added to the template project only
+        template_project = G2sc.G2Project.call_args_list[0]
+        self.assertEqual(template_project, mock.call(filename=template_path))
+        self.assertEqual(G2sc.G2Project.call_count, 3)
+        mock_copy.assert_has_calls([mock.call(template_path, "first.gpx"), mock.call(template_path, "second.gpx")])
+        self.assertEqual((first.gpxfile, second.gpxfile), ("first.gpx", "second.gpx"))
+
+    def test_run_worker_reports_result_of_each_job(self):
+        jobs = [{"gsasii_scriptable_path": "G2sc.py", "job": 1}, {"gsasii_scriptable_path": "G2sc.py", "job": 2}]
+        input_stream = io.StringIO("".join(json.dumps(job) + "\n" for job in jobs))
+        output_stream = io.StringIO()
+        module = create_project.__module__
+
+        with mock.patch(f"{module}.import_gsasii") as mock_import, mock.patch(f"{module}.run_refinement") as mock_refine:
+            mock_refine.side_effect = [None, RuntimeError("refinement failed")]
+            run_worker(input_stream, output_stream)
+
+        mock_import.assert_called_once_with(Path("G2sc.py"))
+        self.assertEqual([call.args[1] for call in mock_refine.call_args_list], jobs)
+        results = [json.loads(line[len(WORKER_RESULT_PREFIX) :]) for line in output_stream.getvalue().splitlines()]
+        self.assertEqual([result["success"] for result in results], [True, False])
+        self.assertEqual(results[1]["error"], "RuntimeError: refinement failed")
+
 
 class TestLimitedRglob(unittest.TestCase):
     def setUp(self):
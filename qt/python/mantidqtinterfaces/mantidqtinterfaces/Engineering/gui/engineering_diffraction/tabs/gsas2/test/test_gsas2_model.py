@@ -153,6 +153,55 @@ class TestGSAS2Model(unittest.TestCase):
         self.model.run_model(load_parameters, refinement_parameters, "test_project", user_x_limits=unformatted_user_x_limits)
         mock_validate_x_limits.assert_called_once_with([[17522.26], [42558.08]])
 
+    def _make_refinement_job(self, project_name, number_of_regions):
+        job = MagicMock()
+        job.save_directories.project_name = project_name
+        job.state.number_of_regions = number_of_regions
+        job.gsasii_call_args = ["python", "call_G2sc.py", project_name]
+        return job
+
+    @patch(model_path + ".GSAS2Model._load_refinement_outputs", return_value=True)
+    @patch(model_path + ".GSAS2Model._get_worker_pool")
+    def test_run_refinements_loads_outputs_as_each_refinement_completes(self, mock_get_pool, mock_load_outputs):
+        jobs = [self._make_refinement_job("project_1", 1), self._make_refinement_job("project_2", 2)]
+        loaded_projects = []
+        mock_load_outputs.side_effect = lambda runtime: loaded_projects.append(self.model.save_directories.project_name) or True
+        result = MagicMock(success=True, runtime=1.0)
+        mock_get_pool.return_value.run.return_value = iter([(jobs[1], result), (jobs[0], result)])
+
+        number_of_histograms = self.model._run_refinements(jobs)
+
+        mock_get_pool.return_value.run.assert_called_once_with([(jobs[0], "project_1"), (jobs[1], "project_2")])
+        self.assertEqual(loaded_projects, ["project_2", "project_1"])
+        # the last file is left loaded for plotting
+        self.assertEqual(number_of_histograms, 2)
+        self.assertEqual(self.model.save_directories.project_name, "project_2")
+
+    @patch(model_path + ".GSAS2Model._load_refinement_outputs", return_value=True)
+    @patch(model_path + ".GSAS2Model._get_worker_pool")
+    def test_run_refinements_returns_none_if_a_refinement_fails(self, mock_get_pool, mock_load_outputs):
+        jobs = [self._make_refinement_job("project_1", 1), self._make_refinement_job("project_2", 1)]
+        mock_get_pool.return_value.run.return_value = iter(
+            [(jobs[0], MagicMock(success=False, error="failed")), (jobs[1], MagicMock(success=True, runtime=1.0))]
+        )
+
+        self.assertIsNone(self.model._run_refinements(jobs))
+        mock_load_outputs.assert_called_once()
+
+    @patch(model_path + ".GSAS2Model._get_worker_pool")
+    def test_run_refinements_returns_none_without_jobs(self, mock_get_pool):
+        self.assertIsNone(self.model._run_refinements([]))
+        mock_get_pool.assert_not_called()
+
+    def test_clear_input_components_keeps_number_of_workers(self):
+        self.model.config.number_of_workers = 3
+        self.model.config.path_to_gsas2 = "path/to/gsas2"
+
+        self.model.clear_input_components()
+
+        self.assertEqual(self.model.config.number_of_workers, 3)
+        self.assertEqual(self.model.config.path_to_gsas2, "")
+
     def test_further_validation(self):
         self.model.x_limits.limits = []
         self.model.refinement_method = "Rietveld"
@@ -71,6 +71,11 @@ class TestGSAS2Presenter(unittest.TestCase):
         self.assertEqual(self.view.set_number_histograms.call_count, 0)
         self.assertEqual(mock_save_load.call_count, 0)
 
+    def test_handle_close_closes_worker_pool(self):
+        self.presenter.handle_close()
+
+        self.model.close_worker_pool.assert_called_once()
+
     @patch(presenter_path + ".presenter.GSAS2Presenter.plot_result")
     def test_on_plot_index_changed(self, mock_plot_result):
         self.presenter.current_plot_index = 1
@@ -0,0 +1,102 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.call_G2sc import WORKER_RESULT_PREFIX
+from mantidqtinterfaces.Engineering.gui.engineering_diffraction.tabs.gsas2.gsas2_worker_pool import GSAS2WorkerPool
+
+# Stands in for call_G2sc.py in worker mode: reports its process id as the error of each successful job
+FAKE_WORKER = f"""
+import json
+import os
+import sys
+import time
+
+for line in sys.stdin:
+    job = json.loads(line)
+    print("refining", job["name"], flush=True)
+    if job.get("crash"):
+        sys.exit(1)
+    time.sleep(job.get("sleep", 0.0))
+    result = {{"success": not job.get("fail", False), "error": str(os.getpid()), "runtime": 0.5}}
+    print("{WORKER_RESULT_PREFIX}" + json.dumps(result), flush=True)
+"""
+
+
+class GSAS2WorkerPoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_directory = tempfile.mkdtemp()
+        cls.worker_script = os.path.join(cls.temp_directory, "fake_worker.py")
+        with open(cls.worker_script, "w") as file:
+            file.write(FAKE_WORKER)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls.temp_directory)
+
+    def setUp(self):
+        self.pool = GSAS2WorkerPool([sys.executable, self.worker_script], dict(os.environ), number_of_workers=2, timeout=10)
+
+    def tearDown(self):
+        self.pool.close()
+
+    @staticmethod
+    def _job(name, **options):
+        return name, json.dumps(dict(name=name, **options))
+
+    def test_all_results_are_returned_with_their_output(self):
+        results = dict(self.pool.run([self._job(f"file_{index}") for index in range(5)]))
+
+        self.assertEqual(sorted(results.keys()), [f"file_{index}" for index in range(5)])
+        for name, result in results.items():
+            self.assertTrue(result.success)
+            self.assertEqual(result.runtime, 0.5)
+            self.assertEqual(result.output, f"refining {name}\n")
+
+    def test_results_are_returned_as_they_complete(self):
+        results = [name for name, _ in self.pool.run([self._job("slow", sleep=1.0), self._job("fast")])]
+
+        self.assertEqual(results, ["fast", "slow"])
+
+    def test_workers_are_reused_between_runs(self):
+        first_pids = {result.error for _, result in self.pool.run([self._job("a", sleep=0.2), self._job("b", sleep=0.2)])}
+        second_pids = {result.error for _, result in self.pool.run([self._job("c", sleep=0.2), self._job("d", sleep=0.2)])}
+
+        self.assertEqual(len(first_pids), 2)
+        self.assertEqual(first_pids, second_pids)
+
+    def test_failed_refinement_is_reported(self):
+        results = dict(self.pool.run([self._job("good"), self._job("bad", fail=True)]))
+
+        self.assertTrue(results["good"].success)
+        self.assertFalse(results["bad"].success)
+
+    def test_crashed_worker_is_replaced(self):
+        results = dict(self.pool.run([self._job("crash", crash=True), self._job("after_1"), self._job("after_2"), self._job("after_3")]))
+
+        self.assertFalse(results["crash"].success)
+        self.assertEqual(results["crash"].error, "GSAS-II worker process exited unexpectedly.")
+        self.assertEqual(results["crash"].output, "refining crash\n")
+        self.assertTrue(all(results[f"after_{index}"].success for index in range(1, 4)))
+
+    def test_refinement_is_aborted_after_timeout(self):
+        self.pool.timeout = 0.5
+
+        results = dict(self.pool.run([self._job("stuck", sleep=30.0)]))
+
+        self.assertFalse(results["stuck"].success)
+        self.assertIn("did not complete after 0.5 seconds", results["stuck"].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,7 @@ import os
 
 class ProjectionModel(TextureProjection):
     def __init__(self):
+        super().__init__()
         self.out_ws = None
         self.hkl = None
         self.projection_method = None
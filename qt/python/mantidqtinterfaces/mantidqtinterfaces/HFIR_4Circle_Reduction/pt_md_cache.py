@@ -0,0 +1,193 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+################################################################################
+#
+# Convert the Pts of a scan to Q-sample MDEventWorkspaces in parallel, cache
+# each of them on disk and merge them, so that merging a scan only converts
+# the Pts which have not been converted before
+#
+################################################################################
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import mantid.simpleapi as mantidsimple
+from mantid.api import AnalysisDataService
+
+# ConvertCWSDExpToMomentum properties that the Q-sample events depend on
+CALIBRATION_PROPERTIES = ["DetectorSampleDistanceShift", "DetectorCenterXShift", "DetectorCenterYShift", "UserDefinedWavelength"]
+
+# columns of the table workspace from CollectHB3AExperimentInfo
+SCAN_COLUMN = 0
+PT_COLUMN = 1
+FILE_NAME_COLUMN = 2
+
+
+class PtMDCache(object):
+    """
+    On-disk cache of the Pts converted to Q-sample MDEventWorkspaces.
+    A cached Pt is identified by its experiment, scan and Pt numbers, the detector calibration
+    and the path, modification time and size of its detector XML file.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        initialization
+        :param cache_dir: directory of the cached MD files
+        """
+        assert isinstance(cache_dir, str), "Cache directory {0} must be a string but not a {1}".format(cache_dir, type(cache_dir))
+        self._cacheDir = cache_dir
+
+        return
+
+    def get_file_name(self, exp_number, scan_number, pt_number, data_file, calibration):
+        """
+        get the name of the cache file of a Pt
+        :param exp_number:
+        :param scan_number:
+        :param pt_number:
+        :param data_file: detector XML file of the Pt
+        :param calibration: dictionary of the detector calibration
+        :return: file name or None if the data file does not exist
+        """
+        try:
+            stat = os.stat(data_file)
+        except OSError:
+            return None
+
+        key = json.dumps(
+            {
+                "exp": exp_number,
+                "scan": scan_number,
+                "pt": pt_number,
+                "calibration": calibration,
+                "file": [os.path.abspath(data_file), stat.st_mtime, stat.st_size],
+            },
+            sort_keys=True,
+        )
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(self._cacheDir, "HB3A_Exp{0}_Scan{1}_Pt{2}_{3}.nxs".format(exp_number, scan_number, pt_number, digest))
+
+    @staticmethod
+    def load(file_name, ws_name):
+        """
+        load a cached Pt
+        :param file_name:
+        :param ws_name: output MDEventWorkspace name
+        :return: True if the Pt is loaded from the cache
+        """
+        if file_name is None or not os.path.isfile(file_name):
+            return False
+        try:
+            mantidsimple.LoadMD(Filename=file_name, OutputWorkspace=ws_name, LoadHistory=False)
+        except (RuntimeError, ValueError):
+            return False
+
+        return True
+
+    def save(self, ws_name, file_name):
+        """
+        save a converted Pt to the cache. Failing to save it only means that it is converted again next time.
+        :param ws_name:
+        :param file_name:
+        :return:
+        """
+        if file_name is None:
+            return
+        try:
+            if not os.path.isdir(self._cacheDir):
+                os.makedirs(self._cacheDir)
+            mantidsimple.SaveMD(InputWorkspace=ws_name, Filename=file_name, SaveHistory=False)
+        except (OSError, RuntimeError, ValueError) as save_error:
+            print("[WARNING] Unable to cache {0} to {1}: {2}".format(ws_name, file_name, save_error))
+
+        return
+
+
+def merge_pts(pt_ws_names, out_ws_name):
+    """
+    Merge the Pts converted to Q-sample one by one into a single MDEventWorkspace.
+    ConvertCWSDExpToMomentum sets the experiment info index of the events of a Pt to its Pt number, which
+    IntegratePeaksCWSD maps back to the Pt's monitor counts and peak center. MergeMD would shift the index of the
+    events of every workspace but the first, so the events are added with PlusMD, which keeps it, and the experiment
+    info of each Pt, which PlusMD does not copy, is added afterwards in the order of the Pts.
+    :param pt_ws_names: names of the MDEventWorkspaces of the Pts, which are consumed
+    :param out_ws_name:
+    :return:
+    """
+    assert len(pt_ws_names) > 0, "At least one Pt must be given"
+    mantidsimple.RenameWorkspace(InputWorkspace=pt_ws_names[0], OutputWorkspace=out_ws_name)
+    for pt_ws_name in pt_ws_names[1:]:
+        mantidsimple.PlusMD(LHSWorkspace=out_ws_name, RHSWorkspace=pt_ws_name, OutputWorkspace=out_ws_name)
+
+    out_ws = AnalysisDataService.retrieve(out_ws_name)
+    for pt_ws_name in pt_ws_names[1:]:
+        pt_ws = AnalysisDataService.retrieve(pt_ws_name)
+        for exp_info_index in range(pt_ws.getNumExperimentInfo()):
+            out_ws.addExperimentInfo(pt_ws.getExperimentInfo(exp_info_index))
+        mantidsimple.DeleteWorkspace(Workspace=pt_ws_name)
+
+    return
+
+
+def convert_pts_to_momentum(exp_number, convert_args, pt_cache=None, max_workers=None):
+    """
+    Convert the Pts listed in a scan information table to Q-sample one by one in parallel, or load them from the
+    cache, and merge them into a single MDEventWorkspace
+    :param exp_number:
+    :param convert_args: ConvertCWSDExpToMomentum arguments with the scan information table as InputWorkspace
+    :param pt_cache: PtMDCache or None for not caching
+    :param max_workers: maximum number of Pts converted at the same time. None for the number of cores
+    :return: number of Pts loaded from the cache
+    """
+    table_name = convert_args["InputWorkspace"]
+    out_ws_name = convert_args["OutputWorkspace"]
+    scan_table = AnalysisDataService.retrieve(table_name)
+    num_rows = scan_table.rowCount()
+    if num_rows == 0:
+        raise RuntimeError("Scan information table {0} does not have any Pt.".format(table_name))
+    calibration = dict((name, convert_args[name]) for name in CALIBRATION_PROPERTIES if name in convert_args)
+
+    def convert_pt(row_index):
+        scan_number = int(scan_table.cell(row_index, SCAN_COLUMN))
+        pt_number = int(scan_table.cell(row_index, PT_COLUMN))
+        pt_ws_name = "{0}_Pt{1}".format(out_ws_name, pt_number)
+        cache_file = None
+        if pt_cache is not None:
+            data_file = os.path.join(convert_args.get("Directory", ""), scan_table.cell(row_index, FILE_NAME_COLUMN))
+            cache_file = pt_cache.get_file_name(exp_number, scan_number, pt_number, data_file, calibration)
+            if pt_cache.load(cache_file, pt_ws_name):
+                return pt_ws_name, True
+
+        # table with this Pt only
+        pt_table_name = "{0}_Pt{1}".format(table_name, pt_number)
+        mantidsimple.CloneWorkspace(InputWorkspace=table_name, OutputWorkspace=pt_table_name)
+        other_rows = [row for row in range(num_rows) if row != row_index]
+        if other_rows:
+            mantidsimple.DeleteTableRows(TableWorkspace=pt_table_name, Rows=other_rows)
+        pt_args = dict(convert_args)
+        pt_args["InputWorkspace"] = pt_table_name
+        pt_args["OutputWorkspace"] = pt_ws_name
+        try:
+            mantidsimple.ConvertCWSDExpToMomentum(**pt_args)
+        finally:
+            mantidsimple.DeleteWorkspace(Workspace=pt_table_name)
+
+        if pt_cache is not None:
+            pt_cache.save(pt_ws_name, cache_file)
+
+        return pt_ws_name, False
+
+    # convert the Pts in parallel but keep their order for merging
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(convert_pt, range(num_rows)))
+
+    merge_pts([pt_ws_name for pt_ws_name, _ in results], out_ws_name)
+
+    return sum(1 for _, from_cache in results if from_cache)
@@ -63,6 +63,7 @@ from mantidqtinterfaces.HFIR_4Circle_Reduction import project_manager
 from mantidqtinterfaces.HFIR_4Circle_Reduction import peak_integration_utility
 from mantidqtinterfaces.HFIR_4Circle_Reduction import absorption
 from mantidqtinterfaces.HFIR_4Circle_Reduction import process_mask
+from mantidqtinterfaces.HFIR_4Circle_Reduction import pt_md_cache
 
 import mantid
 import mantid.simpleapi as mantidsimple
@@ -143,6 +144,9 @@ class CWSCDReductionControl(object):
         self._preprocessedDir = None
         # dictionary for pre-processed scans.  key = scan number, value = dictionary for all kinds of information
         self._preprocessedInfoDict = None
+        # Pts converted to Q-sample are cached in this directory (None for not caching) and converted in parallel
+        self._ptCacheDir = None
+        self._mergePtWorkers = None
 
         self._myServerURL = ""
 
@@ -2695,8 +2699,11 @@ class CWSCDReductionControl(object):
                 if exp_no in self._userWavelengthDict:
                     alg_args["UserDefinedWavelength"] = self._userWavelengthDict[exp_no]
 
-                # call:
-                mantidsimple.ConvertCWSDExpToMomentum(**alg_args)
+                # call: convert Pts in parallel, reusing the ones cached in previous merges
+                pt_cache = self._get_pt_md_cache()
+                num_cached = pt_md_cache.convert_pts_to_momentum(exp_no, alg_args, pt_cache=pt_cache, max_workers=self._mergePtWorkers)
+                if num_cached > 0:
+                    print("[INFO] Exp {0} Scan {1}: {2} Pts are loaded from cache.".format(exp_no, scan_no, num_cached))
 
                 self._myMDWsList.append(out_q_name)
             except (RuntimeError, ValueError) as e:
@@ -3147,6 +3154,53 @@ class CWSCDReductionControl(object):
 
         return True, ""
 
+    def set_pt_cache_directory(self, cache_dir):
+        """
+        Set up the directory where the Pts converted to Q-sample MDEventWorkspaces are cached.
+        The Pts are not cached until a directory is set.
+        :param cache_dir: directory or None for not caching the Pts
+        :return: (boolean, string)
+        """
+        if cache_dir is None:
+            self._ptCacheDir = None
+            return True, ""
+        assert isinstance(cache_dir, str), "Pt cache directory {0} must be a string but not a {1}".format(cache_dir, type(cache_dir))
+
+        if os.path.exists(cache_dir) is False:
+            try:
+                os.mkdir(cache_dir)
+            except OSError as os_err:
+                return False, "Unable to create Pt cache directory %s due to %s." % (cache_dir, str(os_err))
+        elif os.access(cache_dir, os.W_OK) is False:
+            return False, "User specified Pt cache directory %s is not writable." % cache_dir
+
+        self._ptCacheDir = cache_dir
+
+        return True, ""
+
+    def _get_pt_md_cache(self):
+        """
+        get the cache of the Pts converted to Q-sample
+        :return: PtMDCache or None if the Pts are not cached
+        """
+        if self._ptCacheDir is None:
+            return None
+
+        return pt_md_cache.PtMDCache(self._ptCacheDir)
+
+    def set_merge_pt_workers(self, num_workers):
+        """
+        Set up the maximum number of Pts converted to Q-sample at the same time when merging a scan
+        :param num_workers: number of workers or None for the number of cores
+        :return:
+        """
+        assert num_workers is None or (isinstance(num_workers, int) and num_workers > 0), (
+            "Number of workers {0} must be a positive integer or None".format(num_workers)
+        )
+        self._mergePtWorkers = num_workers
+
+        return
+
     def set_instrument_name(self, instrument_name):
         """
         Set instrument name
@@ -10,8 +10,8 @@ from mantidqtinterfaces.Muon.GUI.Common.muon_pair import MuonPair
 from typing import Iterable
 
 
-def calculate_group_data(context, group, run, workspace_name, periods):
-    processed_data = get_pre_process_workspace_name(run, context.data_context.instrument)
+def calculate_group_data(context, group, run, workspace_name, periods, rebin=False):
+    processed_data = get_pre_process_workspace_name(run, context.data_context.instrument, rebin)
 
     params = _get_MuonGroupingCounts_parameters(group, periods)
     params["InputWorkspace"] = processed_data
@@ -38,19 +38,20 @@ def estimate_group_asymmetry_data(context, group, run, workspace_name, unormalis
     return group_asymmetry, group_asymmetry_unnorm
 
 
-def run_pre_processing(context, run, rebin):
-    params = _get_pre_processing_params(context, run, rebin)
+def run_pre_processing(context, run, rebin, params=None):
+    params = dict(get_pre_processing_params(context, run, rebin) if params is None else params)
     params["InputWorkspace"] = context.data_context.loaded_workspace_as_group(run)
     processed_data = algorithm_utils.run_MuonPreProcess(params)
     return processed_data
 
 
-def get_pre_process_workspace_name(run: Iterable[int], instrument: str) -> str:
-    workspace_name = "".join(["__", instrument, run_list_to_string(run), "_pre_processed_data"])
+def get_pre_process_workspace_name(run: Iterable[int], instrument: str, rebin: bool = False) -> str:
+    # the rebinned data is kept separately, so that it does not replace the data which is not rebinned
+    workspace_name = "".join(["__", instrument, run_list_to_string(run), "_pre_processed_data", "_rebinned" if rebin else ""])
     return workspace_name
 
 
-def _get_pre_processing_params(context, run, rebin):
+def get_pre_processing_params(context, run, rebin):
     pre_process_params = {}
 
     try:
@@ -81,7 +82,7 @@ def _get_pre_processing_params(context, run, rebin):
     except KeyError:
         pass
 
-    pre_process_params["OutputWorkspace"] = get_pre_process_workspace_name(run, context.data_context.instrument)
+    pre_process_params["OutputWorkspace"] = get_pre_process_workspace_name(run, context.data_context.instrument, rebin)
 
     return pre_process_params
 
@@ -20,7 +20,6 @@ from mantidqtinterfaces.Muon.GUI.Common.calculate_pair_and_group import (
     calculate_group_data,
     calculate_pair_data,
     estimate_group_asymmetry_data,
-    run_pre_processing,
 )
 from mantidqtinterfaces.Muon.GUI.Common.utilities.run_string_utils import run_list_to_string, run_string_to_list
 from mantidqtinterfaces.Muon.GUI.Common.utilities.algorithm_utils import (
@@ -45,6 +44,7 @@ from mantidqt.utils.observer_pattern import Observable
 from mantidqtinterfaces.Muon.GUI.Common.muon_base import MuonRun
 from mantidqtinterfaces.Muon.GUI.Common.muon_pair import MuonPair
 from mantidqtinterfaces.Muon.GUI.Common.muon_diff import MuonDiff
+from mantidqtinterfaces.Muon.GUI.Common.muon_grouping_engine import MuonGroupingEngine
 from typing import List
 from mantid.dataobjects import TableWorkspace
 
@@ -76,6 +76,7 @@ class MuonContext(object):
         self.base_directory = base_directory
         self.workspace_suffix = workspace_suffix
         self._plot_panes_context = plot_panes_context
+        self._grouping_engine = MuonGroupingEngine()
         self.ads_observer = MuonADSObserver(self.remove_workspace, self.clear_context, self.workspace_replaced)
 
         self.gui_context.update({"LastGoodDataFromFile": True, "selected_group_pair": ""})
@@ -125,7 +126,7 @@ class MuonContext(object):
     def _calculate_counts(self, run, group, periods, run_as_string, periods_as_string, rebin):
         """Calculates the counts workspace for the given run and group."""
         output_name = get_group_data_workspace_name(self, group.name, run_as_string, periods_as_string, rebin=rebin)
-        return calculate_group_data(self, group, run, output_name, periods)
+        return calculate_group_data(self, group, run, output_name, periods, rebin)
 
     def calculate_asymmetry(self, run, group, rebin=False):
         """Calculates the asymmetry workspaces for the given run and group."""
@@ -228,10 +229,11 @@ class MuonContext(object):
             self._calculate_all_counts(rebin=True)
 
     def _calculate_all_counts(self, rebin):
+        groups = self._group_pair_context.groups
         for run in self._data_context.current_runs:
-            run_pre_processing(context=self, run=run, rebin=rebin)
-            for group in self._group_pair_context.groups:
-                counts_workspace = self.calculate_counts(run, group, rebin)
+            counts_workspaces = self._grouping_engine.calculate_all_counts(self, run, groups, rebin)
+            for group in groups:
+                counts_workspace = counts_workspaces.get(group.name)
 
                 if not counts_workspace:
                     continue
@@ -573,6 +575,7 @@ class MuonContext(object):
         self.deleted_plots_notifier.notify_subscribers(workspace)
 
     def clear_context(self):
+        self._grouping_engine.clear()
         self.data_context.clear()
         self.group_pair_context.clear()
         self.phase_context.clear()
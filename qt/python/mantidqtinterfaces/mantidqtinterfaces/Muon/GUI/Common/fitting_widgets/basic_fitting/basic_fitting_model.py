@@ -7,6 +7,7 @@
 from mantid import AlgorithmManager, logger
 from mantid.api import CompositeFunction, IAlgorithm, IFunction
 from mantid.simpleapi import CopyLogs
+from mantidqt.utils.observer_pattern import GenericObservable
 from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_group_definition import add_list_to_group
 
 from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import check_if_workspace_exist, retrieve_ws, make_group
@@ -38,7 +39,10 @@ from mantidqtinterfaces.Muon.GUI.Common.utilities.workspace_utils import StaticW
 
 import math
 import numpy as np
+import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, NamedTuple
 
 DEFAULT_CHI_SQUARED = 0.0
@@ -78,6 +82,12 @@ class BasicFittingModel:
         self.context = context
         self.fitting_context = fitting_context
 
+        # Notified with (row index, function, fit status, chi squared) each time a row of a sequential fit has finished
+        self.sequential_fit_row_finished_notifier = GenericObservable()
+        # Fits running in parallel add their results to the ADS and context one at a time
+        self._fit_results_lock = threading.Lock()
+        self.max_parallel_fits = os.cpu_count()
+
     @property
     def current_dataset_index(self) -> int:
         """Returns the index of the currently selected dataset."""
@@ -692,7 +702,10 @@ class BasicFittingModel:
             covariance_matrix,
         ) = self._do_single_fit_and_return_workspace_parameters_and_fit_function(parameters)
 
-        self._add_single_fit_results_to_ADS_and_context(parameters["InputWorkspace"], parameter_table, output_workspace, covariance_matrix)
+        with self._fit_results_lock:
+            self._add_single_fit_results_to_ADS_and_context(
+                parameters["InputWorkspace"], parameter_table, output_workspace, covariance_matrix
+            )
         return function, fit_status, chi_squared
 
     def _do_single_fit_and_return_workspace_parameters_and_fit_function(self, parameters: dict) -> tuple:
@@ -1036,15 +1049,22 @@ class BasicFittingModel:
         self._set_fit_function_parameter_values(single_fit_function, parameter_values)
         return single_fit_function
 
-    @staticmethod
-    def _evaluate_sequential_fit(fitting_func, workspace_names: list, parameter_values: list, use_initial_values: bool = False):
-        """Evaluates a sequential fit using the provided fitting func. The workspace_names is either a 1D or 2D list."""
+    def _evaluate_sequential_fit(self, fitting_func, workspace_names: list, parameter_values: list, use_initial_values: bool = False):
+        """Evaluates a sequential fit using the provided fitting func. The workspace_names is either a 1D or 2D list.
+
+        When the initial values are used for each fit, the fits are independent and run in parallel. Otherwise, each fit
+        starts from the parameters at the end of the previous fit and they run one after the other.
+        """
+        if use_initial_values and len(workspace_names) > 1:
+            return self._evaluate_independent_sequential_fits(fitting_func, workspace_names, parameter_values)
+
         functions, fit_statuses, chi_squared_list = [], [], []
 
         for row_index, row_workspaces in enumerate(workspace_names):
             function, fit_status, chi_squared = fitting_func(
                 row_index, row_workspaces, parameter_values[row_index], functions, use_initial_values
             )
+            self.sequential_fit_row_finished_notifier.notify_subscribers((row_index, function, fit_status, chi_squared))
 
             functions.append(function)
             fit_statuses.append(fit_status)
@@ -1052,6 +1072,24 @@ class BasicFittingModel:
 
         return functions, fit_statuses, chi_squared_list
 
+    def _evaluate_independent_sequential_fits(self, fitting_func, workspace_names: list, parameter_values: list):
+        """Evaluates the fits of a sequential fit in parallel, where each fit starts from its own initial values.
+        The results are returned in row order."""
+        results = [None] * len(workspace_names)
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_fits) as executor:
+            futures = {
+                executor.submit(fitting_func, row_index, row_workspaces, parameter_values[row_index], [], True): row_index
+                for row_index, row_workspaces in enumerate(workspace_names)
+            }
+            for future in as_completed(futures):
+                row_index = futures[future]
+                results[row_index] = future.result()
+                self.sequential_fit_row_finished_notifier.notify_subscribers((row_index, *results[row_index]))
+
+        functions, fit_statuses, chi_squared_list = (list(values) for values in zip(*results))
+        return functions, fit_statuses, chi_squared_list
+
     def _update_fit_functions_after_sequential_fit(self, workspaces: list, functions: list) -> None:
         """Updates the fit functions after a sequential fit has been run on the Sequential fitting tab."""
         dataset_names = self.fitting_context.dataset_names
@@ -339,9 +339,10 @@ class GeneralFittingModel(BasicFittingModel):
             covariance_matrix,
         ) = self._do_simultaneous_fit_and_return_workspace_parameters_and_fit_function(parameters)
 
-        self._add_simultaneous_fit_results_to_ADS_and_context(
-            parameters["InputWorkspace"], parameter_table, output_group_workspace, covariance_matrix, global_parameters
-        )
+        with self._fit_results_lock:
+            self._add_simultaneous_fit_results_to_ADS_and_context(
+                parameters["InputWorkspace"], parameter_table, output_group_workspace, covariance_matrix, global_parameters
+            )
         return function, fit_status, chi_squared
 
     def _do_simultaneous_fit_and_return_workspace_parameters_and_fit_function(self, parameters: dict) -> tuple:
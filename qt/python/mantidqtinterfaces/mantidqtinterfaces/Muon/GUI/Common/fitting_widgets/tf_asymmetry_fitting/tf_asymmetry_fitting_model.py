@@ -564,7 +564,8 @@ class TFAsymmetryFittingModel(GeneralFittingModel):
 
         dataset_name = parameters["ReNormalizedWorkspaceList"]
         CopyLogs(InputWorkspace=dataset_name, OutputWorkspace=output_workspace, StoreInADS=False)
-        self._add_single_fit_results_to_ADS_and_context(dataset_name, parameter_table, output_workspace, covariance_matrix)
+        with self._fit_results_lock:
+            self._add_single_fit_results_to_ADS_and_context(dataset_name, parameter_table, output_workspace, covariance_matrix)
         return function, fit_status, chi_squared
 
     def _do_tf_asymmetry_simultaneous_fit(self, parameters: dict, global_parameters: list) -> tuple:
@@ -573,9 +574,10 @@ class TFAsymmetryFittingModel(GeneralFittingModel):
 
         dataset_names = parameters["ReNormalizedWorkspaceList"]
         self._copy_logs(dataset_names, output_workspace)
-        self._add_simultaneous_fit_results_to_ADS_and_context(
-            dataset_names, parameter_table, output_workspace, covariance_matrix, global_parameters
-        )
+        with self._fit_results_lock:
+            self._add_simultaneous_fit_results_to_ADS_and_context(
+                dataset_names, parameter_table, output_workspace, covariance_matrix, global_parameters
+            )
         return function, fit_status, chi_squared
 
     def _run_tf_asymmetry_fit(self, parameters: dict) -> tuple:
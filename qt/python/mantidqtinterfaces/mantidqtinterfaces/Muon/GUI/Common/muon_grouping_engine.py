@@ -0,0 +1,162 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import numpy as np
+from scipy import sparse
+
+from mantid.api import WorkspaceFactory
+from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import add_ws_to_ads, check_if_workspace_exist, retrieve_ws
+from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.workspace_naming import get_group_data_workspace_name
+from mantidqtinterfaces.Muon.GUI.Common.calculate_pair_and_group import get_pre_processing_params, run_pre_processing
+from mantidqtinterfaces.Muon.GUI.Common.utilities.run_string_utils import run_list_to_string
+
+
+class PreProcessedRun(object):
+    """
+    The pre-processed data of a run, together with what it was calculated from and the
+    counts of the groups calculated from it, keyed by the detectors and period of the group.
+    """
+
+    def __init__(self, workspace_name, signature, loaded_data):
+        self.workspace_name = workspace_name
+        self.signature = signature
+        self.loaded_data = loaded_data
+        self.group_counts = {}
+
+    def period_workspace(self, period):
+        return retrieve_ws(self.workspace_name).getItem(period - 1)
+
+
+class MuonGroupingEngine(object):
+    """
+    Calculates the counts workspaces of all the groups of a run at once. The counts of the groups
+    are the product of a sparse group x spectrum matrix with the detector count matrix of the
+    pre-processed data, rather than one MuonGroupingCounts per group.
+
+    MuonPreProcess is only run again for a run when its parameters, the loaded data or the dead
+    time table have changed, and only the groups whose detectors or period have changed since
+    are calculated again. The counts workspaces are always written so that they do not contain
+    any background correction applied to them before.
+    """
+
+    def __init__(self):
+        self._pre_processed_runs = {}
+
+    def clear(self):
+        self._pre_processed_runs = {}
+
+    def calculate_all_counts(self, context, run, groups, rebin):
+        """
+        Calculates the counts workspaces of the groups for a run.
+        :return: a dictionary of group name to counts workspace name. Groups without any period in
+        the run are left out.
+        """
+        pre_processed_run = self._pre_process(context, run, rebin)
+
+        # A user requirement is that processing can continue if a period is missing from some
+        # of the runs. This filters out periods which are not in a given run.
+        num_periods = context.num_periods(run)
+        single_period_groups = []
+        counts_workspaces = {}
+        for group in groups:
+            periods = [period for period in group.periods if period <= num_periods]
+            if len(periods) == 1:
+                single_period_groups.append((group, periods[0]))
+            elif periods:
+                # Summing periods also merges their sample logs, which is left to MuonGroupingCounts
+                counts_workspaces[group.name] = context.calculate_counts(run, group, rebin)
+
+        keys = list(dict.fromkeys((tuple(group.detectors), period) for group, period in single_period_groups))
+        for period in sorted(set(period for _, period in keys)):
+            new_detectors = [detectors for detectors, key_period in keys if key_period == period]
+            new_detectors = [detectors for detectors in new_detectors if (detectors, period) not in pre_processed_run.group_counts]
+            if new_detectors:
+                self._calculate_group_counts(pre_processed_run, period, new_detectors)
+        pre_processed_run.group_counts = {key: pre_processed_run.group_counts[key] for key in keys}
+
+        run_as_string = run_list_to_string(run)
+        for group, period in single_period_groups:
+            output_name = get_group_data_workspace_name(context, group.name, run_as_string, run_list_to_string(group.periods), rebin=rebin)
+            self._create_counts_workspace(pre_processed_run, group, period, output_name)
+            counts_workspaces[group.name] = output_name
+
+        return counts_workspaces
+
+    def _pre_process(self, context, run, rebin):
+        """Runs MuonPreProcess for the run, unless the data it was last run for is still valid."""
+        params = get_pre_processing_params(context, run, rebin)
+        signature = (tuple(sorted(params.items())), _get_table_values(params.get("DeadTimeTable")))
+        loaded_data = context.data_context.get_loaded_data_for_run(run)
+
+        key = (tuple(run), rebin)
+        pre_processed_run = self._pre_processed_runs.get(key)
+        if (
+            pre_processed_run is None
+            or pre_processed_run.signature != signature
+            or pre_processed_run.loaded_data is not loaded_data
+            or not check_if_workspace_exist(pre_processed_run.workspace_name)
+        ):
+            workspace_name = run_pre_processing(context, run, rebin, params)
+            pre_processed_run = PreProcessedRun(workspace_name, signature, loaded_data)
+            self._pre_processed_runs[key] = pre_processed_run
+        return pre_processed_run
+
+    @staticmethod
+    def _calculate_group_counts(pre_processed_run, period, detector_groups):
+        """Calculates the counts of several groups of detectors in a period with a single matrix product."""
+        workspace = pre_processed_run.period_workspace(period)
+        rows, columns, workspace_indices = [], [], []
+        for row, detectors in enumerate(detector_groups):
+            indices = workspace.getIndicesFromDetectorIDs(list(detectors))
+            if len(indices) != len(detectors):
+                raise ValueError(
+                    f"The number of detectors requested does not equal the number of detectors provided {len(indices)} != {len(detectors)}"
+                )
+            rows.extend([row] * len(indices))
+            columns.extend(indices)
+            workspace_indices.append(list(indices))
+
+        grouping = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(detector_groups), workspace.getNumberHistograms()))
+        counts = grouping @ workspace.extractY()
+        errors = np.sqrt(grouping @ np.square(workspace.extractE()))
+
+        for row, detectors in enumerate(detector_groups):
+            pre_processed_run.group_counts[(detectors, period)] = (counts[row], errors[row], workspace_indices[row])
+
+    @staticmethod
+    def _create_counts_workspace(pre_processed_run, group, period, output_name):
+        """Creates a counts workspace in the same way as MuonGroupingCounts from the calculated counts of a group."""
+        workspace = pre_processed_run.period_workspace(period)
+        counts, errors, indices = pre_processed_run.group_counts[(tuple(group.detectors), period)]
+        x_data = workspace.readX(indices[0])
+
+        counts_workspace = WorkspaceFactory.create(workspace, 1, len(x_data), len(counts))
+        counts_workspace.setX(0, x_data)
+        counts_workspace.setY(0, counts)
+        counts_workspace.setE(0, errors)
+
+        spectrum = counts_workspace.getSpectrum(0)
+        spectrum.clearDetectorIDs()
+        for index in indices:
+            for detector_id in workspace.getSpectrum(index).getDetectorIDs():
+                spectrum.addDetectorID(detector_id)
+        spectrum.setSpectrumNo(1)
+
+        sample_logs = counts_workspace.mutableRun()
+        sample_logs.addProperty("analysis_group_name", group.name, True)
+        sample_logs.addProperty("analysis_group", run_list_to_string(group.detectors), True)
+        sample_logs.addProperty("analysis_periods_summed", str(period), True)
+        sample_logs.addProperty("analysis_periods_subtracted", "", True)
+
+        add_ws_to_ads(output_name, counts_workspace)
+
+
+def _get_table_values(table_name):
+    """Returns the values of a table workspace, so that a change of a table with the same name can be detected."""
+    if table_name is None or not check_if_workspace_exist(table_name):
+        return None
+    table = retrieve_ws(table_name)
+    return tuple(tuple(table.column(column)) for column in range(table.columnCount()))
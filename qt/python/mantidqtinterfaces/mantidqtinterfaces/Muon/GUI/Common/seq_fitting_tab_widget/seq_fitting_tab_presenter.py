@@ -29,6 +29,7 @@ class SeqFittingTabPresenter(object):
         self.sequential_fit_finished_notifier = GenericObservable()
 
         self.view.set_slot_for_display_data_type_changed(self.handle_selected_workspaces_changed)
+        self.view.setup_slot_for_fit_row_finished(self.handle_seq_fit_row_finished)
 
         # Observers
         self.selected_workspaces_observer = GenericObserver(self.handle_selected_workspaces_changed)
@@ -39,6 +40,7 @@ class SeqFittingTabPresenter(object):
         self.selected_sequential_fit_notifier = GenericObservable()
         self.disable_tab_observer = GenericObserver(lambda: self.view.setEnabled(False))
         self.enable_tab_observer = GenericObserver(lambda: self.view.setEnabled(self.model.number_of_datasets > 0))
+        self.sequential_fit_row_finished_observer = GenericObserverWithArgPassing(self.view.notify_fit_row_finished)
 
     def create_thread(self, callback):
         self.fitting_calculation_model = ThreadModelWrapperWithOutput(callback)
@@ -126,9 +128,7 @@ class SeqFittingTabPresenter(object):
 
         fit_functions, fit_statuses, fit_chi_squareds = self.fitting_calculation_model.result
         for fit_function, fit_status, fit_chi_squared, row in zip(fit_functions, fit_statuses, fit_chi_squareds, self.selected_rows):
-            parameter_values = self.model.get_all_fit_function_parameter_values_for(fit_function)
-            self.view.fit_table.set_parameter_values_for_row(row, parameter_values)
-            self.view.fit_table.set_fit_quality(row, fit_status, fit_chi_squared)
+            self._update_fit_table_row(row, fit_function, fit_status, fit_chi_squared)
 
         self.view.seq_fit_button.setEnabled(True)
         self.view.fit_selected_button.setEnabled(True)
@@ -142,6 +142,17 @@ class SeqFittingTabPresenter(object):
 
         self.sequential_fit_finished_notifier.notify_subscribers()
 
+    def handle_seq_fit_row_finished(self, fit_result):
+        """Shows the results of a row of the sequential fit as soon as it has finished. Runs on the GUI thread."""
+        row_index, fit_function, fit_status, fit_chi_squared = fit_result
+        if row_index < len(self.selected_rows):
+            self._update_fit_table_row(self.selected_rows[row_index], fit_function, fit_status, fit_chi_squared)
+
+    def _update_fit_table_row(self, row, fit_function, fit_status, fit_chi_squared):
+        parameter_values = self.model.get_all_fit_function_parameter_values_for(fit_function)
+        self.view.fit_table.set_parameter_values_for_row(row, parameter_values)
+        self.view.fit_table.set_fit_quality(row, fit_status, fit_chi_squared)
+
     def handle_updated_fit_parameter_in_table(self, index):
         copy_param = self.view.copy_values_for_fits()
         if copy_param:
@@ -4,7 +4,8 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
-from qtpy import QtWidgets
+from qtpy import QtCore, QtWidgets
+from qtpy.QtCore import Signal
 from mantidqt.utils.qt import load_ui
 from mantidqtinterfaces.Muon.GUI.Common.message_box import warning
 from mantidqtinterfaces.Muon.GUI.Common.seq_fitting_tab_widget.SequentialTableWidget import SequentialTableWidget
@@ -16,6 +17,8 @@ default_fit_status = "No fit"
 
 
 class SeqFittingTabView(QtWidgets.QWidget, ui_seq_fitting_tab):
+    fitRowFinished = Signal(object)
+
     def __init__(self, parent=None):
         super(SeqFittingTabView, self).__init__(parent)
         self.setupUi(self)
@@ -49,5 +52,12 @@ class SeqFittingTabView(QtWidgets.QWidget, ui_seq_fitting_tab):
     def setup_slot_for_sequential_fit_button(self, slot):
         self.seq_fit_button.clicked.connect(slot)
 
+    def setup_slot_for_fit_row_finished(self, slot):
+        # The rows of a sequential fit finish on the calculation thread, so the slot is queued onto the GUI thread
+        self.fitRowFinished.connect(slot, QtCore.Qt.QueuedConnection)
+
+    def notify_fit_row_finished(self, fit_result):
+        self.fitRowFinished.emit(fit_result)
+
     def copy_values_for_fits(self):
         return self.copy_fit_checkbox.isChecked()
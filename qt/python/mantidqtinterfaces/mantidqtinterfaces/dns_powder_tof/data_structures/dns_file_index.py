@@ -0,0 +1,188 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#     NScD Oak Ridge National Laboratory, European Spallation Source
+#     & Institut Laue - Langevin
+# SPDX - License - Identifier: GPL - 3.0 +
+
+"""
+Persistent index of the headers of the DNS datafiles in a directory.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from mantidqtinterfaces.dns_powder_tof.data_structures.dns_file import DNSFile
+from mantidqtinterfaces.dns_powder_tof.data_structures.object_dict import ObjectDict
+
+INDEX_FILENAME = "dns_file_index.json"
+INDEX_VERSION = 1
+
+# header entries shown in the file selector tree
+HEADER_FIELDS = [
+    "file_number",
+    "det_rot",
+    "sample_rot",
+    "field",
+    "temp_sample",
+    "sample",
+    "end_time",
+    "tof_channels",
+    "channel_width",
+    "filename",
+    "wavelength",
+    "selector_speed",
+    "scan_number",
+    "scan_command",
+    "scan_points",
+    "new_format",
+    "legacy_format",
+]
+
+# coil currents needed to determine the polarisation of legacy files
+CURRENT_FIELDS = [
+    "flipper_z_compensation_current",
+    "a_coil_current",
+    "b_coil_current",
+    "c_coil_current",
+    "z_coil_current",
+]
+
+
+class DNSIndexedFile(ObjectDict):
+    """
+    Header of a DNS datafile read from the index, the polarisation of legacy
+    files is determined from the coil currents as for DNSFile.
+    """
+
+    determine_polarisation = DNSFile.determine_polarisation
+    currents_match = DNSFile.currents_match
+    format_xml_input_table = DNSFile.format_xml_input_table
+
+
+class DNSFileIndex:
+    """
+    Index of the headers of DNS datafiles, keyed by filename and validated
+    by the modification time and size of the files. Only new or changed files
+    are read, in parallel, and the index is saved in the data directory so
+    that the files are not read again when the directory is opened later.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self.data_path = None
+        self.entries = {}
+
+    @staticmethod
+    def _file_signature(data_path, filename):
+        try:
+            stat = os.stat(os.path.join(data_path, filename))
+        except OSError:
+            return None, None
+        return stat.st_mtime, stat.st_size
+
+    @staticmethod
+    def _read_header(data_path, filename, polarisation_table):
+        try:
+            dns_file = DNSFile(data_path, filename, polarisation_table)
+        except (RuntimeError, ValueError, IndexError, KeyError, OSError) as error:
+            return {"filename": filename, "error": str(error)}
+        entry = {key: dns_file.get(key, "") for key in HEADER_FIELDS}
+        entry["new_format"] = bool(dns_file.get("new_format", False))
+        entry["legacy_format"] = bool(dns_file.get("legacy_format", False))
+        if entry["legacy_format"]:
+            entry.update({key: dns_file[key] for key in CURRENT_FIELDS})
+        return entry
+
+    def load(self, data_path):
+        """
+        Loads the index saved in data_path, unless it is already loaded.
+        """
+        if data_path == self.data_path:
+            return
+        self.data_path = data_path
+        self.entries = {}
+        try:
+            with open(os.path.join(data_path, INDEX_FILENAME), "r", encoding="utf8") as index_file:
+                saved_index = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        if isinstance(saved_index, dict) and saved_index.get("version") == INDEX_VERSION:
+            self.entries = saved_index.get("files", {})
+
+    def save(self):
+        if self.data_path is None:
+            return
+        try:
+            with open(os.path.join(self.data_path, INDEX_FILENAME), "w", encoding="utf8") as index_file:
+                json.dump({"version": INDEX_VERSION, "files": self.entries}, index_file)
+        except OSError:
+            pass
+
+    def update(self, data_path, filenames, polarisation_table, progress=None, canceled=None):
+        """
+        Reads the headers of the files that are not in the index, have
+        changed since they were indexed or could not be read before, e.g.
+        because they were still being written. progress(done, total) is called
+        after each file is read and reading stops when canceled() is True.
+        Returns the filenames which were read.
+        """
+        self.load(data_path)
+        signatures = {filename: self._file_signature(data_path, filename) for filename in filenames}
+        stale = [
+            filename
+            for filename in filenames
+            if not self.is_readable(filename)
+            or signatures[filename][0] is None
+            or [self.entries[filename].get("mtime"), self.entries[filename].get("size")] != list(signatures[filename])
+        ]
+        read = []
+        if not stale:
+            return read
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._read_header, data_path, filename, polarisation_table): filename for filename in stale}
+            for future in as_completed(futures):
+                filename = futures[future]
+                entry = future.result()
+                entry["mtime"], entry["size"] = signatures[filename]
+                self.entries[filename] = entry
+                read.append(filename)
+                if progress is not None:
+                    progress(len(read), len(stale))
+                if canceled is not None and canceled():
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    break
+        return read
+
+    def prune(self, filenames):
+        """
+        Removes the files which are not in filenames from the index.
+        """
+        existing = set(filenames)
+        self.entries = {filename: entry for filename, entry in self.entries.items() if filename in existing}
+
+    def is_readable(self, filename):
+        entry = self.entries.get(filename)
+        return entry is not None and "error" not in entry
+
+    def get(self, filename, polarisation_table=None):
+        """
+        Returns the header of a readable indexed file, with the polarisation
+        of legacy files determined from polarisation_table.
+        """
+        if not self.is_readable(filename):
+            return None
+        dns_file = DNSIndexedFile(self.entries[filename])
+        if dns_file.legacy_format and polarisation_table:
+            dns_file.field = dns_file.determine_polarisation(polarisation_table)
+        return dns_file
+
+    def get_dns_files(self, filenames, polarisation_table=None):
+        """
+        Returns the headers of the readable files in filenames, in order.
+        """
+        return [self.get(filename, polarisation_table) for filename in filenames if self.is_readable(filename)]
+
+    def get_unreadable(self, filenames):
+        return [filename for filename in filenames if filename in self.entries and not self.is_readable(filename)]
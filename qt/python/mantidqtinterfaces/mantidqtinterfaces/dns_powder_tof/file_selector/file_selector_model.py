@@ -10,15 +10,13 @@ Presenter for DNS path panel.
 """
 
 from mantidqtinterfaces.dns_powder_tof.data_structures.dns_file import DNSFile
+from mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index import DNSFileIndex
 from mantidqtinterfaces.dns_powder_tof.data_structures.dns_obs_model import DNSObsModel
-from mantidqtinterfaces.dns_powder_tof.data_structures.dns_treemodel import DNSTreeModel, TreeItemEnum
-from mantidqtinterfaces.dns_powder_tof.data_structures.object_dict import ObjectDict
+from mantidqtinterfaces.dns_powder_tof.data_structures.dns_treemodel import DNSTreeModel
 from mantidqtinterfaces.dns_powder_tof.helpers.file_processing import (
     filter_filenames,
-    load_txt,
     open_editor,
     return_filelist,
-    save_txt,
     unzip_latest_standard,
 )
 
@@ -34,6 +32,8 @@ class DNSFileSelectorModel(DNSObsModel):
         self.old_data_set = None
         self.all_datafiles = None
         self.loading_canceled = False
+        # headers of the sample datafiles, saved in the data directory
+        self.file_index = DNSFileIndex()
 
     def _filter_out_already_loaded(self, all_datafiles, watcher):
         if watcher:
@@ -76,17 +76,15 @@ class DNSFileSelectorModel(DNSObsModel):
         """
         self.loading_canceled = False
         self._clear_scans_if_not_sequential(watcher)
-        for i, filename in enumerate(datafiles):
-            self._update_progress(i, len(datafiles))
-            if self.loading_canceled:
-                break
-            dns_file = self._load_file_from_cache_or_new(loaded, filename, data_path, pol_table)
-            if dns_file.new_format or dns_file.legacy_format:
-                self.sample_data_tree_model.setup_model_data([dns_file])
-        self.old_data_set = set(self.all_datafiles)
+        loaded.update(data_path, datafiles, pol_table, self._update_progress, self._is_loading_canceled)
+        dns_files = [dns_file for dns_file in loaded.get_dns_files(datafiles, pol_table) if dns_file.new_format or dns_file.legacy_format]
+        self.sample_data_tree_model.setup_model_data(dns_files)
+        # files which could not be read, e.g. because they are still being
+        # written, are read again at the next update
+        self.old_data_set = set(self.all_datafiles).difference(loaded.get_unreadable(datafiles))
         self._add_number_of_files_per_scan()
         if datafiles:
-            self._save_filelist(data_path)
+            self._save_index(loaded)
             self._update_progress(len(datafiles), len(datafiles))
 
     def read_standard(self, standard_path, polarisation_table):
@@ -117,46 +115,14 @@ class DNSFileSelectorModel(DNSObsModel):
             self.sample_data_tree_model.clear_scans()
 
     def _get_list_of_loaded_files(self, data_path, watcher):
-        if watcher:
-            return {}
-        return self._load_saved_filelist(data_path)
-
-    @staticmethod
-    def _load_saved_filelist(path):
         """
-        We save the list of load files, so we have to read the files only once.
+        Returns the index of the headers of the datafiles, so only new or
+        changed files have to be read. The index is saved in the data
+        directory and loaded again if the directory was changed.
         """
-        loaded = {}
-        try:
-            txt = load_txt("last_filelist.txt", path)
-        except IOError:
-            return loaded
-        try:
-            for line in txt:
-                dns_file = ObjectDict()
-                data = line[0:-1].split(" ; ")
-                if len(data) < 15:
-                    continue
-                dns_file.file_number = data[TreeItemEnum.number.value]
-                dns_file.det_rot = float(data[TreeItemEnum.det_rot.value])
-                dns_file.sample_rot = float(data[TreeItemEnum.sample_rot.value])
-                dns_file.field = data[TreeItemEnum.field.value]
-                dns_file.temp_sample = float(data[TreeItemEnum.temperature.value])
-                dns_file.sample = data[TreeItemEnum.sample.value]
-                dns_file.end_time = data[TreeItemEnum.time.value]
-                dns_file.tof_channels = int(data[TreeItemEnum.tof_channels.value])
-                dns_file.channel_width = float(data[TreeItemEnum.tof_channel_width.value])
-                dns_file.filename = data[TreeItemEnum.filename.value]
-                dns_file.wavelength = float(data[TreeItemEnum.wavelength.value])
-                dns_file.selector_speed = float(data[TreeItemEnum.selector_speed.value])
-                dns_file.scan_number = data[TreeItemEnum.scan_number.value]
-                dns_file.scan_command = data[TreeItemEnum.scan_command.value]
-                dns_file.scan_points = data[TreeItemEnum.scan_points.value]
-                dns_file.new_format = True
-                loaded[dns_file.filename] = dns_file
-        except IndexError:
-            pass
-        return loaded
+        if not watcher:
+            self.file_index.load(data_path)
+        return self.file_index
 
     def get_number_of_scans(self):
         return self.active_model.number_of_scans()
@@ -197,6 +163,9 @@ class DNSFileSelectorModel(DNSObsModel):
     def set_loading_canceled(self, canceled=True):
         self.loading_canceled = canceled
 
+    def _is_loading_canceled(self):
+        return self.loading_canceled
+
     def get_standard_data_model(self):
         return self.standard_data_tree_model
 
@@ -256,20 +225,10 @@ class DNSFileSelectorModel(DNSObsModel):
         if filename:
             open_editor(filename, path)
 
-    # caching of filelist
-    @staticmethod
-    def _load_file_from_cache_or_new(loaded, filename, data_path, pol_table):
-        dns_file = loaded.get(filename, False)
-        if not dns_file:
-            dns_file = DNSFile(data_path, filename, pol_table)
-        return dns_file
-
-    def _save_filelist(self, data_path):
-        txt = "".join(self.sample_data_tree_model.get_txt())
-        try:
-            save_txt(txt, "last_filelist.txt", data_path)
-        except PermissionError:
-            pass
+    # caching of file headers
+    def _save_index(self, file_index):
+        file_index.prune(self.all_datafiles)
+        file_index.save()
 
     def get_active_model_column_count(self):
         return self.active_model.rootItem.columnCount()
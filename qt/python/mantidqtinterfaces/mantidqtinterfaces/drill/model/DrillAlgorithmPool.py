@@ -5,8 +5,13 @@
 #     & Institut Laue - Langevin
 # SPDX - License - Identifier: GPL - 3.0 +
 
+import heapq
+import itertools
+
 from qtpy.QtCore import QObject, Signal, QThreadPool
 
+from mantid.kernel import logger, MemoryStats
+
 
 class DrillAlgorithmPoolSignals(QObject):
     """
@@ -26,7 +31,11 @@ class DrillAlgorithmPoolSignals(QObject):
 class DrillAlgorithmPool(QThreadPool):
     """
     Class that defines an observer for the algorithms started through the DrILL
-    interface.
+    interface. The tasks are queued and started in order, as long as the
+    number of running tasks is below the maximum thread count and their
+    estimated memory fits in the memory limit. Tasks that need shared auxiliary
+    inputs that are not loaded yet wait for the first task that loads them, so
+    that these inputs are loaded only once.
     """
 
     def __init__(self):
@@ -40,8 +49,29 @@ class DrillAlgorithmPool(QThreadPool):
         self._progresses = dict()
         # if the threadpool is currently running
         self._running = False
-        # to limit the number of threads
-        # self.setMaxThreadCount(1)
+        # queue of tasks waiting to be started (order, task)
+        self._pending = list()
+        self._order = itertools.count()
+        # tasks started in the thread pool
+        self._started = set()
+        # memory (in bytes) reserved by the started tasks
+        self._reservedMemory = 0
+        # memory limit (in bytes), None to use the available memory
+        self._memoryLimit = None
+        self._currentMemoryLimit = 0
+        # shared inputs being loaded by a started task, and already loaded
+        self._loadingInputs = set()
+        self._loadedInputs = set()
+
+    def setMemoryLimit(self, memory):
+        """
+        Set the memory that the running tasks can use.
+
+        Args:
+            memory (int): memory in bytes, None to use the memory available
+                          when the processing starts
+        """
+        self._memoryLimit = memory
 
     def addProcesses(self, tasks):
         """
@@ -53,13 +83,46 @@ class DrillAlgorithmPool(QThreadPool):
         if not tasks:
             self.signals.processingDone.emit()
             return
+        if not self._running:
+            self._loadedInputs.clear()
+            if self._memoryLimit is None:
+                self._currentMemoryLimit = MemoryStats().availMem() * 1024
+            else:
+                self._currentMemoryLimit = self._memoryLimit
         self._running = True
         for task in tasks:
             self._tasks.add(task)
             self._progresses[task] = 0.0
             task.signals.finished.connect(self.onTaskFinished)
             task.signals.progress.connect(self.onProgress)
+            task.setQueued()
+            heapq.heappush(self._pending, (next(self._order), task))
+        self._startTasks()
+
+    def _startTasks(self):
+        """
+        Start the pending tasks, in order, while threads and memory are
+        available.
+        """
+        waiting = list()
+        while self._pending and len(self._started) < self.maxThreadCount():
+            item = heapq.heappop(self._pending)
+            task = item[1]
+            if task.getSharedInputs() & self._loadingInputs:
+                # wait for the task that is loading the shared inputs
+                waiting.append(item)
+                continue
+            memory = task.getMemoryEstimate()
+            if self._started and self._reservedMemory + memory > self._currentMemoryLimit:
+                # keep the order, this task will start first
+                waiting.append(item)
+                break
+            self._loadingInputs.update(task.getSharedInputs() - self._loadedInputs)
+            self._reservedMemory += memory
+            self._started.add(task)
             self.start(task)
+        for item in waiting:
+            heapq.heappush(self._pending, item)
 
     def abortProcessing(self):
         """
@@ -71,6 +134,10 @@ class DrillAlgorithmPool(QThreadPool):
         for task in [task for task in self._tasks]:
             task.cancel()
         self._tasks.clear()
+        self._pending.clear()
+        self._started.clear()
+        self._reservedMemory = 0
+        self._loadingInputs.clear()
         self._tasksDone = 0
         self._progresses.clear()
         self.signals.processingDone.emit()
@@ -90,8 +157,18 @@ class DrillAlgorithmPool(QThreadPool):
             return
 
         self._tasksDone += 1
+        if task in self._started:
+            self._started.remove(task)
+            self._reservedMemory -= task.getMemoryEstimate()
+            self._loadingInputs.difference_update(task.getSharedInputs())
+            self._loadedInputs.update(task.getSharedInputs())
+        waitingTime = task.getWaitingTime()
+        runningTime = task.getRunningTime()
+        if waitingTime is not None and runningTime is not None:
+            logger.notice("Task {0}: {1:.1f} s in the queue, {2:.1f} s of processing.".format(task.getName(), waitingTime, runningTime))
 
         if self._running:
+            self._startTasks()
             if not self._tasks:
                 self._tasksDone = 0
                 self.clear()
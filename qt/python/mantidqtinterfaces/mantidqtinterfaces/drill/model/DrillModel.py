@@ -11,6 +11,7 @@ import sys
 from qtpy.QtCore import QObject, Signal, QThread
 
 import mantid.simpleapi as sapi
+from mantid.api import FileFinder
 from mantid.kernel import config, logger, ConfigService
 
 from .configurations import RundexSettings
@@ -51,6 +52,12 @@ class DrillModel(QObject):
     """
     PROCESSED_DATA_DIR = "processed"
 
+    """
+    Ratio between the memory needed to process a sample and the size of its
+    run files.
+    """
+    MEMORY_PER_FILE_SIZE = 10
+
     """
     List of processing parameter from the current algorithm.
     """
@@ -184,16 +191,53 @@ class DrillModel(QObject):
             self.visualSettings = RundexSettings.VISUAL_SETTINGS[mode]
         self.acquisitionMode = mode
         self.algorithm = RundexSettings.ALGORITHM[self.acquisitionMode]
-        if self.acquisitionMode in RundexSettings.THREADS_NUMBER:
-            nThreads = RundexSettings.THREADS_NUMBER[self.acquisitionMode]
-        else:
-            nThreads = QThread.idealThreadCount()
-        self.tasksPool.setMaxThreadCount(nThreads)
+        self.tasksPool.setMaxThreadCount(self._getThreadsNumber())
+        self.tasksPool.setMemoryLimit(self._getMemoryLimit())
         self.exportModel = DrillExportModel(self.acquisitionMode)
         self._initController()
         self._initProcessingParameters()
         self.newMode.emit(self.instrument, self.acquisitionMode)
 
+    def _getThreadsNumber(self):
+        """
+        Get the maximum number of samples processed at the same time. It can
+        be set with the drill.threads configuration property, otherwise it
+        depends on the acquisition mode.
+
+        Returns:
+            int: number of threads
+        """
+        if "drill.threads" in config:
+            try:
+                nThreads = int(config["drill.threads"])
+                if nThreads > 0:
+                    return nThreads
+            except ValueError:
+                pass
+            logger.warning("Invalid value for drill.threads: {0}".format(config["drill.threads"]))
+        if self.acquisitionMode in RundexSettings.THREADS_NUMBER:
+            return RundexSettings.THREADS_NUMBER[self.acquisitionMode]
+        return QThread.idealThreadCount()
+
+    def _getMemoryLimit(self):
+        """
+        Get the memory that the samples processed at the same time can use. It
+        can be set in MB with the drill.memory_limit configuration property,
+        otherwise the memory available when the processing starts is used.
+
+        Returns:
+            int: memory in bytes, None to use the memory available
+        """
+        if "drill.memory_limit" in config:
+            try:
+                memoryLimit = int(config["drill.memory_limit"])
+                if memoryLimit > 0:
+                    return memoryLimit * 1024 * 1024
+            except ValueError:
+                pass
+            logger.warning("Invalid value for drill.memory_limit: {0}".format(config["drill.memory_limit"]))
+        return None
+
     def getAcquisitionMode(self):
         """
         Get the current acquisition mode.
@@ -446,6 +490,28 @@ class DrillModel(QObject):
         sample.setOutputName(params["OutputWorkspace"])
         return params
 
+    def _setupTaskScheduling(self, task, params):
+        """
+        Provide the scheduling information of a task: the shared auxiliary
+        inputs, and the memory estimated from the size of the other run files.
+
+        Args:
+            task (DrillTask): the task
+            params (dict(str, any)): processing parameters of the task
+        """
+        sharedNames = RundexSettings.SHARED_INPUTS.get(self.acquisitionMode, [])
+        task.setSharedInputs([name + "=" + str(params[name]) for name in sharedNames if params.get(name)])
+        fileSize = 0
+        for name, value in params.items():
+            if "Runs" not in name or name in sharedNames or not value or not isinstance(value, str):
+                continue
+            try:
+                runFiles = FileFinder.findRuns(value.replace("+", ","))
+            except (RuntimeError, ValueError):
+                continue
+            fileSize += sum(os.path.getsize(runFile) for runFile in runFiles if os.path.isfile(runFile))
+        task.setMemoryEstimate(fileSize * self.MEMORY_PER_FILE_SIZE)
+
     def processGroupByGroup(self, indexes):
         """
         Create and submit a task per group. Parameter values are appended if the
@@ -484,6 +550,7 @@ class DrillModel(QObject):
                 if p.getName() not in processingParams:
                     processingParams[p.getName()] = p.getValue()
             task = DrillTask(group.getName(), self.algorithm, **processingParams)
+            self._setupTaskScheduling(task, processingParams)
             for sample in samples:
                 task.addStartedCallback(sample.onProcessStarted)
                 task.addSuccessCallback(sample.onProcessSuccess)
@@ -516,6 +583,7 @@ class DrillModel(QObject):
                 return False
             kwargs = self.getProcessingParameters(e)
             task = DrillTask(str(e), self.algorithm, **kwargs)
+            self._setupTaskScheduling(task, kwargs)
             task.addStartedCallback(self._samples[e].onProcessStarted)
             task.addSuccessCallback(self._samples[e].onProcessSuccess)
             task.addErrorCallback(self._samples[e].onProcessError)
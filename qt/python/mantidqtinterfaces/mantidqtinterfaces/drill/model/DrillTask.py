@@ -5,6 +5,8 @@
 #     & Institut Laue - Langevin
 # SPDX - License - Identifier: GPL - 3.0 +
 
+import time
+
 from qtpy.QtCore import QObject, QRunnable, Signal
 
 import mantid.simpleapi as sapi
@@ -56,6 +58,17 @@ class DrillTask(QRunnable):
     """
     _errorCallbacks = None
 
+    """
+    Estimated memory (in bytes) needed by the task.
+    """
+    _memoryEstimate = 0
+
+    """
+    Auxiliary inputs (e.g. empty beam, container, sensitivity) that can be
+    shared with other tasks, once loaded.
+    """
+    _sharedInputs = None
+
     def __init__(self, name, alg, **kwargs):
         super(DrillTask, self).__init__()
         self._name = name
@@ -66,6 +79,10 @@ class DrillTask(QRunnable):
         self.algName = alg
         self.alg = None
         self.properties = kwargs
+        self._sharedInputs = frozenset()
+        self._queuedTime = None
+        self._startTime = None
+        self._endTime = None
 
     def getName(self):
         """
@@ -76,6 +93,72 @@ class DrillTask(QRunnable):
         """
         return self._name
 
+    def setMemoryEstimate(self, memory):
+        """
+        Set the estimated memory needed by the task.
+
+        Args:
+            memory (int): memory in bytes
+        """
+        self._memoryEstimate = memory
+
+    def getMemoryEstimate(self):
+        """
+        Get the estimated memory needed by the task.
+
+        Returns:
+            int: memory in bytes
+        """
+        return self._memoryEstimate
+
+    def setSharedInputs(self, inputs):
+        """
+        Set the auxiliary inputs of the task that are shared with other tasks.
+
+        Args:
+            inputs (iterable(str)): shared input values
+        """
+        self._sharedInputs = frozenset(inputs)
+
+    def getSharedInputs(self):
+        """
+        Get the auxiliary inputs of the task that are shared with other tasks.
+
+        Returns:
+            frozenset(str): shared input values
+        """
+        return self._sharedInputs
+
+    def setQueued(self):
+        """
+        Record the time at which the task has been queued.
+        """
+        self._queuedTime = time.monotonic()
+        self._startTime = None
+        self._endTime = None
+
+    def getWaitingTime(self):
+        """
+        Get the time the task spent in the queue before starting.
+
+        Returns:
+            float: time in seconds, None if the task was not queued or started
+        """
+        if self._queuedTime is None or self._startTime is None:
+            return None
+        return self._startTime - self._queuedTime
+
+    def getRunningTime(self):
+        """
+        Get the time the task took to run.
+
+        Returns:
+            float: time in seconds, None if the task did not finish
+        """
+        if self._startTime is None or self._endTime is None:
+            return None
+        return self._endTime - self._startTime
+
     def addStartedCallback(self, callback):
         """
         Add a callback in the start callbaks list.
@@ -108,6 +191,7 @@ class DrillTask(QRunnable):
         Override QRunnable::run. Provide the running part of the task that will
         start in an other thread.
         """
+        self._startTime = time.monotonic()
         for f in self._startCallbacks:
             f()
         self.alg = sapi.AlgorithmManager.create(self.algName)
@@ -145,6 +229,8 @@ class DrillTask(QRunnable):
             returnCode (int): return code of the task
             errorMsg (str): optionnal error message
         """
+        if self._endTime is None:
+            self._endTime = time.monotonic()
         if returnCode == 0:
             for fct in self._successCallbacks:
                 fct()
@@ -260,6 +260,7 @@ class RundexSettings(object):
     # ideal number of threads for each acquisition mode (optional)
     # if not provided, Qt will decide, which will likely be the number of cores
     # for the moment, limit those to 1 until the algorithms are made truly thread safe
+    # they can be overridden with the drill.threads configuration property
     THREADS_NUMBER = {
         SANS_ACQ: 1,
         SANS_PSCAN: 1,
@@ -271,6 +272,25 @@ class RundexSettings(object):
         DIRECT_TOF: 1,
     }
 
+    # auxiliary inputs that are loaded once and reused by all the samples
+    # (optional). Samples that need them wait for the first one to load them
+    SHARED_INPUTS = {
+        SANS_ACQ: [
+            "AbsorberRuns",
+            "BeamRuns",
+            "FluxRuns",
+            "ContainerRuns",
+            "ContainerTransmissionRuns",
+            "TransmissionAbsorberRuns",
+            "TransmissionBeamRuns",
+            "MaskFiles",
+            "ReferenceFiles",
+            "SolventFiles",
+            "SensitivityMaps",
+            "DefaultMaskFile",
+        ],
+    }
+
     # settings for each acquisition mode
 
     # optionnal flags
@@ -0,0 +1,93 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#     NScD Oak Ridge National Laboratory, European Spallation Source
+#     & Institut Laue - Langevin
+# SPDX - License - Identifier: GPL - 3.0 +
+
+import unittest
+from unittest import mock
+
+from mantidqtinterfaces.drill.model.DrillAlgorithmPool import DrillAlgorithmPool
+
+
+class DrillAlgorithmPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = DrillAlgorithmPool()
+        self.pool.setMaxThreadCount(2)
+        self.pool.setMemoryLimit(100)
+        patch = mock.patch.object(self.pool, "start")
+        self.mStart = patch.start()
+        self.addCleanup(patch.stop)
+        self.pool.signals = mock.Mock()
+
+    @staticmethod
+    def _task(name, memory=0, sharedInputs=()):
+        task = mock.Mock()
+        task.getName.return_value = name
+        task.getMemoryEstimate.return_value = memory
+        task.getSharedInputs.return_value = frozenset(sharedInputs)
+        task.getWaitingTime.return_value = 0.0
+        task.getRunningTime.return_value = 0.0
+        return task
+
+    def _started(self):
+        return [c[0][0] for c in self.mStart.call_args_list]
+
+    def test_addProcesses(self):
+        tasks = [self._task(str(i)) for i in range(3)]
+        self.pool.addProcesses(tasks)
+        self.assertEqual(self._started(), tasks[:2])
+        for task in tasks:
+            task.setQueued.assert_called_once()
+        self.pool.onTaskFinished(tasks[0])
+        self.assertEqual(self._started(), tasks)
+        self.pool.onTaskFinished(tasks[1])
+        self.pool.onTaskFinished(tasks[2])
+        self.pool.signals.processingDone.emit.assert_called_once()
+
+    def test_addProcessesEmpty(self):
+        self.pool.addProcesses([])
+        self.mStart.assert_not_called()
+        self.pool.signals.processingDone.emit.assert_called_once()
+
+    def test_memoryLimit(self):
+        tasks = [self._task("0", memory=60), self._task("1", memory=60), self._task("2", memory=30)]
+        self.pool.addProcesses(tasks)
+        # the second task does not fit and the third one waits behind it
+        self.assertEqual(self._started(), tasks[:1])
+        self.pool.onTaskFinished(tasks[0])
+        self.assertEqual(self._started(), tasks)
+
+    def test_taskLargerThanMemoryLimit(self):
+        task = self._task("0", memory=1000)
+        self.pool.addProcesses([task])
+        self.assertEqual(self._started(), [task])
+
+    def test_sharedInputs(self):
+        tasks = [
+            self._task("0", sharedInputs=["BeamRuns=1"]),
+            self._task("1", sharedInputs=["BeamRuns=1"]),
+            self._task("2", sharedInputs=["BeamRuns=2"]),
+        ]
+        self.pool.setMaxThreadCount(3)
+        self.pool.addProcesses(tasks)
+        # the second task waits for the first one to load the empty beam
+        self.assertEqual(self._started(), [tasks[0], tasks[2]])
+        self.pool.onTaskFinished(tasks[0])
+        self.assertEqual(self._started(), [tasks[0], tasks[2], tasks[1]])
+
+    def test_abortProcessing(self):
+        tasks = [self._task(str(i)) for i in range(3)]
+        self.pool.addProcesses(tasks)
+        self.pool.abortProcessing()
+        for task in tasks:
+            task.cancel.assert_called_once()
+        self.pool.signals.processingDone.emit.assert_called_once()
+        self.mStart.reset_mock()
+        self.pool.onTaskFinished(tasks[0])
+        self.mStart.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
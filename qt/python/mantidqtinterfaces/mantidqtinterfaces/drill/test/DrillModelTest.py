@@ -63,6 +63,27 @@ class DrillModelTest(unittest.TestCase):
         self.model.setAcquisitionMode("a2")
         self.assertEqual(self.model.acquisitionMode, "a2")
         self.mTasksPool.setMaxThreadCount.assert_called_once_with(20)
+        self.mTasksPool.setMemoryLimit.assert_called_once()
+
+    @mock.patch("mantidqtinterfaces.drill.model.DrillModel.RundexSettings")
+    def test_getThreadsNumber(self, mSettings):
+        mSettings.THREADS_NUMBER = {"a1": 10}
+        self.model.acquisitionMode = "a1"
+        self.assertEqual(self.model._getThreadsNumber(), 10)
+        self.mConfig.__contains__.return_value = True
+        self.mConfig.__getitem__.side_effect = {"drill.threads": "4"}.__getitem__
+        self.assertEqual(self.model._getThreadsNumber(), 4)
+        self.mConfig.__getitem__.side_effect = {"drill.threads": "many"}.__getitem__
+        self.assertEqual(self.model._getThreadsNumber(), 10)
+
+    def test_getMemoryLimit(self):
+        self.mConfig.__contains__.return_value = False
+        self.assertIsNone(self.model._getMemoryLimit())
+        self.mConfig.__contains__.return_value = True
+        self.mConfig.__getitem__.side_effect = {"drill.memory_limit": "2048"}.__getitem__
+        self.assertEqual(self.model._getMemoryLimit(), 2048 * 1024 * 1024)
+        self.mConfig.__getitem__.side_effect = {"drill.memory_limit": "a lot"}.__getitem__
+        self.assertIsNone(self.model._getMemoryLimit())
 
     def test_getAcquisitionMode(self):
         self.model.acquisitionMode = "test"
@@ -275,6 +296,26 @@ class DrillModelTest(unittest.TestCase):
         mTask.assert_has_calls(calls, any_order=True)
         self.model.tasksPool.addProcesses.assert_called_once()
 
+    @mock.patch("mantidqtinterfaces.drill.model.DrillModel.os.path")
+    @mock.patch("mantidqtinterfaces.drill.model.DrillModel.FileFinder")
+    @mock.patch("mantidqtinterfaces.drill.model.DrillModel.RundexSettings")
+    def test_setupTaskScheduling(self, mSettings, mFinder, mPath):
+        mSettings.SHARED_INPUTS = {"a1": ["BeamRuns", "ContainerRuns"]}
+        self.model.acquisitionMode = "a1"
+        mFinder.findRuns.return_value = ["/f1.nxs", "/f2.nxs"]
+        mPath.isfile.return_value = True
+        mPath.getsize.return_value = 100
+        task = mock.Mock()
+        params = {"SampleRuns": "1+2", "BeamRuns": "3", "ContainerRuns": "", "OutputWorkspace": "out"}
+        self.model._setupTaskScheduling(task, params)
+        task.setSharedInputs.assert_called_once_with(["BeamRuns=3"])
+        mFinder.findRuns.assert_called_once_with("1,2")
+        task.setMemoryEstimate.assert_called_once_with(200 * self.model.MEMORY_PER_FILE_SIZE)
+        task.reset_mock()
+        mFinder.findRuns.side_effect = RuntimeError
+        self.model._setupTaskScheduling(task, params)
+        task.setMemoryEstimate.assert_called_once_with(0)
+
     @mock.patch("mantidqtinterfaces.drill.model.DrillModel.DrillTask")
     def test_process(self, mTask):
         self.model.getProcessingParameters = mock.Mock()
@@ -0,0 +1,121 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from mantid.api import AnalysisDataService, FileFinder
+from mantid.simpleapi import ConvertCWSDExpToMomentum, CreateEmptyTableWorkspace, IntegratePeaksCWSD
+
+from mantidqtinterfaces.HFIR_4Circle_Reduction import pt_md_cache
+from mantidqtinterfaces.HFIR_4Circle_Reduction.pt_md_cache import PtMDCache, convert_pts_to_momentum
+
+DATA_FILE = "HB3A_exp355_scan0001_0522.xml"
+
+
+class PtMDCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cache_dir = TemporaryDirectory()
+        self.cache = PtMDCache(self._cache_dir.name)
+        self.data_file = os.path.join(self._cache_dir.name, "HB3A_exp1_scan0001_0001.xml")
+        with open(self.data_file, "w") as fh:
+            fh.write("<SPICErack/>")
+
+    def tearDown(self):
+        self._cache_dir.cleanup()
+        AnalysisDataService.clear()
+
+    def _create_scan_table(self, pt_numbers):
+        table = CreateEmptyTableWorkspace(OutputWorkspace="scan_table")
+        for column_type, name in [
+            ("int", "Scan No"),
+            ("int", "Pt. No"),
+            ("str", "File Name"),
+            ("int", "Starting DetID"),
+            ("int", "Monitor"),
+            ("double", "Time"),
+        ]:
+            table.addColumn(column_type, name)
+        # the same detector counts are used for each Pt, with different monitor counts
+        for index, pt_number in enumerate(pt_numbers):
+            table.addRow([1, pt_number, DATA_FILE, 256 * 256, 1000 * (index + 1), 1.1])
+        return table
+
+    def test_file_name_depends_on_pt_calibration_and_data_file(self):
+        file_name = self.cache.get_file_name(1, 1, 1, self.data_file, {})
+
+        self.assertEqual(os.path.dirname(file_name), self._cache_dir.name)
+        self.assertEqual(self.cache.get_file_name(1, 1, 1, self.data_file, {}), file_name)
+        self.assertNotEqual(self.cache.get_file_name(2, 1, 1, self.data_file, {}), file_name)
+        self.assertNotEqual(self.cache.get_file_name(1, 2, 1, self.data_file, {}), file_name)
+        self.assertNotEqual(self.cache.get_file_name(1, 1, 2, self.data_file, {}), file_name)
+        self.assertNotEqual(self.cache.get_file_name(1, 1, 1, self.data_file, {"DetectorCenterXShift": 0.1}), file_name)
+
+        stat = os.stat(self.data_file)
+        os.utime(self.data_file, (stat.st_atime, stat.st_mtime + 10))
+        self.assertNotEqual(self.cache.get_file_name(1, 1, 1, self.data_file, {}), file_name)
+
+    def test_file_name_is_none_for_missing_data_file(self):
+        self.assertIsNone(self.cache.get_file_name(1, 1, 2, self.data_file + ".missing", {}))
+        self.assertFalse(PtMDCache.load(None, "ws"))
+
+    def test_only_pts_not_in_cache_are_converted(self):
+        args = dict(
+            InputWorkspace="scan_table",
+            CreateVirtualInstrument=False,
+            OutputWorkspace="q_sample",
+            Directory=os.path.dirname(FileFinder.getFullPath(DATA_FILE)),
+        )
+
+        with mock.patch.object(pt_md_cache.mantidsimple, "ConvertCWSDExpToMomentum", wraps=ConvertCWSDExpToMomentum) as convert:
+            self._create_scan_table([522])
+            self.assertEqual(convert_pts_to_momentum(1, args, pt_cache=self.cache), 0)
+            self._create_scan_table([522, 523])
+            self.assertEqual(convert_pts_to_momentum(1, args, pt_cache=self.cache, max_workers=2), 1)
+            self.assertEqual(convert.call_count, 2)
+
+        self.assertEqual(AnalysisDataService.retrieve("q_sample").getNEvents(), 2 * 7400)
+        self.assertEqual(sorted(AnalysisDataService.getObjectNames()), ["q_sample", "scan_table"])
+
+    def test_events_are_mapped_to_their_pts(self):
+        # IntegratePeaksCWSD maps the experiment info index of each event to the monitor counts of its Pt,
+        # and fails if an index does not belong to any Pt
+        self._create_scan_table([522, 523, 524])
+        directory = os.path.dirname(FileFinder.getFullPath(DATA_FILE))
+        ConvertCWSDExpToMomentum(
+            InputWorkspace="scan_table", CreateVirtualInstrument=False, OutputWorkspace="expected", Directory=directory
+        )
+        args = dict(InputWorkspace="scan_table", CreateVirtualInstrument=False, OutputWorkspace="q_sample", Directory=directory)
+        integrate_args = dict(
+            PeakCentre=[0.0, 0.0, 0.0], PeakRadius=100.0, MergePeaks=False, NormalizeByMonitor=True, NormalizeByTime=False
+        )
+        expected = IntegratePeaksCWSD(InputWorkspace="expected", OutputWorkspace="expected_peaks", **integrate_args)
+
+        for num_cached in [0, 3]:
+            self.assertEqual(convert_pts_to_momentum(1, args, pt_cache=self.cache, max_workers=2), num_cached)
+            q_sample = AnalysisDataService.retrieve("q_sample")
+            self.assertEqual(q_sample.getNEvents(), 3 * 7400)
+            run_numbers = [q_sample.getExperimentInfo(index).run().getProperty("run_number").value for index in range(3)]
+            self.assertEqual(run_numbers, [1522, 1523, 1524])
+
+            peaks = IntegratePeaksCWSD(InputWorkspace="q_sample", OutputWorkspace="peaks", **integrate_args)
+            self.assertEqual(peaks.getNumberPeaks(), expected.getNumberPeaks())
+            for index in range(peaks.getNumberPeaks()):
+                self.assertEqual(peaks.getPeak(index).getRunNumber(), expected.getPeak(index).getRunNumber())
+                self.assertAlmostEqual(peaks.getPeak(index).getIntensity(), expected.getPeak(index).getIntensity())
+            AnalysisDataService.remove("q_sample")
+
+    def test_empty_scan_table_raises(self):
+        self._create_scan_table([])
+        args = dict(InputWorkspace="scan_table", OutputWorkspace="q_sample")
+
+        self.assertRaises(RuntimeError, convert_pts_to_momentum, 1, args, self.cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import threading
 import unittest
 from unittest import mock
 
@@ -872,6 +873,39 @@ class BasicFittingModelTest(unittest.TestCase):
             result,
         )
 
+    def test_that_evaluate_sequential_fit_runs_independent_fits_in_parallel_and_returns_them_in_row_order(self):
+        number_of_rows = 3
+        self.model.max_parallel_fits = number_of_rows
+        # Every fit waits for all of them to be running, which only happens when they run in parallel
+        all_fits_running = threading.Barrier(number_of_rows, timeout=10)
+
+        def fitting_func(row_index, workspace_name, parameter_values, functions, use_initial_values):
+            all_fits_running.wait()
+            return f"function_{row_index}", "success", float(row_index)
+
+        rows_finished = []
+        self.model.sequential_fit_row_finished_notifier.add_subscriber(mock.Mock(update=lambda _, arg: rows_finished.append(arg)))
+
+        functions, fit_statuses, chi_squared = self.model._evaluate_sequential_fit(
+            fitting_func, ["ws0", "ws1", "ws2"], [[0.0]] * number_of_rows, True
+        )
+
+        self.assertEqual(functions, ["function_0", "function_1", "function_2"])
+        self.assertEqual(fit_statuses, ["success"] * number_of_rows)
+        self.assertEqual(chi_squared, [0.0, 1.0, 2.0])
+        self.assertEqual(sorted(rows_finished), [(row, f"function_{row}", "success", float(row)) for row in range(number_of_rows)])
+
+    def test_that_evaluate_sequential_fit_passes_the_previous_functions_to_chained_fits(self):
+        fitting_func = mock.Mock(side_effect=lambda row_index, *_: (f"function_{row_index}", "success", 1.0))
+
+        functions, _, _ = self.model._evaluate_sequential_fit(fitting_func, ["ws0", "ws1"], [[0.0], [1.0]], False)
+
+        self.assertEqual(functions, ["function_0", "function_1"])
+        self.assertEqual(fitting_func.call_count, 2)
+        # The list of previous functions is passed to each fit, and grows as the rows are fitted one after the other
+        self.assertEqual(fitting_func.call_args_list[1][0][:3], (1, "ws1", [1.0]))
+        self.assertFalse(fitting_func.call_args_list[1][0][4])
+
     def test_that_validate_sequential_fit_returns_an_empty_message_when_the_data_provided_is_valid_in_normal_fitting(self):
         self.model.dataset_names = self.dataset_names
         self.model.single_fit_functions = self.single_fit_functions
@@ -0,0 +1,126 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from mantid.api import AnalysisDataService, FileFinder
+from mantid import ConfigService
+from mantid.simpleapi import CloneWorkspace
+
+from mantidqtinterfaces.Muon.GUI.Common.ADSHandler.ADS_calls import retrieve_ws
+from mantidqt.utils.qt.testing import start_qapplication
+from mantidqtinterfaces.Muon.GUI.Common import muon_grouping_engine
+from mantidqtinterfaces.Muon.GUI.Common.muon_grouping_engine import MuonGroupingEngine
+from mantidqtinterfaces.Muon.GUI.Common.utilities.load_utils import load_workspace_from_filename
+from mantidqtinterfaces.Muon.GUI.Common.test_helpers.context_setup import setup_context
+from mantidqtinterfaces.Muon.GUI.Common.muon_group import MuonGroup
+
+
+@start_qapplication
+class MuonGroupingEngineTest(unittest.TestCase):
+    def setUp(self):
+        AnalysisDataService.clear()
+        ConfigService["MantidOptions.InvisibleWorkspaces"] = "1"
+        filepath = FileFinder.findRuns("EMU00019489.nxs")[0]
+        load_result, run_number, filename, _ = load_workspace_from_filename(filepath)
+
+        self.context = setup_context()
+        self.context.gui_context.update({"RebinType": "None"})
+        self.context.data_context.instrument = "EMU"
+        self.context.data_context._loaded_data.add_data(workspace=load_result, run=[run_number], filename=filename, instrument="EMU")
+        self.context.data_context.current_runs = [[run_number]]
+        self.context.data_context.update_current_data()
+        self.context.group_pair_context.reset_group_and_pairs_to_default(load_result["OutputWorkspace"][0].workspace, "EMU", "", 1)
+
+        self.run = [run_number]
+        self.groups = self.context.group_pair_context.groups
+        self.engine = MuonGroupingEngine()
+
+    def tearDown(self):
+        ConfigService["MantidOptions.InvisibleWorkspaces"] = "0"
+        self.context.ads_observer.unsubscribe()
+
+    def test_counts_are_the_same_as_MuonGroupingCounts(self):
+        counts_workspaces = self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+
+        self.assertEqual(list(counts_workspaces.keys()), ["fwd", "bwd"])
+        for group in self.groups:
+            workspace = CloneWorkspace(counts_workspaces[group.name], StoreInADS=False)
+            expected = retrieve_ws(self.context.calculate_counts(self.run, group))
+
+            self.assertEqual(counts_workspaces[group.name], expected.name())
+            np.testing.assert_allclose(workspace.readX(0), expected.readX(0))
+            np.testing.assert_allclose(workspace.readY(0), expected.readY(0))
+            np.testing.assert_allclose(workspace.readE(0), expected.readE(0))
+            self.assertEqual(set(workspace.getSpectrum(0).getDetectorIDs()), set(expected.getSpectrum(0).getDetectorIDs()))
+            self.assertEqual(workspace.getSpectrum(0).getSpectrumNo(), 1)
+            for log_name in ["analysis_group_name", "analysis_group", "analysis_periods_summed", "analysis_periods_subtracted"]:
+                self.assertEqual(workspace.run().getProperty(log_name).value, expected.run().getProperty(log_name).value)
+
+    def test_pre_processing_is_only_run_again_when_its_parameters_change(self):
+        with mock.patch.object(muon_grouping_engine, "run_pre_processing", wraps=muon_grouping_engine.run_pre_processing) as pre_processing:
+            self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+            self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+            self.assertEqual(pre_processing.call_count, 1)
+
+            self.context.gui_context.update({"FirstGoodDataFromFile": False, "FirstGoodData": 0.5})
+            self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+            self.assertEqual(pre_processing.call_count, 2)
+
+    def test_only_changed_groups_are_calculated_again(self):
+        with mock.patch.object(self.engine, "_calculate_group_counts", wraps=self.engine._calculate_group_counts) as calculate_group_counts:
+            self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+            self.assertEqual(calculate_group_counts.call_count, 1)
+            self.assertEqual(len(calculate_group_counts.call_args[0][2]), 2)
+
+            self.groups[0].detectors = [1, 2, 3]
+            counts_workspaces = self.engine.calculate_all_counts(self.context, self.run, self.groups, False)
+            self.assertEqual(calculate_group_counts.call_count, 2)
+            self.assertEqual(calculate_group_counts.call_args[0][2], [(1, 2, 3)])
+
+        self.assertEqual(retrieve_ws(counts_workspaces["fwd"]).run().getProperty("analysis_group").value, "1-3")
+
+    def test_rebinned_and_raw_counts_do_not_share_pre_processed_data(self):
+        self.context.gui_context.update({"RebinType": "Fixed", "RebinFixed": "2"})
+
+        def counts(rebin):
+            counts_workspaces = self.engine.calculate_all_counts(self.context, self.run, self.groups, rebin)
+            return {name: CloneWorkspace(workspace_name, StoreInADS=False) for name, workspace_name in counts_workspaces.items()}
+
+        raw = counts(False)
+        rebinned = counts(True)
+        raw_again = counts(False)
+
+        for group in self.groups:
+            raw_x, rebinned_x = raw[group.name].readX(0), rebinned[group.name].readX(0)
+            self.assertLess(len(rebinned_x), len(raw_x))
+            np.testing.assert_allclose(np.diff(rebinned_x)[:-1], 2.0 * (raw_x[1] - raw_x[0]), rtol=1e-6)
+            self.assertEqual(len(rebinned[group.name].readY(0)), len(rebinned_x) - 1)
+            np.testing.assert_allclose(rebinned[group.name].readY(0).sum(), raw[group.name].readY(0).sum(), rtol=1e-6)
+
+            np.testing.assert_array_equal(raw_again[group.name].readX(0), raw_x)
+            np.testing.assert_array_equal(raw_again[group.name].readY(0), raw[group.name].readY(0))
+            np.testing.assert_array_equal(raw_again[group.name].readE(0), raw[group.name].readE(0))
+
+    def test_groups_without_periods_in_the_run_are_skipped(self):
+        groups = self.groups + [MuonGroup("missing_period", detector_ids=[1, 2], periods=[3])]
+
+        counts_workspaces = self.engine.calculate_all_counts(self.context, self.run, groups, False)
+
+        self.assertEqual(list(counts_workspaces.keys()), ["fwd", "bwd"])
+
+    def test_detectors_missing_from_the_data_raise(self):
+        groups = [MuonGroup("invalid", detector_ids=[1, 100000])]
+
+        with self.assertRaises(ValueError):
+            self.engine.calculate_all_counts(self.context, self.run, groups, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
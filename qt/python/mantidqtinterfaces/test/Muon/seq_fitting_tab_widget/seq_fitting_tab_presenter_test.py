@@ -143,6 +143,26 @@ class SeqFittingTabPresenterTest(unittest.TestCase):
         self.view.fit_table.set_fit_quality.assert_called_once_with(2, "Success", 1.07)
         self.view.fit_selected_button.setEnabled.assert_called_once_with(True)
 
+    def test_handle_seq_fit_row_finished_updates_the_row_of_the_fit(self):
+        fit_values = [0.6, 0.9, 0.1, 1]
+        fit_function = self._setup_test_fit_function(fit_values)
+        self.model.get_all_fit_function_parameter_values_for = mock.Mock(return_value=fit_values)
+        self.presenter.selected_rows = [2, 5]
+
+        self.presenter.handle_seq_fit_row_finished((1, fit_function, "Success", 1.07))
+
+        self.view.fit_table.set_parameter_values_for_row.assert_called_once_with(5, fit_values)
+        self.view.fit_table.set_fit_quality.assert_called_once_with(5, "Success", 1.07)
+
+    def test_seq_fit_row_finished_is_passed_to_the_view_to_be_handled_on_the_gui_thread(self):
+        fit_result = (1, mock.Mock(), "Success", 1.07)
+
+        self.presenter.sequential_fit_row_finished_observer.update(None, fit_result)
+
+        self.view.setup_slot_for_fit_row_finished.assert_called_once_with(self.presenter.handle_seq_fit_row_finished)
+        self.view.notify_fit_row_finished.assert_called_once_with(fit_result)
+        self.view.fit_table.set_parameter_values_for_row.assert_not_called()
+
     @mock.patch("mantidqtinterfaces.Muon.GUI.Common.seq_fitting_tab_widget.seq_fitting_tab_presenter.functools")
     def test_handle_sequential_fit_correctly_sets_up_fit(self, mock_function_tools):
         workspaces = ["EMU20884; Group; fwd; Asymmetry"]
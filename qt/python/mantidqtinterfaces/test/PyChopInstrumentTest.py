@@ -87,6 +87,43 @@ class PyChopInstrumentTests(unittest.TestCase):
             assert "Cannot calculate for energy transfer greater than Ei" in str(w[0].message)
             assert np.isnan(res[0])
 
+    def test_pychop_res_flux_arrays(self):
+        # Checks that the array calculation gives the same results as the calculation for each energy
+        for instname, chopper, freq in [("MERLIN", "G", [400]), ("LET", "High flux", [240, 120])]:
+            chopobj = Instrument(instname, chopper, freq)
+            eis = np.linspace(max(chopobj.emin, 1.0), 80.0, 12)
+            freqs = np.array([freq[0], freq[0] / 2])
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                res, flux = chopobj.getResFluxArrays(eis[:, np.newaxis], freqs[np.newaxis, :])
+                self.assertEqual(res.shape, (12, 2))
+                self.assertEqual(chopobj.getFrequency(), freq)
+                for j, frq in enumerate(freqs):
+                    chopobj.setFrequency([frq] + freq[1:])
+                    for i, ei in enumerate(eis):
+                        np.testing.assert_allclose(res[i, j], chopobj.getResolution(0.0, ei)[0], rtol=1e-10)
+                        np.testing.assert_allclose(flux[i, j], chopobj.getFlux(ei), rtol=1e-10)
+                chopobj.setFrequency(freq)
+                etrans = np.linspace(0, 0.9, 5)
+                res, _ = chopobj.getResFluxArrays(eis[:, np.newaxis], None, eis[:, np.newaxis] * etrans)
+                for i, ei in enumerate(eis):
+                    np.testing.assert_allclose(res[i], chopobj.getResolution(ei * etrans, ei), rtol=1e-10)
+
+    def test_pychop_chopper_times_cache(self):
+        # Checks that the opening times are calculated once for each setting and that the phase offset is not
+        # applied to the chopper phases more than once
+        chopobj = Instrument("MERLIN", "G", 400)
+        phase = list(chopobj.chopper_system.phase)
+        with patch.object(MulpyRep, "calcChopTimes", wraps=MulpyRep.calcChopTimes) as calc_chop_times:
+            eis = chopobj.getAllowedEi(30)
+            self.assertEqual(chopobj.getAllowedEi(30), eis)
+            self.assertEqual(calc_chop_times.call_count, 1)
+            chopobj.getAllowedEi(50)
+            self.assertEqual(calc_chop_times.call_count, 2)
+        self.assertEqual(chopobj.chopper_system.phase, phase)
+        chopobj.chopper_system._chop_times_cache.clear()
+        self.assertEqual(chopobj.getAllowedEi(30), eis)
+
 
 class MockedModule(mock.MagicMock):
     # A class which is meant to act like a module
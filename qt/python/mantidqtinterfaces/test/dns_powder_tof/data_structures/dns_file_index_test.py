@@ -0,0 +1,97 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#     NScD Oak Ridge National Laboratory, European Spallation Source
+#     & Institut Laue - Langevin
+# SPDX - License - Identifier: GPL - 3.0 +
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from mantid.api import FileFinder
+
+from mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index import INDEX_FILENAME, DNSFileIndex, DNSIndexedFile
+
+
+class DNSFileIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.data_path = tempfile.mkdtemp()
+        self.filename = "service_774714.d_dat"
+        shutil.copy(FileFinder.Instance().getFullPath("dnstof.d_dat"), os.path.join(self.data_path, self.filename))
+        self.index = DNSFileIndex()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_path)
+
+    def test_update(self):
+        progress = mock.Mock()
+        test_v = self.index.update(self.data_path, [self.filename, "missing.d_dat"], [], progress)
+        self.assertEqual(sorted(test_v), ["missing.d_dat", self.filename])
+        self.assertEqual(progress.call_count, 2)
+        self.assertTrue(self.index.is_readable(self.filename))
+        self.assertEqual(self.index.get_unreadable([self.filename, "missing.d_dat"]), ["missing.d_dat"])
+        dns_file = self.index.get(self.filename)
+        self.assertIsInstance(dns_file, DNSIndexedFile)
+        self.assertAlmostEqual(dns_file.det_rot, -7.5)
+        self.assertEqual(dns_file.filename, self.filename)
+        self.assertNotIn("counts", dns_file)
+
+    def test_update_reads_only_changed_files(self):
+        self.index.update(self.data_path, [self.filename], [])
+        test_v = self.index.update(self.data_path, [self.filename], [])
+        self.assertEqual(test_v, [])
+        with open(os.path.join(self.data_path, self.filename), "a") as datafile:
+            datafile.write("\n")
+        test_v = self.index.update(self.data_path, [self.filename], [])
+        self.assertEqual(test_v, [self.filename])
+
+    def test_update_canceled(self):
+        filenames = [self.filename, "a.d_dat", "b.d_dat"]
+        test_v = self.index.update(self.data_path, filenames, [], canceled=lambda: True)
+        self.assertLess(len(test_v), len(filenames))
+
+    def test_save_and_load(self):
+        self.index.update(self.data_path, [self.filename], [])
+        self.index.save()
+        self.assertTrue(os.path.isfile(os.path.join(self.data_path, INDEX_FILENAME)))
+        new_index = DNSFileIndex()
+        new_index.load(self.data_path)
+        self.assertEqual(new_index.entries, self.index.entries)
+        self.assertEqual(new_index.update(self.data_path, [self.filename], []), [])
+
+    def test_load_invalid_index(self):
+        with open(os.path.join(self.data_path, INDEX_FILENAME), "w") as index_file:
+            index_file.write("no index")
+        self.index.load(self.data_path)
+        self.assertEqual(self.index.entries, {})
+
+    def test_prune(self):
+        self.index.update(self.data_path, [self.filename, "missing.d_dat"], [])
+        self.index.prune([self.filename])
+        self.assertEqual(list(self.index.entries.keys()), [self.filename])
+
+    def test_get_dns_files(self):
+        self.index.update(self.data_path, [self.filename, "missing.d_dat"], [])
+        test_v = self.index.get_dns_files(["missing.d_dat", self.filename])
+        self.assertEqual([dns_file.filename for dns_file in test_v], [self.filename])
+
+    def test_get_legacy_file_polarisation(self):
+        self.index.entries["legacy.d_dat"] = {
+            "filename": "legacy.d_dat",
+            "field": "unknown",
+            "legacy_format": True,
+            "flipper_z_compensation_current": 0.0,
+            "a_coil_current": 0.0,
+            "b_coil_current": 0.0,
+            "c_coil_current": -2.0,
+            "z_coil_current": 0.0,
+        }
+        polarisation_table = [{"polarisation": "z", "C_a": 0.0, "C_b": 0.0, "C_c": -2.0, "C_z": 0.0}]
+        self.assertEqual(self.index.get("legacy.d_dat", polarisation_table).field, "z_nsf")
+        self.assertEqual(self.index.get("legacy.d_dat").field, "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
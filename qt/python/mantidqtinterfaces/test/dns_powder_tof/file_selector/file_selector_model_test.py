@@ -13,9 +13,9 @@ import unittest
 from unittest import mock
 from unittest.mock import patch
 
+from mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index import DNSFileIndex
 from mantidqtinterfaces.dns_powder_tof.data_structures.dns_obs_model import DNSObsModel
 from mantidqtinterfaces.dns_powder_tof.data_structures.dns_treemodel import DNSTreeModel
-from mantidqtinterfaces.dns_powder_tof.data_structures.object_dict import ObjectDict
 from mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model import DNSFileSelectorModel
 from mantidqtinterfaces.dns_powder_tof.helpers.helpers_for_testing import dns_file, get_filepath
 
@@ -42,15 +42,15 @@ class DNSFileSelectorModelTest(unittest.TestCase):
     def setUp(self):
         self.parent.update_progress.reset_mock()
 
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSFileSelectorModel._save_filelist")
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSFile", new=dns_file)
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFileIndex.save")
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFile", new=dns_file)
     def read3files(self, mock_save):
         # this avoids reading files by patching dnsfile with a corresponding
         # dictionary, there are three different files supported
         self.model.datafiles = get3files()
         self.model.all_datafiles = get3files()
         self.model.datapath = self.filepath
-        self.model.read_all(self.model.datafiles, self.model.datapath, {}, [])
+        self.model.read_all(self.model.datafiles, self.model.datapath, DNSFileIndex(), [])
         mock_save.assert_called_once()
 
     def test___init__(self):
@@ -124,44 +124,39 @@ class DNSFileSelectorModelTest(unittest.TestCase):
         self.model._clear_scans_if_not_sequential(False)
         self.assertEqual(self.model.sample_data_tree_model.rowCount(), 0)
 
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSFileSelectorModel._load_saved_filelist")
+    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSFileIndex.load")
     def test_get_list_of_loaded_files(self, mock_load):
-        mock_load.return_value = "x"
         test_v = self.model._get_list_of_loaded_files("a", True)
-        self.assertEqual(test_v, {})
+        mock_load.assert_not_called()
+        self.assertIs(test_v, self.model.file_index)
         test_v = self.model._get_list_of_loaded_files("a", False)
         mock_load.assert_called_once_with("a")
-        self.assertEqual(test_v, "x")
-
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.load_txt")
-    def test_load_saved_filelist(self, mock_load):
-        mock_load.return_value = [" ; 0" * 14]
-        test_v = self.model._load_saved_filelist("123")
-        mock_load.assert_called_once_with("last_filelist.txt", "123")
-        self.assertIsInstance(test_v["0"], ObjectDict)
-        for name in [
-            "file_number",
-            "det_rot",
-            "sample_rot",
-            "field",
-            "temp_sample",
-            "sample",
-            "end_time",
-            "tof_channels",
-            "channel_width",
-            "filename",
-            "wavelength",
-            "selector_speed",
-            "scan_number",
-            "scan_command",
-            "scan_points",
-            "new_format",
-        ]:
-            self.assertTrue(hasattr(test_v["0"], name))
-        self.assertEqual(len(test_v), 1)
-        mock_load.side_effect = IOError
-        test_v = self.model._load_saved_filelist("123")
-        self.assertEqual(test_v, {})
+        self.assertIs(test_v, self.model.file_index)
+
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFileIndex.save")
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFile")
+    def test_read_all_reads_only_new_files(self, mock_dnsfile, mock_save):
+        mock_dnsfile.side_effect = dns_file
+        file_index = DNSFileIndex()
+        self.model.all_datafiles = get3files()
+        self.model.read_all(get3files(), self.filepath, file_index, [])
+        self.assertEqual(mock_dnsfile.call_count, 3)
+        mock_dnsfile.reset_mock()
+        file_index.entries[get3files()[0]]["mtime"], file_index.entries[get3files()[0]]["size"] = 1.0, 2
+        with patch.object(DNSFileIndex, "_file_signature", return_value=(1.0, 2)):
+            self.model.read_all(get3files(), self.filepath, file_index, [])
+        mock_dnsfile.assert_has_calls([mock.call(self.filepath, file, []) for file in get3files()[1:]], any_order=True)
+        self.assertEqual(mock_dnsfile.call_count, 2)
+        self.assertEqual(self.model.sample_data_tree_model.rowCount(), 3)
+
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFileIndex.save")
+    @patch("mantidqtinterfaces.dns_powder_tof.data_structures.dns_file_index.DNSFile")
+    def test_read_all_retries_unreadable_files(self, mock_dnsfile, mock_save):
+        mock_dnsfile.side_effect = RuntimeError("The file is not complete")
+        self.model.all_datafiles = get3files()
+        self.model.read_all(get3files(), self.filepath, DNSFileIndex(), [])
+        self.assertEqual(self.model.old_data_set, set())
+        self.assertEqual(self.model.sample_data_tree_model.rowCount(), 0)
 
     def test_check_last_scans(self):
         self.read3files()  # pylint: disable=no-value-for-parameter
@@ -243,26 +238,6 @@ class DNSFileSelectorModelTest(unittest.TestCase):
         self.model.open_datafile(1, "b", "c")
         mock_open.assert_called_once_with("a", "b")
 
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSFile")
-    def test_load_file_from_cache_or_new(self, mock_dnsfile):
-        filename = get2files()[0]
-        # data_path = self.filepath
-        mydict = {filename: dns_file("a", filename, [])}
-        test_v = self.model._load_file_from_cache_or_new(mydict, filename, "a", [])
-        mock_dnsfile.assert_not_called()
-        self.assertIsInstance(test_v, ObjectDict)
-        test_v = self.model._load_file_from_cache_or_new({}, filename, "a", [])
-        mock_dnsfile.assert_called_once_with("a", filename, [])
-
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.DNSTreeModel.get_txt")
-    @patch("mantidqtinterfaces.dns_powder_tof.file_selector.file_selector_model.save_txt")
-    def test_save_filelist(self, mock_save, mock_get_txt):
-        mock_get_txt.return_value = "c"
-        mock_save.side_effect = PermissionError  # handled exception
-        self.model._save_filelist("a")
-        mock_get_txt.assert_called_once()
-        mock_save.assert_called_once_with("c", "last_filelist.txt", "a")
-
 
 if __name__ == "__main__":
     unittest.main()
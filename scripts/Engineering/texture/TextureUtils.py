@@ -5,15 +5,17 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import numpy as np
-from os import path, scandir
+from os import cpu_count, path, scandir
 import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from Engineering.texture.polefigure.polefigure_model import TextureProjection
 from Engineering.texture.correction.correction_model import TextureCorrectionModel
 from mantid.simpleapi import SaveNexus, logger, CreateEmptyTableWorkspace, Fit
 from pathlib import Path
 from Engineering.EnggUtils import GROUP
 from Engineering.EnginX import EnginX
-from mantid.api import AnalysisDataService as ADS, MultiDomainFunction, FunctionFactory
+from mantid.api import AnalysisDataService as ADS, MultiDomainFunction, FunctionFactory, WorkspaceGroup
 from typing import Optional, Sequence, Union, Tuple
 from mantid.dataobjects import Workspace2D
 from mantid.fitfunctions import FunctionWrapper, CompositeFunctionWrapper
@@ -383,6 +385,127 @@ def is_macOS():
     return sys.platform == "darwin"
 
 
+def _delete_fit_outputs(fit_output: str) -> None:
+    # remove the members of the output workspace group as well, as removing a group leaves its members in the ADS
+    for suffix in ("_Parameters", "_NormalisedCovarianceMatrix", "_Workspaces", "_Workspace"):
+        name = fit_output + suffix
+        if ADS.doesExist(name):
+            ws = ADS.retrieve(name)
+            if isinstance(ws, WorkspaceGroup):
+                for member in ws.getNames():
+                    ADS.remove(member)
+            ADS.remove(name)
+
+
+def _fit_peak(
+    ws: Workspace2D,
+    peak: float,
+    peak_window: float,
+    out_ws: str,
+    parameters_to_tie: Sequence[str],
+    i_over_sigma_thresh: float,
+    nan_replacement: Optional[str],
+    no_fit_value_dict: Optional[dict],
+) -> None:
+    """
+    Fit a single peak in all the spectra of a workspace and fill the table of fit parameters out_ws with the results.
+    The intermediate fit outputs are named after out_ws, so that several peaks can be fit at the same time.
+    """
+    fit_kwargs = {
+        "Minimizer": "Levenberg-Marquardt",
+        "StepSizeMethod": "Sqrt epsilon",
+        "IgnoreInvalidData": True,
+        "CreateOutput": True,
+        "OutputCompositeMembers": True,
+    }
+
+    xmin, xmax = peak - peak_window, peak + peak_window
+
+    out_tab = CreateEmptyTableWorkspace(OutputWorkspace=out_ws)
+
+    peak_func_name = "BackToBackExponential"
+    bg_func_name = "LinearBackground"
+
+    func_generator = TexturePeakFunctionGenerator([])  # don't fix any parameters
+    initial_function, md_fit_kwargs, intensity_estimates = func_generator.get_initial_fit_function_and_kwargs_from_specs(
+        ws, peak, (xmin, xmax), parameters_to_tie, peak_func_name, bg_func_name
+    )
+
+    first_fit_output, fit_output = f"{out_ws}_first_fit", f"{out_ws}_fit"
+    try:
+        fit_object = Fit(
+            Function=initial_function,
+            CostFunction="Least squares",
+            Output=first_fit_output,
+            MaxIterations=50,  # if it hasn't fit in 50 it is likely because the texture has the peak missing
+            **fit_kwargs,
+            **md_fit_kwargs,
+        )
+
+        fit_result = {"Function": fit_object.Function.function, "OutputWorkspace": fit_object.OutputWorkspace.name()}
+
+        # update peak mask based on I/sig from fit
+        *_, i_over_sigma, _ = calc_intens_and_sigma_arrays(fit_result, "Summation")
+        fit_mask = i_over_sigma > i_over_sigma_thresh
+
+        # fit only peak pixels and let peak centers vary independently of DIFC ratio
+        final_function = func_generator.get_final_fit_function(fit_result["Function"], fit_mask, 0.02)
+        spec_fit = Fit(
+            Function=final_function,
+            CostFunction="Least squares",
+            Output=fit_output,
+            MaxIterations=50,  # if it hasn't fit in 50 it is likely because the texture has the peak missing
+            **fit_kwargs,
+            **md_fit_kwargs,
+        ).OutputParameters
+
+        all_params = spec_fit.column("Name")[:-1]  # last row is cost function
+        param_vals = spec_fit.column("Value")[:-1]
+        param_errs = spec_fit.column("Error")[:-1]
+    finally:
+        _delete_fit_outputs(first_fit_output)
+        _delete_fit_outputs(fit_output)
+
+    si = ws.spectrumInfo()
+
+    out_tab.addColumn("int", "wsindex")
+    out_tab.addColumn("double", "I_est")
+    u_params = []
+    for col in all_params:  # last col is cost of whole fit
+        spec_num, func_num, param = col.split(".")
+        # assume first function is the peak
+        if func_num == "f0" and param not in u_params:
+            u_params.append(param)
+            out_tab.addColumn("double", param)
+            out_tab.addColumn("double", f"{param}_err")
+
+    default_vals = get_default_values(u_params, no_fit_value_dict)
+
+    table_vals = np.zeros((si.size(), 2 * len(u_params) + 1))  # intensity_est + param_1_val, param_1_err, +...
+    for ispec in range(si.size()):
+        if fit_mask[ispec]:
+            row = [intensity_estimates[ispec]]
+            for p in u_params:
+                param_name = f"f{ispec}.f0.{p}"
+                pind = all_params.index(param_name)
+                row += [param_vals[pind], param_errs[pind]]
+        else:
+            row = [default_vals.get("I_est", np.nan)]
+            for p in u_params:
+                row += [default_vals[p], np.nan]
+        table_vals[ispec] = row
+    if nan_replacement:
+        table_vals = replace_nans(table_vals, nan_replacement)
+    for i, row in enumerate(table_vals):
+        out_tab.addRow([i] + list(row))
+
+
+def _timed_fit_peak(*args) -> float:
+    start = time.perf_counter()
+    _fit_peak(*args)
+    return time.perf_counter() - start
+
+
 def fit_all_peaks(
     wss: Sequence[str],
     peaks: Sequence[float],
@@ -393,6 +516,7 @@ def fit_all_peaks(
     i_over_sigma_thresh: float = 2.0,
     nan_replacement: Optional[str] = "zeros",
     no_fit_value_dict: Optional[dict] = None,
+    max_workers: Optional[int] = None,
 ) -> None:
     """
 
@@ -409,107 +533,63 @@ def fit_all_peaks(
                      zero - will replace all nans with 0.0
                      min/max/mean - will replace all nans in a column with the min/max/mean non-nan value (otherwise will remain nan)
     no_fit_value_dict: allows the user to specify the unfit default value of parameters as a dict of key:value pairs
+    max_workers: maximum number of (workspace, peak) pairs fit at the same time, defaults to the number of cores.
+                 The parameter tables are saved one at a time as the fits finish, and at most twice this number of
+                 tables are waiting to be saved. A failed fit is logged and does not stop the remaining fits.
     """
 
     if is_macOS():
         logger.warning("Fitting can be unreliable on MacOS, this is being worked on")
 
-    fit_kwargs = {
-        "Minimizer": "Levenberg-Marquardt",
-        "StepSizeMethod": "Sqrt epsilon",
-        "IgnoreInvalidData": True,
-        "CreateOutput": True,
-        "OutputCompositeMembers": True,
-    }
+    parameters_to_tie = () if not parameters_to_tie else parameters_to_tie
+    max_workers = max_workers if max_workers else (cpu_count() or 1)
 
+    tasks = []
     for wsname in wss:
         ws = ADS.retrieve(wsname)
         run, prefix = _get_run_and_prefix_from_ws_log(ws, wsname)
         grouping = _get_grouping_from_ws_log(ws)
 
         for peak in peaks:
-            logger.information(f"Workspace: {wsname}, Peak: {peak}")
-            # change peak window to fraction
             out_ws = f"{prefix}{run}_{peak}_{grouping}_Fit_Parameters"
             out_file = out_ws + ".nxs"
             out_path = path.join(save_dir, out_file) if override_dir else path.join(save_dir, grouping, str(peak), out_file)
-
-            xmin, xmax = peak - peak_window, peak + peak_window
-
-            out_tab = CreateEmptyTableWorkspace(OutputWorkspace=out_ws)
-
-            peak_func_name = "BackToBackExponential"
-            bg_func_name = "LinearBackground"
-
-            func_generator = TexturePeakFunctionGenerator([])  # don't fix any parameters
-            parameters_to_tie = () if not parameters_to_tie else parameters_to_tie
-            initial_function, md_fit_kwargs, intensity_estimates = func_generator.get_initial_fit_function_and_kwargs_from_specs(
-                ws, peak, (xmin, xmax), parameters_to_tie, peak_func_name, bg_func_name
-            )
-
-            fit_object = Fit(
-                Function=initial_function,
-                CostFunction="Least squares",
-                Output="first_fit",
-                MaxIterations=50,  # if it hasn't fit in 50 it is likely because the texture has the peak missing
-                **fit_kwargs,
-                **md_fit_kwargs,
-            )
-
-            fit_result = {"Function": fit_object.Function.function, "OutputWorkspace": fit_object.OutputWorkspace.name()}
-
-            # update peak mask based on I/sig from fit
-            *_, i_over_sigma, _ = calc_intens_and_sigma_arrays(fit_result, "Summation")
-            fit_mask = i_over_sigma > i_over_sigma_thresh
-
-            # fit only peak pixels and let peak centers vary independently of DIFC ratio
-            final_function = func_generator.get_final_fit_function(fit_result["Function"], fit_mask, 0.02)
-            Fit(
-                Function=final_function,
-                CostFunction="Least squares",
-                Output="fit",
-                MaxIterations=50,  # if it hasn't fit in 50 it is likely because the texture has the peak missing
-                **fit_kwargs,
-                **md_fit_kwargs,
-            )
-
-            spec_fit = ADS.retrieve("fit_Parameters")
-            si = ws.spectrumInfo()
-
-            out_tab.addColumn("int", "wsindex")
-            out_tab.addColumn("double", "I_est")
-            all_params = spec_fit.column("Name")[:-1]  # last row is cost function
-            param_vals = spec_fit.column("Value")[:-1]
-            param_errs = spec_fit.column("Error")[:-1]
-            u_params = []
-            for col in all_params:  # last col is cost of whole fit
-                spec_num, func_num, param = col.split(".")
-                # assume first function is the peak
-                if func_num == "f0" and param not in u_params:
-                    u_params.append(param)
-                    out_tab.addColumn("double", param)
-                    out_tab.addColumn("double", f"{param}_err")
-
-            default_vals = get_default_values(u_params, no_fit_value_dict)
-
-            table_vals = np.zeros((si.size(), 2 * len(u_params) + 1))  # intensity_est + param_1_val, param_1_err, +...
-            for ispec in range(si.size()):
-                if fit_mask[ispec]:
-                    row = [intensity_estimates[ispec]]
-                    for p in u_params:
-                        param_name = f"f{ispec}.f0.{p}"
-                        pind = all_params.index(param_name)
-                        row += [param_vals[pind], param_errs[pind]]
-                else:
-                    row = [default_vals.get("I_est", np.nan)]
-                    for p in u_params:
-                        row += [default_vals[p], np.nan]
-                table_vals[ispec] = row
-            if nan_replacement:
-                table_vals = replace_nans(table_vals, nan_replacement)
-            for i, row in enumerate(table_vals):
-                out_tab.addRow([i] + list(row))
-            SaveNexus(InputWorkspace=out_ws, Filename=out_path)
+            tasks.append((wsname, ws, peak, out_ws, out_path))
+
+    failed_fits = []
+    remaining_tasks = iter(tasks)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+        def submit_next_task():
+            task = next(remaining_tasks, None)
+            if task is not None:
+                wsname, ws, peak, out_ws, _ = task
+                args = (ws, peak, peak_window, out_ws, parameters_to_tie, i_over_sigma_thresh, nan_replacement, no_fit_value_dict)
+                running[executor.submit(_timed_fit_peak, *args)] = task
+
+        # bound the number of fits ahead of the writer
+        for _ in range(2 * max_workers):
+            submit_next_task()
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                wsname, _, peak, out_ws, out_path = running.pop(future)
+                submit_next_task()
+                try:
+                    fit_time = future.result()
+                except (RuntimeError, ValueError) as error:
+                    logger.warning(f"Workspace: {wsname}, Peak: {peak}, fit failed: {error}")
+                    failed_fits.append(f"{wsname} ({peak})")
+                    if ADS.doesExist(out_ws):
+                        ADS.remove(out_ws)
+                    continue
+                logger.information(f"Workspace: {wsname}, Peak: {peak}, fit in {fit_time:.2f} s")
+                SaveNexus(InputWorkspace=out_ws, Filename=out_path)
+
+    if failed_fits:
+        logger.error(f"{len(failed_fits)} of {len(tasks)} peak fits failed: {', '.join(failed_fits)}")
 
 
 # -------- Pole Figure Script Logic--------------------------------
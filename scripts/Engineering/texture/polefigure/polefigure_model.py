@@ -6,8 +6,6 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 from mantid.simpleapi import (
     CreatePoleFigureTableWorkspace,
-    CloneWorkspace,
-    CombineTableWorkspaces,
     logger,
     SaveNexus,
     CreateEmptyTableWorkspace,
@@ -18,7 +16,7 @@ from mantid.api import AnalysisDataService as ADS
 from typing import Optional, Sequence, Tuple
 import matplotlib.pyplot as plt
 from os import path, makedirs
-from scipy.interpolate import griddata
+from scipy.spatial import cKDTree
 from scipy.ndimage import gaussian_filter
 from Engineering.common.texture_sample_viewer import has_valid_shape
 from matplotlib.figure import Figure
@@ -26,7 +24,71 @@ from matplotlib.axes import Axes
 from Engineering.texture.xtal_helper import get_xtal_structure
 
 
+# radius and number of points along each axis of the grid contour plots are interpolated onto
+CONTOUR_GRID_RADIUS = 1
+CONTOUR_GRID_POINTS = 200
+# maximum number of pole figure geometries, with their projections and contour grids, kept by a TextureProjection
+MAX_CACHED_GEOMETRIES = 8
+
+
+class PoleFigureTable:
+    """
+    The columns of a pole figure table as NumPy arrays, so that the tables of many workspaces
+    can be combined at once rather than pairwise
+    """
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+
+    @classmethod
+    def from_table_workspaces(cls, ws_names: Sequence[str]) -> "PoleFigureTable":
+        tables = [ADS.retrieve(ws_name) for ws_name in ws_names]
+        columns = {
+            name: np.concatenate([np.asarray(table.columnArray(name), dtype=float) for table in tables])
+            for name in tables[0].getColumnNames()
+        }
+        return cls(columns)
+
+    def to_table_workspace(self, out_ws: str):
+        table = CreateEmptyTableWorkspace(OutputWorkspace=out_ws)
+        for name in self.columns:
+            table.addColumn(type="double", name=name, plottype=2)
+        for row in zip(*(column.tolist() for column in self.columns.values())):
+            table.addRow(list(row))
+        return table
+
+
+class PoleFigureGeometry:
+    """
+    The alphas and betas of a pole figure table. The projected positions and the nearest pole to each point of
+    the contour grid are cached for each projection, so that only the readout column needs reading when it changes
+    """
+
+    def __init__(self, alphas: np.ndarray, betas: np.ndarray):
+        self.alphas = alphas
+        self.betas = betas
+        self._projections = {}
+        self._contour_grid_indices = {}
+
+    def get_projection(self, projection: str) -> np.ndarray:
+        key = projection.lower()
+        if key not in self._projections:
+            proj = ster_proj if key == "stereographic" else azim_proj
+            self._projections[key] = proj(self.alphas, self.betas, np.zeros_like(self.alphas))[:, :2]
+        return self._projections[key]
+
+    def get_contour_grid_indices(self, projection: str) -> np.ndarray:
+        key = projection.lower()
+        if key not in self._contour_grid_indices:
+            projected = self.get_projection(projection)
+            self._contour_grid_indices[key] = get_nearest_contour_grid_indices(projected[:, 1], projected[:, 0])
+        return self._contour_grid_indices[key]
+
+
 class TextureProjection:
+    def __init__(self):
+        self._geometries = {}
+
     # ~~~~~ Pole Figure Data functions ~~~~~~~~
 
     def make_pole_figure_tables(
@@ -78,22 +140,24 @@ class TextureProjection:
                     AxesTransform=flat_ax_transform,
                 )
                 table_workspaces.append(ws_str)
-        CloneWorkspace(InputWorkspace=table_workspaces[0], OutputWorkspace=out_ws)
-        for tw in table_workspaces[1:]:
-            CombineTableWorkspaces(LHSWorkspace=out_ws, RHSWorkspace=tw, OutputWorkspace=out_ws)
+        PoleFigureTable.from_table_workspaces(table_workspaces).to_table_workspace(out_ws)
         self._save_files(out_ws, save_dirs)
 
-    @staticmethod
-    def get_pole_figure_data(ws_name: str, projection: str, readout_col: str = "I"):
-        if projection.lower() == "stereographic":
-            proj = ster_proj
-        else:
-            proj = azim_proj
+    def get_pole_figure_geometry_and_values(self, ws_name: str, readout_col: str = "I") -> Tuple[PoleFigureGeometry, np.ndarray]:
         ws = ADS.retrieve(ws_name)
-        alphas = np.asarray(ws.column("Alpha"))
-        betas = np.asarray(ws.column("Beta"))
-        i = np.asarray(ws.column(readout_col))
-        return proj(alphas, betas, i)
+        alphas = np.asarray(ws.columnArray("Alpha"), dtype=float)
+        betas = np.asarray(ws.columnArray("Beta"), dtype=float)
+        # tables with the same poles share a geometry, such as the tables of different readout columns
+        key = (alphas.tobytes(), betas.tobytes())
+        geometry = self._geometries.pop(key, None) or PoleFigureGeometry(alphas, betas)
+        self._geometries[key] = geometry
+        if len(self._geometries) > MAX_CACHED_GEOMETRIES:
+            del self._geometries[next(iter(self._geometries))]
+        return geometry, np.asarray(ws.columnArray(readout_col), dtype=float)
+
+    def get_pole_figure_data(self, ws_name: str, projection: str, readout_col: str = "I") -> np.ndarray:
+        geometry, i = self.get_pole_figure_geometry_and_values(ws_name, readout_col)
+        return np.concatenate([geometry.get_projection(projection), i[:, None]], axis=1)
 
     @staticmethod
     def get_pf_table_name(
@@ -133,14 +197,16 @@ class TextureProjection:
         contour_kernel: Optional[float] = 2.0,
         **kwargs,
     ) -> Figure:
-        pfi = self.get_pole_figure_data(ws_name, projection, readout_col)
+        geometry, i = self.get_pole_figure_geometry_and_values(ws_name, readout_col)
+        pfi = np.concatenate([geometry.get_projection(projection), i[:, None]], axis=1)
 
         if plot_exp:
             suffix = "scatter"
             fig, ax = self.plot_exp_pf(pfi, ax_labels, readout_col, fig, **kwargs)
         else:
             suffix = f"contour_{contour_kernel}"
-            fig, ax = self.plot_contour_pf(pfi, ax_labels, readout_col, fig, contour_kernel, **kwargs)
+            grid_indices = geometry.get_contour_grid_indices(projection)
+            fig, ax = self.plot_contour_pf(pfi, ax_labels, readout_col, fig, contour_kernel, grid_indices, **kwargs)
         if save_dirs:
             for save_dir in save_dirs:
                 fig.savefig(str(path.join(save_dir, ws_name + f"_{suffix}.png")))
@@ -185,18 +251,26 @@ class TextureProjection:
 
     @staticmethod
     def plot_contour_pf(
-        pfi: np.ndarray, ax_labels: Sequence[str], column_label: str, fig: Optional[Figure] = None, contour_kernel: float = 2.0, **kwargs
+        pfi: np.ndarray,
+        ax_labels: Sequence[str],
+        column_label: str,
+        fig: Optional[Figure] = None,
+        contour_kernel: float = 2.0,
+        grid_indices: Optional[np.ndarray] = None,
+        **kwargs,
     ) -> [Figure, Axes]:
         x, y, z = pfi[:, 1], pfi[:, 0], np.nan_to_num(pfi[:, 2])
         # Grid definition
-        R = 1
-        grid_x, grid_y = np.mgrid[-R:R:200j, -R:R:200j]
+        R = CONTOUR_GRID_RADIUS
+        grid_x, grid_y = get_contour_grid()
 
         # Mask to keep only points inside the circle of radius R
         mask = grid_x**2 + grid_y**2 <= R**2
 
-        # Interpolate z-values on the grid
-        grid_z = np.asarray(griddata((x, y), z, (grid_x, grid_y), method="nearest"))
+        # Interpolate z-values on the grid, taking the value of the nearest pole
+        if grid_indices is None:
+            grid_indices = get_nearest_contour_grid_indices(x, y)
+        grid_z = z[grid_indices]
         grid_z = np.asarray(gaussian_filter(grid_z, sigma=contour_kernel))
 
         # Apply the mask
@@ -336,6 +410,18 @@ class TextureProjection:
             self.set_ws_xtal(ws, lattice, space_group, basis, cif)
 
 
+def get_contour_grid() -> Tuple[np.ndarray, np.ndarray]:
+    R, n = CONTOUR_GRID_RADIUS, CONTOUR_GRID_POINTS
+    return np.mgrid[-R : R : n * 1j, -R : R : n * 1j]
+
+
+def get_nearest_contour_grid_indices(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    # same as the nearest neighbour interpolation of scipy.interpolate.griddata, but the indices can be reused
+    grid_x, grid_y = get_contour_grid()
+    _, indices = cKDTree(np.column_stack((x, y))).query(np.column_stack((grid_x.ravel(), grid_y.ravel())))
+    return indices.reshape(grid_x.shape)
+
+
 def ster_proj(alphas: np.ndarray, betas: np.ndarray, i: np.ndarray) -> np.ndarray:
     betas = np.pi - betas  # this formula projects onto the north-pole, and beta is taken from the south
     r = np.sin(betas) / (1 - np.cos(betas))
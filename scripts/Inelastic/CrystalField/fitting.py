@@ -11,15 +11,16 @@ from mantid.simpleapi import (
     CreateEmptyTableWorkspace,
     EvaluateFunction,
     FunctionFactory,
-    FunctionWrapper,
     plotSpectrum,
 )
 from .function import PeaksFunction, PhysicalProperties, ResolutionModel, Background, Function
 from .energies import energies
 from .normalisation import split2range, ionname2Nre
 from .CrystalFieldMultiSite import CrystalFieldMultiSite
+from .gofit_residual import GOFitResidual, run_gofit_seed, sample_seeds
+from concurrent.futures import ProcessPoolExecutor
 from scipy.constants import physical_constants
-from scipy.optimize._numdiff import approx_derivative
+import multiprocessing
 import numpy as np
 import re
 import scipy.optimize as sp
@@ -1441,15 +1442,9 @@ class CrystalFieldFit(object):
         m = self._input_workspace.getNumberBins(0)
         n = len(all_parameters)
 
-        # Create a wrapper around a callable mantid fitting function
-        callable_func = FunctionWrapper(self.model.function, all_parameters)
-
-        def wrapped_func(*params):
-            return callable_func(x, *params)
-
-        # Calculates the residual using a non-linear least squares cost function
-        def residual(params):
-            return np.ravel((y - wrapped_func(*np.array(params))) / e)
+        # Calculates the residual using a non-linear least squares cost function, evaluating the model on a
+        # workspace which is created once for the whole fit
+        residual = GOFitResidual(self.model.function, all_parameters, x, y, e)
 
         # Pop the 'parameter_bounds' and 'jacobian' arguments
         parameter_bounds = kwargs.pop("parameter_bounds", dict())
@@ -1475,7 +1470,7 @@ class CrystalFieldFit(object):
         all_parameters: List[str],
         b_parameters: List[str],
         p0: List[float],
-        residual: Callable,
+        residual: GOFitResidual,
         parameter_bounds: Dict[str, Tuple[float, float]],
         jacobian: bool,
     ) -> List:
@@ -1493,9 +1488,76 @@ class CrystalFieldFit(object):
         algorithm_args.append(residual)
 
         if jacobian and (algorithm_name == "regularisation" or algorithm_name == "multistart"):
-            algorithm_args.append(lambda p: approx_derivative(residual, p, method="2-point"))
+            algorithm_args.append(residual.jacobian)
         return algorithm_args
 
+    def gofit_multistart(
+        self,
+        algorithm_callable: Callable,
+        parameter_bounds: Dict[str, Tuple[float, float]],
+        seeds: int = 10,
+        workers: int = None,
+        random_seed: int = None,
+        jacobian: bool = False,
+        **kwargs,
+    ) -> List[dict]:
+        """
+        Performs a multistart fit by running a local algorithm from the GOFit python package from starting points
+        sampled uniformly between the parameter bounds. The starting points are independent, so they are fitted
+        in parallel in separate processes, and the parameters of the best fit are kept.
+        @param algorithm_callable: The local algorithm callable from the GOFit python package, e.g. gofit.regularisation.
+        @param parameter_bounds: A dictionary of tuples containing the upper and lower bounds for each parameter.
+        @param seeds: The number of starting points, at least 1.
+        @param workers: The number of processes fitting the starting points, defaults to the number of cores.
+                        If 1, the starting points are fitted one after the other in this process.
+        @param random_seed: The seed of the random number generator sampling the starting points.
+        @param jacobian: A boolean to specify whether to use a Jacobian.
+
+        the remaining kwargs are passed to the GOFit algorithm callable.
+        @return: A list with the starting values, fitted values, status, cost and time in seconds of each starting point.
+        """
+        if seeds < 1:
+            raise ValueError("The number of starting points (seeds) must be at least 1, got %s" % seeds)
+        algorithm_name = algorithm_callable.__name__
+        b_parameters, shape_parameters, _ = self._find_b_and_shape_parameters_to_optimize()
+        all_parameters = b_parameters + shape_parameters
+        xl, xu = self._parse_lower_and_upper_bounds(all_parameters, parameter_bounds)
+        starts = sample_seeds(xl, xu, seeds, random_seed)
+
+        ws = self._input_workspace
+        data = (np.array(ws.readX(0)), np.array(ws.readY(0)), np.array(ws.readE(0)))
+        seed_args = [
+            ((algorithm_callable.__module__, algorithm_name), str(self.model.function), all_parameters, data, start, jacobian, kwargs)
+            for start in starts
+        ]
+
+        # A TypeError can occur when provided an invalid kwarg
+        try:
+            if workers == 1:
+                seed_results = [run_gofit_seed(*args) for args in seed_args]
+            else:
+                # Mantid is not safe to fork, so the workers start a new interpreter
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    futures = [executor.submit(run_gofit_seed, *args) for args in seed_args]
+                    seed_results = [future.result() for future in futures]
+        except TypeError as ex:
+            logger.error(str(ex))
+            return []
+
+        results = []
+        for start, (params, status, cost, seed_time) in zip(starts, seed_results):
+            logger.notice(
+                f"GOFit {algorithm_name} from starting point {len(results)} exited with status code {status} "
+                f"and cost {cost:.6g} in {seed_time:.2f} s."
+            )
+            results.append({"start": start, "parameters": params, "status": status, "cost": cost, "time": seed_time})
+        best = min(results, key=lambda result: result["cost"])
+
+        suffix = "_multistart_" + algorithm_name
+        self._process_gofit_output(all_parameters, best["parameters"], suffix)
+        self._create_seed_table(self._get_output_name() + suffix + "_seeds", results)
+        return results
+
     def _find_b_and_shape_parameters_to_optimize(self) -> Tuple[List[str], List[str], List[float]]:
         """Finds the B parameters and Shape parameters we want to optimize across."""
         b_params, shape_params, initial_values = [], [], []
@@ -1527,10 +1589,25 @@ class CrystalFieldFit(object):
         for name, value in zip(parameter_names, parameter_values):
             self.model.function.setParameter(name, value)
 
-        output_name = self._fit_properties["Output"] if "Output" in self._fit_properties else self._output_workspace_base_name
+        output_name = self._get_output_name()
         EvaluateFunction(Function=str(self.model.function), InputWorkspace=self._input_workspace, OutputWorkspace=output_name + suffix)
         self._create_parameter_table(output_name, suffix)
 
+    def _get_output_name(self) -> str:
+        return self._fit_properties["Output"] if "Output" in self._fit_properties else self._output_workspace_base_name
+
+    @staticmethod
+    def _create_seed_table(table_name: str, results: List[dict]) -> None:
+        """Creates a table workspace to display the outcome of each starting point of a multistart GOFit."""
+        seed_table = CreateEmptyTableWorkspace(OutputWorkspace=table_name)
+        seed_table.setTitle("Multistart Seeds")
+        seed_table.addColumn("int", "Seed")
+        seed_table.addColumn("int", "Status")
+        seed_table.addColumn("double", "Cost")
+        seed_table.addColumn("double", "Time")
+        for i, result in enumerate(results):
+            seed_table.addRow([i, int(result["status"]), result["cost"], result["time"]])
+
     def _create_parameter_table(self, output_name: str, suffix: str) -> None:
         """Creates a table workspace to display the output parameters from a GOFit."""
         parameter_table = CreateEmptyTableWorkspace(OutputWorkspace=output_name + suffix + "_parameters")
@@ -0,0 +1,133 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import importlib
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from mantid.api import AlgorithmManager, FunctionFactory, IFunction
+
+# relative step of the forward differences, the same as scipy's approx_derivative with method="2-point"
+RELATIVE_STEP = np.finfo(np.float64).eps ** 0.5
+
+
+class GOFitResidual(object):
+    """
+    Residual of a crystal field model for the GOFit algorithms. The workspace the model is evaluated on and the
+    EvaluateFunction algorithm are created once and reused for every evaluation, and the Jacobian is calculated
+    by forward differences which reuse the residual of the last evaluation at the same parameters.
+    """
+
+    def __init__(self, function: IFunction, parameter_names: Sequence[str], x: np.ndarray, y: np.ndarray, e: np.ndarray):
+        self._function = function
+        self._parameter_names = list(parameter_names)
+        self._y = np.asarray(y, dtype=float)
+        self._e = np.asarray(e, dtype=float)
+        self.number_of_evaluations = 0
+        self._last_params = None
+        self._last_residual = None
+
+        create_alg = AlgorithmManager.createUnmanaged("CreateWorkspace")
+        create_alg.initialize()
+        create_alg.setChild(True)
+        create_alg.setProperty("DataX", x)
+        create_alg.setProperty("DataY", x)
+        create_alg.setProperty("OutputWorkspace", "dummy")
+        create_alg.execute()
+
+        self._evaluate_alg = AlgorithmManager.createUnmanaged("EvaluateFunction")
+        self._evaluate_alg.initialize()
+        self._evaluate_alg.setChild(True)
+        self._evaluate_alg.setProperty("InputWorkspace", create_alg.getProperty("OutputWorkspace").value)
+        self._evaluate_alg.setProperty("OutputWorkspace", "dummy")
+
+    @property
+    def number_of_points(self) -> int:
+        return self._y.size
+
+    def set_parameters(self, params: Sequence[float]) -> None:
+        for name, value in zip(self._parameter_names, params):
+            self._function.setParameter(name, float(value))
+
+    def evaluate(self, params: Sequence[float]) -> np.ndarray:
+        """Evaluates the model with the given values of the parameters being optimized."""
+        self.set_parameters(params)
+        self._evaluate_alg.setProperty("Function", self._function)
+        self._evaluate_alg.execute()
+        self.number_of_evaluations += 1
+        return np.array(self._evaluate_alg.getProperty("OutputWorkspace").value.readY(1))
+
+    def __call__(self, params: Sequence[float]) -> np.ndarray:
+        params = np.array(params, dtype=float)
+        residual = np.ravel((self._y - self.evaluate(params)) / self._e)
+        self._last_params, self._last_residual = params, residual
+        return residual
+
+    def jacobian(self, params: Sequence[float]) -> np.ndarray:
+        """
+        Calculates the Jacobian of the residual by forward differences with the same steps as
+        approx_derivative(residual, params, method="2-point"), evaluating n rather than n + 1 models
+        when the residual at params has just been calculated.
+        """
+        params = np.array(params, dtype=float)
+        if self._last_params is not None and np.array_equal(params, self._last_params):
+            residual = self._last_residual
+        else:
+            residual = self(params)
+        # the step is rounded to one that can be represented exactly when added to the parameters
+        steps = RELATIVE_STEP * np.where(params >= 0, 1.0, -1.0) * np.maximum(1.0, np.abs(params))
+        steps = (params + steps) - params
+
+        jacobian = np.empty((residual.size, params.size))
+        shifted_params = np.tile(params, (params.size, 1))
+        shifted_params[np.diag_indices(params.size)] += steps
+        for i, shifted in enumerate(shifted_params):
+            jacobian[:, i] = np.ravel((self._y - self.evaluate(shifted)) / self._e) - residual
+        jacobian /= steps
+        # leave the model at the parameters the Jacobian was calculated for
+        self.set_parameters(params)
+        return jacobian
+
+
+def sample_seeds(lower_bounds: Sequence[float], upper_bounds: Sequence[float], number_of_seeds: int, random_seed=None) -> np.ndarray:
+    """Samples the starting parameters of a multistart fit uniformly between the bounds."""
+    rng = np.random.default_rng(random_seed)
+    return rng.uniform(lower_bounds, upper_bounds, size=(number_of_seeds, len(lower_bounds)))
+
+
+def run_gofit_seed(
+    algorithm: Tuple[str, str],
+    function: str,
+    parameter_names: List[str],
+    data: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    seed: np.ndarray,
+    jacobian: bool,
+    kwargs: Dict,
+) -> Tuple[np.ndarray, int, float, float]:
+    """
+    Runs a local GOFit algorithm from one starting point of a multistart fit. This only takes picklable arguments,
+    so that the starting points can be run in separate processes.
+    @param algorithm: The module and the name of the GOFit algorithm callable, e.g. ("gofit", "regularisation").
+    @param function: The model as a function string.
+    @param parameter_names: The names of the parameters being optimized.
+    @param data: The x, y and error data being fitted.
+    @param seed: The starting values of the parameters.
+    @param jacobian: Whether to pass a Jacobian to the algorithm.
+    @param kwargs: Keyword arguments of the algorithm.
+    @return: The fitted parameters, the status of the algorithm, the sum of the squared residuals and the time taken.
+    """
+    start = time.perf_counter()
+    algorithm_callable = getattr(importlib.import_module(algorithm[0]), algorithm[1])
+    residual = GOFitResidual(FunctionFactory.createInitialized(function), parameter_names, *data)
+
+    algorithm_args = [residual.number_of_points, len(parameter_names), np.array(seed, dtype=float), residual]
+    if jacobian:
+        algorithm_args.append(residual.jacobian)
+    params, status = algorithm_callable(*algorithm_args, **kwargs)
+
+    cost = float(np.sum(residual(params) ** 2))
+    return np.array(params), status, cost, time.perf_counter() - start
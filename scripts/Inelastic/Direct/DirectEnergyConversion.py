@@ -13,10 +13,13 @@ from mantid import geometry, api
 
 import os.path
 import copy
+import hashlib
 import math
 import time
 import numpy as np
 import collections.abc
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import Direct.CommonFunctions as common
 import Direct.diagnostics as diagnostics
 from Direct.PropertyManager import PropertyManager
@@ -516,88 +519,115 @@ class DirectEnergyConversion(object):
         #  -- code below uses current energy state from PropertyManager.incident_energy
         AllEn = PropertyManager.incident_energy.getAllEiList()
         num_ei_cuts = len(AllEn)
-        for ind, ei_guess in enumerate(AllEn):
-            PropertyManager.incident_energy.set_current_ind(ind)
+        self._multirep_ei_cache = {}
+        self._ei_timings = []
+        # In multirep mode the results for each energy are saved in the background,
+        # while the next energy is processed
+        save_executor = ThreadPoolExecutor(max_workers=1) if self._multirep_mode else None
+        save_futures = []
+        save_errors = []
+        try:
+            for ind, ei_guess in enumerate(AllEn):
+                PropertyManager.incident_energy.set_current_ind(ind)
+
+                cut_ind = ind + 1  # nice printing convention (1 of 1 rather them 0 of 1)
+                timings = {"ei_guess": ei_guess}
+                self._ei_timings.append(timings)
+                stage_start = time.time()
+                # ---------------
+                if self._multirep_mode:
+                    tof_range = self.find_tof_range_for_multirep(ws_base)
+                    ws_base = PropertyManager.sample_run.chop_ws_part(ws_base, tof_range, self._do_early_rebinning, cut_ind, num_ei_cuts)
+                    prop_man.log(
+                        "*** Processing multirep chunk: #{0}/{1} for provisional energy: {2} meV".format(cut_ind, num_ei_cuts, ei_guess),
+                        "notice",
+                    )
+                    # do bleed corrections for chunk if necessary
+                    bleed_mask = self._do_bleed_corrections(PropertyManager.sample_run, cut_ind)
+                    if bleed_mask is not None:
+                        mask_ws_name = PropertyManager.sample_run.get_workspace().name() + "_bleed_mask"
+                        RenameWorkspace(bleed_mask, OutputWorkspace=mask_ws_name)
+                        self._old_runs_list.append(mask_ws_name)
+                else:
+                    # single energy uses single workspace and all TOF are used
+                    tof_range = None
 
-            cut_ind = ind + 1  # nice printing convention (1 of 1 rather them 0 of 1)
-            # ---------------
-            if self._multirep_mode:
-                tof_range = self.find_tof_range_for_multirep(ws_base)
-                ws_base = PropertyManager.sample_run.chop_ws_part(ws_base, tof_range, self._do_early_rebinning, cut_ind, num_ei_cuts)
-                prop_man.log(
-                    "*** Processing multirep chunk: #{0}/{1} for provisional energy: {2} meV".format(cut_ind, num_ei_cuts, ei_guess),
-                    "notice",
-                )
-                # do bleed corrections for chunk if necessary
-                bleed_mask = self._do_bleed_corrections(PropertyManager.sample_run, cut_ind)
-                if bleed_mask is not None:
-                    mask_ws_name = PropertyManager.sample_run.get_workspace().name() + "_bleed_mask"
-                    RenameWorkspace(bleed_mask, OutputWorkspace=mask_ws_name)
-                    self._old_runs_list.append(mask_ws_name)
-            else:
-                # single energy uses single workspace and all TOF are used
-                tof_range = None
+                # Do custom preprocessing if such operation is defined
+                try:
+                    ws_to_preprocess = PropertyManager.sample_run.get_workspace()
+                    ws_to_preprocess = self.do_preprocessing(ws_to_preprocess)
+                    PropertyManager.sample_run.synchronize_ws(ws_to_preprocess)
+                except AttributeError:
+                    pass
+                # ---------------
+                #
+                timings["tof_range"], stage_start = _elapsed_since(stage_start)
+                # Run the conversion first on the sample
+                deltaE_ws_sample = self.mono_sample(PropertyManager.sample_run, ei_guess, PropertyManager.wb_run, self.map_file, masking)
+                timings["conversion"], stage_start = _elapsed_since(stage_start)
+                #
 
-            # Do custom preprocessing if such operation is defined
-            try:
-                ws_to_preprocess = PropertyManager.sample_run.get_workspace()
-                ws_to_preprocess = self.do_preprocessing(ws_to_preprocess)
-                PropertyManager.sample_run.synchronize_ws(ws_to_preprocess)
-            except AttributeError:
-                pass
-            # ---------------
-            #
-            # Run the conversion first on the sample
-            deltaE_ws_sample = self.mono_sample(PropertyManager.sample_run, ei_guess, PropertyManager.wb_run, self.map_file, masking)
-            #
-
-            ei = deltaE_ws_sample.getRun().getLogData("Ei").value
-            # PropertyManager.incident_energy.set_current(ei) let's not do it --
-            # this makes subsequent calls to this method depend on previous calls
-            prop_man.log("*** Incident energy found for sample run: {0} meV".format(ei), "notice")
-            #
-            # calculate absolute units integral and apply it to the workspace
-            # or use previously cashed value
-            cashed_mono_int = PropertyManager.mono_correction_factor.get_val_from_cash(prop_man)
-            if mono_van_cache_num is not None or self.mono_correction_factor or cashed_mono_int:
-                deltaE_ws_sample, mono_ws_base = self._do_abs_corrections(
-                    deltaE_ws_sample, cashed_mono_int, ei_guess, mono_ws_base, tof_range, cut_ind, num_ei_cuts
-                )
-            else:
-                pass  # no absolute units corrections
-            # ensure that the sample_run name is intact with the sample workspace
-            PropertyManager.sample_run.synchronize_ws(deltaE_ws_sample)
-            if prop_man.correct_absorption_on is not None:
-                abs_shape = prop_man.correct_absorption_on
-                deltaE_ws_sample = abs_shape.correct_absorption(deltaE_ws_sample, prop_man.abs_corr_info)
-            #
-            #
-            # Do custom post-processing if such operation is defined
-            try:
-                deltaE_ws_sample = self.do_postprocessing(deltaE_ws_sample)
+                ei = deltaE_ws_sample.getRun().getLogData("Ei").value
+                # PropertyManager.incident_energy.set_current(ei) let's not do it --
+                # this makes subsequent calls to this method depend on previous calls
+                prop_man.log("*** Incident energy found for sample run: {0} meV".format(ei), "notice")
+                #
+                # calculate absolute units integral and apply it to the workspace
+                # or use previously cashed value
+                cashed_mono_int = PropertyManager.mono_correction_factor.get_val_from_cash(prop_man)
+                if mono_van_cache_num is not None or self.mono_correction_factor or cashed_mono_int:
+                    deltaE_ws_sample, mono_ws_base = self._do_abs_corrections(
+                        deltaE_ws_sample, cashed_mono_int, ei_guess, mono_ws_base, tof_range, cut_ind, num_ei_cuts
+                    )
+                else:
+                    pass  # no absolute units corrections
+                timings["abs_units"], stage_start = _elapsed_since(stage_start)
+                # ensure that the sample_run name is intact with the sample workspace
                 PropertyManager.sample_run.synchronize_ws(deltaE_ws_sample)
-            except AttributeError:
-                pass
-            self.save_results(deltaE_ws_sample)
-
-            # prepare output workspace
-            results_name = deltaE_ws_sample.name()
-            if out_ws_name:
-                if self._multirep_mode:
-                    result.append(deltaE_ws_sample)
+                if prop_man.correct_absorption_on is not None:
+                    abs_shape = prop_man.correct_absorption_on
+                    deltaE_ws_sample = abs_shape.correct_absorption(deltaE_ws_sample, prop_man.abs_corr_info)
+                #
+                #
+                # Do custom post-processing if such operation is defined
+                try:
+                    deltaE_ws_sample = self.do_postprocessing(deltaE_ws_sample)
+                    PropertyManager.sample_run.synchronize_ws(deltaE_ws_sample)
+                except AttributeError:
+                    pass
+                timings["post_processing"], stage_start = _elapsed_since(stage_start)
+
+                # prepare output workspace
+                results_name = deltaE_ws_sample.name()
+                save_operations = self._prepare_save_operations(deltaE_ws_sample)
+                if save_executor:
+                    save_futures.append((timings, save_executor.submit(_timed, save_operations)))
                 else:
-                    if results_name != out_ws_name:  # This actually returns deltaE_ws_sample.name()
-                        # to the state, defined in ADS. Intentionally skip renaming here.
-                        result = PropertyManager.sample_run.synchronize_ws(deltaE_ws_sample)
+                    timings["save"] = _timed(save_operations)
+                if out_ws_name:
+                    if self._multirep_mode:
+                        result.append(deltaE_ws_sample)
                     else:
-                        result = deltaE_ws_sample
-            else:  # delete workspace if no output is requested
-                result = None
-            self._old_runs_list.append(results_name)
-        # end_for
+                        if results_name != out_ws_name:  # This actually returns deltaE_ws_sample.name()
+                            # to the state, defined in ADS. Intentionally skip renaming here.
+                            result = PropertyManager.sample_run.synchronize_ws(deltaE_ws_sample)
+                        else:
+                            result = deltaE_ws_sample
+                else:  # delete workspace if no output is requested
+                    result = None
+                self._old_runs_list.append(results_name)
+            # end_for
+        finally:
+            if save_executor:
+                # wait for all saves, also if the conversion has failed, so no save is left running
+                save_errors = self._wait_for_saves(save_futures)
+                save_executor.shutdown()
         # ------------------------------------------------------------------------------------------
         # END Main loop over incident energies
         # ------------------------------------------------------------------------------------------
+        if save_errors:
+            raise save_errors[0]
+        self._log_ei_timings()
 
         self.clean_up_convert_to_energy(start_time)
         return result
@@ -624,6 +654,30 @@ class DirectEnergyConversion(object):
                 MaskDetectors(empty_bg_ws, MaskedWorkspace=masking_ws)
             rd_prop.remove_empty_background(empty_bg_ws)
 
+    def _wait_for_saves(self, save_futures):
+        """Wait for the results saved in the background and record the time taken by each save.
+        Returns the errors raised by the saves, which are also logged.
+        """
+        save_errors = []
+        for timings, future in save_futures:
+            try:
+                timings["save"] = future.result()
+            except Exception as err:
+                self.prop_man.log(
+                    "*** Failed to save the results for provisional energy: {0} meV: {1}".format(timings["ei_guess"], err), "error"
+                )
+                save_errors.append(err)
+        return save_errors
+
+    def _log_ei_timings(self):
+        """Report the time taken by each stage of the conversion for each incident energy"""
+        stages = ["tof_range", "conversion", "abs_units", "post_processing", "save"]
+        self.prop_man.log("*** Time taken for each incident energy, sec:", "notice")
+        self.prop_man.log("*** {0:>10} {1}".format("Ei guess", " ".join("{0:>15}".format(stage) for stage in stages)), "notice")
+        for timings in self._ei_timings:
+            times = " ".join("{0:>15.2f}".format(timings.get(stage, 0.0)) for stage in stages)
+            self.prop_man.log("*** {0:>10.2f} {1}".format(timings["ei_guess"], times), "notice")
+
     # ------------------------------------------------------------------------------------------
     # Handles cleanup of the convert_to_energy method
 
@@ -632,9 +686,11 @@ class DirectEnergyConversion(object):
         # source for next workspace
         if "bkgr_ws_source" in mtd:
             DeleteWorkspace("bkgr_ws_source")
+        self._multirep_ei_cache = {}
 
-        # clear combined mask
-        self.spectra_masks = None
+        # clear combined mask, unless it is kept to be reused for the next run
+        if not self._keep_spectra_masks:
+            self.spectra_masks = None
         end_time = time.time()
         self.prop_man.log("*** ISIS CONVERT TO ENERGY TRANSFER WORKFLOW FINISHED  *********")
         self.prop_man.log("*** Elapsed time : {0:>9.2f} sec                       *********".format(end_time - start_time), "notice")
@@ -920,13 +976,7 @@ class DirectEnergyConversion(object):
 
         # Calculate the incident energy
         # Returns: ei,mon1_peak,mon1_index,tzero
-        ei, mon1_peak, _, _ = GetEi(
-            InputWorkspace=monitor_ws,
-            Monitor1Spec=ei_mon_spectra[0],
-            Monitor2Spec=ei_mon_spectra[1],
-            EnergyEstimate=ei_guess,
-            FixEi=fix_ei,
-        )
+        ei, mon1_peak, _, _ = self._get_ei_from_monitors(monitor_ws, ei_mon_spectra[0], ei_mon_spectra[1], ei_guess, fix_ei)
         SetInstrumentParameter(data_ws, ParameterName="EFixed", ParameterType="Number", Value="{0}".format(ei))
 
         # Store found incident energy in the class itself
@@ -973,6 +1023,28 @@ class DirectEnergyConversion(object):
         data_run.synchronize_ws(mtd[resultws_name])
         return ei, mon1_peak
 
+    def _get_ei_from_monitors(self, monitor_ws, mon1_spec, mon2_spec, ei_guess, fix_ei):
+        """Run GetEi on the monitors and return its results: ei, mon1_peak, mon1_index, tzero
+
+        In multirep mode the results are kept until the end of the conversion, as
+        the monitors of every chunk of the run are copies of the same monitors, so that
+        the TOF range and the incident energy of each chunk do not repeat the same search.
+        The results are kept for the contents of the monitor spectra, so that the monitors
+        of a different run (e.g. monovanadium) are never given the results of the sample run.
+        """
+        if not self._multirep_mode:
+            return GetEi(InputWorkspace=monitor_ws, Monitor1Spec=mon1_spec, Monitor2Spec=mon2_spec, EnergyEstimate=ei_guess, FixEi=fix_ei)
+        monitors_hash = hashlib.sha1()
+        for spec_num in (mon1_spec, mon2_spec):
+            ws_index = monitor_ws.getIndexFromSpectrumNumber(int(spec_num))
+            monitors_hash.update(np.ascontiguousarray(monitor_ws.readX(ws_index)).tobytes())
+            monitors_hash.update(np.ascontiguousarray(monitor_ws.readY(ws_index)).tobytes())
+        key = (monitors_hash.hexdigest(), mon1_spec, mon2_spec, ei_guess, fix_ei)
+        if key not in self._multirep_ei_cache:
+            result = GetEi(InputWorkspace=monitor_ws, Monitor1Spec=mon1_spec, Monitor2Spec=mon2_spec, EnergyEstimate=ei_guess, FixEi=fix_ei)
+            self._multirep_ei_cache[key] = tuple(result)
+        return self._multirep_ei_cache[key]
+
     # -------------------------------------------------------------------------------
     def remap(self, result_ws, spec_masks, map_file):
         """
@@ -1263,13 +1335,7 @@ class DirectEnergyConversion(object):
 
                 # Calculate the incident energy and TOF when the particles access Monitor1
                 try:
-                    ei, mon1_peak, mon1_index, _ = GetEi(
-                        InputWorkspace=monitor_ws,
-                        Monitor1Spec=mon_1_spec_ID,
-                        Monitor2Spec=mon_2_spec_ID,
-                        EnergyEstimate=ei_guess,
-                        FixEi=fix_ei,
-                    )
+                    ei, mon1_peak, mon1_index, _ = self._get_ei_from_monitors(monitor_ws, mon_1_spec_ID, mon_2_spec_ID, ei_guess, fix_ei)
                     mon1_det = monitor_ws.getDetector(mon1_index)
                     mon1_pos = mon1_det.getPos()
                     src_name = monitor_ws.getInstrument().getSource().name()
@@ -1337,6 +1403,14 @@ class DirectEnergyConversion(object):
         Save the result workspace to the specified filename using the list of formats specified in
         formats. If formats is None then the default list is used
         """
+        for save_operation in self._prepare_save_operations(workspace, save_file, formats):
+            save_operation()
+
+    def _prepare_save_operations(self, workspace, save_file=None, formats=None):
+        """Return the operations saving the workspace in each of the formats requested, as
+        callables without arguments. The file names and saving parameters are defined at this point,
+        from the current state of the reduction, so the operations can be run later.
+        """
         if formats:
             # clear up existing save formats as one is defined in parameters
             self.prop_man.save_format = None
@@ -1354,7 +1428,7 @@ class DirectEnergyConversion(object):
         if save_file is None:
             if workspace is None:
                 self.prop_man.log("DirectEnergyConversion:save_results: Nothing to save", "warning")
-                return
+                return []
             else:
                 save_file = workspace.name()
         elif os.path.isdir(save_file):
@@ -1366,31 +1440,37 @@ class DirectEnergyConversion(object):
 
         prop_man = self.prop_man
         name_orig = workspace.name()
+        save_operations = []
         for file_format in formats:
             for case in common.switch(file_format):
                 if case("nxspe"):
-                    filename = save_file + ".nxspe"
                     # nxspe can not write workspace with / in the name
-                    # (something to do with folder names inside nxspe)
+                    # (something to do with folder names inside nxspe).
+                    # The save may run in the background, so a copy with a supported name is
+                    # saved rather than renaming the workspace used by the reduction.
                     name_supported = name_orig.replace("/", "of")
                     if name_supported != name_orig:
-                        RenameWorkspace(InputWorkspace=name_orig, OutputWorkspace=name_supported)
-                    SaveNXSPE(
-                        InputWorkspace=name_supported, Filename=filename, KiOverKfScaling=prop_man.apply_kikf_correction, psi=prop_man.psi
+                        CloneWorkspace(InputWorkspace=workspace, OutputWorkspace=name_supported)
+                    save_operations.append(
+                        partial(
+                            _save_nxspe,
+                            name_supported,
+                            save_file + ".nxspe",
+                            prop_man.apply_kikf_correction,
+                            prop_man.psi,
+                            name_supported != name_orig,
+                        )
                     )
-                    if name_supported != name_orig:
-                        RenameWorkspace(InputWorkspace=name_supported, OutputWorkspace=name_orig)
                     break
                 if case("spe"):
-                    filename = save_file + ".spe"
-                    SaveSPE(InputWorkspace=workspace, Filename=filename)
+                    save_operations.append(partial(SaveSPE, InputWorkspace=workspace, Filename=save_file + ".spe"))
                     break
                 if case("nxs"):
-                    filename = save_file + ".nxs"
-                    SaveNexus(InputWorkspace=workspace, Filename=filename)
+                    save_operations.append(partial(SaveNexus, InputWorkspace=workspace, Filename=save_file + ".nxs"))
                     break
                 if case():  # default, could also just omit condition or 'if True'
                     prop_man.log("Unknown file format {0} requested to save results. No saving performed this format".format(file_format))
+        return save_operations
 
     #########
 
@@ -1665,6 +1745,9 @@ class DirectEnergyConversion(object):
         object.__setattr__(self, "_keep_wb_workspace", True)
         object.__setattr__(self, "_do_ISIS_reduction", True)
         object.__setattr__(self, "_spectra_masks", None)
+        # if True, the masks are not cleared at the end of convert_to_energy
+        # and are used for the next run instead of running diagnostics again
+        object.__setattr__(self, "_keep_spectra_masks", False)
         # if normalized by monitor-2, range have to be established before
         # shifting the instrument
         object.__setattr__(self, "_mon2_norm_time_range", None)
@@ -1677,6 +1760,11 @@ class DirectEnergyConversion(object):
         # workspace
         # processed
         object.__setattr__(self, "_multirep_mode", False)
+        # results of the searches for incident energy on the monitors, kept
+        # while the chunks of a multirep run are processed
+        object.__setattr__(self, "_multirep_ei_cache", {})
+        # time taken by each stage of the conversion for each incident energy
+        object.__setattr__(self, "_ei_timings", [])
         # list of workspace names, processed earlier
         object.__setattr__(self, "_old_runs_list", [])
 
@@ -2055,6 +2143,29 @@ class DirectEnergyConversion(object):
         return ws
 
 
+def _save_nxspe(ws_name, filename, ki_over_kf_scaling, psi, delete_after_save):
+    """Save a workspace to nxspe file, deleting it afterwards if it is a copy made for saving"""
+    try:
+        SaveNXSPE(InputWorkspace=ws_name, Filename=filename, KiOverKfScaling=ki_over_kf_scaling, psi=psi)
+    finally:
+        if delete_after_save:
+            DeleteWorkspace(ws_name)
+
+
+def _elapsed_since(start_time):
+    """Return the time elapsed since start_time and the current time"""
+    now = time.time()
+    return now - start_time, now
+
+
+def _timed(operations):
+    """Run the operations one after another and return the time they have taken"""
+    start_time = time.time()
+    for operation in operations:
+        operation()
+    return time.time() - start_time
+
+
 def get_failed_spectra_list_from_masks(masked_wksp, prop_man):
     """Compile a list of spectra numbers that are marked as
     masked in the masking workspace
@@ -0,0 +1,162 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+# pylint: disable=invalid-name
+import os
+import shutil
+import time
+
+from mantid.api import FileFinder
+from mantid.simpleapi import LoadDetectorInfo, LoadEmptyInstrument
+
+from Direct.PropertyManager import PropertyManager
+
+
+class ReductionService(object):
+    """Long-lived reduction service, which reduces the runs requested through a queue
+    directory one after another with the same reduction (an instance of a ReductionWrapper),
+    rather than starting a new process for each run.
+
+    The state which does not depend on the sample run is built once and reused between runs:
+    - the instrument and the reduction properties;
+    - the white beam vanadium and monovanadium workspaces and the white beam integrals,
+      which the reducer keeps for the runs they have been loaded for;
+    - the absolute normalisation factors, cached by the reducer for the monovanadium run,
+      incident energy and integration range;
+    - the detector calibration, which is loaded from the calibration file into a workspace
+      once and copied to each run;
+    - the diagnostics masks, if they do not depend on the sample run, i.e. if only the hard
+      mask is used, diagnostics are switched off or mask_run is set.
+
+    Each file in the queue directory is a request to reduce the run number or file name it contains.
+    The requests are processed in the order they have been written and are moved to the
+    processed or failed subdirectory afterwards. Files starting with '.' are ignored, so a request
+    can be written under such name and renamed when it is complete.
+    """
+
+    PROCESSED_DIR = "processed"
+    FAILED_DIR = "failed"
+
+    def __init__(self, reduction, queue_directory, poll_interval=10.0):
+        """Inputs:
+        reduction       -- the instance of a ReductionWrapper to reduce the runs with
+        queue_directory -- the directory to take the requests from
+        poll_interval   -- time in seconds to wait before checking the queue directory again if it is empty
+        """
+        self._reduction = reduction
+        self._queue_directory = queue_directory
+        self._poll_interval = poll_interval
+        # what the diagnostics masks kept by the reducer have been calculated for
+        self._masks_key = None
+        # time in seconds the reduction of each run has taken
+        self.reduction_times = {}
+        for subdir in (self.PROCESSED_DIR, self.FAILED_DIR):
+            os.makedirs(os.path.join(queue_directory, subdir), exist_ok=True)
+
+    @property
+    def reducer(self):
+        """Return the DirectEnergyConversion the runs are reduced with"""
+        return self._reduction.reducer
+
+    def pending_requests(self):
+        """Return the request files in the queue directory in the order they have been written"""
+        requests = [entry.path for entry in os.scandir(self._queue_directory) if entry.is_file() and not entry.name.startswith(".")]
+        return sorted(requests, key=lambda path: (os.path.getmtime(path), path))
+
+    def process_queue(self):
+        """Reduce all runs requested in the queue directory and return the number of requests processed"""
+        requests = self.pending_requests()
+        for request in requests:
+            self._process_request(request)
+        return len(requests)
+
+    def serve(self, max_requests=None):
+        """Wait for requests and reduce the runs requested until max_requests have been processed,
+        or forever if max_requests is None"""
+        self.reducer.prop_man.log("*** Reduction service is waiting for requests in {0}".format(self._queue_directory), "notice")
+        num_processed = 0
+        while max_requests is None or num_processed < max_requests:
+            requests = self.pending_requests()
+            if not requests:
+                time.sleep(self._poll_interval)
+                continue
+            self._process_request(requests[0])
+            num_processed += 1
+        return num_processed
+
+    def reduce_run(self, run):
+        """Reduce a single run, reusing the state kept from the runs reduced before"""
+        start_time = time.time()
+        self._cache_calibration()
+        self._update_masks()
+        # the result is not assigned to a variable, as the reduction would rename it after such variable
+        self._reduction.reduce(run)
+        elapsed = time.time() - start_time
+        self.reduction_times[run] = elapsed
+        self.reducer.prop_man.log("*** Reduction service: run {0} reduced in {1:>9.2f} sec".format(run, elapsed), "notice")
+
+    def _process_request(self, request):
+        """Reduce the run requested in a request file and move the file out of the queue"""
+        with open(request) as fh:
+            run = fh.read().strip()
+        try:
+            if not run:
+                raise ValueError("the request does not contain a run")
+            self.reduce_run(run)
+            target_dir = self.PROCESSED_DIR
+        # a failed run should not stop the service reducing the following ones
+        # pylint: disable=broad-except
+        except Exception as err:
+            self.reducer.prop_man.log("*** Reduction of run {0} requested in {1} failed: {2}".format(run, request, err), "error")
+            target_dir = self.FAILED_DIR
+        shutil.move(request, os.path.join(self._queue_directory, target_dir, os.path.basename(request)))
+
+    def _cache_calibration(self):
+        """Load the detector calibration file into a workspace, so that the calibration is copied
+        from this workspace to each run rather than loaded from the file again"""
+        prop_man = self.reducer.prop_man
+        det_cal_file = prop_man.det_cal_file
+        # calibration from the workspace or the run itself, or a workspace loaded before
+        if not isinstance(det_cal_file, str) or "det_cal_file" not in prop_man.getChangedProperties():
+            return
+        file_name = FileFinder.getFullPath(det_cal_file)
+        if not file_name:
+            # leave it to the reducer to report the missing file
+            return
+        cal_ws_name = "__{0}_calibration".format(prop_man.short_inst_name)
+        prop_man.log("*** Reduction service: loading detector calibration {0} into workspace {1}".format(file_name, cal_ws_name), "notice")
+        LoadEmptyInstrument(InstrumentName=prop_man.instr_name, OutputWorkspace=cal_ws_name)
+        LoadDetectorInfo(Workspace=cal_ws_name, DataFilename=file_name, RelocateDets=True)
+        prop_man.det_cal_file = cal_ws_name
+
+    def _update_masks(self):
+        """Keep the diagnostics masks for the next run if they do not depend on the sample run,
+        and clear them if anything they depend on has changed since they have been calculated"""
+        masks_key = self._get_masks_key()
+        keep_masks = masks_key is not None
+        if not keep_masks or masks_key != self._masks_key:
+            self.reducer.spectra_masks = None
+        # pylint: disable=protected-access
+        self.reducer._keep_spectra_masks = keep_masks
+        self._masks_key = masks_key
+
+    def _get_masks_key(self):
+        """Return the values the diagnostics masks depend on, or None if they depend on the sample run"""
+        prop_man = self.reducer.prop_man
+        own_mask_run = PropertyManager.mask_run.has_own_value()
+        if prop_man.run_diagnostics and not prop_man.use_hard_mask_only and not own_mask_run:
+            return None
+        diag_params = prop_man.get_diagnostics_parameters()
+        return (
+            prop_man.run_diagnostics,
+            PropertyManager.wb_run.run_number(),
+            PropertyManager.mask_run.run_number() if own_mask_run else None,
+            PropertyManager.monovan_run.run_number(),
+            PropertyManager.wb_for_monovan_run.run_number(),
+            str(prop_man.mono_correction_factor),
+            str(prop_man.use_sam_msk_on_monovan),
+            tuple((key, str(value)) for key, value in sorted(diag_params.items())),
+        )
@@ -6,8 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import numpy as np
 import math
-from Muon.MaxentTools.opus import OPUS
-from Muon.MaxentTools.tropus import TROPUS
+from Muon.MaxentTools.transforms import get_transforms
 from Muon.MaxentTools.project import PROJECT
 from Muon.MaxentTools.move import MOVE
 
@@ -48,6 +47,10 @@ def MAXENT(
     p = npts * ngroups
     xi = np.zeros([MAXPAGE_n, 3])
     eta = np.zeros([npts, ngroups, 3])
+    # pulse shape and detector arrays are fixed for this call, so reuse the FFT buffers on every iteration,
+    # and in the following calls for this run and the other runs of a batch
+    transforms = get_transforms(SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+    sig2 = sigma**2
     #
     SPACE_blank = flat
     if SPACE_blank != 0:
@@ -69,13 +72,13 @@ def MAXENT(
     while HERITAGE_iter <= itermax and (HERITAGE_iter <= 1 or not (test < 0.02 and abs(SPACE_chisq / SPACE_chizer - 1) < 0.01)):  # label 6
         mylog.debug("start loop, iter={} ngo={} test={} chisq={}".format(HERITAGE_iter, SAVETIME_ngo, test, SPACE_chisq / SPACE_chizer))
         mylog.debug("entering loop with spectrum from {0} to {1}".format(np.amin(MAXPAGE_f), np.amax(MAXPAGE_f)))
-        ox = OPUS(MAXPAGE_f, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        ox = transforms.opus(MAXPAGE_f)
         warningMsg(ox, "ox", mylog)
         mylog.debug("ox from {0} to {1}".format(np.amin(ox), np.amax(ox)))
         a = ox - datum
-        SPACE_chisq = np.sum(a**2 / sigma**2)
-        ox = 2 * a / (sigma**2)
-        cgrad = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        SPACE_chisq = np.sum(a**2 / sig2)
+        ox = 2 * a / sig2
+        cgrad = transforms.tropus(ox)
         warningMsg(cgrad, "cgrad", mylog)
         mylog.debug("cgrad from {0} to {1}".format(np.amin(cgrad), np.amax(cgrad)))
         SPACE_xsum = np.sum(MAXPAGE_f)
@@ -109,18 +112,17 @@ def MAXENT(
         if sumfix:
             PROJECT(0, MAXPAGE_n, xi)
             PROJECT(1, MAXPAGE_n, xi)
-        eta[:, :, 0] = OPUS(xi[:, 0], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
-        eta[:, :, 1] = OPUS(xi[:, 1], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        eta[:, :, 0:2] = transforms.opus(xi[:, 0:2])
         warningMsg(eta[:, :, 0], "eta[,,0]", mylog)
         warningMsg(eta[:, :, 1], "eta[,,1]", mylog)
-        ox = eta[:, :, 1] / (sigma**2)
-        xi[:, 2] = TROPUS(ox, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        ox = eta[:, :, 1] / sig2
+        xi[:, 2] = transforms.tropus(ox)
         warningMsg(xi[:, 2], "xi[,2]", mylog)
         a = 1.0 / math.sqrt(np.sum(xi[:, 2] ** 2 * MAXPAGE_f))
         xi[:, 2] = xi[:, 2] * MAXPAGE_f * a
         if sumfix:
             PROJECT(2, MAXPAGE_n, xi)
-        eta[:, :, 2] = OPUS(xi[:, 2], SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        eta[:, :, 2] = transforms.opus(xi[:, 2])
         warningMsg(eta[:, :, 2], "eta[,,2]", mylog)
         # loop DO 17, DO 18
         SPACE_s1 = np.dot(sgrad, xi)
@@ -132,7 +134,7 @@ def MAXENT(
             for k in range(m):
                 if L <= k:
                     SPACE_s2[k, L] = -np.sum(xi[:, k] * xi[:, L] / MAXPAGE_f) / SPACE_blank
-                    SPACE_c2[k, L] = np.sum(eta[:, :, k] * eta[:, :, L] / sigma**2) * 2.0 / SPACE_chisq
+                    SPACE_c2[k, L] = np.sum(eta[:, :, k] * eta[:, :, L] / sig2) * 2.0 / SPACE_chisq
                 else:  # make symmetric
                     SPACE_s2[k, L] = SPACE_s2[L, k]
                     SPACE_c2[k, L] = SPACE_c2[L, k]
@@ -158,6 +160,7 @@ def MAXENT(
                 FAC_facfake,
                 mylog,
             )
+            sig2 = sigma**2
         # do 23,24
         MAXPAGE_f += np.dot(xi, SPACE_beta)
         MAXPAGE_f = np.where(MAXPAGE_f < 0, 1.0e-3 * SPACE_blank, MAXPAGE_f)
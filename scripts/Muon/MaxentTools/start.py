@@ -6,9 +6,20 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import numpy as np
 import math
+from functools import lru_cache
 
 
 def START(npts, PULSES_npulse, RUNDATA_res, MAXPAGE_n, TZERO_fine, mylog):
+    # runs sharing the same binning and pulse structure reuse the cached factors
+    (DETECT_e, PULSESHAPE_convol_raw, PULSESHAPE_convol) = _pulse_shape(npts, PULSES_npulse, RUNDATA_res, MAXPAGE_n, TZERO_fine)
+    mylog.notice("convol before time shift:" + str(PULSESHAPE_convol_raw[0:3]))
+    mylog.notice("convol after time shift:" + str(PULSESHAPE_convol[0:3]))
+
+    return (DETECT_e.copy(), PULSESHAPE_convol.copy())
+
+
+@lru_cache(maxsize=16)
+def _pulse_shape(npts, PULSES_npulse, RUNDATA_res, MAXPAGE_n, TZERO_fine):
     Tmuon = 2.19704
     Tpion = 0.026
     TAUlife = Tmuon / RUNDATA_res
@@ -30,13 +41,11 @@ def START(npts, PULSES_npulse, RUNDATA_res, MAXPAGE_n, TZERO_fine, mylog):
     PULSESHAPE_convolr = aa * (np.cos(ww * pulse2t / 2) - np.tanh(pulse2t / (2 * Tmuon)) * np.sin(ww * pulse2t / 2) * ww * Tpion)
     PULSESHAPE_convoli = -aa * (np.tanh(pulse2t / (2 * Tmuon)) * np.sin(ww * pulse2t / 2) + np.cos(pulse2t * ww / 2) * ww * Tpion)
 
-    PULSESHAPE_convol = PULSESHAPE_convolr + 1.0j * PULSESHAPE_convoli
-    mylog.notice("convol before time shift:" + str(PULSESHAPE_convol[0:3]))
+    PULSESHAPE_convol_raw = PULSESHAPE_convolr + 1.0j * PULSESHAPE_convoli
     # adjust for T0 not being an exact bin boundary (JSL)
     # adjust such that time zero is mean muon arrival as calculated by
     # frequency scan, NOT centre of proton pulse parabola (single pulse case
     # only for now)
-    PULSESHAPE_convol = PULSESHAPE_convol * np.exp(1.0j * (TZERO_fine + Tpion) * ww)
-    mylog.notice("convol after time shift:" + str(PULSESHAPE_convol[0:3]))
+    PULSESHAPE_convol = PULSESHAPE_convol_raw * np.exp(1.0j * (TZERO_fine + Tpion) * ww)
 
-    return (DETECT_e, PULSESHAPE_convol)
+    return (DETECT_e, PULSESHAPE_convol_raw, PULSESHAPE_convol)
@@ -0,0 +1,93 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+"""
+Preallocated equivalents of OPUS and TROPUS for use inside the MAXENT iterations.
+The pulse shape and detector arrays are fixed for the duration of a MAXENT call,
+so the FFT buffers are allocated once and reused for every transform. OPUS can
+transform several spectra with a single batched FFT.
+Results are identical to the functions in opus.py and tropus.py.
+A batch of runs shares the buffers: get_transforms reuses the transforms last used
+by the calling thread when the transform length, pulse shape and detector arrays
+have the same shapes, so only the first run of a batch allocates them.
+"""
+
+import threading
+
+import numpy as np
+
+# transforms last used by each thread, kept for the next run of a batch
+_last_transforms = threading.local()
+
+
+class MaxentTransforms:
+    def __init__(self, SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e, max_spectra=3):
+        self.i2 = SAVETIME_i2
+        self.n = PULSESHAPE_convol.shape[0]
+        self.npts = DETECT_e.shape[0]
+        self.set_arrays(PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        # frequency spectra, one per row. Entries beyond n are never written and stay zero
+        self._opus_in = np.zeros([max_spectra, SAVETIME_i2], dtype=np.complex128)
+        self._opus_out = np.empty([max_spectra, SAVETIME_i2], dtype=np.complex128)
+        # time domain. Entries beyond npts are never written and stay zero
+        self._tropus_in = np.zeros([SAVETIME_i2], dtype=np.complex128)
+        self._tropus_out = np.empty([SAVETIME_i2], dtype=np.complex128)
+
+    def matches(self, SAVETIME_i2, PULSESHAPE_convol, DETECT_e):
+        """
+        True if the buffers can be used for transforms of this length, pulse shape and detector arrays
+        """
+        return SAVETIME_i2 == self.i2 and PULSESHAPE_convol.shape[0] == self.n and DETECT_e.shape[0] == self.npts
+
+    def set_arrays(self, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
+        """
+        Use another pulse shape and detector arrays with the same shapes, keeping the buffers
+        """
+        self.convol = PULSESHAPE_convol
+        self.convol_r = np.real(PULSESHAPE_convol)
+        self.convol_i = np.imag(PULSESHAPE_convol)
+        self.a = DETECT_a
+        self.b = DETECT_b
+        self.e = DETECT_e
+
+    def opus(self, x):
+        """
+        Equivalent of OPUS(x, ...). x may be a single spectrum of shape (n,) giving a result of
+        shape (npts, ngroups), or several spectra of shape (n, k) giving (npts, ngroups, k)
+        """
+        spectra = x.T if x.ndim == 2 else x[np.newaxis, :]
+        k = spectra.shape[0]
+        y = self._opus_in[:k]
+        y2 = self._opus_out[:k]
+        y[:, : self.n] = spectra * self.convol
+        np.fft.ifft(y, axis=-1, out=y2)
+        y2 *= self.i2  # SN=+1, inverse FFT without the 1/N
+        re = np.real(y2[:, : self.npts])
+        im = np.imag(y2[:, : self.npts])
+        ox = (re[:, :, np.newaxis] * self.a + im[:, :, np.newaxis] * self.b) * self.e[np.newaxis, :, np.newaxis]
+        return np.moveaxis(ox, 0, -1) if x.ndim == 2 else ox[0]
+
+    def tropus(self, ox):
+        """
+        Equivalent of TROPUS(ox, ...)
+        """
+        y = self._tropus_in
+        y[: self.npts] = np.dot(ox, self.a) * self.e + 1.0j * np.dot(ox, self.b) * self.e
+        y2 = np.fft.fft(y, out=self._tropus_out)  # SN=-1 meaning forward fft, scale is OK
+        return np.real(y2)[: self.n] * self.convol_r + np.imag(y2)[: self.n] * self.convol_i
+
+
+def get_transforms(SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e):
+    """
+    MaxentTransforms for these arrays, reusing the buffers of the transforms last used by this thread if they match
+    """
+    transforms = getattr(_last_transforms, "transforms", None)
+    if transforms is not None and transforms.matches(SAVETIME_i2, PULSESHAPE_convol, DETECT_e):
+        transforms.set_arrays(PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+    else:
+        transforms = MaxentTransforms(SAVETIME_i2, PULSESHAPE_convol, DETECT_a, DETECT_b, DETECT_e)
+        _last_transforms.transforms = transforms
+    return transforms
@@ -174,6 +174,12 @@ class RowEntries(_UserEntries):
     def is_empty(self):
         return not any(getattr(self, attr) for attr in self._data_vars.keys())
 
+    def get_entry_names(self):
+        """
+        :return: the names of the attributes holding the user entries for the row
+        """
+        return self._data_vars.keys()
+
     def reset_row_state(self):
         self.state = RowState.UNPROCESSED
         self.tool_tip = None
@@ -4,28 +4,141 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
-from mantid.kernel import Logger
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from mantid.kernel import ConfigService, Logger
+from sans.common.file_information import find_sans_file
 from sans.gui_logic.models.state_gui_model import StateGuiModel
 from sans.gui_logic.presenter.gui_state_director import GuiStateDirector
 
 sans_logger = Logger("SANS")
 
+# Tables with at least this many rows to regenerate are processed in a thread pool
+PARALLEL_ROW_THRESHOLD = 20
+MAX_WORKER_THREADS = 8
+
+# The row entries holding the runs which are looked up in the data search directories
+DATA_FILE_ENTRIES = ["sample_scatter", "sample_transmission", "sample_direct", "can_scatter", "can_transmission", "can_direct"]
+
 
-def create_states(state_model, facility, row_entries=None, file_lookup=True):
+class RowStateCache(object):
+    """
+    Memoises the states created for the rows of the batch table, so that only the rows which have
+    changed are rebuilt when the states are requested again.
+
+    A state is stored against the row's entries and options and the data files they refer to, and is
+    only returned while the global settings (the state model, facility and data search directories)
+    match those it was created with. Each call to get returns a new copy, so the caller is free to
+    modify it. Rows with a custom user file are not cached as the contents of the file may change.
+    """
+
+    def __init__(self):
+        self._settings_version = None
+        self._states = {}
+        self._file_stamps = {}
+
+    def set_settings(self, state_model, facility):
+        """
+        Sets the global settings used to create the states. The cached states are discarded if these have changed.
+        """
+        # The data files are looked up again for each set of states, in case they have been modified
+        self._file_stamps.clear()
+        search_directories = ConfigService["datasearch.directories"]
+        try:
+            version = pickle.dumps((state_model, facility, search_directories), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            version = None
+
+        if version is None or version != self._settings_version:
+            self._states.clear()
+        self._settings_version = version
+
+    def get(self, row, file_lookup):
+        entry = self._states.get(row)
+        if entry is None or self._settings_version is None:
+            return None
+
+        key, blob = entry
+        if key != self._row_key(row, file_lookup):
+            return None
+        return pickle.loads(blob)
+
+    def add(self, row, file_lookup, state):
+        if self._settings_version is None or row.user_file:
+            return
+        try:
+            blob = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+        self._states[row] = (self._row_key(row, file_lookup), blob)
+
+    def remove_stale_rows(self, rows):
+        """
+        Discards the states of rows which are no longer in the table
+        """
+        rows = set(rows)
+        for row in [row for row in self._states if row not in rows]:
+            del self._states[row]
+
+    def clear(self):
+        self._settings_version = None
+        self._states.clear()
+        self._file_stamps.clear()
+
+    def _row_key(self, row, file_lookup):
+        file_stamps = tuple(self._file_stamp(getattr(row, attr)) for attr in DATA_FILE_ENTRIES) if file_lookup else ()
+        return tuple(getattr(row, attr) for attr in row.get_entry_names()) + (row.options.get_displayed_text(), file_lookup, file_stamps)
+
+    def _file_stamp(self, run):
+        """
+        :return: the full path, modification time and size of the data file of a run, or None if it cannot be found
+        """
+        if not run:
+            return None
+        run = str(run)
+        if run not in self._file_stamps:
+            try:
+                full_path = find_sans_file(run)
+                stat = os.stat(full_path)
+                self._file_stamps[run] = (full_path, stat.st_mtime_ns, stat.st_size)
+            except (RuntimeError, ValueError, OSError):
+                self._file_stamps[run] = None
+        return self._file_stamps[run]
+
+
+def create_states(state_model, facility, row_entries=None, file_lookup=True, state_cache=None):
     """
     Here we create the states based on the settings in the models
     :param state_model: the state model object
     :param row_entries: a list of row entry objects to create state for
+    :param state_cache: (Optional) a RowStateCache, if provided only the states of rows which have changed are created
     """
 
     states = {}
     errors = {}
 
-    gui_state_director = GuiStateDirector(state_model, facility)
+    if state_cache:
+        state_cache.set_settings(state_model, facility)
+
+    created_states = {}
+    rows_to_create = []
     for row in row_entries:
-        _get_thickness_for_row(row)
+        state = state_cache.get(row, file_lookup) if state_cache else None
+        if state is not None:
+            created_states[row] = state
+        else:
+            rows_to_create.append(row)
 
-        state = _create_row_state(row, file_lookup, gui_state_director)
+    gui_state_director = GuiStateDirector(state_model, facility)
+    for row, state in zip(rows_to_create, _create_row_states(rows_to_create, file_lookup, gui_state_director)):
+        created_states[row] = state
+        if state_cache and isinstance(state, StateGuiModel):
+            state_cache.add(row, file_lookup, state)
+
+    for row in row_entries:
+        state = created_states[row]
         if isinstance(state, StateGuiModel):
             states.update({row: state})
         elif isinstance(state, str):
@@ -35,15 +148,36 @@ def create_states(state_model, facility, row_entries=None, file_lookup=True):
     return states, errors
 
 
-def _get_thickness_for_row(row):
+def _create_row_states(rows, file_lookup, gui_state_director):
+    """
+    Creates the state for each of the rows. Large tables are processed in a thread pool as much of the
+    time is spent looking up and reading the data files.
+    :return: a list with the state or error message for each row
+    """
+
+    def create_state_for_row(row):
+        file_information = None if row.is_empty() else row.file_information
+        _get_thickness_for_row(row, file_information)
+        return _create_row_state(row, file_lookup, gui_state_director, file_information)
+
+    if len(rows) < PARALLEL_ROW_THRESHOLD:
+        return [create_state_for_row(row) for row in rows]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS) as executor:
+        return list(executor.map(create_state_for_row, rows))
+
+
+def _get_thickness_for_row(row, file_info=None):
     """
     Read in the sample thickness for the given rows from the file and set it in the table.
     :param row: Row to update with file information
+    :param file_info: (Optional) The file information for the row, if it has already been looked up
     """
     if row.is_empty():
         return
 
-    file_info = row.file_information
+    if not file_info:
+        file_info = row.file_information
 
     for attr in ["sample_thickness", "sample_height", "sample_width"]:
         original_val = getattr(row, attr)
@@ -61,12 +195,14 @@ def _get_thickness_for_row(row):
         row.sample_shape = file_info.get_shape()
 
 
-def _create_row_state(row_entry, file_lookup, gui_state_director):
+def _create_row_state(row_entry, file_lookup, gui_state_director, file_information=None):
     sans_logger.information("Generating state for row {}".format(row_entry))
     state = None
 
     try:
-        if not row_entry.file_information and file_lookup:
+        if not file_information:
+            file_information = row_entry.file_information
+        if not file_information and file_lookup:
             error_message = (
                 "Trying to find the SANS file {0}, but cannot find it. Make sure that "
                 "the relevant paths are added and the correct instrument is selected."
@@ -75,7 +211,9 @@ def _create_row_state(row_entry, file_lookup, gui_state_director):
 
         if not row_entry.is_empty():
             row_user_file = row_entry.user_file
-            state = gui_state_director.create_state(row_entry, file_lookup=file_lookup, row_user_file=row_user_file)
+            state = gui_state_director.create_state(
+                row_entry, file_lookup=file_lookup, row_user_file=row_user_file, file_information=file_information
+            )
         return state
     except (ValueError, RuntimeError) as e:
         return "{}".format(str(e))
@@ -29,19 +29,21 @@ class GuiStateDirector(object):
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
 
-    def create_state(self, row_entry: RowEntries, file_lookup=True, row_user_file: str = None) -> StateGuiModel:
+    def create_state(self, row_entry: RowEntries, file_lookup=True, row_user_file: str = None, file_information=None) -> StateGuiModel:
         """
         Packs the current GUI options (e.g. settings selection) into a state object for the current row
         :param row_entry: The associated row entry
         :param file_lookup: Whether to lookup file information whilst creating state
         :param row_user_file: (Optional) The name of an overriding user file if one is provided. In this case the
         GUI options selected will be ignored.
+        :param file_information: (Optional) The file information for the row, if it has already been looked up
         :return: A populated StateGuiModel
         """
 
         # 1. Get the data settings, such as sample_scatter, etc... and create the data state.
         if file_lookup:
-            file_information = row_entry.file_information
+            if not file_information:
+                file_information = row_entry.file_information
         else:
             file_information = SANSFileInformationBlank()
 
@@ -45,7 +45,7 @@ from sans.gui_logic.gui_common import (
 )
 from sans.gui_logic.models.RowEntries import RowEntries
 from sans.gui_logic.models.async_workers.sans_run_tab_async import SansRunTabAsync
-from sans.gui_logic.models.create_state import create_states
+from sans.gui_logic.models.create_state import create_states, RowStateCache
 from sans.gui_logic.models.file_loading import FileLoading, UserFileLoadException
 from sans.gui_logic.models.run_tab_model import RunTabModel
 from sans.gui_logic.models.settings_adjustment_model import SettingsAdjustmentModel
@@ -218,6 +218,7 @@ class RunTabPresenter(PresenterCommon):
         self._run_tab_model: RunTabModel = run_tab_model
         self._table_model = table_model if table_model else TableModel()
         self._table_model.subscribe_to_model_changes(self)
+        self._row_state_cache = RowStateCache()
 
         self._processing = False
         self.batch_process_runner = SansRunTabAsync(self.notify_progress, self.on_processing_finished, self.on_processing_error)
@@ -485,6 +486,7 @@ class RunTabPresenter(PresenterCommon):
         self._table_model.add_multiple_table_entries(table_index_model_list=rows)
 
     def on_update_rows(self):
+        self._row_state_cache.remove_stale_rows(self._table_model.get_all_rows())
         self.update_view_from_table_model()
         self._get_current_file_information()
 
@@ -950,7 +952,11 @@ class RunTabPresenter(PresenterCommon):
         states, errors = None, None
         if table_model and state_model_with_view_update:
             states, errors = create_states(
-                state_model_with_view_update, facility=self._facility, row_entries=row_entries, file_lookup=file_lookup
+                state_model_with_view_update,
+                facility=self._facility,
+                row_entries=row_entries,
+                file_lookup=file_lookup,
+                state_cache=self._row_state_cache,
             )
 
         if errors and not suppress_warnings:
@@ -5,21 +5,48 @@
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
 import json
+import pickle
 from enum import Enum
+from functools import lru_cache
 
 
 from sans.state.JsonSerializable import JsonSerializable
 
 
+# The number of states remembered by the encoding and decoding caches
+_CACHE_SIZE = 64
+
+
 class Serializer(object):
+    """
+    Converts the SANS state to and from the JSON strings passed to the SANS workflow algorithms.
+
+    The same state is typically passed to many child algorithms during a reduction, so both
+    directions are memoised. The cache keys and values are pickles of the state, which are much
+    cheaper to produce and load than the JSON encoding. An object is only encoded to JSON again
+    if its contents have changed and a JSON string is only decoded once, after which each call
+    to from_json returns a new copy of the state loaded from its pickle.
+    """
+
     @staticmethod
     def to_json(obj):
-        return json.dumps(obj, cls=SerializerImpl)
+        blob = _to_pickle(obj)
+        if blob is None:
+            return _encode(obj)
+        return _encode_pickle(blob)
 
     @staticmethod
     def from_json(json_str):
         assert isinstance(json_str, str)
-        return json.loads(json_str, object_hook=SerializerImpl.obj_hook)
+        blob = _decode_to_pickle(json_str)
+        if blob is None:
+            return _decode(json_str)
+        return pickle.loads(blob)
+
+    @staticmethod
+    def clear_cache():
+        _encode_pickle.cache_clear()
+        _decode_to_pickle.cache_clear()
 
     @staticmethod
     def load_file(file_path):
@@ -32,6 +59,37 @@ class Serializer(object):
             json.dump(obj, f, cls=SerializerImpl, sort_keys=True, indent=4)
 
 
+def _encode(obj):
+    return json.dumps(obj, cls=SerializerImpl)
+
+
+def _decode(json_str):
+    return json.loads(json_str, object_hook=SerializerImpl.obj_hook)
+
+
+def _to_pickle(obj):
+    """
+    :return: The pickled object or None if the object cannot be pickled, e.g. if it contains
+             an instance of a class that cannot be imported. Such objects are not cached.
+    """
+    try:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _encode_pickle(blob):
+    return _encode(pickle.loads(blob))
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _decode_to_pickle(json_str):
+    # The pickle is taken of the decoded object, not the original one, so that a copy loaded
+    # from it is identical to decoding the JSON string, e.g. tuples have become lists
+    return _to_pickle(_decode(json_str))
+
+
 class SerializerImpl(json.JSONEncoder):
     def default(self, o):
         metaclass = type(type(o))  # Get class of o, then get metaclass of the class type
@@ -97,7 +97,7 @@ def get3DPeak(
             iccFitDict=iccFitDict,
             fitPenalty=fitPenalty,
         )
-        chiSqTOF = mtd["fit_Parameters"].column(1)[-1]
+        chiSqTOF = mtd[ICCFT.wsName("fit") + "_Parameters"].column(1)[-1]
     else:  # we already did I-C profile, so we'll just read the parameters
         pp_lambda = fICCParams[-1]
         fICC = ICC.IkedaCarpenterConvoluted()
@@ -320,8 +320,13 @@ def fitScaling(n_events, box, YTOF, YBVG, goodIDX=None, neigh_length_m=3):
     scaleLinear.constrain("A1>0")
     scaleX = YJOINT[goodIDX]
     scaleY = n_events[goodIDX]
-    CreateWorkspace(OutputWorkspace="__scaleWS", dataX=scaleX, dataY=scaleY)
-    fitResultsScaling = Fit(Function=scaleLinear, InputWorkspace="__scaleWS", Output="__scalefit", CostFunction="Unweighted least squares")
+    CreateWorkspace(OutputWorkspace=ICCFT.wsName("__scaleWS"), dataX=scaleX, dataY=scaleY)
+    fitResultsScaling = Fit(
+        Function=scaleLinear,
+        InputWorkspace=ICCFT.wsName("__scaleWS"),
+        Output=ICCFT.wsName("__scalefit"),
+        CostFunction="Unweighted least squares",
+    )
     A0 = fitResultsScaling[3].row(0)["Value"]
     A1 = fitResultsScaling[3].row(1)["Value"]
     YRET = A1 * YJOINT + A0
@@ -407,14 +412,15 @@ def fitTOFCoordinate(
         tofWS, energy, flightPath, padeCoefficients, fitOrder=bgPolyOrder, constraintScheme=1, iccFitDict=iccFitDict, fitPenalty=fitPenalty
     )
 
+    fitParams = mtd[ICCFT.wsName("fit") + "_Parameters"]
     for i, param in enumerate(["A", "B", "R", "T0", "Scale", "HatWidth", "KConv"]):
-        fICC[param] = mtd["fit_Parameters"].row(i)["Value"]
+        fICC[param] = fitParams.row(i)["Value"]
     bgParamsRows = [7 + i for i in range(bgPolyOrder + 1)]
     bgCoeffs = []
     for bgRow in bgParamsRows[::-1]:  # reverse for numpy order
-        bgCoeffs.append(mtd["fit_Parameters"].row(bgRow)["Value"])
+        bgCoeffs.append(fitParams.row(bgRow)["Value"])
     x = tofWS.readX(0)
-    yFit = mtd["fit_Workspace"].readY(1)
+    yFit = mtd[ICCFT.wsName("fit") + "_Workspace"].readY(1)
 
     interpF = interp1d(x, yFit, kind="cubic")
     tofxx = np.linspace(tofWS.readX(0).min(), tofWS.readX(0).max(), 1000)
@@ -424,7 +430,7 @@ def fitTOFCoordinate(
         plt.clf()
         plt.plot(tofxx, tofyy, label="Interpolated")
         plt.plot(tofWS.readX(0), tofWS.readY(0), "o", label="Data")
-        plt.plot(mtd["fit_Workspace"].readX(1), mtd["fit_Workspace"].readY(1), label="Fit")
+        plt.plot(mtd[ICCFT.wsName("fit") + "_Workspace"].readX(1), yFit, label="Fit")
         plt.title(fitResults.OutputChi2overDoF)
         plt.legend(loc="best")
     ftof = interp1d(tofxx, tofyy, bounds_error=False, fill_value=0.0)
@@ -648,8 +654,10 @@ def doBVGFit(
         m.setAttributeValue("nY", h.shape[1])
         m.setConstraints(boundsDict, penalty=fitPenalty)
         # Do the fit
-        CreateWorkspace(OutputWorkspace="__bvgWS", DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
-        fitResults = Fit(Function=m, InputWorkspace="__bvgWS", Output="__bvgfit", Minimizer="Levenberg-MarquardtMD")
+        CreateWorkspace(OutputWorkspace=ICCFT.wsName("__bvgWS"), DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
+        fitResults = Fit(
+            Function=m, InputWorkspace=ICCFT.wsName("__bvgWS"), Output=ICCFT.wsName("__bvgfit"), Minimizer="Levenberg-MarquardtMD"
+        )
 
     elif forceParams is not None:
         p0 = np.zeros(7)
@@ -701,19 +709,22 @@ def doBVGFit(
         m.setAttributeValue("nY", h.shape[1])
         m.setConstraints(boundsDict, penalty=fitPenalty)
         # Do the fit
-        CreateWorkspace(OutputWorkspace="__bvgWS", DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
+        CreateWorkspace(OutputWorkspace=ICCFT.wsName("__bvgWS"), DataX=pos.ravel(), DataY=H.ravel(), DataE=np.sqrt(H.ravel()))
         fitFun = m
-        fitResults = Fit(Function=fitFun, InputWorkspace="__bvgWS", Output="__bvgfit", Minimizer="Levenberg-MarquardtMD")
+        fitResults = Fit(
+            Function=fitFun, InputWorkspace=ICCFT.wsName("__bvgWS"), Output=ICCFT.wsName("__bvgfit"), Minimizer="Levenberg-MarquardtMD"
+        )
     # Recover the result
     m = BivariateGaussian.BivariateGaussian()
     m.init()
-    m["A"] = mtd["__bvgfit_Parameters"].row(0)["Value"]
-    m["MuX"] = mtd["__bvgfit_Parameters"].row(1)["Value"]
-    m["MuY"] = mtd["__bvgfit_Parameters"].row(2)["Value"]
-    m["SigX"] = mtd["__bvgfit_Parameters"].row(3)["Value"]
-    m["SigY"] = mtd["__bvgfit_Parameters"].row(4)["Value"]
-    m["SigP"] = mtd["__bvgfit_Parameters"].row(5)["Value"]
-    m["Bg"] = mtd["__bvgfit_Parameters"].row(6)["Value"]
+    bvgParams = mtd[ICCFT.wsName("__bvgfit") + "_Parameters"]
+    m["A"] = bvgParams.row(0)["Value"]
+    m["MuX"] = bvgParams.row(1)["Value"]
+    m["MuY"] = bvgParams.row(2)["Value"]
+    m["SigX"] = bvgParams.row(3)["Value"]
+    m["SigY"] = bvgParams.row(4)["Value"]
+    m["SigP"] = bvgParams.row(5)["Value"]
+    m["Bg"] = bvgParams.row(6)["Value"]
 
     m.setAttributeValue("nX", h.shape[0])
     m.setAttributeValue("nY", h.shape[1])
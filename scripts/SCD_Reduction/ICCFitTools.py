@@ -14,11 +14,36 @@ from mantid.simpleapi import BinMD, ConvertToMD, CreateWorkspace, Fit, FunctionW
 from mantid.kernel import logger, V3D
 import ICConvoluted as ICC
 import itertools
+import threading
 from functools import reduce
 from scipy.ndimage.filters import convolve
 
 plt.ion()
 
+# Suffix appended to the names of the temporary workspaces created while fitting a peak.  Threads that
+# fit peaks concurrently set their own suffix so that they do not overwrite each other's workspaces.
+_workspaceSuffix = threading.local()
+
+
+def setWorkspaceSuffix(suffix):
+    """
+    setWorkspaceSuffix sets the suffix appended to temporary workspace names by the calling thread.
+    Input:
+        suffix - str; use a different suffix in each thread fitting peaks concurrently
+    """
+    _workspaceSuffix.value = suffix
+
+
+def wsName(name):
+    """
+    wsName returns the name of a temporary workspace for the calling thread
+    Input:
+        name - str; the base name of the workspace (e.g. '__tofWS' or 'fit_Parameters')
+    Returns:
+        name with the suffix set by setWorkspaceSuffix appended (if any)
+    """
+    return name + getattr(_workspaceSuffix, "value", "")
+
 
 def parseConstraints(peaks_ws):
     """
@@ -197,8 +222,8 @@ def getQuickTOFWS(
     h = [tofWS.readY(0), tofWS.readX(0)]
     chiSq = fitResults.OutputChi2overDoF
 
-    r = mtd["fit_Workspace"]
-    param = mtd["fit_Parameters"]
+    r = mtd[wsName("fit") + "_Workspace"]
+    param = mtd[wsName("fit") + "_Parameters"]
     n_events = box.getNumEventsArray()
 
     iii = fICC.numParams() - 1
@@ -794,7 +819,7 @@ def getTOFWS(
     yPoints = h[0]
 
     if workspaceNumber is None:
-        tofWS = CreateWorkspace(OutputWorkspace="__tofWS", DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
+        tofWS = CreateWorkspace(OutputWorkspace=wsName("__tofWS"), DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
     else:
         tofWS = CreateWorkspace(OutputWorkspace="tofWS%i" % workspaceNumber, DataX=tPoints, DataY=yPoints, DataE=np.sqrt(yPoints))
     return tofWS, float(pp_lambda)
@@ -925,7 +950,9 @@ def plotFit(filenameFormat, r, tofWS, fICC, runNumber, peakNumber, energy, chiSq
     plt.savefig(filenameFormat % (runNumber, peakNumber))
 
 
-def getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, dQPixel=0.005, fracHKL=0.5, fracHKLRefine=0.2, q_frame="sample"):
+def getBoxFracHKL(
+    peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, dQPixel=0.005, fracHKL=0.5, fracHKLRefine=0.2, q_frame="sample", outputWSName="MDbox"
+):
     """
     getBoxFracHKL returns the binned MDbox going from (x,y,z) - (dq_x, dq_y, dq_z) to (x,y,z) + (dq_x, dq_y, dq_z)
      Inputs:
@@ -940,6 +967,8 @@ def getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, dQPixel=0.00
         fracHKL - not used; TODO: remove this
         fracHKLRefine - not used;  TODO: remove this
         q_frame - str; either 'sample' or 'lab'
+        outputWSName - the name of the output workspace.  Use a different name for each box to keep
+            the boxes of several peaks at once.
       Returns:
           Box, an MDWorkspace with histogrammed events around the peak
     """
@@ -962,7 +991,7 @@ def getBoxFracHKL(peak, peaks_ws, MDdata, UBMatrix, peakNumber, dQ, dQPixel=0.00
         AlignedDim0="Q_%s_x," % q_frame + str(Qx - dQ[0, 0]) + "," + str(Qx + dQ[0, 1]) + "," + str(nPtsQ[0]),
         AlignedDim1="Q_%s_y," % q_frame + str(Qy - dQ[1, 0]) + "," + str(Qy + dQ[1, 1]) + "," + str(nPtsQ[1]),
         AlignedDim2="Q_%s_z," % q_frame + str(Qz - dQ[2, 0]) + "," + str(Qz + dQ[2, 1]) + "," + str(nPtsQ[2]),
-        OutputWorkspace="MDbox",
+        OutputWorkspace=outputWSName,
     )
     return Box
 
@@ -1045,7 +1074,7 @@ def doICCFit(
         bg["A" + str(fitOrder - i)] = bgx0[i]
     bg.constrain("-1.0 < A%i < 1.0" % fitOrder)
     fitFun = f + bg
-    fitResults = Fit(Function=fitFun, InputWorkspace="__tofWS", Output=outputWSName)
+    fitResults = Fit(Function=fitFun, InputWorkspace=wsName("__tofWS"), Output=wsName(outputWSName))
     return fitResults, fICC
 
 
@@ -1144,7 +1173,9 @@ def integrateSample(
                     logger.information("Peak {:d} has 0 events or is HKL=000. Skipping!".format(p))
                     peak.setIntensity(0)
                     peak.setSigmaIntensity(1)
-                    paramList.append([i, energy, 0.0, 1.0e10, 1.0e10] + [0 for i in range(mtd["fit_parameters"].rowCount())] + [0])
+                    paramList.append(
+                        [i, energy, 0.0, 1.0e10, 1.0e10] + [0 for i in range(mtd[wsName("fit") + "_Parameters"].rowCount())] + [0]
+                    )
 
                     mtd.remove("MDbox_" + str(run) + "_" + str(i))
                     continue
@@ -1165,7 +1196,7 @@ def integrateSample(
                     iccFitDict=iccFitDict,
                     fitPenalty=fitPenalty,
                 )
-                tofWS = mtd["__tofWS"]
+                tofWS = mtd[wsName("__tofWS")]
 
                 fitResults, fICC = doICCFit(
                     tofWS,
@@ -1179,9 +1210,9 @@ def integrateSample(
                 )
                 chiSq = fitResults.OutputChi2overDoF
 
-                r = mtd["fit_Workspace"]
-                param = mtd["fit_Parameters"]
-                tofWS = mtd["__tofWS"]
+                r = mtd[wsName("fit") + "_Workspace"]
+                param = mtd[wsName("fit") + "_Parameters"]
+                tofWS = mtd[wsName("__tofWS")]
 
                 iii = fICC.numParams() - 1
                 fitBG = [param.row(int(iii + bgIDX + 1))["Value"] for bgIDX in range(bgPolyOrder + 1)]
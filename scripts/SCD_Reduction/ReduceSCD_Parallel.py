@@ -10,11 +10,13 @@
 #
 # Version 2.0, modified to work with Mantid's new python interface.
 #
-# This script will run multiple instances of the script ReduceSCD_OneRun.py
-# in parallel, using either local processes or a slurm partition.  After
-# using the ReduceSCD_OneRun script to find, index and integrate peaks from
-# multiple runs, this script merges the integrated peaks files and re-indexes
-# them in a consistent way.  If desired, the indexing can also be changed to a
+# This script will reduce multiple runs with the script ReduceSCD_OneRun.py
+# in parallel, using either worker threads in this process, local processes
+# or a slurm partition.  The runs are scheduled by SCDRunScheduler.py, which
+# limits the number of runs (and optionally the memory) in use at once and
+# retries runs that fail.  After using the ReduceSCD_OneRun script to find,
+# index and integrate peaks from multiple runs, this script merges the
+# integrated peaks and re-indexes them in a consistent way.  If desired, the indexing can also be changed to a
 # specified conventional cell.
 # Many intermediate files are generated and saved, so all output is written
 # to a specified output_directory.  This output directory must be created
@@ -41,23 +43,24 @@
 #
 
 import os
+import subprocess
 import sys
-import threading
 import time
 import ReduceDictionary
+import ReduceSCD_OneRun
+from SCDRunScheduler import RunScheduler, file_size_memory_estimate
 
 sys.path.append("/opt/mantidnightly/bin")
 # sys.path.append("/opt/Mantid/bin")
 
-from mantid import apiVersion, FileFinder
+from mantid import apiVersion
 from mantid.simpleapi import (
+    CloneWorkspace,
     CombinePeaksWorkspaces,
-    CreatePeaksWorkspace,
     FindUBUsingFFT,
     FindUBUsingLatticeParameters,
     IndexPeaks,
     Load,
-    LoadEventNexus,
     LoadIsawPeaks,
     LoadIsawUB,
     SaveNexus,
@@ -71,26 +74,6 @@ print(apiVersion())
 
 start_time = time.time()
 
-# -------------------------------------------------------------------------
-# ProcessThread is a simple local class.  Each instance of ProcessThread is
-# a thread that starts a command line process to reduce one run.
-#
-
-
-class ProcessThread(threading.Thread):
-    command = ""
-
-    def setCommand(self, command=""):
-        self.command = command
-
-    def run(self):
-        print("STARTING PROCESS: " + self.command)
-        os.system(self.command)
-
-
-# -------------------------------------------------------------------------
-
-
 #
 # Get the config file name from the command line
 #
@@ -113,6 +96,9 @@ output_nexus = params_dictionary.get("output_nexus", False)
 reduce_one_run_script = params_dictionary["reduce_one_run_script"]
 slurm_queue_name = params_dictionary["slurm_queue_name"]
 max_processes = int(params_dictionary["max_processes"])
+max_memory_GB = params_dictionary.get("max_memory_GB", None)
+memory_per_file_size = params_dictionary.get("memory_per_file_size", None)
+max_retries = int(params_dictionary.get("max_retries", 0))
 min_d = params_dictionary["min_d"]
 max_d = params_dictionary["max_d"]
 tolerance = params_dictionary["tolerance"]
@@ -136,47 +122,62 @@ if python is None:  # not all platforms define this variable
     python = "python"
 
 #
-# Make the list of separate process commands.  If a slurm queue name
-# was specified, run the processes using slurm, otherwise just use
-# multiple processes on the local machine.
+# If the standard ReduceSCD_OneRun.py script is used on the local machine, the
+# runs are reduced in this process, so the instrument is only loaded once and
+# the integrated peaks are kept in memory.  Otherwise a separate process is
+# started for each run, using slurm if a slurm queue name was specified, and
+# the integrated peaks are loaded from the file saved for the run.
 #
-procList = []
-index = 0
-for r_num in run_nums:
-    procList.append(ProcessThread())
+reduce_in_process = slurm_queue_name is None and os.path.basename(reduce_one_run_script) == "ReduceSCD_OneRun.py"
+
+
+def load_run_peaks(r_num):
+    if output_nexus:
+        return Load(Filename=output_directory + "/" + str(r_num) + "_Niggli.nxs", OutputWorkspace=str(r_num) + "_Niggli")
+    return LoadIsawPeaks(Filename=output_directory + "/" + str(r_num) + "_Niggli.integrate", OutputWorkspace=str(r_num) + "_Niggli")
+
+
+def reduce_one_run(r_num):
+    if reduce_in_process:
+        return ReduceSCD_OneRun.reduce_run(params_dictionary, str(r_num))
     cmd = "%s %s %s %s" % (python, reduce_one_run_script, " ".join(config_files), str(r_num))
     if slurm_queue_name is not None:
         console_file = output_directory + "/" + str(r_num) + "_output.txt"
         cmd = "srun -p " + slurm_queue_name + " --cpus-per-task=3 -J ReduceSCD_Parallel.py -o " + console_file + " " + cmd
-    procList[index].setCommand(cmd)
-    index = index + 1
+    print("STARTING PROCESS: " + cmd)
+    subprocess.run(cmd, shell=True, check=True)
+    if use_cylindrical_integration:
+        return None
+    return load_run_peaks(r_num)
+
 
 #
-# Now create and start a thread for each command to run the commands in parallel,
-# starting up to max_processes simultaneously.
+# Reduce the runs, up to max_processes at a time.  If memory_per_file_size is
+# set, a run is only started when its estimated memory, memory_per_file_size
+# times the size of its event file, fits in max_memory_GB together with the
+# runs already being reduced.  Failed runs are retried up to max_retries times.
 #
-all_done = False
-active_list = []
-while not all_done:
-    if len(procList) > 0 and len(active_list) < max_processes:
-        thread = procList[0]
-        procList.remove(thread)
-        active_list.append(thread)
-        thread.start()
-    time.sleep(2)
-    for thread in active_list:
-        if not thread.is_alive():
-            active_list.remove(thread)
-    if len(procList) == 0 and len(active_list) == 0:
-        all_done = True
+memory_estimate = None
+if memory_per_file_size is not None:
+    event_files = {r_num: ReduceSCD_OneRun.find_event_file(instrument_name, str(r_num), data_directory) for r_num in run_nums}
+    memory_estimate = file_size_memory_estimate(event_files, float(memory_per_file_size))
+memory_limit = float(max_memory_GB) * 1e9 if max_memory_GB is not None else None
+
+scheduler = RunScheduler(max_processes, memory_limit=memory_limit, max_retries=max_retries)
+run_peaks = scheduler.run(run_nums, reduce_one_run, memory_estimate)
+if scheduler.failed:
+    print("WARNING: the following runs could not be reduced and are NOT included: " + ", ".join(str(r_num) for r_num in scheduler.failed))
+    run_nums = [r_num for r_num in run_nums if r_num in run_peaks]
+if len(run_nums) == 0:
+    print("Exiting since none of the runs could be reduced")
+    exit(0)
 
 print("\n**************************************************************************************")
 print("************** Completed Individual Runs, Starting to Combine Results ****************")
 print("**************************************************************************************\n")
 
 #
-# First combine all of the integrated files, by reading the separate files and
-# appending them to a combined output file.
+# First combine the integrated peaks from all of the runs in memory.
 #
 niggli_name = output_directory + "/" + exp_name + "_Niggli"
 if output_nexus:
@@ -185,73 +186,25 @@ else:
     niggli_integrate_file = niggli_name + ".integrate"
 niggli_matrix_file = niggli_name + ".mat"
 
-first_time = True
-
-if output_nexus:
-    # Only need this for instrument for peaks_total
-    short_filename = "%s_%s" % (instrument_name, str(run_nums[0]))
-    if data_directory is not None:
-        full_name = data_directory + "/" + short_filename + ".nxs.h5"
-        if not os.path.exists(full_name):
-            full_name = data_directory + "/" + short_filename + "_event.nxs"
-    else:
-        candidates = FileFinder.findRuns(short_filename)
-        full_name = ""
-        for item in candidates:
-            if os.path.exists(item):
-                full_name = str(item)
-
-        if not full_name.endswith("nxs") and not full_name.endswith("h5"):
-            print("Exiting since the data_directory was not specified and")
-            print("findnexus failed for event NeXus file: " + instrument_name + " " + str(run_nums[0]))
-            exit(0)
-
-    #
-    # Load the first data file to find instrument
-    #
-    wksp = LoadEventNexus(Filename=full_name, FilterByTofMin=0, FilterByTofMax=0)
-    peaks_total = CreatePeaksWorkspace(NumberOfPeaks=0, InstrumentWorkspace=wksp)
-
 if not use_cylindrical_integration:
-    for r_num in run_nums:
-        if output_nexus:
-            one_run_file = output_directory + "/" + str(r_num) + "_Niggli.nxs"
-            peaks_ws = Load(Filename=one_run_file)
-        else:
-            one_run_file = output_directory + "/" + str(r_num) + "_Niggli.integrate"
-            peaks_ws = LoadIsawPeaks(Filename=one_run_file)
-        if first_time:
-            if UseFirstLattice and not read_UB:
-                # Find a UB (using FFT) for the first run to use in the FindUBUsingLatticeParameters
-                FindUBUsingFFT(PeaksWorkspace=peaks_ws, MinD=min_d, MaxD=max_d, Tolerance=tolerance)
-                uc_a = peaks_ws.sample().getOrientedLattice().a()
-                uc_b = peaks_ws.sample().getOrientedLattice().b()
-                uc_c = peaks_ws.sample().getOrientedLattice().c()
-                uc_alpha = peaks_ws.sample().getOrientedLattice().alpha()
-                uc_beta = peaks_ws.sample().getOrientedLattice().beta()
-                uc_gamma = peaks_ws.sample().getOrientedLattice().gamma()
-            if output_nexus:
-                peaks_total = CombinePeaksWorkspaces(LHSWorkspace=peaks_total, RHSWorkspace=peaks_ws)
-                SaveNexus(InputWorkspace=peaks_ws, Filename=niggli_integrate_file)
-            else:
-                SaveIsawPeaks(InputWorkspace=peaks_ws, AppendFile=False, Filename=niggli_integrate_file)
-            first_time = False
-        else:
-            if output_nexus:
-                peaks_total = CombinePeaksWorkspaces(LHSWorkspace=peaks_total, RHSWorkspace=peaks_ws)
-                SaveNexus(InputWorkspace=peaks_total, Filename=niggli_integrate_file)
-            else:
-                SaveIsawPeaks(InputWorkspace=peaks_ws, AppendFile=True, Filename=niggli_integrate_file)
+    first_peaks_ws = run_peaks[run_nums[0]]
+    if UseFirstLattice and not read_UB:
+        # Find a UB (using FFT) for the first run to use in the FindUBUsingLatticeParameters
+        FindUBUsingFFT(PeaksWorkspace=first_peaks_ws, MinD=min_d, MaxD=max_d, Tolerance=tolerance)
+        uc_a = first_peaks_ws.sample().getOrientedLattice().a()
+        uc_b = first_peaks_ws.sample().getOrientedLattice().b()
+        uc_c = first_peaks_ws.sample().getOrientedLattice().c()
+        uc_alpha = first_peaks_ws.sample().getOrientedLattice().alpha()
+        uc_beta = first_peaks_ws.sample().getOrientedLattice().beta()
+        uc_gamma = first_peaks_ws.sample().getOrientedLattice().gamma()
+
+    peaks_ws = CloneWorkspace(InputWorkspace=first_peaks_ws, OutputWorkspace=exp_name + "_Niggli")
+    for r_num in run_nums[1:]:
+        peaks_ws = CombinePeaksWorkspaces(LHSWorkspace=peaks_ws, RHSWorkspace=run_peaks[r_num], OutputWorkspace=exp_name + "_Niggli")
 
     #
-    # Load the combined file and re-index all of the peaks together.
-    # Save them back to the combined Niggli file (Or selected UB file if in use...)
-    #
-    if output_nexus:
-        peaks_ws = Load(Filename=niggli_integrate_file)
-    else:
-        peaks_ws = LoadIsawPeaks(Filename=niggli_integrate_file)
-
+    # Re-index all of the combined peaks together and save them to the
+    # combined Niggli file (Or selected UB file if in use...)
     #
     # Find a Niggli UB matrix that indexes the peaks in this run
     # Load UB instead of Using FFT
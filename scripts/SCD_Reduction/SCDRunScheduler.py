@@ -0,0 +1,117 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+#
+# File: SCDRunScheduler.py
+#
+# This module schedules the reduction of many SCD runs, as done by the
+# ReduceSCD_Parallel.py script.  Runs are reduced by a pool of worker threads
+# in the calling process, so the instrument definitions loaded by the first
+# runs are cached and reused by the others, and the reduced workspaces can be
+# combined in memory.  A run is only started if the memory it is estimated to
+# need is available, failed runs can be retried and the progress of each run is
+# reported as it finishes.
+#
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from mantid.kernel import MemoryStats
+
+
+def available_memory():
+    """
+    Returns the memory available on this machine in bytes
+    """
+    return MemoryStats().availMem() * 1024
+
+
+def file_size_memory_estimate(filenames, factor):
+    """
+    Returns a function that estimates the memory needed to reduce a run as factor times
+    the size of its event file.  filenames maps the run numbers to their event files.
+    """
+
+    def estimate(run):
+        return factor * os.path.getsize(filenames[run])
+
+    return estimate
+
+
+class RunScheduler:
+    """
+    Reduces a list of runs concurrently, starting runs only while the memory they are
+    estimated to need is available.
+    """
+
+    def __init__(self, max_workers, memory_limit=None, max_retries=0, report=print):
+        """
+        :param max_workers: the maximum number of runs reduced at once
+        :param memory_limit: the memory in bytes that the runs reduced at once may use, None uses the memory available when run is called
+        :param max_retries: the number of times a failed run is reduced again before giving up
+        :param report: function called with a message when a run starts, finishes or fails
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.memory_limit = memory_limit
+        self.max_retries = max_retries
+        self.report = report
+        self.failed = {}
+
+    def run(self, runs, reduce_run, memory_estimate=None):
+        """
+        Calls reduce_run(run) for each run and returns a dictionary of the results keyed by run,
+        in the order of runs.  Runs that fail after all retries are left out of the results
+        and their last exception is kept in the failed dictionary.
+        :param runs: the runs to reduce
+        :param reduce_run: function reducing one run, it must not depend on the other runs being reduced
+        :param memory_estimate: function returning the memory in bytes needed to reduce a run, None if the memory is not limited
+        """
+        memory_limit = self.memory_limit if self.memory_limit is not None else available_memory()
+        pending = deque((run, 0) for run in runs)
+        running = {}
+        results = {}
+        self.failed = {}
+        memory_in_use = 0
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Start as many runs as the workers and memory allow, a run is always started if nothing else is running
+                while pending and len(running) < self.max_workers:
+                    run, attempt = pending[0]
+                    memory = memory_estimate(run) if memory_estimate is not None else 0
+                    if running and memory_in_use + memory > memory_limit:
+                        break
+                    pending.popleft()
+                    memory_in_use += memory
+                    running[executor.submit(self._timed_reduce, reduce_run, run)] = (run, attempt, memory)
+                    self.report("Started run %s (%.1f GB estimated, %i runs running)" % (run, memory / 1e9, len(running)))
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    run, attempt, memory = running.pop(future)
+                    memory_in_use -= memory
+                    try:
+                        results[run], elapsed = future.result()
+                    except Exception as error:
+                        if attempt < self.max_retries:
+                            self.report("Run %s failed (%s), retrying" % (run, error))
+                            pending.append((run, attempt + 1))
+                        else:
+                            self.report("Run %s failed (%s)" % (run, error))
+                            self.failed[run] = error
+                        continue
+                    self.report(
+                        "Finished run %s in %.1f sec (%i of %i runs done, %.1f sec elapsed)"
+                        % (run, elapsed, len(results), len(runs), time.time() - start_time)
+                    )
+        return {run: results[run] for run in runs if run in results}
+
+    @staticmethod
+    def _timed_reduce(reduce_run, run):
+        start = time.time()
+        result = reduce_run(run)
+        return result, time.time() - start
@@ -46,13 +46,15 @@ def tchop(freq, Ei, pslit, radius, rho):
     gamm = (2.00 * (R**2) / p) * abs(1.00 / rho - 2.00 * w / veloc)
     # Find regime and calculate variance:
     if hasattr(gamm, "__len__"):
-        tausqr = np.zeros(len(gamm))
+        tausqr = np.full(len(gamm), np.nan)
         pre = (p / (2.00 * R * w)) ** 2 / 6.00
         idx = np.where((gamm <= 1.0))
-        tausqr[idx] = pre * (1.00 - (gamm[idx] ** 2) ** 2 / 10.00) / (1.00 - (gamm[idx] ** 2) / 6.00)
+        tausqr[idx] = pre * ((1.00 - (gamm[idx] ** 2) ** 2 / 10.00) / (1.00 - (gamm[idx] ** 2) / 6.00))
         idx = np.where((gamm > 1.0) * (gamm < 4.0))
         groot = np.sqrt(gamm[idx])
-        # area[idx] = pre * 0.60 * gamm[idx] * ((groot-2.00)**2) * (groot+8.00) / (groot+4.00)
+        tausqr[idx] = pre * (0.60 * gamm[idx] * ((groot - 2.00) ** 2) * (groot + 8.00) / (groot + 4.00))
+        if np.any(gamm >= 4.00):
+            warnings.warn("PyChop: tchop(): No transmission at %d of the energies at %3d Hz" % (np.sum(gamm >= 4.00), freq))
     else:
         if gamm >= 4.00:
             warnings.warn("PyChop: tchop(): No transmission at %5.3f meV at %3d Hz" % (Ei, freq))
@@ -87,13 +89,15 @@ def achop(Ei, freq, dslat, pslit, radius, rho):
     gamm = (2.00 * (R1**2) / p1) * abs(1.00 / rho1 - 2.00 * w1 / vela)
     # Find regime and calculate variance:
     if hasattr(gamm, "__len__"):
-        area = np.zeros(len(gamm))
+        area = np.full(len(gamm), np.nan)
         pre = (p1**2) / (2.00 * R1 * w1)
         idx = np.where(gamm <= 1.0)
         area[idx] = pre * (1.0 - (gamm[idx] ** 2) / 6.0)
         idx = np.where((gamm > 1.0) * (gamm < 4.0))
         groot = np.sqrt(gamm[idx])
-        area[idx] = pre * groot * ((groot - 2.0) ** 2) * (groot + 4.0) / 6.0
+        area[idx] = pre * (groot * ((groot - 2.0) ** 2) * (groot + 4.0) / 6.0)
+        if np.any(gamm >= 4.00):
+            warnings.warn("PyChop: achop(): No transmission at %d of the energies at %3d Hz" % (np.sum(gamm >= 4.00), freq), UserWarning)
     else:
         if gamm >= 4.00:
             warnings.warn("PyChop: achop(): No transmission at %5.3f meV at %3d Hz" % (Ei, freq), UserWarning)
@@ -289,7 +293,7 @@ def detect_he(wvec, rad, atms, t2rad):
     else:
         reff = rad * (1.0 - t2rad)
         var = 2.0 * (rad * (1.0 - t2rad)) * (const * atms)
-        if wvec < (var * 1.0e-18):
+        if np.any(np.asarray(wvec) < (var * 1.0e-18)):
             raise ValueError("Error with size of wavevector for input pars")
         else:
             alf = var / wvec
@@ -595,6 +599,10 @@ def tube_mts(alf):
         -9.4195068411906391e-14,
         -3.4105815394092076e-13,
     ]
+    if np.ndim(alf) > 0:
+        c_f = [c_eff_f, c_del_f, c_xsqr_f, c_vx_f, c_vy_f]
+        c_g = [c_eff_g, c_del_g, c_xsqr_g, c_vx_g, c_vy_g]
+        return _tube_mts_array(np.asarray(alf, dtype=float), c_f, c_g, g0, g1)
     if alf < 0:
         raise ValueError("alf < 0, invalid choice")
     else:
@@ -631,6 +639,41 @@ def tube_mts(alf):
     return eff, delta, xsqr, vx, vy
 
 
+def _tube_mts_array(alf, c_f, c_g, g0, g1):
+    """
+    ! Calculates the quantities of tube_mts for an array of ALF. Both expansions are evaluated for all
+    ! the values they are needed for, with the coefficients of the five quantities along a leading axis,
+    ! and the values outside their range are discarded.
+    """
+    if np.any(alf < 0):
+        raise ValueError("alf < 0, invalid choice")
+    coeffs_shape = (25, 5) + (1,) * np.ndim(alf)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        if np.all(alf >= 10.00):
+            eff_f = del_f = xsqr_f = vx_f = vy_f = 0.0
+        else:
+            chb_eff, chb_del, chb_xsqr, chb_vx, chb_vy = chbmts(0.00, 10.00, np.reshape(np.transpose(c_f), coeffs_shape), 25, alf)
+            eff_f = (np.pi / 4.00) * alf * chb_eff
+            del_f = -0.125 * alf * chb_del
+            xsqr_f = 0.25 * chb_xsqr
+            vx_f = 0.25 * chb_vx
+            vy_f = 0.25 * chb_vy
+        if np.all(alf <= 9.0):
+            eff_g = del_g = xsqr_g = vx_g = vy_g = 0.0
+        else:
+            y = 1.0 - 18.0 / alf
+            chb_eff, chb_del, chb_xsqr, chb_vx, chb_vy = chbmts(-1.00, 1.00, np.reshape(np.transpose(c_g), coeffs_shape), 25, y)
+            eff_g = 1.00 - chb_eff / alf**2
+            del_g = (2.0 * chb_del / alf - 0.25 * np.pi) / eff_g
+            xsqr_g = ((-np.pi / alf) * chb_xsqr + 2.0 / 3.0) / eff_g
+            vx_g = g0 + g1 * chb_vx / (alf**2)
+            vy_g = (-chb_vy / (alf**2) + 1.0 / 3.0) / eff_g
+        return tuple(
+            np.where(alf <= 9.0, val_f, np.where(alf >= 10.00, val_g, (10.0 - alf) * val_f + (alf - 9.0) * val_g))
+            for val_f, val_g in zip([eff_f, del_f, xsqr_f, vx_f, vy_f], [eff_g, del_g, xsqr_g, vx_g, vy_g])
+        )
+
+
 def chbmts(a, b, c, m, x):
     """
     ! Essentially CHEBEV of "Numerical Recipes"
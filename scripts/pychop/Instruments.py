@@ -13,6 +13,7 @@ import numpy as np
 import yaml
 import warnings
 import copy
+from collections import OrderedDict
 from . import Chop, MulpyRep
 from scipy.interpolate import interp1d
 from scipy.special import erf
@@ -25,6 +26,8 @@ SIGMA2FWHMSQ = SIGMA2FWHM**2
 E2V = np.sqrt((constants.e / 1000) * 2 / constants.neutron_mass)  # v = E2V * sqrt(E)    veloc in m/s, E in meV
 E2L = 1.0e23 * constants.h**2 / (2 * constants.m_n * constants.e)  # lam = sqrt(E2L / E)  lam in Angst, E in meV
 E2K = constants.e * 2 * constants.m_n / constants.hbar**2 / 1e23  # k = sqrt(E2K * E)    k in 1/Angst, E in meV
+# Number of sets of chopper opening times (for different Ei, frequencies and phases) kept by a chopper system
+CHOP_TIMES_CACHE_SIZE = 256
 
 
 def wrap_attributes(obj, inval, allowed_var_names):
@@ -65,9 +68,7 @@ def soft_hat(x, p):
     sig1, sig2 = tuple(np.abs(p[4:6] / sig2fwhh))
     # linearly interpolate sig for x1<x<x2
     sig = ((x2 - x) * sig1 - (x1 - x) * sig2) / (x2 - x1)
-    if np.shape(sig):
-        sig[x < x1] = sig1
-        sig[x > x2] = sig2
+    sig = np.where(x < x1, sig1, np.where(x > x2, sig2, sig))
     # calculate blurred hat function with gradient
     e1 = (x1 - x) / (np.sqrt(2) * sig)
     e2 = (x2 - x) / (np.sqrt(2) * sig)
@@ -145,6 +146,7 @@ class ChopperSystem(object):
         self.overlap_ei_frac = 0.9
         self.n_frame = 1
         self._ei = None
+        self._chop_times_cache = OrderedDict()
         # Parse input values (if any)
         wrap_attributes(self, inval, self.__allowed_var_names)
         self._parse_choppers()
@@ -370,9 +372,11 @@ class ChopperSystem(object):
         if self.isFermi:
             return self._ChopDriver(Ei_in, squared), None
         else:
-            chop_times = self._MulpyRepDriver(Ei_in, calc_res=False)[1]
-            # Output of MulpyRep is FWHM in us - want it in seconds for later calculations
-            wd = ((chop_times[1][1] - chop_times[1][0]) / 2.0 / 1.0e6, (chop_times[0][1] - chop_times[0][0]) / 2.0 / 1.0e6)
+            _check_input(self, Ei_in)
+            # The opening times of the choppers only depend on their frequencies, not on Ei or the phases
+            open_times = MulpyRep.calcChopOpenTimes(self._long_frequency, self._instpar)
+            # Output of MulpyRep is in us, the FWHM is half of it - want it in seconds for later calculations
+            wd = (open_times[-1] / 2.0 / 1.0e6, open_times[0] / 2.0 / 1.0e6)
             return (wd[0] ** 2, wd[1] ** 2) if squared else wd
 
     def getDistances(self):
@@ -392,7 +396,7 @@ class ChopperSystem(object):
             return self.packages[self.package].getTransmission(Ei, freq) * magic / fudge
         else:
             # For disk choppers, transmission goes quadratic with freq at high resolution, linear at low
-            freqdep = (self.flux_ref_freq / freq) ** 2 if hires else (self.flux_ref_freq / freq)
+            freqdep = np.where(hires, (self.flux_ref_freq / freq) ** 2, (self.flux_ref_freq / freq))
             return (self.slot_width[-1] / self.flux_ref_slot) * freqdep
 
     def setNFrame(self, value):
@@ -418,14 +422,21 @@ class ChopperSystem(object):
     def _MulpyRepDriver(self, Ei_in=None, calc_res=True):
         """Private method to calculate resolution for given Ei from chopper opening times"""
         Ei = _check_input(self, Ei_in)
-        if "_saved_state" not in self.__dict__ or (self._saved_state[0] != self._get_state(Ei)):
+        # The opening times are kept for the most recently used states, so that going back to
+        # an earlier Ei, frequency or phase (e.g. in a scan) does not calculate them again
+        state = self._get_state(Ei)
+        if state in self._chop_times_cache:
+            self._chop_times_cache.move_to_end(state)
+        else:
+            # calcChopTimes applies the phase offset to the phases it is given, so they are copied
             Eis, all_times, chop_times, lastChopDist, lines = MulpyRep.calcChopTimes(
-                Ei, self._long_frequency, self._instpar, self.phase, self.phaseOffset
+                Ei, self._long_frequency, self._instpar, list(self.phase), self.phaseOffset
             )
             Eis, lines = self._removeLowIntensityReps(Eis, lines, Ei)
-            self._saved_state = [self._get_state(Ei), Eis, chop_times, lastChopDist, lines, all_times]
-        else:
-            Eis, chop_times, lastChopDist, lines, all_times = tuple(self._saved_state[1:])
+            self._chop_times_cache[state] = (Eis, chop_times, lastChopDist, lines, all_times)
+            if len(self._chop_times_cache) > CHOP_TIMES_CACHE_SIZE:
+                self._chop_times_cache.popitem(last=False)
+        Eis, chop_times, lastChopDist, lines, all_times = self._chop_times_cache[state]
         if calc_res:
             res_el, percent, chop_width, mod_width = MulpyRep.calcRes(
                 Eis, chop_times, lastChopDist, self.chop_sam, self.sam_det, self.guide_width[-1], self.slot_width[-1]
@@ -616,15 +627,19 @@ class Moderator(object):
 
     def getWidthSquared(self, Ei):
         """Returns the squared time gaussian FWHM width due to the sample in s^2"""
-        if hasattr(self, "width_interp"):
-            wavelength = np.sqrt(E2L / (Ei if not hasattr(Ei, "__len__") else Ei[0]))
-            if wavelength >= self.wmn:
-                # Data is obtained from measuring widths of powder Bragg peaks in backscattering
-                # At low wavelengths / high energies, the peaks are too close together to discern
-                # so there is no measurements, but the analytical expressions should still be good.
-                width = self.width_interp(min([wavelength, self.wmx])) ** 2 / 1e12
-                return (width * SIGMA2FWHMSQ) if self.measured_width["isSigma"] else width
-        return self.getAnalyticWidthsSquared(Ei)
+        if not hasattr(self, "width_interp"):
+            return self.getAnalyticWidthsSquared(Ei)
+        wavelength = np.sqrt(E2L / np.asarray(Ei, dtype=float))
+        # Data is obtained from measuring widths of powder Bragg peaks in backscattering
+        # At low wavelengths / high energies, the peaks are too close together to discern
+        # so there is no measurements, but the analytical expressions should still be good.
+        width = self.width_interp(np.clip(wavelength, self.wmn, self.wmx)) ** 2 / 1e12
+        if self.measured_width["isSigma"]:
+            width = width * SIGMA2FWHMSQ
+        is_measured = wavelength >= self.wmn
+        if np.all(is_measured):
+            return width
+        return np.where(is_measured, width, self.getAnalyticWidthsSquared(Ei))
 
     def getWidth(self, Ei):
         """Calculates the moderator time width in seconds for a given neutron energy (Ei)"""
@@ -653,10 +668,8 @@ class Moderator(object):
         """Interpolates flux from a table of measured flux"""
         if not hasattr(self, "flux_interp"):
             raise AttributeError("This instrument does not have a table of measured flux")
-        wavelengths = [
-            min(max(wavelength, self.fmn), self.fmx) for wavelength in np.sqrt(E2L / np.array(Ei if hasattr(Ei, "__len__") else [Ei]))
-        ]
-        return self.flux_interp(wavelengths[0])
+        wavelengths = np.clip(np.sqrt(E2L / np.asarray(Ei, dtype=float)), self.fmn, self.fmx)
+        return self.flux_interp(wavelengths)
 
     @property
     def theta_m(self):
@@ -812,6 +825,63 @@ class Instrument(object):
         """Returns the resolution and flux as a tuple."""
         return self.getResolution(Etrans, Ei_in, frequency), self.getFlux(Ei_in, frequency)
 
+    def getResFluxArrays(self, Ei, frequency=None, Etrans=0.0):
+        """
+        Calculates the resolution and flux for arrays of incident energies and chopper frequencies at once
+
+        res, flux = getResFluxArrays(eis)
+        res, flux = getResFluxArrays(eis, freqs)
+        res, flux = getResFluxArrays(eis[:, np.newaxis], freqs[np.newaxis, :])    # on a grid of Ei and frequency
+
+        Inputs:
+            ei - incident energies in meV
+            frequency - frequencies of the first chopper in Hz, the other choppers are kept at their
+                        preset frequencies [default: preset frequency]
+            etrans - energy transfers in meV [default: 0, elastic]
+
+        The inputs are broadcast against each other like numpy arrays. The calculation is made once
+        for each distinct frequency, for all the incident energies and energy transfers at that frequency.
+        The chopper phases only determine which other reps are transmitted in multi-rep mode
+        (see getAllowedEi), not the resolution or flux of a given Ei.
+
+        Output:
+            res - the incoherent (Vanadium) energy FWHM in meV, NaN where etrans >= ei
+            flux - the monochromatic flux estimate in n/cm^2/s (which does not depend on etrans)
+        """
+        freq0 = self.chopper_system.frequency
+        Ei, frequency, Etrans = np.broadcast_arrays(
+            np.asarray(Ei, dtype=float),
+            np.asarray(freq0[0] if frequency is None else frequency, dtype=float),
+            np.asarray(Etrans, dtype=float),
+        )
+        res = np.full(Ei.shape, np.nan)
+        flux = np.full(Ei.shape, np.nan)
+        try:
+            for freq in np.unique(frequency):
+                idx = frequency == freq
+                self.chopper_system.frequency = [freq] + list(freq0[1:])
+                res[idx], flux[idx] = self._getResFluxArrays(Ei[idx], Etrans[idx])
+        finally:
+            self.chopper_system.frequency = freq0
+        return res, flux
+
+    def _getResFluxArrays(self, Ei, Etrans):
+        """Calculates the resolution and flux for 1D arrays of Ei and Etrans at the current chopper frequencies"""
+        if np.any(Etrans > Ei):
+            warnings.warn("Cannot calculate for energy transfer greater than Ei (physically negative neutron energies!)")
+        Etrans = np.where(Etrans >= Ei, np.nan, Etrans)
+        x2 = self.chopper_system.sam_det
+        v_van, _, _ = self.getVanVar(Ei, None, Etrans)
+        res = (2 * E2V * np.sqrt((Ei - Etrans) ** 3 * v_van)) / x2
+        # As in getFlux, the transmission of disk choppers depends on whether the elastic resolution is better than 2%
+        if self.isFermi:
+            isHires = False
+        else:
+            elastic_res = res if np.all(Etrans == 0) else (2 * E2V * np.sqrt(Ei**3 * self.getVanVar(Ei, None, np.zeros(Ei.shape))[0])) / x2
+            isHires = ~(elastic_res / Ei > 0.02)
+        flux = self.moderator.getFlux(Ei) * self.chopper_system.getTransmission(Ei, None, hires=isHires)
+        return res, flux
+
     def getWidths(self, Ei_in=None, frequency=None):
         """Returns the time FWHM of different components for one rep (Ei) in microseconds"""
         Ei = _check_input(self.chopper_system, Ei_in)
@@ -887,31 +957,35 @@ class Instrument(object):
             frac_dist = 1 - (xm / x0)
             tsmeff = tsqmod * frac_dist**2  # Effective moderator time at first chopper
             x0 -= xm  # Propagate from first chopper, not from moderator (after rescaling tmod)
-            tsqmod = tsmeff if (tsqchp[1] > tsmeff) else tsqchp[1]
+            tsqmod = np.where(tsqchp[1] > tsmeff, tsmeff, tsqchp[1])
         tsqchp = tsqchp[0]
-        tsqmodchop = np.array([tsqmod, tsqchp, x0])
+        tsqmodchop = np.array(np.broadcast_arrays(tsqmod, tsqchp, x0))
         # Propagate the time widths to the sample position
+        # (Ei and Etrans may be arrays of the same shape, for which each element is calculated separately)
         omega = self.chopper_system.frequency[0] * 2 * np.pi
         vi = E2V * np.sqrt(Ei)
         vf = E2V * np.sqrt(Ei - Etrans)
         vratio = (vi / vf) ** 3
         tanthm = np.tan(self.moderator.theta_m * np.pi / 180.0)
-        g1, g2 = tuple(1.0 - ((omega * tanthm / vi) * np.array([xa + x1, x0 - xa])))
-        f1, f2 = tuple(1.0 + (x1 / x0) * np.array([g1, g2]))
-        g1, g2, f1, f2 = tuple(np.array([g1, g2, f1, f2]) / (omega * (xa + x1)))
+        g1 = 1.0 - ((omega * tanthm / vi) * (xa + x1))
+        g2 = 1.0 - ((omega * tanthm / vi) * (x0 - xa))
+        f1, f2 = (1.0 + (x1 / x0) * g1, 1.0 + (x1 / x0) * g2)
+        g1, g2, f1, f2 = tuple(val / (omega * (xa + x1)) for val in [g1, g2, f1, f2])
         modfac = (x1 + vratio * x2) / x0
         chpfac = 1.0 + modfac
         apefac = f1 + ((vratio * x2 / x0) * g1)
-        tsqmod *= modfac**2
-        tsqchp *= chpfac**2
-        tsqjit *= chpfac**2
+        tsqmod = tsqmod * modfac**2
+        tsqchp = tsqchp * chpfac**2
+        tsqjit = tsqjit * chpfac**2
         tsqape = apefac**2 * (self.aperture_width**2 / 12.0) * SIGMA2FWHMSQ
         vsqvan = tsqmod + tsqchp + tsqjit + tsqape
         outdic = {"moderator": tsqmod, "chopper": tsqchp, "jitter": tsqjit, "aperture": tsqape}
         if self.has_detector and hasattr(self.detector, "idet"):
             phi = self.detector.phi_deg * np.pi / 180.0
-            tsqdet = (1.0 / vf) ** 2 * np.array([self.detector.getWidthSquared(Ei, en) for en in Etrans])
-            vsqvan += tsqdet
+            # a single detector width is much faster to calculate from scalars than from arrays
+            en = Etrans.item() if np.ndim(Ei) == 0 and Etrans.size == 1 else Etrans
+            tsqdet = (1.0 / vf) ** 2 * self.detector.getWidthSquared(Ei, en)
+            vsqvan = vsqvan + tsqdet
             outdic["detector"] = tsqdet
         else:
             phi = 0.0
@@ -920,7 +994,7 @@ class Instrument(object):
             bb = (-np.sin(gam) / vi) + (np.sin(gam - phi) / vf) - (f2 * np.cos(gam))
             samfac = bb - ((vratio * x2 / x0) * g2 * np.cos(gam))
             tsqsam = samfac**2 * self.sample.getWidthSquared()
-            vsqvan += tsqsam
+            vsqvan = vsqvan + tsqsam
             outdic["sample"] = tsqsam
         if frequency:
             self.chopper_system.frequency = oldfreq
@@ -25,86 +25,82 @@ def findLine(chop_times, chopDist, moderator_limits):
     chop_times: a list of the opening and closing times of the chopper within the time frame
     chopDist: a list of the distance from moderator to chopper in meters
     moderator_limits: the earliest and latest times that neutrons can leave the moderator in microseconds
+
+    Returns an array of the lines, each as [[leftM, leftC], [rightM, rightC]]
     """
-    lines = []
-    for i in range(len(chop_times)):
-        # final chopper openings
-        leftM = (-chopDist) / (moderator_limits[0] - chop_times[i][0])
-        rightM = (-chopDist) / (moderator_limits[1] - chop_times[i][1])
-        leftC = -leftM * moderator_limits[0]
-        rightC = -rightM * moderator_limits[1]
-        if leftM > 0 and rightM > 0:
-            lines.append([[leftM, leftC], [rightM, rightC]])
-    return lines
+    chop_times = np.reshape(np.asarray(chop_times, dtype=float), (-1, 2))
+    # final chopper openings
+    leftM = (-chopDist) / (moderator_limits[0] - chop_times[:, 0])
+    rightM = (-chopDist) / (moderator_limits[1] - chop_times[:, 1])
+    leftC = -leftM * moderator_limits[0]
+    rightC = -rightM * moderator_limits[1]
+    idx = (leftM > 0) & (rightM > 0)
+    return np.stack([np.stack([leftM[idx], leftC[idx]], axis=-1), np.stack([rightM[idx], rightC[idx]], axis=-1)], axis=1)
 
 
 def checkPath(chop_times, lines, chopDist, chop5Dist):
     """
     A recursive function to check for lines which can satisfy a window in the next chopper
+
+    Each line is compared with all the openings of the chopper at once, and the lines which
+    get through are returned as an array in the order of the lines, then of the openings.
     """
     if len(chop_times) > 1:
         # recursive bit
         lines = checkPath(chop_times[1:], lines, chopDist[1:], chop5Dist)
-    newLines = []
-    for line in lines:
-        # for each line check to see if there is an opening in the right time window
-        # fast first
-        earlyT = (chopDist[0] - line[0][1]) / line[0][0]
-        # then slow
-        lateT = (chopDist[0] - line[1][1]) / line[1][0]
+    lines = np.reshape(np.asarray(lines, dtype=float), (-1, 2, 2))
+    windows = np.reshape(np.asarray(chop_times[0], dtype=float), (-1, 2))
+    # for each line check to see if there is an opening in the right time window
+    # fast first
+    earlyT = ((chopDist[0] - lines[:, 0, 1]) / lines[:, 0, 0])[:, np.newaxis]
+    # then slow
+    lateT = ((chopDist[0] - lines[:, 1, 1]) / lines[:, 1, 0])[:, np.newaxis]
+
+    # then compare this time window to when this chopper is open, keep the range if it is possible
+    # (the comparisons are made for each line and each opening of this chopper)
+    chop_open = windows[np.newaxis, :, 0]
+    chop_close = windows[np.newaxis, :, 1]
+    # the chopper window is larger than the maximum possible spread, change nothing
+    keep = (chop_open < earlyT) & (chop_close > lateT)
+    # both are within the window, draw a new box
+    new_both = (chop_open > earlyT) & (chop_close < lateT)
+    # the left most range is fine but the right most is outside the window. Redefine it
+    new_right = ((chop_close < lateT) & (chop_close > earlyT)) & (chop_open < earlyT)
+    # the leftmost range is outside the chopper window
+    new_left = (chop_close > lateT) & ((chop_open > earlyT) & (chop_open < lateT))
 
-        # then compare this time window to when this chopper is open, keep the range if it is possible
-        for i in range(len(chop_times[0])):
-            if (chop_times[0][i][0] < earlyT) and (chop_times[0][i][1] > lateT):
-                # the chopper window is larger than the maximum possible spread, change nothing
-                newLines.append(line)
-            elif (chop_times[0][i][0] > earlyT) and (chop_times[0][i][1] < lateT):
-                # both are within the window, draw a new box
-                chop5_open = (chop5Dist - line[0][1]) / line[0][0]
-                leftM = (chopDist[0] - chop5Dist) / (chop_times[0][i][0] - chop5_open)
-                leftC = chop5Dist - leftM * chop5_open
-                chop5_close = (chop5Dist - line[1][1]) / line[1][0]
-                rightM = (chopDist[0] - chop5Dist) / (chop_times[0][i][1] - chop5_close)
-                rightC = chop5Dist - rightM * chop5_close
-                newLines.append([[leftM, leftC], [rightM, rightC]])
-            elif ((chop_times[0][i][1] < lateT) and (chop_times[0][i][1] > earlyT)) and (chop_times[0][i][0] < earlyT):
-                # the left most range is fine but the right most is outside the window. Redefine it
-                chop5_close = (chop5Dist - line[1][1]) / line[1][0]
-                rightM = (chopDist[0] - chop5Dist) / (chop_times[0][i][1] - chop5_close)
-                rightC = chop5Dist - rightM * chop5_close
-                newLines.append([line[0], [rightM, rightC]])
-            elif (chop_times[0][i][1] > lateT) and ((chop_times[0][i][0] > earlyT) and (chop_times[0][i][0] < lateT)):
-                # the leftmost range is outside the chopper window
-                chop5_open = (chop5Dist - line[0][1]) / line[0][0]
-                leftM = (chopDist[0] - chop5Dist) / (chop_times[0][i][0] - chop5_open)
-                leftC = chop5Dist - leftM * chop5_open
-                newLines.append([[leftM, leftC], line[1]])
-    return newLines
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chop5_open = ((chop5Dist - lines[:, 0, 1]) / lines[:, 0, 0])[:, np.newaxis]
+        leftM = (chopDist[0] - chop5Dist) / (chop_open - chop5_open)
+        leftC = chop5Dist - leftM * chop5_open
+        chop5_close = ((chop5Dist - lines[:, 1, 1]) / lines[:, 1, 0])[:, np.newaxis]
+        rightM = (chopDist[0] - chop5Dist) / (chop_close - chop5_close)
+        rightC = chop5Dist - rightM * chop5_close
+    newLines = np.repeat(lines[:, np.newaxis], windows.shape[0], axis=1)
+    left = new_both | new_left
+    newLines[left, 0, 0], newLines[left, 0, 1] = leftM[left], leftC[left]
+    right = new_both | new_right
+    newLines[right, 1, 0], newLines[right, 1, 1] = rightM[right], rightC[right]
+    return newLines[keep | new_both | new_right | new_left]
 
 
 def calcEnergy(lines, samDist):
     """
     Calculates the energies of neutrons which can pass through choppering openings.
     """
-    Ei = np.zeros(len(lines))
+    lines = np.reshape(np.asarray(lines, dtype=float), (-1, 2, 2))
     massN = 1.674927e-27
-    for i in range(len(lines)):
-        # look at the middle of the time window
-        x0 = -lines[i][0][1] / lines[i][0][0]
-        x1 = ((samDist - lines[i][0][1]) / lines[i][0][0] + (samDist - lines[i][1][1]) / lines[i][1][0]) / 2.0
-        v = samDist / (x1 - x0)
-        Ei[i] = (v * 1e6) ** 2 * massN / 2.0 / 1.60217662e-22
-    return Ei
+    # look at the middle of the time window
+    x0 = -lines[:, 0, 1] / lines[:, 0, 0]
+    x1 = ((samDist - lines[:, 0, 1]) / lines[:, 0, 0] + (samDist - lines[:, 1, 1]) / lines[:, 1, 0]) / 2.0
+    v = samDist / (x1 - x0)
+    return (v * 1e6) ** 2 * massN / 2.0 / 1.60217662e-22
 
 
 def calcRes(ei, chop_times, lastChopDist, samDist, detDist, guide, slot):
     """
     # for each incident energy work out the moderator and chopper component of the resolution
     """
-    res = []
-    percent = []
-    chwid = []
-    modwid = []
     # IMPORTANT POINT
     # The chopper opening times are the full opening, for the resolution we want FWHM
     # consequently divide each by a factor of 2 here
@@ -120,25 +116,19 @@ def calcRes(ei, chop_times, lastChopDist, samDist, detDist, guide, slot):
         flat_time = (slot - guide) * totalOpen / slot
         triangleTime = guide * totalOpen / slot / 2.0  # /2 for FWHM of the triangles
         chop_width = [(chop_times[0][1] - chop_times[0][0]) / 2.0, (flat_time + triangleTime)]
-    for energy in ei:
-        lamba = np.sqrt(81.81 / energy)
-        # this is the experimentally determined FWHM of moderator
-        mod_FWHM = -3.143 * lamba**2 + 49.28 * lamba + 0.535
-        # the effective width at chopper 1
-        mod_eff = 0.6666 * mod_FWHM
-        # when running chopper 1 slowly the moderator is smaller than the chopper speed so use that
-        if chop_width[0] > mod_eff:
-            mod_width = mod_eff
-        else:
-            mod_width = chop_width[0]
-        t_mod_chop = 252.82 * lastChopDist * lamba
-        chopRes = (2 * chop_width[1] / t_mod_chop) * ((detDist + samDist + lastChopDist) / detDist)
-        modRes = (2 * mod_width / t_mod_chop) * (1 + (samDist / detDist))
-        res.append(np.sqrt(chopRes**2 + modRes**2) * energy)
-        percent.append(np.sqrt(chopRes**2 + modRes**2))
-        chwid.append(chop_width[1])
-        modwid.append(mod_width)
-    return res, percent, chwid, modwid
+    energy = np.asarray(ei, dtype=float)
+    lamba = np.sqrt(81.81 / energy)
+    # this is the experimentally determined FWHM of moderator
+    mod_FWHM = -3.143 * lamba**2 + 49.28 * lamba + 0.535
+    # the effective width at chopper 1
+    mod_eff = 0.6666 * mod_FWHM
+    # when running chopper 1 slowly the moderator is smaller than the chopper speed so use that
+    mod_width = np.where(chop_width[0] > mod_eff, mod_eff, chop_width[0])
+    t_mod_chop = 252.82 * lastChopDist * lamba
+    chopRes = (2 * chop_width[1] / t_mod_chop) * ((detDist + samDist + lastChopDist) / detDist)
+    modRes = (2 * mod_width / t_mod_chop) * (1 + (samDist / detDist))
+    percent = np.sqrt(chopRes**2 + modRes**2)
+    return list(percent * energy), list(percent), [chop_width[1]] * len(percent), list(mod_width)
 
 
 def calcFlux(Ei, freq1, percent, slot):
@@ -268,16 +258,25 @@ def calcFlux(Ei, freq1, percent, slot):
         0.0387,
     ]
     fluxLamba = np.linspace(0.5, 11.9, num=len(fluxProf))
-    flux = []
-    lamba = lamba if hasattr(lamba, "__len__") else [lamba]
-    for j in range(len(lamba)):
-        i = (abs(fluxLamba - lamba[j])).argmin()
-        intensity = fluxProf[i]
-        if percent[j] < 0.02:
-            flux.append(5.6e4 * intensity / intRef * (slot / refSlot) * (freqRef / freq1) ** 2)
-        else:
-            flux.append(5.6e4 * intensity / intRef * (slot / refSlot) * (freqRef / freq1))
-    return flux
+    lamba = np.atleast_1d(lamba)
+    # the measured flux at the nearest wavelength in the table
+    intensity = np.asarray(fluxProf)[np.abs(fluxLamba[np.newaxis, :] - lamba[:, np.newaxis]).argmin(axis=1)]
+    freqdep = np.where(np.asarray(percent[: len(lamba)]) < 0.02, (freqRef / freq1) ** 2, (freqRef / freq1))
+    return list(5.6e4 * intensity / intRef * (slot / refSlot) * freqdep)
+
+
+def calcChopOpenTimes(freq, instrumentpars):
+    """
+    Calculates the full opening time of each chopper in microseconds, which only depends on the
+    chopper frequencies and not on the incident energy or the chopper phases.
+    freq: The frequency of each chopper
+    instrumentpars: a list of instrument parameters [see Instruments.py]
+    """
+    uSec = 1e6  # seconds to microseconds
+    slot_width, guide_width, radius, numDisk = tuple(instrumentpars[3:7])
+    # effective chopper velocity (if 2 disks effective velocity is double)
+    chopVel = 2 * np.pi * np.asarray(radius) * np.asarray(numDisk) * np.asarray(freq)
+    return uSec * (np.asarray(slot_width) + np.asarray(guide_width)) / chopVel
 
 
 def calcChopTimes(efocus, freq, instrumentpars, chop2Phase=5, phaseOffset=None):
@@ -376,10 +375,8 @@ def calcChopTimes(efocus, freq, instrumentpars, chop2Phase=5, phaseOffset=None):
     for i in range(nframe):
         t0 = i * uSec / source_rep
         lines = findLine(chop_times[-1], dist[-1], [t0, t0 + tmod])
-        lines = checkPath([np.array(ct) + t0 for ct in chop_times[0:-1]], lines, dist[:-1], dist[-1])
-        if lines:
-            for line in lines:
-                lines_all.append(line)
+        lines_all.append(checkPath([np.array(ct) + t0 for ct in chop_times[0:-1]], lines, dist[:-1], dist[-1]))
+    lines_all = np.concatenate(lines_all)
     # ok, now we know the possible neutron velocities. we now need their energies
     Ei = calcEnergy(lines_all, (dist[-1] + chop_samp))
 
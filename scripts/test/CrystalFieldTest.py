@@ -15,8 +15,10 @@ import numpy as np
 # Import mantid to setup the python paths to the bundled scripts
 import CrystalField
 from CrystalField.energies import energies
+from CrystalField.gofit_residual import GOFitResidual
 from CrystalField.normalisation import split2range
 from scipy.constants import physical_constants
+from scipy.optimize._numdiff import approx_derivative
 
 import mantid.simpleapi
 from mantid.geometry import CrystalStructure
@@ -744,6 +746,11 @@ class CrystalFieldTests(unittest.TestCase):
         self.assertAlmostEqual(y1[150], 0.87543333482970631, 8)
 
 
+def _start_point_algorithm(m, n, x0, residual, **kwargs):
+    """Stands in for a local GOFit algorithm, returning the starting point as the fitted parameters."""
+    return x0, 0
+
+
 class CrystalFieldFitTest(unittest.TestCase):
     def test_CrystalFieldFit(self):
         origin = CrystalField.CrystalField(
@@ -2043,6 +2050,68 @@ class CrystalFieldFitTest(unittest.TestCase):
 
         self.assertLess(cf.chi2, chi2)
 
+    def _make_gofit_test_data(self):
+        origin = CrystalField.CrystalField(
+            "Ce", "C2v", B20=0.37737, B22=3.9770, B40=-0.031787, B42=-0.11611, B44=-0.12544, Temperature=44.0, FWHM=1.1
+        )
+        ws = CrystalField.fitting.makeWorkspace(*origin.getSpectrum())
+        cf = CrystalField.CrystalField("Ce", "C2v", B20=0.37, B22=3.97, B40=-0.0317, B42=-0.116, B44=-0.12, Temperature=44.0, FWHM=1.0)
+        return cf, ws
+
+    def test_gofit_residual_jacobian_matches_approx_derivative(self):
+        cf, ws = self._make_gofit_test_data()
+        residual = GOFitResidual(cf.function, ["B20", "B40"], ws.readX(0), ws.readY(0), ws.readE(0))
+        params = np.array([0.37, -0.0317])
+
+        expected = approx_derivative(residual, params, method="2-point")
+        residual(params)
+        evaluations = residual.number_of_evaluations
+        jacobian = residual.jacobian(params)
+
+        np.testing.assert_allclose(jacobian, expected)
+        # the residual at params is reused, so only the shifted parameters are evaluated
+        self.assertEqual(residual.number_of_evaluations - evaluations, 2)
+        self.assertAlmostEqual(cf.function.getParameterValue("B40"), -0.0317)
+
+    def test_gofit_multistart_keeps_the_best_starting_point(self):
+        cf, ws = self._make_gofit_test_data()
+        fit = CrystalField.CrystalFieldFit(cf, InputWorkspace=ws, Output="gofit_test")
+        parameter_bounds = {"B20": (0.3, 0.4), "B22": (3.9, 4.0), "B40": (-0.04, -0.03), "B42": (-0.12, -0.11), "B44": (-0.13, -0.12)}
+        parameter_bounds.update({"IntensityScaling": (0.9, 1.1), "FWHM": (1.0, 1.2)})
+
+        results = fit.gofit_multistart(_start_point_algorithm, parameter_bounds, seeds=3, workers=1, random_seed=0)
+
+        self.assertEqual(len(results), 3)
+        best = min(results, key=lambda result: result["cost"])
+        np.testing.assert_allclose(best["parameters"], best["start"])
+        self.assertTrue(all(result["time"] >= 0.0 for result in results))
+        self.assertTrue(mtd.doesExist("gofit_test_multistart__start_point_algorithm_parameters"))
+        seed_table = mtd["gofit_test_multistart__start_point_algorithm_seeds"]
+        self.assertEqual(seed_table.rowCount(), 3)
+        np.testing.assert_allclose(seed_table.column("Cost"), [result["cost"] for result in results])
+
+    def test_gofit_multistart_fits_starting_points_in_worker_processes(self):
+        cf, ws = self._make_gofit_test_data()
+        fit = CrystalField.CrystalFieldFit(cf, InputWorkspace=ws, Output="gofit_test")
+        parameter_bounds = {"B20": (0.3, 0.4), "B22": (3.9, 4.0), "B40": (-0.04, -0.03), "B42": (-0.12, -0.11), "B44": (-0.13, -0.12)}
+        parameter_bounds.update({"IntensityScaling": (0.9, 1.1), "FWHM": (1.0, 1.2)})
+
+        results = fit.gofit_multistart(_start_point_algorithm, parameter_bounds, seeds=2, workers=2, random_seed=0)
+        serial_results = fit.gofit_multistart(_start_point_algorithm, parameter_bounds, seeds=2, workers=1, random_seed=0)
+
+        self.assertEqual(len(results), 2)
+        for result, serial_result in zip(results, serial_results):
+            np.testing.assert_allclose(result["parameters"], result["start"])
+            np.testing.assert_allclose(result["start"], serial_result["start"])
+            self.assertAlmostEqual(result["cost"], serial_result["cost"])
+
+    def test_gofit_multistart_needs_at_least_one_starting_point(self):
+        cf, ws = self._make_gofit_test_data()
+        fit = CrystalField.CrystalFieldFit(cf, InputWorkspace=ws, Output="gofit_test")
+
+        with self.assertRaises(ValueError):
+            fit.gofit_multistart(_start_point_algorithm, {}, seeds=0, workers=1)
+
     def test_matrix_components_equal_to_summed_matrix(self):
         cf = CrystalField.CrystalField("Ce", "C2v", B20=0.035, B40=-0.012, B43=-0.027, B60=-0.00012, B63=0.0025, B66=0.0068)
         with self.assertRaises(Exception):
@@ -6,6 +6,7 @@
 # SPDX - License - Identifier: GPL - 3.0 +
 import unittest
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import Direct.dgreduce as dgreduce
 from Direct.DirectEnergyConversion import DirectEnergyConversion
@@ -123,6 +124,40 @@ class DirectEnergyConversionTest(unittest.TestCase):
         # this is strange feature.
         self.assertEqual(len(tReducer.prop_man.save_format), 2)
 
+    def test_save_nxspe_prepared_without_renaming_workspace(self):
+        tReducer = self.reducer
+        tws = CreateSampleWorkspace(
+            Function="Flat background", NumBanks=1, BankPixelWidth=1, NumEvents=10, XUnit="DeltaE", XMin=-10, XMax=10, BinWidth=0.1
+        )
+        tws = RenameWorkspace(tws, OutputWorkspace="save_nxspe_test_ws#1/2")
+
+        save_operations = tReducer._prepare_save_operations(tws, "save_nxspe_test_file", ["nxspe"])
+        # the operations could now run in the background, while the reduction keeps using the workspace
+        self.assertIn("save_nxspe_test_ws#1/2", mtd)
+        for save_operation in save_operations:
+            save_operation()
+
+        self.assertIn("save_nxspe_test_ws#1/2", mtd)
+        self.assertNotIn("save_nxspe_test_ws#1of2", mtd)
+        file = FileFinder.getFullPath("save_nxspe_test_file.nxspe")
+        self.assertGreater(len(file), 0)
+        os.remove(file)
+
+    def test_wait_for_saves_reports_all_failed_saves(self):
+        def failed_save():
+            raise RuntimeError("save failed")
+
+        save_futures = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for ei_guess, save in [(10, failed_save), (20, lambda: 0.5), (30, failed_save)]:
+                save_futures.append(({"ei_guess": ei_guess}, executor.submit(save)))
+
+        save_errors = self.reducer._wait_for_saves(save_futures)
+
+        self.assertEqual([str(err) for err in save_errors], ["save failed", "save failed"])
+        self.assertEqual(save_futures[1][0]["save"], 0.5)
+        self.assertNotIn("save", save_futures[0][0])
+
     def test_diagnostics_wb(self):
         wb_ws = CreateSampleWorkspace(NumBanks=1, BankPixelWidth=4, NumEvents=10000)
         LoadInstrument(wb_ws, InstrumentName="MARI", RewriteSpectraMap=True)
@@ -438,6 +473,13 @@ class DirectEnergyConversionTest(unittest.TestCase):
         self.assertAlmostEqual(x[0], -2 * 122.0)
         self.assertAlmostEqual(x[-1], 0.8 * 122.0)
 
+        # the time taken by each stage is recorded for each incident energy
+        self.assertEqual([timings["ei_guess"] for timings in tReducer._ei_timings], [67.0, 122.0])
+        for timings in tReducer._ei_timings:
+            for stage in ["tof_range", "conversion", "abs_units", "post_processing", "save"]:
+                self.assertGreaterEqual(timings[stage], 0)
+        self.assertEqual(tReducer._multirep_ei_cache, {})
+
         # test another ws
         # rename samples from previous workspace to avoid deleting them on current run
         for ind, item in enumerate(result):
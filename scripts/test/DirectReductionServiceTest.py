@@ -0,0 +1,105 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from mantid.api import mtd
+from mantid.simpleapi import CreateSampleWorkspace
+
+from Direct.ReductionService import ReductionService
+from Direct.ReductionWrapper import ReductionWrapper
+
+
+class ServiceTestReduction(ReductionWrapper):
+    def __init__(self, web_var=None):
+        ReductionWrapper.__init__(self, "MAR", web_var)
+
+    def reduce(self, input_file=None, output_directory=None):
+        self.reducer.prop_man.sample_run = input_file
+
+
+class DirectReductionServiceTest(unittest.TestCase):
+    def setUp(self):
+        self._queue_dir = TemporaryDirectory()
+        self.reduction = ServiceTestReduction()
+        self.service = ReductionService(self.reduction, self._queue_dir.name, poll_interval=0)
+
+    def tearDown(self):
+        self.reduction.reducer.prop_man.mask_run = None
+        self._queue_dir.cleanup()
+        mtd.clear()
+
+    def _add_request(self, name, run, mod_time):
+        file_name = os.path.join(self._queue_dir.name, name)
+        with open(file_name, "w") as fh:
+            fh.write(run)
+        os.utime(file_name, (mod_time, mod_time))
+        return file_name
+
+    def _queued_files(self, subdir):
+        return sorted(os.listdir(os.path.join(self._queue_dir.name, subdir)))
+
+    def test_requests_are_reduced_in_the_order_they_were_written(self):
+        self._add_request("b", "11002", 2000)
+        self._add_request("a", "11001", 3000)
+        self._add_request("c", "11003", 1000)
+
+        with mock.patch.object(self.reduction, "reduce") as reduce:
+            self.assertEqual(self.service.process_queue(), 3)
+
+        self.assertEqual([call[0][0] for call in reduce.call_args_list], ["11003", "11002", "11001"])
+        self.assertEqual(self._queued_files(ReductionService.PROCESSED_DIR), ["a", "b", "c"])
+        self.assertEqual(self.service.pending_requests(), [])
+        self.assertEqual(sorted(self.service.reduction_times.keys()), ["11001", "11002", "11003"])
+
+    def test_hidden_requests_are_ignored(self):
+        self._add_request(".incomplete", "11001", 1000)
+
+        self.assertEqual(self.service.pending_requests(), [])
+
+    def test_failed_reduction_does_not_stop_the_service(self):
+        self._add_request("a", "11001", 1000)
+        self._add_request("b", "11002", 2000)
+        self._add_request("empty", "", 3000)
+
+        with mock.patch.object(self.reduction, "reduce", side_effect=[RuntimeError("reduction failed"), None]) as reduce:
+            self.assertEqual(self.service.serve(max_requests=3), 3)
+
+        self.assertEqual(reduce.call_count, 2)
+        self.assertEqual(self._queued_files(ReductionService.FAILED_DIR), ["a", "empty"])
+        self.assertEqual(self._queued_files(ReductionService.PROCESSED_DIR), ["b"])
+
+    def test_masks_depending_on_the_sample_run_are_not_kept(self):
+        reducer = self.reduction.reducer
+        reducer.spectra_masks = CreateSampleWorkspace(OutputWorkspace="masks")
+
+        self.service.reduce_run("11001")
+
+        self.assertFalse(reducer._keep_spectra_masks)
+        self.assertIsNone(reducer.spectra_masks)
+        self.assertNotIn("masks", mtd)
+
+    def test_masks_are_kept_until_what_they_depend_on_changes(self):
+        reducer = self.reduction.reducer
+        reducer.prop_man.mask_run = 11060
+        self.service.reduce_run("11001")
+        self.assertTrue(reducer._keep_spectra_masks)
+
+        reducer.spectra_masks = CreateSampleWorkspace(OutputWorkspace="masks")
+        self.service.reduce_run("11002")
+        self.assertEqual(reducer.spectra_masks.name(), "masks")
+
+        reducer.prop_man.wb_run = 11061
+        self.service.reduce_run("11003")
+        self.assertIsNone(reducer.spectra_masks)
+        self.assertTrue(reducer._keep_spectra_masks)
+
+
+if __name__ == "__main__":
+    unittest.main()
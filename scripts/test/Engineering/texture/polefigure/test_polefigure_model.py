@@ -8,7 +8,13 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import numpy as np
-from Engineering.texture.polefigure.polefigure_model import TextureProjection
+from scipy.interpolate import griddata
+from Engineering.texture.polefigure.polefigure_model import (
+    TextureProjection,
+    PoleFigureGeometry,
+    get_contour_grid,
+    get_nearest_contour_grid_indices,
+)
 
 correction_model_path = "Engineering.texture.polefigure.polefigure_model"
 
@@ -86,12 +92,81 @@ class TextureProjectionTest(unittest.TestCase):
         def get_column(col):
             return col_data.get(col)
 
-        mock_ws.column.side_effect = get_column
+        mock_ws.columnArray.side_effect = get_column
         mock_ads.retrieve.return_value = mock_ws
 
         result = self.model.get_pole_figure_data("ws", "stereographic")
         self.assertEqual(result.shape[1], 3)
 
+    @staticmethod
+    def _mock_pole_figure_table(col_data):
+        mock_ws = MagicMock()
+        mock_ws.getColumnNames.return_value = list(col_data.keys())
+        mock_ws.columnArray.side_effect = lambda col: col_data[col]
+        return mock_ws
+
+    @patch(correction_model_path + ".ADS")
+    def test_geometry_is_shared_by_tables_with_the_same_poles(self, mock_ads):
+        alphas, betas = np.array([0.1, 0.2]), np.array([0.3, 0.4])
+        tables = {
+            "I_table": self._mock_pole_figure_table({"Beta": betas, "Alpha": alphas, "I": np.array([1.0, 2.0])}),
+            "X0_table": self._mock_pole_figure_table({"Beta": betas, "Alpha": alphas, "X0": np.array([3.0, 4.0])}),
+            "other_table": self._mock_pole_figure_table({"Beta": betas + 0.1, "Alpha": alphas, "I": np.array([1.0, 2.0])}),
+        }
+        mock_ads.retrieve.side_effect = lambda name: tables[name]
+
+        geometry, i = self.model.get_pole_figure_geometry_and_values("I_table", "I")
+        x0_geometry, x0 = self.model.get_pole_figure_geometry_and_values("X0_table", "X0")
+        other_geometry, _ = self.model.get_pole_figure_geometry_and_values("other_table", "I")
+
+        self.assertIs(geometry, x0_geometry)
+        self.assertIsNot(geometry, other_geometry)
+        np.testing.assert_array_equal(i, [1.0, 2.0])
+        np.testing.assert_array_equal(x0, [3.0, 4.0])
+
+    def test_geometry_caches_projections_and_contour_grid_indices(self):
+        geometry = PoleFigureGeometry(np.array([0.1, 0.2, 1.0]), np.array([0.3, 0.4, 1.2]))
+
+        projected = geometry.get_projection("Stereographic")
+        grid_indices = geometry.get_contour_grid_indices("stereographic")
+
+        self.assertIs(geometry.get_projection("stereographic"), projected)
+        self.assertIs(geometry.get_contour_grid_indices("Stereographic"), grid_indices)
+        self.assertEqual(projected.shape, (3, 2))
+        self.assertIsNot(geometry.get_projection("azimuthal"), projected)
+
+    def test_nearest_contour_grid_indices_match_griddata(self):
+        rng = np.random.default_rng(0)
+        x, y, z = rng.uniform(-1, 1, 50), rng.uniform(-1, 1, 50), rng.uniform(0, 1, 50)
+        grid_x, grid_y = get_contour_grid()
+
+        grid_z = z[get_nearest_contour_grid_indices(x, y)]
+
+        np.testing.assert_array_equal(grid_z, griddata((x, y), z, (grid_x, grid_y), method="nearest"))
+
+    @patch(correction_model_path + ".TextureProjection._save_files")
+    @patch(correction_model_path + ".CreateEmptyTableWorkspace")
+    @patch(correction_model_path + ".CreatePoleFigureTableWorkspace")
+    @patch(correction_model_path + ".ADS")
+    def test_make_pole_figure_tables_combines_all_tables_at_once(self, mock_ads, mock_create_pf_table, mock_create_table, mock_save):
+        tables = {
+            "_0_abi_table": self._mock_pole_figure_table({"Beta": np.array([0.1]), "Alpha": np.array([0.2]), "I": np.array([1.0])}),
+            "_1_abi_table": self._mock_pole_figure_table(
+                {"Beta": np.array([0.3, 0.5]), "Alpha": np.array([0.4, 0.6]), "I": np.array([2.0, 3.0])}
+            ),
+        }
+        mock_ads.retrieve.side_effect = lambda name: tables[name]
+        mock_table = MagicMock()
+        mock_create_table.return_value = mock_table
+
+        self.model.make_pole_figure_tables(["ws1", "ws2"], ["param1", "param2"], "out_ws", None, False, [0, 0, 0], 0.0, 0.0, ["/tmp"])
+
+        self.assertEqual(mock_create_pf_table.call_count, 2)
+        mock_create_table.assert_called_once_with(OutputWorkspace="out_ws")
+        self.assertEqual([c.kwargs["name"] for c in mock_table.addColumn.call_args_list], ["Beta", "Alpha", "I"])
+        self.assertEqual([c.args[0] for c in mock_table.addRow.call_args_list], [[0.1, 0.2, 1.0], [0.3, 0.4, 2.0], [0.5, 0.6, 3.0]])
+        mock_save.assert_called_once_with("out_ws", ["/tmp"])
+
     @patch(correction_model_path + ".ADS")
     def test_get_pf_table_name_with_hkl(self, mock_ads):
         mock_ads.retrieve.return_value = self.mock_ws
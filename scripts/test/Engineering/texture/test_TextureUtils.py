@@ -190,7 +190,7 @@ class TextureUtilsTest(unittest.TestCase):
         expected_first_fit_kwargs = {
             "Function": expected_func,
             "CostFunction": "Least squares",
-            "Output": "first_fit",
+            "Output": f"{prefix}{run_number}_{peak}_{group}_Fit_Parameters_first_fit",
             "MaxIterations": 50,
             "InputWorkspace": wsname,
             "Minimizer": "Levenberg-Marquardt",
@@ -202,7 +202,7 @@ class TextureUtilsTest(unittest.TestCase):
         expected_fit_kwargs = {
             "Function": expected_func,
             "CostFunction": "Least squares",
-            "Output": "fit",
+            "Output": f"{prefix}{run_number}_{peak}_{group}_Fit_Parameters_fit",
             "MaxIterations": 50,
             "InputWorkspace": wsname,
             "Minimizer": "Levenberg-Marquardt",
@@ -242,7 +242,9 @@ class TextureUtilsTest(unittest.TestCase):
             "expected_intensity_sub_bkg": expected_intensity_sub_bkg,
         }
 
-    def setup_fit_mocks_from_expected_results(self, repeated_expected_results, mock_peak_func_gen_cls, mock_ads, mock_intens_sigma):
+    def setup_fit_mocks_from_expected_results(
+        self, repeated_expected_results, mock_peak_func_gen_cls, mock_ads, mock_intens_sigma, mock_fit
+    ):
         # mock ws information retrieval
         mock_ws = MagicMock()
         mock_ws.getNumberHistograms.side_effect = [er["num_spec"] for er in repeated_expected_results]
@@ -267,8 +269,9 @@ class TextureUtilsTest(unittest.TestCase):
             mock_get_name() if name == "Name" else mock_get_val() if name == "Value" else mock_get_err()
         )
 
-        # mock ADS calls (first to get ws, then to get parameter table)
-        mock_ads.retrieve.side_effect = [mock_ws, mock_param_ws] * len(repeated_expected_results)
+        # mock ADS calls to get ws and parameter table from the final fit
+        mock_ads.retrieve.return_value = mock_ws
+        mock_fit.return_value.OutputParameters = mock_param_ws
         mock_intens_sigma.return_value = (None, np.ones(30), None)
         return mock_ws, mock_param_ws, mock_peak_func_gen_cls, mock_ads
 
@@ -304,7 +307,9 @@ class TextureUtilsTest(unittest.TestCase):
         expected_results = self.setup_expected_fit_results(wsname, prefix, run_number, group, peak, num_spec, save_dir)
 
         # SETUP TEST
-        mocks = self.setup_fit_mocks_from_expected_results((expected_results,), mock_peak_func_gen_cls, mock_ads, mock_intens_sigma)
+        mocks = self.setup_fit_mocks_from_expected_results(
+            (expected_results,), mock_peak_func_gen_cls, mock_ads, mock_intens_sigma, mock_fit
+        )
         mock_ws, mock_param_ws, mock_peak_func_gen_cls, mock_ads = mocks
         mock_get_run_prefix.return_value = (run_number, prefix)
         mock_get_group.return_value = group
@@ -361,7 +366,7 @@ class TextureUtilsTest(unittest.TestCase):
                 expected = self.setup_expected_fit_results(wsname, prefix, run_number, group, peak, num_spec, save_dir)
                 all_expected.append(expected)
 
-        mocks = self.setup_fit_mocks_from_expected_results(all_expected, mock_peak_func_gen_cls, mock_ads, mock_intens_sigma)
+        mocks = self.setup_fit_mocks_from_expected_results(all_expected, mock_peak_func_gen_cls, mock_ads, mock_intens_sigma, mock_fit)
         mock_ws, mock_param_ws, mock_peak_func_gen_cls, mock_ads = mocks
         mock_get_run_prefix.side_effect = [(run_number, prefix) for run_number in runs]
         mock_get_group.side_effect = [group for _ in runs]
@@ -382,7 +387,49 @@ class TextureUtilsTest(unittest.TestCase):
 
         mock_create_tab_ws.assert_has_calls(expected_create_calls, any_order=True)
         mock_fit.assert_has_calls(expected_fit_calls, any_order=True)
-        mock_save_nexus.assert_has_calls(expected_save_calls, any_order=False)
+        mock_save_nexus.assert_has_calls(expected_save_calls, any_order=True)
+
+    @patch(f"{texture_utils_path}.logger")
+    @patch(f"{texture_utils_path}.SaveNexus")
+    @patch(f"{texture_utils_path}.CreateEmptyTableWorkspace")
+    @patch(f"{texture_utils_path}.calc_intens_and_sigma_arrays")
+    @patch(f"{texture_utils_path}.Fit")
+    @patch(f"{texture_utils_path}._get_grouping_from_ws_log")
+    @patch(f"{texture_utils_path}._get_run_and_prefix_from_ws_log")
+    @patch(f"{texture_utils_path}.ADS")
+    @patch(f"{texture_utils_path}.TexturePeakFunctionGenerator")
+    def test_fit_all_peaks_continues_after_failed_fit(
+        self,
+        mock_peak_func_gen_cls,
+        mock_ads,
+        mock_get_run_prefix,
+        mock_get_group,
+        mock_fit,
+        mock_intens_sigma,
+        mock_create_tab_ws,
+        mock_save_nexus,
+        mock_logger,
+    ):
+        wsname = "TEST000101_ws"
+        peaks = [1.0, 2.0]
+        all_expected = [self.setup_expected_fit_results(wsname, "TEST", "000101", "TestGroup", peak, 2, "save") for peak in peaks]
+        self.setup_fit_mocks_from_expected_results(all_expected, mock_peak_func_gen_cls, mock_ads, mock_intens_sigma, mock_fit)
+        mock_get_run_prefix.return_value = ("000101", "TEST")
+        mock_get_group.return_value = "TestGroup"
+        fit_return = mock_fit.return_value
+
+        def fit(**kwargs):
+            if kwargs["Output"].startswith("TEST000101_1.0_"):
+                raise RuntimeError("Fit failed")
+            return fit_return
+
+        mock_fit.side_effect = fit
+
+        fit_all_peaks(wss=[wsname], peaks=peaks, peak_window=0.1, save_dir="save", override_dir=True, max_workers=1)
+
+        mock_save_nexus.assert_called_once_with(**all_expected[1]["expected_save_kwargs"])
+        mock_ads.remove.assert_any_call("TEST000101_1.0_TestGroup_Fit_Parameters")
+        mock_logger.error.assert_called_once_with("1 of 2 peak fits failed: TEST000101_ws (1.0)")
 
     def test_make_iterable_wraps_scalar(self):
         self.assertEqual(make_iterable("val"), ["val"])
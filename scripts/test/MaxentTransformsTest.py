@@ -0,0 +1,108 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import threading
+import unittest
+
+import numpy as np
+
+from Muon.MaxentTools.opus import OPUS
+from Muon.MaxentTools.transforms import MaxentTransforms, get_transforms
+from Muon.MaxentTools.tropus import TROPUS
+
+
+def _opus_loop(x, i2, convol, a, b, e):
+    """OPUS written as explicit loops over the time points, groups and frequencies"""
+    npts, ngroups = e.shape[0], a.shape[0]
+    ox = np.zeros([npts, ngroups])
+    for j in range(npts):
+        y = 0.0j
+        for k in range(x.shape[0]):
+            y += x[k] * convol[k] * np.exp(2.0j * np.pi * j * k / i2)
+        for g in range(ngroups):
+            ox[j, g] = (y.real * a[g] + y.imag * b[g]) * e[j]
+    return ox
+
+
+def _tropus_loop(ox, i2, convol, a, b, e):
+    """TROPUS written as explicit loops over the frequencies, time points and groups"""
+    npts, ngroups = ox.shape
+    x = np.zeros([convol.shape[0]])
+    for k in range(convol.shape[0]):
+        y = 0.0j
+        for j in range(npts):
+            for g in range(ngroups):
+                y += ox[j, g] * (a[g] + 1.0j * b[g]) * e[j] * np.exp(-2.0j * np.pi * j * k / i2)
+        x[k] = y.real * convol[k].real + y.imag * convol[k].imag
+    return x
+
+
+class MaxentTransformsTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(seed=42)
+        self.i2, n, npts, ngroups = 32, 12, 20, 3
+        self.convol = rng.random(n) + 1.0j * rng.random(n)
+        self.a = rng.random(ngroups)
+        self.b = rng.random(ngroups)
+        self.e = rng.random(npts)
+        self.spectra = rng.random([n, 2])
+        self.ox = rng.random([npts, ngroups])
+        self.transforms = MaxentTransforms(self.i2, self.convol, self.a, self.b, self.e)
+        self.args = (self.i2, self.convol, self.a, self.b, self.e)
+
+    def test_opus_matches_previous_implementation(self):
+        for x in self.spectra.T:
+            ox = self.transforms.opus(x)
+
+            np.testing.assert_array_equal(ox, OPUS(x, *self.args))
+            np.testing.assert_allclose(ox, _opus_loop(x, *self.args), rtol=1e-12, atol=1e-12)
+
+    def test_opus_of_several_spectra_matches_each_spectrum(self):
+        ox = self.transforms.opus(self.spectra)
+
+        self.assertEqual(ox.shape, (self.e.shape[0], self.a.shape[0], 2))
+        for index, x in enumerate(self.spectra.T):
+            np.testing.assert_array_equal(ox[:, :, index], OPUS(x, *self.args))
+
+    def test_tropus_matches_previous_implementation(self):
+        x = self.transforms.tropus(self.ox)
+
+        np.testing.assert_array_equal(x, TROPUS(self.ox, *self.args))
+        np.testing.assert_allclose(x, _tropus_loop(self.ox, *self.args), rtol=1e-12, atol=1e-12)
+
+    def test_buffers_are_reused_without_changing_results(self):
+        first = self.transforms.opus(self.spectra[:, 0]).copy()
+        self.transforms.opus(self.spectra)
+        self.transforms.tropus(self.ox)
+
+        np.testing.assert_array_equal(self.transforms.opus(self.spectra[:, 0]), first)
+
+    def test_runs_of_a_batch_share_the_transforms(self):
+        first = get_transforms(*self.args)
+        a, b = self.a[::-1].copy(), 2.0 * self.b
+        second = get_transforms(self.i2, self.convol, a, b, self.e)
+
+        self.assertIs(second, first)
+        np.testing.assert_array_equal(second.opus(self.spectra[:, 0]), OPUS(self.spectra[:, 0], self.i2, self.convol, a, b, self.e))
+        np.testing.assert_array_equal(second.tropus(self.ox), TROPUS(self.ox, self.i2, self.convol, a, b, self.e))
+
+    def test_transforms_of_other_shapes_or_threads_are_not_shared(self):
+        first = get_transforms(*self.args)
+        self.assertIsNot(get_transforms(2 * self.i2, self.convol, self.a, self.b, self.e), first)
+        self.assertIsNot(get_transforms(self.i2, self.convol[:-1], self.a, self.b, self.e), first)
+        self.assertIsNot(get_transforms(self.i2, self.convol, self.a, self.b, self.e[:-1]), first)
+
+        main_thread = get_transforms(*self.args)
+        in_thread = []
+        thread = threading.Thread(target=lambda: in_thread.append(get_transforms(*self.args)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(in_thread[0], main_thread)
+        self.assertIs(get_transforms(*self.args), main_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
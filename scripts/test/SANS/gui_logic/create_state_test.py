@@ -4,12 +4,15 @@
 #   NScD Oak Ridge National Laboratory, European Spallation Source,
 #   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
 # SPDX - License - Identifier: GPL - 3.0 +
+import os
 import unittest
+from tempfile import TemporaryDirectory
 
 from unittest import mock
+from mantid.kernel import ConfigService
 from sans.common.enums import SANSFacility
 from sans.gui_logic.models.RowEntries import RowEntries
-from sans.gui_logic.models.create_state import create_states
+from sans.gui_logic.models.create_state import create_states, RowStateCache
 from sans.gui_logic.models.state_gui_model import StateGuiModel
 from sans.state.AllStates import AllStates
 
@@ -52,10 +55,111 @@ class GuiCommonTest(unittest.TestCase):
 
         self.assertEqual(len(states), 1)
         self.gui_state_director_instance.create_state.assert_called_once_with(
-            mock_row_entry, file_lookup=mock.ANY, row_user_file=expected_user_file
+            mock_row_entry, file_lookup=mock.ANY, row_user_file=expected_user_file, file_information=mock.ANY
         )
         thickness_mock.assert_called()
 
 
+@mock.patch("sans.gui_logic.models.create_state._get_thickness_for_row")
+@mock.patch.object(RowEntries, "file_information", new_callable=mock.PropertyMock)
+class RowStateCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.state_gui_model = StateGuiModel(AllStates())
+        self.rows = [RowEntries(sample_scatter="LOQ74044"), RowEntries(sample_scatter="LOQ74045")]
+        self.cache = RowStateCache()
+
+        self.gui_state_director_instance = mock.MagicMock()
+        self.gui_state_director_instance.create_state.side_effect = lambda *args, **kwargs: StateGuiModel(AllStates())
+        self.patcher = mock.patch("sans.gui_logic.models.create_state.GuiStateDirector")
+        self.addCleanup(self.patcher.stop)
+        self.gui_state_director = self.patcher.start()
+        self.gui_state_director.return_value = self.gui_state_director_instance
+
+    def _create_states(self, rows=None):
+        return create_states(self.state_gui_model, SANSFacility.ISIS, row_entries=rows or self.rows, state_cache=self.cache)
+
+    def test_unchanged_rows_are_not_recreated(self, *_):
+        self._create_states()
+        states, errors = self._create_states()
+
+        self.assertEqual(len(states), 2)
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 2)
+
+    def test_only_changed_row_is_recreated(self, *_):
+        self._create_states()
+        self.rows[1].sample_transmission = "LOQ74046"
+        self._create_states()
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 3)
+        self.assertIs(self.gui_state_director_instance.create_state.call_args[0][0], self.rows[1])
+
+    def test_changed_options_recreates_row(self, *_):
+        self._create_states()
+        self.rows[0].options.set_user_options("WavelengthMin=1.5")
+        self._create_states()
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 3)
+
+    def test_changed_settings_recreates_all_rows(self, *_):
+        self._create_states()
+        self.state_gui_model.wavelength_min = 3.0
+        self._create_states()
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 4)
+
+    def test_changed_search_directories_recreates_all_rows(self, *_):
+        search_directories = ConfigService["datasearch.directories"]
+        self.addCleanup(ConfigService.setString, "datasearch.directories", search_directories)
+
+        self._create_states()
+        ConfigService["datasearch.directories"] = search_directories + ";" + os.getcwd()
+        self._create_states()
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 4)
+
+    def test_modified_data_file_recreates_row(self, *_):
+        with TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, "LOQ74044.nxs")
+            with open(data_file, "w") as f:
+                f.write("data")
+
+            with mock.patch("sans.gui_logic.models.create_state.find_sans_file", return_value=data_file):
+                self._create_states([self.rows[0]])
+                self._create_states([self.rows[0]])
+                self.assertEqual(self.gui_state_director_instance.create_state.call_count, 1)
+
+                with open(data_file, "a") as f:
+                    f.write("more data")
+                self._create_states([self.rows[0]])
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 2)
+
+    def test_rows_with_user_file_are_always_recreated(self, *_):
+        self.rows[0].user_file = "MaskLOQData.txt"
+        self._create_states()
+        self._create_states()
+
+        self.assertEqual(self.gui_state_director_instance.create_state.call_count, 3)
+
+    def test_cached_states_are_copies(self, *_):
+        states, _ = self._create_states()
+        states[self.rows[0]].wavelength_min = 5.0
+
+        cached_states, _ = self._create_states()
+
+        self.assertIsNot(cached_states[self.rows[0]], states[self.rows[0]])
+        self.assertNotEqual(cached_states[self.rows[0]].wavelength_min, 5.0)
+
+    def test_states_are_returned_in_row_order_when_created_in_parallel(self, *_):
+        rows = [RowEntries(sample_scatter="LOQ{}".format(74044 + i)) for i in range(10)]
+        self.gui_state_director_instance.create_state.side_effect = lambda row, **kwargs: row.sample_scatter
+
+        with mock.patch("sans.gui_logic.models.create_state.PARALLEL_ROW_THRESHOLD", 2):
+            states, errors = create_states(self.state_gui_model, SANSFacility.ISIS, row_entries=rows)
+
+        self.assertEqual(list(errors.keys()), rows)
+        self.assertEqual(list(errors.values()), [row.sample_scatter for row in rows])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -167,6 +167,51 @@ class JsonSerializerTest(unittest.TestCase):
         self.assertEqual(state_2.float_parameter, 23.0)
         self.assertEqual(state_2.positive_float_with_none_parameter, 234.0)
 
+    def test_that_deserialized_states_are_independent_copies(self):
+        serialized = Serializer.to_json(ComplexState())
+
+        state_1 = Serializer.from_json(serialized)
+        state_1.sub_state_1.float_list_parameter.append(1.0)
+        state_1.float_parameter = 1.0
+        state_2 = Serializer.from_json(serialized)
+
+        self.assertIsNot(state_1, state_2)
+        self.assertEqual(state_2.float_parameter, 23.0)
+        self.assertEqual(state_2.sub_state_1.float_list_parameter, [123.0, 234.0])
+
+    def test_that_changed_state_is_serialized_again(self):
+        state = ComplexState()
+        serialized = Serializer.to_json(state)
+        self.assertEqual(Serializer.to_json(state), serialized)
+
+        state.sub_state_1.sub_state_very_simple.string_parameter = "changed"
+        serialized_after_change = Serializer.to_json(state)
+
+        self.assertNotEqual(serialized_after_change, serialized)
+        self.assertEqual(Serializer.from_json(serialized_after_change).sub_state_1.sub_state_very_simple.string_parameter, "changed")
+
+    def test_that_deserialized_state_matches_json_when_serialized_state_contains_tuples(self):
+        state = SimpleState()
+        state.float_list_parameter = (1.0, 2.0)
+
+        state_2 = Serializer.from_json(Serializer.to_json(state))
+
+        self.assertEqual(state_2.float_list_parameter, [1.0, 2.0])
+
+    def test_that_state_which_cannot_be_pickled_is_serialized(self):
+        class LocalState(metaclass=JsonSerializable):
+            # Classes which cannot be imported by name cannot be pickled
+            def __init__(self):
+                self.string_parameter = "test_in_local_state"
+
+        state = SimpleState()
+        state.sub_state_very_simple = LocalState()
+
+        state_2 = Serializer.from_json(Serializer.to_json(state))
+
+        self.assertEqual(state_2.sub_state_very_simple.string_parameter, "test_in_local_state")
+        self.assertEqual(state_2.float_list_parameter, [123.0, 234.0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,88 @@
+# Mantid Repository : https://github.com/mantidproject/mantid
+#
+# Copyright &copy; 2025 ISIS Rutherford Appleton Laboratory UKRI,
+#   NScD Oak Ridge National Laboratory, European Spallation Source,
+#   Institut Laue - Langevin & CSNS, Institute of High Energy Physics, CAS
+# SPDX - License - Identifier: GPL - 3.0 +
+import threading
+import time
+import unittest
+
+from SCDRunScheduler import RunScheduler
+
+
+class SCDRunSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.messages = []
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def _reduce(self, run):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01 * (run % 3))
+        with self.lock:
+            self.running -= 1
+        return run * 10
+
+    def test_results_are_returned_in_run_order(self):
+        runs = list(range(1, 10))
+        scheduler = RunScheduler(4, report=self.messages.append)
+
+        results = scheduler.run(runs, self._reduce)
+
+        self.assertEqual(list(results.keys()), runs)
+        self.assertEqual(list(results.values()), [run * 10 for run in runs])
+        self.assertLessEqual(self.max_running, 4)
+        self.assertEqual(sum(message.startswith("Finished run") for message in self.messages), len(runs))
+
+    def test_runs_are_limited_by_memory(self):
+        scheduler = RunScheduler(4, memory_limit=2.5, report=self.messages.append)
+
+        results = scheduler.run(list(range(1, 9)), self._reduce, memory_estimate=lambda run: 1.0)
+
+        self.assertEqual(len(results), 8)
+        self.assertLessEqual(self.max_running, 2)
+
+    def test_run_larger_than_memory_limit_is_reduced_alone(self):
+        scheduler = RunScheduler(4, memory_limit=1.0, report=self.messages.append)
+
+        results = scheduler.run([1, 2, 3], self._reduce, memory_estimate=lambda run: 5.0)
+
+        self.assertEqual(list(results.keys()), [1, 2, 3])
+        self.assertEqual(self.max_running, 1)
+
+    def test_failed_runs_are_retried(self):
+        attempts = {}
+
+        def reduce_run(run):
+            attempts[run] = attempts.get(run, 0) + 1
+            if run == 2 and attempts[run] == 1:
+                raise RuntimeError("first attempt fails")
+            return run
+
+        scheduler = RunScheduler(2, max_retries=1, report=self.messages.append)
+        results = scheduler.run([1, 2, 3], reduce_run)
+
+        self.assertEqual(results, {1: 1, 2: 2, 3: 3})
+        self.assertEqual(attempts[2], 2)
+        self.assertEqual(scheduler.failed, {})
+
+    def test_runs_failing_every_retry_are_reported(self):
+        def reduce_run(run):
+            if run == 2:
+                raise RuntimeError("always fails")
+            return run
+
+        scheduler = RunScheduler(2, max_retries=2, report=self.messages.append)
+        results = scheduler.run([1, 2, 3], reduce_run)
+
+        self.assertEqual(list(results.keys()), [1, 3])
+        self.assertEqual(list(scheduler.failed.keys()), [2])
+        self.assertEqual(sum(message.startswith("Run 2 failed") for message in self.messages), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()